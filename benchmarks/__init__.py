@@ -0,0 +1,6 @@
+"""
+Benchmarks du Refactoring Swarm.
+
+Mesurent le débit du pipeline lui-même (orchestrateur, graphe, outils,
+logging) avec un modèle Gemini factice, sans appel réseau.
+"""
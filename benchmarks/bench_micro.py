@@ -0,0 +1,181 @@
+"""
+Micro-benchmarks des fonctions du chemin I/O
+log_experiment, _is_inside_sandbox, read_file, write_file
+
+Une fois les appels LLM rapides (ou simulés), le coût par appel de ces
+fonctions domine : chacune écrit au moins une entrée dans le log JSON.
+Elles sont mesurées (timeit) pour plusieurs tailles de log existant.
+
+Usage:
+    python -m benchmarks.bench_micro
+    python -m benchmarks.bench_micro --log_sizes 0 10000 --repeat 10
+    python -m benchmarks.bench_micro --compare benchmarks/results/micro_baseline.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import timeit
+import uuid
+from datetime import datetime
+from typing import Callable, Dict, List
+
+DEFAULT_OUTPUT = os.path.join("benchmarks", "results", "micro_latest.json")
+DEFAULT_LOG_SIZES = (0, 10_000, 100_000)
+SAMPLE_CODE = "def add(a, b):\n    return a + b\n" * 20
+
+
+def make_log_entries(count: int) -> List[Dict]:
+    """Entrées de log réalistes (taille proche d'une entrée d'outil fichier)."""
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "timestamp": datetime.now().isoformat(),
+            "agent": "FileSystem_Tool",
+            "model": "N/A",
+            "action": "ANALYSIS",
+            "details": {
+                "operation": "read_file",
+                "file_path": f"sandbox/bench/file_{i}.py",
+                "input_prompt": f"Reading file content from: sandbox/bench/file_{i}.py",
+                "output_response": f"Successfully read 640 characters from file_{i}.py",
+                "file_size_chars": 640,
+                "content_preview": SAMPLE_CODE[:150] + "...",
+            },
+            "status": "SUCCESS",
+        }
+        for i in range(count)
+    ]
+
+
+def time_call(func: Callable[[], None], repeat: int) -> Dict:
+    """Mesure un appel (number=1) répété repeat fois."""
+    timings = timeit.Timer(func).repeat(repeat=repeat, number=1)
+    return {
+        "mean_ms": sum(timings) / len(timings) * 1000,
+        "min_ms": min(timings) * 1000,
+        "max_ms": max(timings) * 1000,
+    }
+
+
+def bench_log_size(log_size: int, repeat: int) -> Dict[str, Dict]:
+    """
+    Mesure les quatre fonctions avec un log pré-rempli de log_size entrées.
+
+    Le log et la sandbox sont redirigés vers un dossier temporaire.
+    """
+    from src.tools import file_tools
+    from src.utils import logger
+    from src.utils.logger import ActionType, log_experiment
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        log_file = os.path.join(work_dir, "logs", "experiment_data.json")
+        sandbox = os.path.join(work_dir, "sandbox")
+        os.makedirs(os.path.dirname(log_file))
+        os.makedirs(sandbox)
+
+        with open(log_file, "w", encoding="utf-8") as f:
+            json.dump(make_log_entries(log_size), f, indent=4, ensure_ascii=False)
+
+        target = os.path.join(sandbox, "bench.py")
+        with open(target, "w", encoding="utf-8") as f:
+            f.write(SAMPLE_CODE)
+
+        previous = (logger.LOG_FILE, file_tools.SANDBOX_DIR)
+        logger.LOG_FILE, file_tools.SANDBOX_DIR = log_file, sandbox
+        try:
+            calls = {
+                "log_experiment": lambda: log_experiment(
+                    agent_name="Bench", model_used="N/A", action=ActionType.ANALYSIS,
+                    details={"input_prompt": "bench", "output_response": "bench"},
+                    status="SUCCESS"
+                ),
+                "_is_inside_sandbox": lambda: file_tools._is_inside_sandbox(target),
+                "read_file": lambda: file_tools.read_file(target),
+                "write_file": lambda: file_tools.write_file(target, SAMPLE_CODE),
+            }
+            with contextlib.redirect_stdout(io.StringIO()):
+                return {name: time_call(func, repeat) for name, func in calls.items()}
+        finally:
+            logger.LOG_FILE, file_tools.SANDBOX_DIR = previous
+
+
+def compare_results(current: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Signale les fonctions dont le temps moyen dépasse la référence de plus de tolerance."""
+    regressions = []
+    for size, functions in current["results"].items():
+        for name, stats in functions.items():
+            old = baseline.get("results", {}).get(size, {}).get(name, {}).get("mean_ms")
+            if not old:
+                continue
+            change = (stats["mean_ms"] - old) / old
+            if change > tolerance:
+                regressions.append(f"{name} (log de {size} entrées) : {old:.2f}ms -> {stats['mean_ms']:.2f}ms ({change:+.1%})")
+    return regressions
+
+
+def parse_arguments(argv=None):
+    parser = argparse.ArgumentParser(description="Micro-benchmarks du logger et des outils fichiers")
+    parser.add_argument("--log_sizes", type=int, nargs="+", default=list(DEFAULT_LOG_SIZES),
+                        help="Tailles du log existant (défaut: 0 10000 100000)")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="Nombre de mesures par fonction (défaut: 5)")
+    parser.add_argument("--output", type=str, default=DEFAULT_OUTPUT,
+                        help=f"Fichier JSON de résultats (défaut: {DEFAULT_OUTPUT})")
+    parser.add_argument("--compare", type=str, default=None,
+                        help="Fichier de résultats de référence pour détecter les régressions")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Écart relatif toléré avant régression (défaut: 0.2)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_arguments(argv)
+
+    print("=" * 80)
+    print("MICRO-BENCHMARKS DU CHEMIN I/O")
+    print("=" * 80)
+
+    results = {}
+    for log_size in args.log_sizes:
+        results[str(log_size)] = bench_log_size(log_size, args.repeat)
+        print(f"\nLog existant : {log_size} entrées")
+        for name, stats in results[str(log_size)].items():
+            print(f"   {name:<20}: {stats['mean_ms']:9.2f} ms/appel (min {stats['min_ms']:.2f} ms)")
+
+    output = {
+        "timestamp": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "results": results,
+    }
+
+    parent_dir = os.path.dirname(args.output)
+    if parent_dir:
+        os.makedirs(parent_dir, exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(output, f, indent=2)
+    print(f"\nRésultats : {args.output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_results(output, baseline, args.tolerance)
+        if regressions:
+            print(f"\n❌ {len(regressions)} régression(s) par rapport à {args.compare} :")
+            for message in regressions:
+                print(f"   • {message}")
+            return 1
+        print(f"\n✅ Aucune régression par rapport à {args.compare}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+"""
+Benchmark du pipeline d'orchestration
+Débit de Orchestrator.run avec un modèle Gemini factice
+
+Pour chaque taille de dataset, un processus dédié (pour isoler le pic de
+mémoire) génère les fichiers, lance Orchestrator.run et mesure :
+- fichiers/seconde
+- latence par fichier (p50 / p95)
+- pic de mémoire résidente (RSS)
+- part du temps passée à écrire les logs
+
+Usage:
+    python -m benchmarks.bench_pipeline --files 1 10 100 --latency 0.05
+    python -m benchmarks.bench_pipeline --files 1000 --compare benchmarks/results/pipeline_baseline.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing import get_context
+from typing import Dict, List
+
+from benchmarks.datasets import DEFAULT_DATASETS_DIR, generate_dataset
+
+DEFAULT_OUTPUT = os.path.join("benchmarks", "results", "pipeline_latest.json")
+
+# Métriques comparées avec --compare : (clé, True si plus grand = meilleur)
+COMPARED_METRICS = (
+    ("files_per_second", True),
+    ("p50_file_seconds", False),
+    ("p95_file_seconds", False),
+    ("peak_rss_mb", False),
+)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Percentile par interpolation linéaire (0 si aucune valeur)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def run_scenario(dataset_dir: str, file_count: int, latency: float, clean_ratio: float,
+                 max_iterations: int = 3) -> Dict:
+    """
+    Exécute un scénario dans le processus courant.
+
+    Les logs sont écrits dans un dossier temporaire et le rate limiter est
+    désactivé : seul le coût du pipeline (et la latence simulée) est mesuré.
+
+    Returns:
+        dict: Mesures du scénario
+    """
+    from benchmarks.fake_model import install_fake_model
+    from src.orchestrator import Orchestrator
+    from src.utils import logger, rate_limiter
+
+    install_fake_model(latency)
+    rate_limiter._global_limiter.min_delay = 0.0
+    rate_limiter.reset_rate_limiter()
+
+    generate_dataset(dataset_dir, file_count, clean_ratio)
+
+    with tempfile.TemporaryDirectory() as log_dir:
+        logger.LOG_FILE = os.path.join(log_dir, "experiment_data.json")
+
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            summary = Orchestrator(dataset_dir, max_iterations=max_iterations).run()
+        elapsed = time.perf_counter() - start
+
+        log_bytes = sum(
+            os.path.getsize(os.path.join(root, name))
+            for root, _, names in os.walk(log_dir) for name in names
+        )
+
+    timing = summary.get("timing", {})
+    file_latencies = [
+        stats["wall_s"] for stats in timing.get("by_file", {}).values() if "wall_s" in stats
+    ]
+    log_write_s = timing.get("by_io", {}).get("log_experiment", {}).get("total_s", 0.0)
+
+    return {
+        "files": file_count,
+        "latency_s": latency,
+        "clean_ratio": clean_ratio,
+        "elapsed_seconds": elapsed,
+        "files_per_second": file_count / elapsed if elapsed > 0 else 0.0,
+        "p50_file_seconds": percentile(file_latencies, 50),
+        "p95_file_seconds": percentile(file_latencies, 95),
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "log_write_seconds": log_write_s,
+        "log_write_share": log_write_s / elapsed if elapsed > 0 else 0.0,
+        "log_bytes": log_bytes,
+        "files_validated": summary.get("files_validated", 0),
+        "files_failed": summary.get("files_failed", 0),
+    }
+
+
+def run_isolated(dataset_dir: str, file_count: int, latency: float, clean_ratio: float) -> Dict:
+    """Exécute un scénario dans un processus neuf (mesure RSS indépendante)."""
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+        return pool.submit(run_scenario, dataset_dir, file_count, latency, clean_ratio).result()
+
+
+def compare_results(current: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """
+    Compare deux fichiers de résultats scénario par scénario.
+
+    Returns:
+        list: Messages de régression (vide si aucune)
+    """
+    baseline_by_size = {s["files"]: s for s in baseline.get("scenarios", [])}
+    regressions = []
+
+    for scenario in current["scenarios"]:
+        reference = baseline_by_size.get(scenario["files"])
+        if reference is None:
+            continue
+        for key, higher_is_better in COMPARED_METRICS:
+            old, new = reference.get(key, 0.0), scenario.get(key, 0.0)
+            if old <= 0:
+                continue
+            change = (new - old) / old
+            if (higher_is_better and change < -tolerance) or (not higher_is_better and change > tolerance):
+                regressions.append(f"{scenario['files']} fichiers - {key}: {old:.4f} -> {new:.4f} ({change:+.1%})")
+
+    return regressions
+
+
+def parse_arguments(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark du pipeline avec un LLM factice")
+    parser.add_argument("--files", type=int, nargs="+", default=[1, 10, 100],
+                        help="Tailles de dataset à mesurer (défaut: 1 10 100)")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="Latence simulée par appel LLM, en secondes (défaut: 0)")
+    parser.add_argument("--clean_ratio", type=float, default=0.5,
+                        help="Fraction des fichiers sans bug (défaut: 0.5)")
+    parser.add_argument("--output", type=str, default=DEFAULT_OUTPUT,
+                        help=f"Fichier JSON de résultats (défaut: {DEFAULT_OUTPUT})")
+    parser.add_argument("--compare", type=str, default=None,
+                        help="Fichier de résultats de référence pour détecter les régressions")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Écart relatif toléré avant régression (défaut: 0.2)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_arguments(argv)
+
+    print("=" * 80)
+    print("BENCHMARK DU PIPELINE (LLM factice)")
+    print("=" * 80)
+
+    scenarios = []
+    for file_count in args.files:
+        dataset_dir = os.path.join(DEFAULT_DATASETS_DIR, f"dataset_{file_count}")
+        result = run_isolated(dataset_dir, file_count, args.latency, args.clean_ratio)
+        scenarios.append(result)
+        print(f"{file_count:>6} fichiers : {result['files_per_second']:8.2f} fichiers/s | "
+              f"p50 {result['p50_file_seconds']:.3f}s | p95 {result['p95_file_seconds']:.3f}s | "
+              f"RSS {result['peak_rss_mb']:.0f} Mo | logs {result['log_write_share']:.0%}")
+
+    results = {
+        "timestamp": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "latency_s": args.latency,
+        "scenarios": scenarios,
+    }
+
+    parent_dir = os.path.dirname(args.output)
+    if parent_dir:
+        os.makedirs(parent_dir, exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nRésultats : {args.output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_results(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n❌ {len(regressions)} régression(s) par rapport à {args.compare} :")
+            for message in regressions:
+                print(f"   • {message}")
+            return 1
+        print(f"\n✅ Aucune régression par rapport à {args.compare}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
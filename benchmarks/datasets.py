@@ -0,0 +1,74 @@
+"""
+Génération de datasets synthétiques pour les benchmarks
+Fichiers construits à partir de sandbox/test_samples/*
+
+Chaque fichier reprend un échantillon de sandbox/test_samples, répété
+1, 2, 4 ou 8 fois pour faire varier la taille. Une fraction des fichiers
+est marquée "propre" pour exercer la branche JUDGE_CLEAN_CODE.
+"""
+
+import os
+import shutil
+from typing import List
+
+from benchmarks.fake_model import CLEAN_MARKER
+
+SAMPLES_DIR = os.path.join("sandbox", "test_samples")
+DEFAULT_DATASETS_DIR = os.path.join("sandbox", "benchmarks")
+SIZE_MULTIPLIERS = (1, 2, 4, 8)
+
+
+def load_samples(samples_dir: str = SAMPLES_DIR) -> List[str]:
+    """Retourne le contenu des échantillons .py, triés par nom."""
+    samples = []
+    for name in sorted(os.listdir(samples_dir)):
+        if name.endswith(".py"):
+            with open(os.path.join(samples_dir, name), "r", encoding="utf-8") as f:
+                samples.append(f.read())
+    if not samples:
+        raise FileNotFoundError(f"Aucun échantillon .py dans {samples_dir}")
+    return samples
+
+
+def generate_dataset(output_dir: str, file_count: int, clean_ratio: float = 0.5,
+                     samples_dir: str = SAMPLES_DIR) -> List[str]:
+    """
+    Crée un dataset synthétique de file_count fichiers.
+
+    Le dossier est recréé à chaque appel. Il doit se trouver dans sandbox/
+    pour être accepté par les outils fichiers.
+
+    Args:
+        output_dir (str): Dossier de sortie
+        file_count (int): Nombre de fichiers (1 à 10 000 et plus)
+        clean_ratio (float): Fraction des fichiers marqués sans bug
+        samples_dir (str): Dossier des échantillons modèles
+
+    Returns:
+        list: Chemins des fichiers créés
+    """
+    samples = load_samples(samples_dir)
+
+    if os.path.exists(output_dir):
+        shutil.rmtree(output_dir)
+    os.makedirs(output_dir)
+
+    paths = []
+    clean_every = round(1 / clean_ratio) if clean_ratio > 0 else 0
+    for i in range(file_count):
+        sample = samples[i % len(samples)]
+        multiplier = SIZE_MULTIPLIERS[(i // len(samples)) % len(SIZE_MULTIPLIERS)]
+
+        header = f"# bench file {i}\n"
+        if clean_every and i % clean_every == 0:
+            header += CLEAN_MARKER + "\n"
+
+        # Au plus 1000 fichiers par sous-dossier, comme dans un vrai dépôt
+        sub_dir = os.path.join(output_dir, f"pkg_{i // 1000:03d}")
+        os.makedirs(sub_dir, exist_ok=True)
+        path = os.path.join(sub_dir, f"bench_{i:05d}.py")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(header + "\n\n".join([sample] * multiplier))
+        paths.append(path)
+
+    return paths
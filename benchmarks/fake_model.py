@@ -0,0 +1,100 @@
+"""
+Modèle Gemini factice pour les benchmarks
+Remplace genai.GenerativeModel avec une latence configurable
+
+Comportement (déterministe, identique pour tous les runs) :
+- Auditeur : 1 problème tant que le code n'est pas marqué "# fixed",
+  0 problème si le fichier est marqué "# bench: clean"
+- Correcteur : renvoie le code reçu suivi de "# fixed"
+- Audit + Correction : rapport de l'Auditeur et code du Correcteur
+- Testeur : VALIDATE
+"""
+
+import json
+import time
+
+CLEAN_MARKER = "# bench: clean"
+FIXED_MARKER = "# fixed"
+
+
+class FakeUsage:
+    """Imite response.usage_metadata (approximation 1 token = 4 caractères)."""
+
+    def __init__(self, prompt: str, text: str):
+        self.prompt_token_count = len(prompt) // 4
+        self.candidates_token_count = len(text) // 4
+        self.total_token_count = self.prompt_token_count + self.candidates_token_count
+
+
+class FakeChunk:
+    """Imite un morceau de réponse en streaming."""
+
+    def __init__(self, text: str):
+        self.text = text
+
+
+class FakeResponse:
+    """Imite la réponse de generate_content (itérable par ligne avec stream=True)."""
+
+    def __init__(self, prompt: str, text: str):
+        self.text = text
+        self.usage_metadata = FakeUsage(prompt, text)
+
+    def __iter__(self):
+        for line in self.text.splitlines(keepends=True):
+            yield FakeChunk(line)
+
+
+def _code_block(prompt: str) -> str:
+    return prompt.split("```python", 1)[1].split("```", 1)[0]
+
+
+class FakeGenerativeModel:
+    """
+    Remplaçant de genai.GenerativeModel.
+
+    La latence (en secondes) est un attribut de classe pour pouvoir être
+    réglée avant que les agents n'instancient le modèle.
+    """
+
+    latency = 0.0
+
+    def __init__(self, model_name: str = "gemini-2.5-flash", **kwargs):
+        self.model_name = model_name
+
+    def generate_content(self, prompt: str, **kwargs) -> FakeResponse:
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+        if "en une seule réponse" in prompt:
+            code = _code_block(prompt)
+            if CLEAN_MARKER in code or FIXED_MARKER in code:
+                text = '{"file":"bench.py","total_issues":0,"issues":[],"fixed_code":""}'
+            else:
+                text = json.dumps({"file": "bench.py", "total_issues": 1, "issues": [{
+                    "line": 1, "type": "missing_docstring", "severity": "MEDIUM",
+                    "description": "Function lacks docstring", "suggestion": "Add docstring"}],
+                    "fixed_code": code.strip() + f"\n{FIXED_MARKER}\n"})
+        elif "auditeur de code" in prompt:
+            code = _code_block(prompt)
+            if CLEAN_MARKER in code or FIXED_MARKER in code:
+                text = '{"file":"bench.py","total_issues":0,"issues":[]}'
+            else:
+                text = ('{"file":"bench.py","total_issues":1,"issues":[{"line":1,'
+                        '"type":"missing_docstring","severity":"MEDIUM",'
+                        '"description":"Function lacks docstring","suggestion":"Add docstring"}]}')
+        elif "corriger les bugs" in prompt:
+            text = _code_block(prompt).strip() + f"\n{FIXED_MARKER}\n"
+        else:
+            text = ('{"decision":"VALIDATE","tests_run":0,"tests_passed":0,"tests_failed":0,'
+                    '"errors":[],"message":"All tests passed"}')
+
+        return FakeResponse(prompt, text)
+
+
+def install_fake_model(latency: float = 0.0) -> None:
+    """Remplace genai.GenerativeModel par le modèle factice."""
+    import google.generativeai as genai
+
+    FakeGenerativeModel.latency = latency
+    genai.GenerativeModel = FakeGenerativeModel
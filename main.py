@@ -13,10 +13,10 @@ Version : 1.0
 import argparse
 import os
 import sys
-import google.generativeai as genai
 from dotenv import load_dotenv
 
-from src.orchestrator import Orchestrator
+# google.generativeai et l'orchestrateur (LangGraph) sont importés dans main(),
+# après le parsing des arguments : --help et les erreurs d'arguments sont immédiats.
 
 
 def validate_environment():
@@ -57,6 +57,15 @@ def validate_environment():
     return True
 
 
+def _duration_argument(value):
+    """Type argparse pour --deadline (ex: 90s, 30m, 1h)."""
+    from src.scheduler import parse_duration
+    try:
+        return parse_duration(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
 def parse_arguments():
     """
     Parse les arguments de la ligne de commande.
@@ -71,11 +80,20 @@ def parse_arguments():
 Exemples d'utilisation:
   python main.py --target_dir ./sandbox/dataset_inconnu
   python main.py --target_dir ./sandbox/test_dataset --max_iterations 5
+  python main.py --target_dir ./sandbox/test_dataset --trace_file logs/traces.otlp.json
+  python main.py --target_dir ./sandbox/test_dataset --metrics_port 9108
+  python main.py --target_dir ./sandbox/dataset_inconnu --plan
+  python main.py --target_dir ./sandbox/dataset_inconnu --workers 4 --deadline 30m
+  python main.py --target_dir ./sandbox/dataset_inconnu --workers 4 --hedge_percentile 95
+  python main.py --target_dir ./sandbox/dataset_inconnu --fuse_max_tokens 1500
 
 Notes:
   - Le dossier cible doit contenir des fichiers .py
   - Les logs seront sauvegardés dans logs/experiment_data.json
   - Le système s'arrête après max_iterations (défaut: 10)
+  - Les fichiers sont traités par priorité : erreurs de syntaxe d'abord, puis
+    score pylint (--schedule_pylint), taux d'échec des runs précédents, taille
+  - --plan estime requêtes, tokens et durée sans appeler le modèle (pas de clé API requise)
         """
     )
     
@@ -93,6 +111,118 @@ Notes:
         help="Nombre maximum d'itérations par fichier (défaut: 10)"
     )
     
+    parser.add_argument(
+        "--trace_file",
+        type=str,
+        default=None,
+        help="Exporte les spans du run au format OTLP/JSON dans ce fichier (ex: logs/traces.otlp.json)"
+    )
+    
+    parser.add_argument(
+        "--metrics_port",
+        type=int,
+        default=None,
+        help="Expose des métriques Prometheus sur http://127.0.0.1:<port>/metrics pendant le run"
+    )
+    
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Nombre de fichiers traités en parallèle (défaut: 1)"
+    )
+    
+    parser.add_argument(
+        "--deadline",
+        type=_duration_argument,
+        default=None,
+        help="Budget de temps du run (ex: 30m) : priorise les fichiers au meilleur rendement "
+             "et ne lance plus ceux qui ne tiennent pas dans le temps restant"
+    )
+    
+    parser.add_argument(
+        "--schedule_pylint",
+        action="store_true",
+        help="Ordonne aussi les fichiers par score pylint (un appel pylint par fichier avant le run)"
+    )
+    
+    parser.add_argument(
+        "--hedge_percentile",
+        type=float,
+        default=None,
+        help="Renvoie une copie d'une requête Auditeur/Correcteur plus lente que ce percentile "
+             "de latence observée (ex: 95), dans la limite du rate limiter"
+    )
+    
+    parser.add_argument(
+        "--fuse_max_tokens",
+        type=int,
+        default=None,
+        help="Audit et correction en un seul appel pour les fichiers d'au plus N tokens "
+             "(~4 caractères par token, ex: 1500)"
+    )
+    
+    parser.add_argument(
+        "--no_pytest_pool",
+        action="store_true",
+        help="Lance un nouveau processus pytest pour chaque test (par défaut : workers "
+             "pytest préchargés, si le système le permet)"
+    )
+    
+    parser.add_argument(
+        "--no_full_test_run",
+        action="store_true",
+        help="N'exécute pas toute la suite de tests en fin de run (par défaut : une exécution "
+             "complète, rapportée dans le résumé sans changer le statut des fichiers)"
+    )
+    
+    parser.add_argument(
+        "--no_test_impact",
+        action="store_true",
+        help="Le Judge exécute pytest sur le seul fichier corrigé, sans les tests qui l'importent"
+    )
+    
+    parser.add_argument(
+        "--summary_file",
+        type=str,
+        default=None,
+        help="Résumé JSON Lines du run, une ligne par fichier écrite dès qu'il est terminé "
+             "(défaut : logs/run_summary.jsonl)"
+    )
+    
+    parser.add_argument(
+        "--no_dedup",
+        action="store_true",
+        help="Traite chaque fichier, même s'il est identique à un autre (par défaut : un seul "
+             "fichier par groupe de copies identiques, sa version validée est recopiée)"
+    )
+    
+    parser.add_argument(
+        "--verify_duplicates",
+        action="store_true",
+        help="Exécute pytest sur chaque copie après y avoir recopié la version validée"
+    )
+    
+    parser.add_argument(
+        "--no_fix_memory",
+        action="store_true",
+        help="N'utilise pas les corrections déjà validées (logs/fix_memory.json) comme "
+             "exemples pour les fonctions quasi identiques"
+    )
+    
+    parser.add_argument(
+        "--no_tiering",
+        action="store_true",
+        help="Utilise gemini-2.5-flash pour tous les appels (par défaut : modèle léger d'abord, "
+             "escalade si la sortie est invalide ou si les tests échouent)"
+    )
+    
+    parser.add_argument(
+        "--plan",
+        action="store_true",
+        help="Affiche une estimation du run (requêtes, tokens, durée) sans appeler le modèle"
+    )
+    
     return parser.parse_args()
 
 
@@ -135,9 +265,24 @@ def main():
     """
     Point d'entrée principal du système multi-agents.
     """
+    # Parser les arguments (avant tout import lourd)
+    args = parse_arguments()
+    
     # Charger les variables d'environnement
     load_dotenv()
     
+    # Mode plan : estimation seule, ni clé API ni appel au modèle
+    if args.plan:
+        if not os.path.isdir(args.target_dir):
+            print(f"❌ ERREUR: Le dossier '{args.target_dir}' n'existe pas")
+            sys.exit(1)
+        
+        from src.planning import build_plan, print_plan
+        print_plan(build_plan(args.target_dir, max_iterations=args.max_iterations,
+                              workers=args.workers, fuse_max_tokens=args.fuse_max_tokens,
+                              dedup=not args.no_dedup))
+        sys.exit(0)
+    
     # Afficher le header
     print("\n" + "█"*80)
     print("█" + " "*78 + "█")
@@ -151,14 +296,22 @@ def main():
     if not validate_environment():
         sys.exit(1)
     
-    # Parser les arguments
-    args = parse_arguments()
-    
     print("="*80)
     print("CONFIGURATION DU SYSTÈME")
     print("="*80)
     print(f"Dossier cible     : {args.target_dir}")
     print(f"Max iterations    : {args.max_iterations}")
+    print(f"Workers           : {args.workers}")
+    if args.deadline is not None:
+        print(f"Deadline          : {args.deadline:.0f}s")
+    if args.hedge_percentile is not None:
+        print(f"Hedging           : au-delà du p{args.hedge_percentile:g} de latence")
+    if args.fuse_max_tokens is not None:
+        print(f"Audit + fix fusés : fichiers <= {args.fuse_max_tokens} tokens")
+    if args.trace_file:
+        print(f"Trace OTLP/JSON   : {args.trace_file}")
+    if args.metrics_port is not None:
+        print(f"Port métriques    : {args.metrics_port}")
     print("="*80 + "\n")
     
     # Valider le dossier cible
@@ -166,6 +319,10 @@ def main():
         sys.exit(1)
     
     # Configurer Gemini
+    import google.generativeai as genai
+    from src.orchestrator import Orchestrator
+    from src.utils.logger import export_experiment_log
+    
     api_key = os.getenv("GOOGLE_API_KEY")
     genai.configure(api_key=api_key)
     
@@ -177,10 +334,27 @@ def main():
     try:
         orchestrator = Orchestrator(
             target_dir=args.target_dir,
-            max_iterations=args.max_iterations
+            max_iterations=args.max_iterations,
+            trace_file=args.trace_file,
+            metrics_port=args.metrics_port,
+            workers=args.workers,
+            deadline_seconds=args.deadline,
+            schedule_pylint=args.schedule_pylint,
+            hedge_percentile=args.hedge_percentile,
+            model_tiering=not args.no_tiering,
+            fuse_max_tokens=args.fuse_max_tokens,
+            pytest_pool=not args.no_pytest_pool,
+            test_impact=not args.no_test_impact,
+            full_test_run=not args.no_full_test_run,
+            summary_file=args.summary_file,
+            dedup=not args.no_dedup,
+            verify_duplicates=args.verify_duplicates,
+            fix_memory=not args.no_fix_memory
         )
         
         summary = orchestrator.run()
+        # Runs arrêtés avant le traitement (dossier vide...) : journal reversé aussi
+        export_experiment_log()
         
         # Afficher le résumé final
         print("\n" + "█"*80)
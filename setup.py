@@ -6,6 +6,7 @@ setup(
     packages=find_packages(),
     install_requires=[
         "google-generativeai",
+        "pydantic>=2",
         "python-dotenv",
         "pytest",
     ],
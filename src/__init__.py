@@ -4,17 +4,40 @@ Refactoring Swarm - Système multi-agents de refactoring automatique
 Auteur: Équipe Refactoring Swarm
 Date: 2026-01-10
 Version: 1.0.0
+
+Les agents et l'orchestrateur sont chargés à la première utilisation
+(PEP 562) : importer un sous-module léger (ex: src.prompts) ne charge ni
+google.generativeai ni LangGraph.
 """
 
+import importlib
+
 __version__ = "1.0.0"
 __author__ = "Équipe Refactoring Swarm"
 
-from src.agents import AuditorAgent, FixerAgent, JudgeAgent
-from src.orchestrator import Orchestrator
-
 __all__ = [
     "AuditorAgent",
     "FixerAgent", 
     "JudgeAgent",
     "Orchestrator",
-]
\ No newline at end of file
+]
+
+# Nom exporté -> module qui le définit
+_LAZY_EXPORTS = {
+    "AuditorAgent": "src.agents",
+    "FixerAgent": "src.agents",
+    "JudgeAgent": "src.agents",
+    "Orchestrator": "src.orchestrator",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        value = getattr(importlib.import_module(_LAZY_EXPORTS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -3,14 +3,36 @@ Module des agents du Refactoring Swarm.
 
 Auteur: Lead Dev (Orchestrateur)
 Date: 2026-01-10
+
+Chaque agent importe google.generativeai : ils sont chargés à la première
+utilisation (PEP 562) pour ne pas payer cet import au démarrage.
 """
 
-from .auditor_agent import AuditorAgent
-from .fixer_agent import FixerAgent
-from .judge_agent import JudgeAgent
+import importlib
 
 __all__ = [
+    "AuditFixAgent",
     "AuditorAgent",
     "FixerAgent",
     "JudgeAgent",
-]
\ No newline at end of file
+]
+
+# Nom exporté -> sous-module qui le définit
+_LAZY_EXPORTS = {
+    "AuditFixAgent": ".audit_fix_agent",
+    "AuditorAgent": ".auditor_agent",
+    "FixerAgent": ".fixer_agent",
+    "JudgeAgent": ".judge_agent",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        value = getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
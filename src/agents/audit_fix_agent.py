@@ -0,0 +1,138 @@
+"""
+Agent Audit + Correction - Un seul appel pour les petits fichiers
+Responsable : Lead Dev (Orchestrateur)
+Date : 2026-10-18
+"""
+
+import google.generativeai as genai
+from typing import Dict, Optional
+import os
+
+from src.prompts import build_audit_fix_prompt
+from src.utils.logger import log_experiment, ActionType
+from src.utils.llm import generate_content
+from src.utils.structured_output import (
+    AuditFixReport,
+    StructuredOutputError,
+    json_generation_kwargs,
+    parse_structured,
+)
+from src.tools.file_tools import read_file, write_file
+
+
+class AuditFixAgent:
+    """
+    Agent Audit + Correction - Detecte les problemes et renvoie le code corrige
+    dans la meme reponse (le fichier n'est envoye qu'une fois).
+    """
+
+    def __init__(self, model_name: str = "gemini-2.5-flash"):
+        """
+        Initialise l'agent combine.
+
+        Args:
+            model_name (str): Nom du modele Gemini a utiliser
+        """
+        self.model_name = model_name
+        self.model = genai.GenerativeModel(model_name)
+        self.agent_name = "AuditFix_Agent"
+
+    def audit_and_fix(self, file_path: str, context: str = "") -> Optional[Dict]:
+        """
+        Analyse un fichier et ecrit sa version corrigee.
+
+        Args:
+            file_path (str): Chemin complet vers le fichier
+            context (str): Signatures des symboles importes d'autres fichiers du projet
+
+        Returns:
+            dict: Rapport d'audit (sans le code corrige), ou None si la reponse est
+            inutilisable (JSON invalide ou repare, code corrige absent ou syntaxiquement
+            invalide). Le fichier n'est modifie que si le code corrige compile.
+        """
+
+        try:
+            code_content = read_file(file_path)
+        except Exception as e:
+            print(f"ERREUR: Impossible de lire le fichier : {e}")
+            return None
+
+        file_name = os.path.basename(file_path)
+
+        print(f"\n{'='*80}")
+        print(f"AUDIT + FIX - Analyse et correction de {file_name}")
+        print(f"{'='*80}")
+
+        prompt, prompt_stats = build_audit_fix_prompt(file_name, code_content, context)
+
+        try:
+            print(f"Envoi a {self.model_name}...")
+            response = generate_content(self.model, prompt, self.agent_name, self.model_name,
+                                        prompt_stats=prompt_stats,
+                                        **json_generation_kwargs(AuditFixReport))
+            raw_response = response.text.strip()
+
+            print(f"Reponse recue ({len(raw_response)} caracteres)")
+
+            report, repaired = parse_structured(raw_response, AuditFixReport)
+            # JSON repare : reponse le plus souvent coupee par la limite de tokens.
+            # Rapport ou code corrige possiblement tronques, meme sans probleme
+            # signale : le fichier repasse par l'Auditeur puis le Correcteur
+            if repaired:
+                raise StructuredOutputError("reponse reparee, rapport ou code corrige possiblement tronque")
+
+            fixed_code = report.pop("fixed_code", "").strip()
+            bugs_found = report.get("total_issues", 0)
+            print(f"Resultat : {bugs_found} probleme(s) detecte(s)")
+
+            syntax_valid = True
+            if bugs_found:
+                if not fixed_code:
+                    raise StructuredOutputError("problemes signales sans code corrige")
+                try:
+                    compile(fixed_code, file_name, 'exec')
+                    print("Code corrige syntaxiquement VALIDE")
+                except SyntaxError as e:
+                    print(f"ATTENTION : Erreur de syntaxe ligne {e.lineno}")
+                    syntax_valid = False
+
+                if syntax_valid:
+                    write_file(file_path, fixed_code)
+                    print(f"Code corrige sauvegarde : {file_path}")
+
+            log_experiment(
+                agent_name=self.agent_name,
+                model_used=self.model_name,
+                action=ActionType.FIX,
+                details={
+                    "file_fixed": file_name,
+                    "input_prompt": prompt,
+                    "output_response": raw_response,
+                    "bugs_found": bugs_found,
+                    "original_lines": len(code_content.splitlines()),
+                    "fixed_lines": len(fixed_code.splitlines()),
+                    "syntax_valid": syntax_valid,
+                    "prompt_budget": prompt_stats
+                },
+                status="SUCCESS" if syntax_valid else "PARTIAL_SUCCESS"
+            )
+
+            return report if syntax_valid else None
+
+        except Exception as e:
+            print(f"ERREUR lors de l'audit + correction : {e}")
+
+            log_experiment(
+                agent_name=self.agent_name,
+                model_used=self.model_name,
+                action=ActionType.FIX,
+                details={
+                    "file_fixed": file_name,
+                    "input_prompt": prompt,
+                    "output_response": raw_response if 'raw_response' in locals() else "N/A",
+                    "error": str(e)
+                },
+                status="FAILURE"
+            )
+
+            return None
@@ -4,13 +4,19 @@ Responsable : Lead Dev (Orchestrateur)
 Date : 2026-01-10
 """
 
-import json
 import google.generativeai as genai
 from typing import Dict, Optional
 import os
 
-from src.prompts import get_auditor_prompt
+from src.prompts import build_auditor_prompt
 from src.utils.logger import log_experiment, ActionType
+from src.utils.llm import generate_content
+from src.utils.structured_output import (
+    AuditReport,
+    StructuredOutputError,
+    json_generation_kwargs,
+    parse_structured,
+)
 from src.tools.file_tools import read_file
 
 
@@ -30,12 +36,13 @@ class AuditorAgent:
         self.model = genai.GenerativeModel(model_name)
         self.agent_name = "Auditor_Agent"
     
-    def analyze_file(self, file_path: str) -> Optional[Dict]:
+    def analyze_file(self, file_path: str, context: str = "") -> Optional[Dict]:
         """
         Analyse un fichier Python et produit un rapport JSON.
         
         Args:
             file_path (str): Chemin complet vers le fichier a analyser
+            context (str): Signatures des symboles importes d'autres fichiers du projet
             
         Returns:
             dict: Rapport d'audit au format JSON, ou None si erreur
@@ -53,20 +60,29 @@ class AuditorAgent:
         print(f"AUDITOR - Analyse de {file_name}")
         print(f"{'='*80}")
         
-        prompt = get_auditor_prompt(file_name, code_content)
+        # Prompt dans le budget de tokens de l'Auditeur
+        prompt, prompt_stats = build_auditor_prompt(file_name, code_content, context)
         
         try:
             print(f"Envoi a {self.model_name}...")
-            response = self.model.generate_content(prompt)
+            # Sortie JSON demandee au modele quand le SDK le permet
+            response = generate_content(self.model, prompt, self.agent_name, self.model_name,
+                                        prompt_stats=prompt_stats,
+                                        **json_generation_kwargs(AuditReport))
             raw_response = response.text.strip()
             
             print(f"Reponse recue ({len(raw_response)} caracteres)")
             
-            cleaned_response = self._clean_json_response(raw_response)
-            
-            audit_report = json.loads(cleaned_response)
+            # Validation par schema, reparation locale si le JSON est mal forme
+            audit_report, repaired = parse_structured(raw_response, AuditReport)
+            if repaired:
+                print("JSON mal forme repare localement")
             
             bugs_found = audit_report.get("total_issues", 0)
+            # JSON repare sans probleme signale : la liste a pu etre coupee,
+            # le fichier ne doit pas etre valide sans tests sur ce rapport
+            if repaired and not bugs_found:
+                raise StructuredOutputError("reponse reparee sans probleme signale, rapport possiblement tronque")
             print(f"Resultat : {bugs_found} probleme(s) detecte(s)")
             
             log_experiment(
@@ -78,14 +94,16 @@ class AuditorAgent:
                     "input_prompt": prompt,
                     "output_response": raw_response,
                     "bugs_found": bugs_found,
-                    "code_lines": len(code_content.splitlines())
+                    "code_lines": len(code_content.splitlines()),
+                    "prompt_budget": prompt_stats,
+                    "json_repaired": repaired
                 },
                 status="SUCCESS"
             )
             
             return audit_report
             
-        except json.JSONDecodeError as e:
+        except StructuredOutputError as e:
             print(f"ERREUR : JSON invalide de l'Auditeur")
             print(f"   {e}")
             
@@ -121,24 +139,3 @@ class AuditorAgent:
             )
             
             return None
-    
-    def _clean_json_response(self, response: str) -> str:
-        """
-        Nettoie la reponse pour extraire le JSON pur.
-        
-        Args:
-            response (str): Reponse brute de Gemini
-            
-        Returns:
-            str: JSON nettoye
-        """
-        cleaned = response.strip()
-        
-        if cleaned.startswith("```json"):
-            cleaned = cleaned[7:]
-        if cleaned.startswith("```"):
-            cleaned = cleaned[3:]
-        if cleaned.endswith("```"):
-            cleaned = cleaned[:-3]
-        
-        return cleaned.strip()
\ No newline at end of file
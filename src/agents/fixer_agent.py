@@ -8,9 +8,11 @@ import google.generativeai as genai
 from typing import Dict
 import os
 
-from src.prompts import get_fixer_prompt
+from src.prompts import build_fixer_prompt
 from src.utils.logger import log_experiment, ActionType
-from src.tools.file_tools import read_file, write_file
+from src.utils.llm import generate_content, stream_content
+from src.tools.code_stream import IncrementalCodeChecker
+from src.tools.file_tools import StreamingFileWriter, read_file, write_file
 
 
 class FixerAgent:
@@ -18,24 +20,30 @@ class FixerAgent:
     Agent Correcteur - Corrige les bugs selon le rapport de l'Auditeur.
     """
     
-    def __init__(self, model_name: str = "gemini-2.5-flash"):
+    def __init__(self, model_name: str = "gemini-2.5-flash", streaming: bool = True):
         """
         Initialise l'Agent Correcteur.
         
         Args:
             model_name (str): Nom du modele Gemini a utiliser
+            streaming (bool): Recoit le code en streaming, verifie au fil de l'eau
+                (src.tools.code_stream) et ecrit dans un fichier temporaire
         """
         self.model_name = model_name
+        self.streaming = streaming
         self.model = genai.GenerativeModel(model_name)
         self.agent_name = "Fixer_Agent"
     
-    def fix_file(self, file_path: str, audit_report: Dict) -> bool:
+    def fix_file(self, file_path: str, audit_report: Dict, context: str = "", examples: str = "") -> bool:
         """
         Corrige un fichier selon le rapport d'audit.
         
         Args:
             file_path (str): Chemin complet vers le fichier a corriger
             audit_report (dict): Rapport JSON de l'Auditeur
+            context (str): Signatures des symboles importes d'autres fichiers du projet
+            examples (str): Corrections validees de fonctions quasi identiques
+                (src.tools.fix_memory)
             
         Returns:
             bool: True si correction reussie, False sinon
@@ -60,17 +68,29 @@ class FixerAgent:
             print(f"ERREUR: Impossible de lire le fichier : {e}")
             return False
         
-        prompt = get_fixer_prompt(file_name, buggy_code, audit_report)
+        # Prompt dans le budget de tokens du Correcteur (rapport en JSON compact)
+        prompt, prompt_stats = build_fixer_prompt(file_name, buggy_code, audit_report, context, examples)
         
+        writer = None
+        stream_stats = None
         try:
             print(f"Envoi a {self.model_name}...")
-            response = self.model.generate_content(prompt)
-            raw_response = response.text.strip()
+            if self.streaming:
+                writer = StreamingFileWriter(file_path)
+                raw_response, fixed_code, stream_stats = self._generate_streaming(
+                    prompt, prompt_stats, writer
+                )
+                if fixed_code is None:
+                    writer.discard()
+                    return self._log_aborted(file_name, prompt, raw_response, stream_stats, prompt_stats)
+            else:
+                response = generate_content(self.model, prompt, self.agent_name, self.model_name,
+                                            prompt_stats=prompt_stats)
+                raw_response = response.text.strip()
+                fixed_code = self._clean_code_response(raw_response)
             
             print(f"Reponse recue ({len(raw_response)} caracteres)")
             
-            fixed_code = self._clean_code_response(raw_response)
-            
             try:
                 compile(fixed_code, file_name, 'exec')
                 print("Code corrige syntaxiquement VALIDE")
@@ -82,7 +102,10 @@ class FixerAgent:
             print(f"Lignes : {len(buggy_code.splitlines())} -> {len(fixed_code.splitlines())}")
             
             try:
-                write_file(file_path, fixed_code)
+                if writer is not None:
+                    writer.commit(fixed_code)
+                else:
+                    write_file(file_path, fixed_code)
                 print(f"Code corrige sauvegarde : {file_path}")
             except Exception as e:
                 print(f"ERREUR: Impossible de sauvegarder le fichier : {e}")
@@ -99,7 +122,9 @@ class FixerAgent:
                     "bugs_fixed": bugs_to_fix,
                     "original_lines": len(buggy_code.splitlines()),
                     "fixed_lines": len(fixed_code.splitlines()),
-                    "syntax_valid": syntax_valid
+                    "syntax_valid": syntax_valid,
+                    "prompt_budget": prompt_stats,
+                    "streaming": stream_stats
                 },
                 status="SUCCESS" if syntax_valid else "PARTIAL_SUCCESS"
             )
@@ -108,6 +133,8 @@ class FixerAgent:
             
         except Exception as e:
             print(f"ERREUR lors de la correction : {e}")
+            if writer is not None:
+                writer.discard()
             
             log_experiment(
                 agent_name=self.agent_name,
@@ -124,6 +151,55 @@ class FixerAgent:
             
             return False
     
+    def _generate_streaming(self, prompt: str, prompt_stats: Dict, writer: StreamingFileWriter):
+        """
+        Recoit le code en streaming : chaque ligne est verifiee puis ecrite
+        dans le fichier temporaire, la lecture s'arrete des que la sortie est
+        inutilisable ou que le bloc de code est ferme.
+        
+        Returns:
+            tuple: (reponse brute, code corrige ou None si interrompu, stats du flux)
+        """
+        checker = IncrementalCodeChecker(sink=writer.write)
+        
+        def restart():
+            checker.reset()
+            writer.reset()
+        
+        raw_response, stream_stats = stream_content(
+            self.model, prompt, self.agent_name, self.model_name,
+            on_chunk=lambda text: checker.feed(text) and not checker.closed,
+            on_restart=restart, prompt_stats=prompt_stats
+        )
+        stream_stats = {**stream_stats, "checked_lines": checker.checked_lines,
+                        "abort_reason": checker.error}
+        if checker.error is not None:
+            return raw_response.strip(), None, stream_stats
+        return raw_response.strip(), checker.finish(), stream_stats
+    
+    def _log_aborted(self, file_name: str, prompt: str, raw_response: str,
+                     stream_stats: Dict, prompt_stats: Dict) -> bool:
+        """Generation interrompue : le fichier n'est pas modifie."""
+        print(f"ATTENTION : Generation interrompue apres {stream_stats['chunks']} morceau(x) "
+              f"({stream_stats['abort_reason']})")
+        
+        log_experiment(
+            agent_name=self.agent_name,
+            model_used=self.model_name,
+            action=ActionType.FIX,
+            details={
+                "file_fixed": file_name,
+                "input_prompt": prompt,
+                "output_response": raw_response,
+                "syntax_valid": False,
+                "prompt_budget": prompt_stats,
+                "streaming": stream_stats
+            },
+            status="FAILURE"
+        )
+        
+        return False
+    
     def _clean_code_response(self, response: str) -> str:
         """
         Nettoie la reponse pour extraire le code Python pur.
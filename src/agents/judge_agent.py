@@ -7,12 +7,21 @@ Version : 1.1 - Fixed to handle no-test scenarios
 
 import json
 import google.generativeai as genai
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 import os
 
-from src.prompts import get_judge_prompt
+from src.prompts import build_judge_prompt
 from src.utils.logger import log_experiment, ActionType
-from src.tools.analysis_tools import run_pytest
+from src.utils.tracing import span
+from src.utils.llm import generate_content
+from src.utils.model_tiers import RULES
+from src.utils.structured_output import (
+    JudgeReport,
+    StructuredOutputError,
+    json_generation_kwargs,
+    parse_structured,
+)
+from src.tools.analysis_tools import parse_pytest_summary, run_pytest
 from src.tools.file_tools import read_file
 
 
@@ -21,18 +30,25 @@ class JudgeAgent:
     Agent Testeur - Execute pytest et decide de valider ou renvoyer au Correcteur.
     """
     
-    def __init__(self, model_name: str = "gemini-2.5-flash"):
+    def __init__(self, model_name: str = "gemini-2.5-flash", use_rules: bool = False):
         """
         Initialise l'Agent Testeur.
         
         Args:
             model_name (str): Nom du modele Gemini a utiliser
+            use_rules (bool): Decide sans appel au modele quand le resume pytest
+                est sans ambiguite (niveau "rules" de src.utils.model_tiers)
         """
         self.model_name = model_name
         self.model = genai.GenerativeModel(model_name)
         self.agent_name = "Judge_Agent"
+        self.use_rules = use_rules
+        # Resultat du dernier pytest (reutilise par les niveaux suivants)
+        self.pytest_result: Optional[Dict] = None
     
-    def judge_file(self, file_path: str, audit_report: Optional[Dict] = None) -> Optional[Dict]:
+    def judge_file(self, file_path: str, audit_report: Optional[Dict] = None,
+                   test_paths: Optional[List[str]] = None,
+                   pytest_result: Optional[Dict] = None) -> Optional[Dict]:
         """
         Execute pytest et analyse les resultats.
         Si aucun test unitaire n'existe, valide le code s'il est propre.
@@ -40,6 +56,10 @@ class JudgeAgent:
         Args:
             file_path (str): Chemin complet vers le fichier a tester
             audit_report (dict, optional): Rapport d'audit pour validation sans tests
+            test_paths (list, optional): Fichiers de test executes avec le fichier
+                (tests impactes, src.tools.test_impact)
+            pytest_result (dict, optional): Resultat de run_pytest deja obtenu sur
+                ce code (niveau precedent) : pytest n'est pas relance
             
         Returns:
             dict: Rapport du Testeur avec decision (VALIDATE ou PASS_TO_FIXER)
@@ -95,12 +115,14 @@ class JudgeAgent:
                     print(f"ERREUR: Code invalide malgré 0 bugs détectés : {e}")
                     # Continue avec pytest normal
         
-        # LOGIQUE NORMALE : Exécute pytest
-        try:
-            pytest_result = run_pytest(file_path)
-        except Exception as e:
-            print(f"ERREUR: Impossible d'executer pytest : {e}")
-            return None
+        # LOGIQUE NORMALE : Exécute pytest (sauf resultat fourni)
+        if pytest_result is None:
+            try:
+                pytest_result = run_pytest(file_path, extra_paths=test_paths)
+            except Exception as e:
+                print(f"ERREUR: Impossible d'executer pytest : {e}")
+                return None
+        self.pytest_result = pytest_result
         
         passed = pytest_result.get("passed", 0)
         failed = pytest_result.get("failed", 0)
@@ -151,23 +173,34 @@ class JudgeAgent:
                 
                 return judge_report
         
+        # Niveau "rules" : tests executes et resultat net -> decision locale
+        if self.use_rules:
+            judge_report = self._judge_by_rules(file_name, pytest_output, returncode)
+            if judge_report is not None:
+                return judge_report
+        
         # LOGIQUE ORIGINALE : Demande à Gemini d'analyser la sortie pytest
-        prompt = get_judge_prompt(file_name, pytest_output)
+        # Prompt dans le budget du Testeur : sections d'echec de la sortie pytest
+        prompt, prompt_stats = build_judge_prompt(file_name, pytest_output)
         
         try:
             print(f"Envoi a {self.model_name}...")
-            response = self.model.generate_content(prompt)
+            # Sortie JSON demandee au modele quand le SDK le permet
+            response = generate_content(self.model, prompt, self.agent_name, self.model_name,
+                                        prompt_stats=prompt_stats,
+                                        **json_generation_kwargs(JudgeReport))
             raw_response = response.text.strip()
             
             print(f"Reponse recue ({len(raw_response)} caracteres)")
             
-            cleaned_response = self._clean_json_response(raw_response)
-            
-            judge_report = json.loads(cleaned_response)
+            # Validation par schema, reparation locale si le JSON est mal forme
+            judge_report, repaired = parse_structured(raw_response, JudgeReport)
+            if repaired:
+                print("JSON mal forme repare localement")
             
             decision = judge_report.get("decision", "UNKNOWN")
-            judge_passed = judge_report.get("passed", 0)
-            judge_failed = judge_report.get("failed", 0)
+            judge_passed = judge_report["tests_passed"]
+            judge_failed = judge_report["tests_failed"]
             
             print(f"Tests : {judge_passed} passes, {judge_failed} echoues")
             print(f"Decision : {decision}")
@@ -184,14 +217,16 @@ class JudgeAgent:
                     "tests_passed": judge_passed,
                     "tests_failed": judge_failed,
                     "pytest_returncode": returncode,
-                    "pytest_output": pytest_output[:500]
+                    "pytest_output": pytest_output[:500],
+                    "prompt_budget": prompt_stats,
+                    "json_repaired": repaired
                 },
                 status="SUCCESS"
             )
             
             return judge_report
             
-        except json.JSONDecodeError as e:
+        except StructuredOutputError as e:
             print(f"ERREUR : JSON invalide du Testeur")
             print(f"   {e}")
             
@@ -228,23 +263,64 @@ class JudgeAgent:
             
             return None
     
-    def _clean_json_response(self, response: str) -> str:
+    def _judge_by_rules(self, file_name: str, pytest_output: str, returncode: int) -> Optional[Dict]:
         """
-        Nettoie la reponse pour extraire le JSON pur.
+        Decision sans modele, avec les regles du prompt du Testeur.
+        
+        Seuls les cas sans ambiguite sont decides : au moins un test en echec
+        (PASS_TO_FIXER), ou des tests tous passes avec un code retour nul
+        (VALIDATE). Le reste (erreurs de collection, aucun test, timeout...)
+        va au modele.
         
-        Args:
-            response (str): Reponse brute de Gemini
-            
         Returns:
-            str: JSON nettoye
+            dict: Rapport du Testeur, ou None si le modele doit trancher
         """
-        cleaned = response.strip()
+        with span("judge_rules", kind="rules", agent=self.agent_name, model=RULES) as current:
+            summary = parse_pytest_summary(pytest_output)
+            if summary is None:
+                current.set(decided=False)
+                return None
+            
+            failed = summary["failed"] + summary["errors"]
+            if summary["failed"]:
+                decision = "PASS_TO_FIXER"
+                message = f"{failed} tests failed"
+            elif summary["passed"] and not summary["errors"] and returncode == 0:
+                decision = "VALIDATE"
+                message = "All tests passed"
+            else:
+                current.set(decided=False)
+                return None
+            current.set(decided=True, decision=decision)
+        
+        judge_report = {
+            "decision": decision,
+            "tests_run": summary["passed"] + failed,
+            "tests_passed": summary["passed"],
+            "tests_failed": failed,
+            "errors": summary["failures"],
+            "message": message,
+            "validation_method": RULES
+        }
+        
+        print(f"Tests : {summary['passed']} passes, {failed} echoues")
+        print(f"Decision : {decision} (regles, sans appel au modele)")
         
-        if cleaned.startswith("```json"):
-            cleaned = cleaned[7:]
-        if cleaned.startswith("```"):
-            cleaned = cleaned[3:]
-        if cleaned.endswith("```"):
-            cleaned = cleaned[:-3]
+        log_experiment(
+            agent_name=self.agent_name,
+            model_used=RULES,
+            action=ActionType.DEBUG,
+            details={
+                "file_tested": file_name,
+                "input_prompt": "Decision par regles sur le resume pytest",
+                "output_response": json.dumps(judge_report),
+                "decision": decision,
+                "tests_passed": summary["passed"],
+                "tests_failed": failed,
+                "pytest_returncode": returncode,
+                "validation_method": RULES
+            },
+            status="SUCCESS"
+        )
         
-        return cleaned.strip()
\ No newline at end of file
+        return judge_report
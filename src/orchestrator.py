@@ -13,30 +13,35 @@ FEATURES:
 
 import os
 import json
+import threading
+import time
+import contextvars
+import heapq
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from typing import Dict, List, Optional
-from dataclasses import dataclass
-import google.generativeai as genai
 
-from src.agents import AuditorAgent, FixerAgent, JudgeAgent
-from src.workflow_graph import refactoring_graph
-from src.tools.file_tools import read_file, write_file
-from src.utils.logger import log_experiment, ActionType
-from src.utils.rate_limiter import wait_for_rate_limit
-
-
-@dataclass
-class WorkflowState:
-    """Etat du workflow pour un fichier."""
-    file_name: str
-    file_path: str
-    current_code: str
-    original_code: str
-    iteration: int
-    audit_report: Optional[Dict] = None
-    judge_report: Optional[Dict] = None
-    status: str = "PENDING"
-    total_bugs_found: int = 0
-    total_bugs_fixed: int = 0
+from src.workflow_graph import CODE_STORE, get_refactoring_graph
+from src.scheduler import ScheduledFile, history_key, schedule_files
+from src.tools.file_tools import read_file, write_file, find_python_files
+from src.tools.analysis_tools import run_pytest
+from src.tools.dedup import group_duplicates
+from src.tools.dependency_graph import ImportGraph, build_import_graph, clear_ast_cache
+from src.tools.fix_memory import FixMemory, configure_fix_memory, get_fix_memory_stats
+from src.tools.symbol_index import SymbolIndex
+from src.tools.pytest_pool import configure_pytest_pool, get_pytest_pool_stats
+from src.tools.test_impact import (
+    FULL_RUN_TIMEOUT, TestImpactIndex, configure_test_impact, get_test_impact_stats
+)
+from src.prompts import get_project_context
+from src.utils.logger import log_experiment, ActionType, export_experiment_log
+from src.utils.rate_limiter import wait_for_rate_limit, get_rate_limiter_stats
+from src.utils.hedging import HedgePolicy, configure_hedging, get_hedging_stats, reset_hedging
+from src.utils.model_tiers import DEFAULT_TIERS, configure_tiers
+from src.utils.resilience import get_resilience_stats, reset_resilience
+from src.utils.run_summary import FileResult, SummaryWriter
+from src.utils.tracing import configure_span_retention, span, reset_tracing, summarize_spans
+from src.utils.trace_export import export_otlp_json
+from src.utils.metrics import REGISTRY, ITERATIONS_PER_FILE, start_metrics_server
 
 
 class Orchestrator:
@@ -57,28 +62,100 @@ class Orchestrator:
     - Final summary logging
     """
     
-    def __init__(self, target_dir: str, max_iterations: int = 10):
+    def __init__(self, target_dir: str, max_iterations: int = 10, trace_file: Optional[str] = None,
+                 metrics_port: Optional[int] = None, workers: int = 1,
+                 deadline_seconds: Optional[float] = None, schedule_pylint: bool = False,
+                 hedge_percentile: Optional[float] = None, model_tiering: bool = True,
+                 fuse_max_tokens: Optional[int] = None, pytest_pool: bool = True,
+                 test_impact: bool = True, full_test_run: bool = True, summary_file: Optional[str] = None,
+                 dedup: bool = True, verify_duplicates: bool = False, fix_memory: bool = True):
         """
         Initialise l'Orchestrateur.
         
         Args:
             target_dir (str): Dossier contenant les fichiers Python a traiter
             max_iterations (int): Nombre maximum d'iterations par fichier (defaut: 10)
+            trace_file (str, optional): Fichier OTLP/JSON ou exporter les spans du run
+            metrics_port (int, optional): Port local du endpoint Prometheus /metrics
+            workers (int): Nombre de fichiers traites en parallele (defaut: 1)
+            deadline_seconds (float, optional): Budget de temps du run ; les fichiers
+                qui ne tiennent plus dans le temps restant ne sont pas lances
+            schedule_pylint (bool): Utilise le score pylint pour ordonner les fichiers
+            hedge_percentile (float, optional): Active le hedging des appels de
+                l'Auditeur et du Correcteur au-delà de ce percentile de latence (ex: 95)
+            model_tiering (bool): Modèle léger d'abord, escalade si nécessaire
+                (src.utils.model_tiers) ; False : gemini-2.5-flash partout
+            fuse_max_tokens (int, optional): Audit et correction en un seul appel
+                pour les fichiers d'au plus ce nombre de tokens
+            pytest_pool (bool): Exécute pytest dans des workers préchargés
+                (src.tools.pytest_pool, un par worker) ; False : un processus par test
+            test_impact (bool): Le Judge exécute aussi les tests qui importent
+                directement le fichier (src.tools.test_impact) ; False : pytest sur
+                le seul fichier jugé
+            full_test_run (bool): Exécute toute la suite de tests une fois, après le
+                traitement des fichiers (rapportée, sans effet sur leur statut)
+            summary_file (str, optional): Résumé JSON Lines écrit au fil du run
+                (src.utils.run_summary, défaut : logs/run_summary.jsonl)
+            dedup (bool): Un seul fichier par groupe de contenus identiques passe
+                par le graphe, sa version validée est recopiée dans les autres
+                (src.tools.dedup)
+            verify_duplicates (bool): Exécute pytest sur chaque copie après recopie
+                (copie restaurée si ses tests échouent)
+            fix_memory (bool): Garde les corrections validées (logs/fix_memory.json) et
+                les joint en exemples au Correcteur pour les fonctions quasi identiques
+                (src.tools.fix_memory)
         """
         self.target_dir = target_dir
         self.max_iterations = max_iterations
+        self.trace_file = trace_file
+        self.metrics_port = metrics_port
+        self.metrics_server = None
+        self.workers = max(1, workers)
+        self.deadline_seconds = deadline_seconds
+        self.schedule_pylint = schedule_pylint
+        self.hedge_percentile = hedge_percentile
+        self.model_tiering = model_tiering
+        self.fuse_max_tokens = fuse_max_tokens
+        self.pytest_pool = pytest_pool
+        self.use_test_impact = test_impact
+        self.full_test_run = full_test_run
+        self.summary_file = summary_file
+        self.summary_writer: Optional[SummaryWriter] = None
+        self.dedup = dedup
+        self.verify_duplicates = verify_duplicates
+        # Représentant -> copies de même contenu (remplie au début du run)
+        self.duplicates: Dict[str, List[str]] = {}
+        self.test_impact: Optional[TestImpactIndex] = None
+        self.use_fix_memory = fix_memory
+        self.fix_memory: Optional[FixMemory] = None
+        self._run_started: Optional[float] = None
+        self.import_graph: Optional[ImportGraph] = None
+        self.symbol_index: Optional[SymbolIndex] = None
         
         # Agents are created within LangGraph nodes
-        self.files_processed: List[WorkflowState] = []
+        # Statut et compteurs seulement : le détail part dans le fichier de résumé
+        self.files_processed: List[FileResult] = []
         self.total_files = 0
         self.files_validated = 0
         self.files_failed = 0
+        self.files_skipped: List[str] = []
+        # Les compteurs sont mis a jour par plusieurs workers
+        self._counters_lock = threading.Lock()
+        
+        # Compteurs lus a chaque scrape du endpoint /metrics
+        REGISTRY.register_collector("orchestrator", self._metrics_samples, {
+            "swarm_files_discovered": ("gauge", "Fichiers Python trouves dans le dossier cible"),
+            "swarm_files_processed_total": ("counter", "Fichiers traites, par statut final"),
+        })
         
         print(f"\n{'='*80}")
         print(f"ORCHESTRATOR INITIALISE (LangGraph v2.1 + Complete Logging)")
         print(f"{'='*80}")
         print(f"Dossier cible : {target_dir}")
         print(f"Max iterations : {max_iterations}")
+        print(f"Workers : {self.workers}")
+        if deadline_seconds is not None:
+            print(f"Deadline : {deadline_seconds:.0f}s")
         print(f"{'='*80}\n")
         
         # ✅ LOG 1: Orchestrator initialization
@@ -92,6 +169,8 @@ class Orchestrator:
                 "output_response": f"Orchestrator initialized with LangGraph v2.1. Target: {target_dir}, Max iterations: {max_iterations}",
                 "target_directory": target_dir,
                 "max_iterations": max_iterations,
+                "workers": self.workers,
+                "deadline_seconds": deadline_seconds,
                 "workflow_engine": "LangGraph_v2.1",
                 "agents_available": ["AuditorAgent", "FixerAgent", "JudgeAgent"]
             },
@@ -126,6 +205,11 @@ class Orchestrator:
             
             return self._generate_summary()
         
+        if self.metrics_port is not None and self.metrics_server is None:
+            self.metrics_server = start_metrics_server(self.metrics_port)
+            host, port = self.metrics_server.server_address[:2]
+            print(f"Metriques Prometheus : http://{host}:{port}/metrics")
+        
         python_files = self._find_python_files()
         
         if not python_files:
@@ -150,8 +234,46 @@ class Orchestrator:
         
         self.total_files = len(python_files)
         print(f"Fichiers Python trouves : {self.total_files}")
+        
+        # Copies identiques : seul le representant de chaque groupe est traite
+        all_files = python_files
+        self.duplicates = group_duplicates(python_files) if self.dedup else {}
+        if self.dedup:
+            python_files = list(self.duplicates)
+        duplicate_count = len(all_files) - len(python_files)
+        if duplicate_count:
+            print(f"Copies identiques : {duplicate_count} (traitees via leur representant)")
         print(f"{'='*80}\n")
         
+        # Ordre de traitement : les fichiers au meilleur rendement d'abord
+        scheduled = schedule_files(
+            python_files,
+            deadline_seconds=self.deadline_seconds,
+            use_pylint=self.schedule_pylint,
+            root=self.target_dir,
+            fuse_max_tokens=self.fuse_max_tokens
+        )
+        
+        # Graphe des imports (une fois par run) : chaque module passe apres
+        # les modules du projet qu'il importe ; dans chaque niveau du graphe,
+        # l'ordre du scheduler (erreurs de syntaxe, rendement sous deadline).
+        # Construit sur tous les fichiers : un import qui vise une copie
+        # compte pour son representant
+        self.import_graph = build_import_graph(
+            self.target_dir, all_files,
+            duplicate_of={copy: path for path, copies in self.duplicates.items() for copy in copies}
+        )
+        python_files = self.import_graph.topological_order(priority=[item.path for item in scheduled])
+        by_path = {item.path: item for item in scheduled}
+        scheduled = [by_path[path] for path in python_files]
+        independent_groups = self.import_graph.independent_groups()
+        
+        # Index des symboles persistant : seuls les fichiers modifies depuis le
+        # run precedent sont reparses
+        self.symbol_index = SymbolIndex.load()
+        symbols_reparsed = self.symbol_index.update(all_files)
+        self.symbol_index.save()
+        
         # ✅ LOG 4: Files discovered successfully
         log_experiment(
             agent_name="Orchestrator",
@@ -162,18 +284,85 @@ class Orchestrator:
                 "input_prompt": f"Completed directory scan: {self.target_dir}",
                 "output_response": f"Found {self.total_files} Python files ready for processing",
                 "target_directory": self.target_dir,
-                "files_found": python_files,
-                "file_count": self.total_files
+                "files_found": all_files,
+                "file_count": self.total_files,
+                "schedule": [
+                    {
+                        "file": os.path.basename(item.path),
+                        "history_key": item.history_key,
+                        "syntax_error": item.syntax_error,
+                        "pylint_score": item.pylint_score,
+                        "failure_rate": round(item.failure_rate, 3),
+                        "estimated_seconds": round(item.estimated_seconds, 1)
+                    }
+                    for item in scheduled
+                ],
+                "import_edges": sum(len(deps) for deps in self.import_graph.dependencies.values()),
+                "independent_groups": len(independent_groups),
+                "symbols_reparsed": symbols_reparsed,
+                "duplicates": duplicate_count
             },
             status="SUCCESS"
         )
         
-        # Process each file
-        for file_path in python_files:
-            self._process_file(file_path)
+        # Process each file (chaque fichier est mesuré par le traçage)
+        # Tous les spans ne sont gardés que pour l'export de la trace ; le résumé
+        # est agrégé au fil de l'eau
+        configure_span_retention(keep_all=bool(self.trace_file))
+        reset_tracing()
+        reset_resilience()
+        reset_hedging()
+        configure_tiers(DEFAULT_TIERS if self.model_tiering else None)
+        configure_pytest_pool(enabled=self.pytest_pool, max_workers=self.workers)
+        self.test_impact = (
+            TestImpactIndex(self.target_dir, all_files)
+            if self.use_test_impact or self.full_test_run else None
+        )
+        configure_test_impact(self.test_impact if self.use_test_impact else None)
+        # Graphes des imports construits : les AST ne servent plus pendant le run
+        clear_ast_cache()
+        # Corrections des runs précédents et de celui-ci, consultées avant chaque correction
+        self.fix_memory = FixMemory.load() if self.use_fix_memory else None
+        configure_fix_memory(self.fix_memory)
+        configure_hedging(
+            HedgePolicy(percentile=self.hedge_percentile) if self.hedge_percentile else None,
+            workers=self.workers
+        )
+        self.summary_writer = SummaryWriter(self.summary_file, target_dir=self.target_dir)
+        self._run_started = time.monotonic()
+        with span("orchestrator.run", kind="run", target_dir=self.target_dir,
+                  file_count=self.total_files, workers=self.workers):
+            if self.workers > 1:
+                self._run_with_workers(scheduled)
+            else:
+                for item in scheduled:
+                    self._run_scheduled_file(item)
+        
+        # Les fichiers corriges ont de nouvelles signatures
+        self.symbol_index.update(all_files)
+        self.symbol_index.save()
+        if self.fix_memory is not None:
+            self.fix_memory.save()
+        full_run = self._run_full_test_suite() if self.full_test_run else None
         
         summary = self._generate_summary()
+        summary["timing"] = summarize_spans()
+        summary["timing"]["rate_limiter"] = get_rate_limiter_stats()
+        summary["timing"]["retries"] = get_resilience_stats()
+        summary["timing"]["hedging"] = get_hedging_stats()
+        summary["timing"]["pytest_pool"] = get_pytest_pool_stats()
+        summary["timing"]["test_impact"] = get_test_impact_stats()
+        if full_run is not None:
+            summary["timing"]["test_impact"]["full_run"] = full_run
+        summary["timing"]["fix_memory"] = get_fix_memory_stats()
+        self.summary_writer.close({key: value for key, value in summary.items() if key != "files"})
+        summary["summary_file"] = self.summary_writer.path
         self._print_final_summary(summary)
+        self._print_timing_summary(summary["timing"])
+        
+        if self.trace_file:
+            exported = export_otlp_json(self.trace_file)
+            print(f"Trace OTLP/JSON ({exported} spans) : {self.trace_file}\n")
         
         # ✅ LOG 5: Workflow completion summary
         log_experiment(
@@ -189,10 +378,13 @@ class Orchestrator:
                 "files_failed": self.files_failed,
                 "success_rate": summary['success_rate'],
                 "workflow_engine": "LangGraph_v2.1",
+                "llm_by_model": summary["timing"]["llm_by_model"],
                 "summary": summary
             },
             status="SUCCESS"
         )
+        # Journal du run reversé dans logs/experiment_data.json (une réécriture par run)
+        export_experiment_log()
         
         return summary
     
@@ -203,15 +395,111 @@ class Orchestrator:
         Returns:
             list: Liste des chemins complets vers les fichiers .py
         """
-        python_files = []
+        return find_python_files(self.target_dir)
+    
+    def _run_with_workers(self, scheduled: List[ScheduledFile]) -> None:
+        """
+        Traite les fichiers en parallele en respectant les imports.
+        
+        Un fichier n'est lance qu'une fois termines les modules du projet qu'il
+        importe (et qui le precedent dans l'ordre) : les sous-arbres independants
+        avancent en parallele, les fichiers prets partent dans l'ordre recu
+        (niveau du graphe, puis ordre du scheduler).
+        
+        Args:
+            scheduled (list): Fichiers dans l'ordre topologique (topological_order)
+        """
+        position = {item.path: index for index, item in enumerate(scheduled)}
+        # Dependances restantes par fichier, fichiers qui attendent chacun
+        pending: Dict[str, int] = {}
+        dependents: Dict[str, List[str]] = {}
+        for item in scheduled:
+            deps = [
+                dep for dep in self.import_graph.dependencies.get(item.path, ())
+                if position.get(dep, len(position)) < position[item.path]
+            ]
+            pending[item.path] = len(deps)
+            for dep in deps:
+                dependents.setdefault(dep, []).append(item.path)
         
-        for root, dirs, files in os.walk(self.target_dir):
-            for file in files:
-                if file.endswith(".py") and not file.startswith("test_"):
-                    file_path = os.path.join(root, file)
-                    python_files.append(file_path)
+        # Fichiers prets, dans l'ordre du scheduler
+        ready = [position[item.path] for item in scheduled if not pending[item.path]]
+        heapq.heapify(ready)
+        running = {}
         
-        return python_files
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="swarm-worker") as pool:
+            while ready or running:
+                while ready:
+                    item = scheduled[heapq.heappop(ready)]
+                    # Copie du contexte : les spans du fichier restent sous le span du run
+                    future = pool.submit(contextvars.copy_context().run, self._run_scheduled_file, item)
+                    running[future] = item.path
+                
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    finished = running.pop(future)
+                    future.result()
+                    for dependent in dependents.get(finished, ()):
+                        pending[dependent] -= 1
+                        if not pending[dependent]:
+                            heapq.heappush(ready, position[dependent])
+    
+    def _run_scheduled_file(self, item: ScheduledFile) -> None:
+        """
+        Traite un fichier ordonnance, sauf s'il ne tient plus avant la deadline.
+        
+        Args:
+            item (ScheduledFile): Fichier et son estimation de duree
+        """
+        if not self._fits_deadline(item):
+            self._skip_file(item)
+            return
+        
+        with span("file", kind="file", file=os.path.basename(item.path), path=item.path):
+            self._process_file(item.path)
+    
+    def _fits_deadline(self, item: ScheduledFile) -> bool:
+        """Vrai si la duree estimee du fichier tient dans le temps restant."""
+        if self.deadline_seconds is None or self._run_started is None:
+            return True
+        remaining = self.deadline_seconds - (time.monotonic() - self._run_started)
+        return item.estimated_seconds <= remaining
+    
+    def _skip_file(self, item: ScheduledFile) -> None:
+        """Enregistre un fichier non lance faute de temps avant la deadline."""
+        file_name = os.path.basename(item.path)
+        elapsed = time.monotonic() - self._run_started
+        print(f"DEADLINE : {file_name} non traite (estime {item.estimated_seconds:.0f}s, "
+              f"reste {max(self.deadline_seconds - elapsed, 0):.0f}s)")
+        
+        with self._counters_lock:
+            self.files_skipped.append(item.path)
+            self.files_skipped.extend(self.duplicates.get(item.path, []))
+        if self.summary_writer is not None:
+            self.summary_writer.write("skipped", {
+                "file_path": item.path,
+                "estimated_seconds": round(item.estimated_seconds, 1)
+            })
+            for duplicate in self.duplicates.get(item.path, []):
+                self.summary_writer.write("skipped", {"file_path": duplicate, "duplicate_of": item.path})
+        
+        # ✅ LOG: File skipped (deadline)
+        log_experiment(
+            agent_name="Orchestrator",
+            model_used="N/A",
+            action=ActionType.ANALYSIS,
+            details={
+                "operation": "file_skipped_deadline",
+                "file": file_name,
+                "input_prompt": f"Checking time budget before processing: {file_name}",
+                "output_response": f"Skipped: estimated {item.estimated_seconds:.0f}s exceeds remaining time before deadline",
+                "file_path": item.path,
+                "estimated_seconds": item.estimated_seconds,
+                "elapsed_seconds": elapsed,
+                "deadline_seconds": self.deadline_seconds
+            },
+            status="FAILURE"
+        )
     
     def _process_file(self, file_path: str) -> None:
         """
@@ -264,7 +552,8 @@ class Orchestrator:
                 status="FAILURE"
             )
             
-            self.files_failed += 1
+            with self._counters_lock:
+                self.files_failed += 1
             return
         
         # Prepare initial state for LangGraph
@@ -278,8 +567,15 @@ class Orchestrator:
             "status": "PENDING",
             "total_bugs_found": 0,
             "total_bugs_fixed": 0,
-            "original_code": original_code,
-            "current_code": original_code
+            "current_hash": CODE_STORE.put(original_code, file_path),
+            "dependency_context": self._dependency_context(file_path),
+            "rejected_hashes": [],
+            "convergence": None,
+            "best_hash": None,
+            "best_score": None,
+            "model_tier": 0,
+            "escalations": [],
+            "fused_fallback": False
         }
         
         # ═══════════════════════════════════════════════════════════
@@ -293,7 +589,8 @@ class Orchestrator:
             wait_for_rate_limit()
             
             # Execute the LangGraph workflow
-            final_state = refactoring_graph.invoke(initial_state)
+            with span("refactoring_graph.invoke", kind="graph"):
+                final_state = get_refactoring_graph(self.fuse_max_tokens).invoke(initial_state)
             
             # ✅ LOG 8: Graph execution success
             log_experiment(
@@ -342,29 +639,44 @@ class Orchestrator:
                 "iteration": 0
             }
         
+        finally:
+            # Versions du code de ce fichier : plus utiles une fois le graphe terminé
+            CODE_STORE.release(file_path)
+        
         # ═══════════════════════════════════════════════════════════
         # PROCESS RESULTS
-        # Create WorkflowState and update counters
+        # Create FileResult, stream it to the summary file and update counters
         # ═══════════════════════════════════════════════════════════
         
-        state = WorkflowState(
+        state = FileResult(
             file_name=file_name,
             file_path=file_path,
-            current_code=final_state.get("current_code", original_code),
-            original_code=original_code,
             iteration=final_state.get("iteration", 0),
-            audit_report=final_state.get("audit_report", {}),
-            judge_report=final_state.get("judge_report", {}),
             status=final_state.get("status", "FAILED"),
             total_bugs_found=final_state.get("total_bugs_found", 0),
             total_bugs_fixed=final_state.get("total_bugs_fixed", 0)
         )
         
-        self.files_processed.append(state)
+        ITERATIONS_PER_FILE.observe(state.iteration)
+        
+        if self.summary_writer is not None:
+            self.summary_writer.write("file", {
+                **state.to_dict(),
+                "file_path": file_path,
+                "failure_reason": None if state.status == "VALIDATED" else self._determine_failure_reason(state),
+                "final_model_tier": final_state.get("model_tier", 0),
+                "escalations": len(final_state.get("escalations", []))
+            })
         
         # Update counters
+        with self._counters_lock:
+            self.files_processed.append(state)
+            if state.status == "VALIDATED":
+                self.files_validated += 1
+            else:
+                self.files_failed += 1
+        
         if state.status == "VALIDATED":
-            self.files_validated += 1
             
             # ✅ LOG 10: File validated successfully
             log_experiment(
@@ -384,8 +696,6 @@ class Orchestrator:
                 status="SUCCESS"
             )
         else:
-            self.files_failed += 1
-            
             # ✅ LOG 11: File processing failed
             log_experiment(
                 agent_name="Orchestrator",
@@ -414,6 +724,7 @@ class Orchestrator:
             details={
                 "operation": "file_processing_complete",
                 "file": file_name,
+                "history_key": history_key(file_path, self.target_dir),
                 "input_prompt": f"Completed processing file: {file_name}",
                 "output_response": f"File processing finished. Status: {state.status}, Iterations: {state.iteration}, Bugs found: {state.total_bugs_found}, Bugs fixed: {state.total_bugs_fixed}",
                 "file_path": file_path,
@@ -421,15 +732,192 @@ class Orchestrator:
                 "bugs_found": state.total_bugs_found,
                 "bugs_fixed": state.total_bugs_fixed,
                 "final_status": state.status,
+                "final_model_tier": final_state.get("model_tier", 0),
+                "escalations": final_state.get("escalations", []),
                 "workflow_engine": "LangGraph_v2.1"
             },
             status="SUCCESS" if state.status == "VALIDATED" else "PARTIAL_SUCCESS"
         )
+        
+        if state.status == "VALIDATED" and self.fix_memory is not None:
+            self._remember_fix(file_path, original_code)
+        
+        if self.duplicates.get(file_path):
+            self._apply_to_duplicates(state, original_code)
+    
+    def _remember_fix(self, file_path: str, original_code: str) -> None:
+        """Garde les fonctions modifiees par une correction validee (exemples pour la suite du run)."""
+        try:
+            fixed_code = read_file(file_path)
+        except Exception as e:
+            print(f"ERREUR: Impossible de relire {os.path.basename(file_path)} : {e}")
+            return
+        if fixed_code != original_code:
+            self.fix_memory.record(original_code, fixed_code, file_path)
+    
+    def _apply_to_duplicates(self, result: FileResult, original_code: str) -> None:
+        """
+        Reporte le resultat d'un representant sur ses copies identiques.
+        
+        Version validee et modifiee : recopiee dans chaque copie (et testee si
+        verify_duplicates). Sinon les copies restent intactes et prennent le
+        statut du representant.
+        
+        Args:
+            result (FileResult): Resultat du representant
+            original_code (str): Contenu du representant avant traitement
+        """
+        fixed_code = None
+        if result.status == "VALIDATED":
+            try:
+                fixed_code = read_file(result.file_path)
+            except Exception as e:
+                print(f"ERREUR: Impossible de relire {result.file_name} : {e}")
+        
+        for path in self.duplicates[result.file_path]:
+            status, reason = result.status, None
+            if result.status != "VALIDATED":
+                reason = f"Same content as {result.file_name}: {self._determine_failure_reason(result)}"
+            elif fixed_code is None:
+                status, reason = "FAILED", f"Validated version of {result.file_name} unreadable"
+            elif fixed_code != original_code:
+                status, reason = self._copy_validated(path, fixed_code)
+            
+            duplicate = FileResult(
+                file_name=os.path.basename(path),
+                file_path=path,
+                status=status,
+                total_bugs_found=result.total_bugs_found,
+                total_bugs_fixed=result.total_bugs_fixed if status == "VALIDATED" else 0
+            )
+            with self._counters_lock:
+                self.files_processed.append(duplicate)
+                if status == "VALIDATED":
+                    self.files_validated += 1
+                else:
+                    self.files_failed += 1
+            
+            if self.summary_writer is not None:
+                self.summary_writer.write("file", {
+                    **duplicate.to_dict(),
+                    "file_path": path,
+                    "failure_reason": reason,
+                    "duplicate_of": result.file_path
+                })
+            
+            # ✅ LOG: Duplicate resolved through its representative
+            log_experiment(
+                agent_name="Orchestrator",
+                model_used="N/A",
+                action=ActionType.FIX if status == "VALIDATED" else ActionType.ANALYSIS,
+                details={
+                    "operation": "duplicate_applied",
+                    "file": duplicate.file_name,
+                    "history_key": history_key(path, self.target_dir),
+                    "input_prompt": f"Applying result of {result.file_name} to identical file {path}",
+                    "output_response": f"Duplicate status: {status}" + (f" ({reason})" if reason else ""),
+                    "file_path": path,
+                    "duplicate_of": result.file_path,
+                    "final_status": status,
+                    "verified": self.verify_duplicates
+                },
+                status="SUCCESS" if status == "VALIDATED" else "FAILURE"
+            )
+    
+    def _copy_validated(self, path: str, fixed_code: str) -> tuple:
+        """
+        Ecrit la version validee dans une copie ; la restaure si ses tests echouent.
+        
+        Returns:
+            tuple: (statut, raison de l'echec ou None)
+        """
+        try:
+            duplicate_code = read_file(path)
+            write_file(path, fixed_code)
+        except Exception as e:
+            print(f"ERREUR: Impossible de mettre a jour la copie {path} : {e}")
+            return "FAILED", f"Write failed: {e}"
+        
+        if not self.verify_duplicates:
+            return "VALIDATED", None
+        
+        tests = self.test_impact.impacted_tests(path) if self.test_impact is not None else []
+        try:
+            # 5 : aucun test collecte, comme pour un fichier sans tests
+            passed = run_pytest(path, extra_paths=tests)["returncode"] in (0, 5)
+        except Exception as e:
+            print(f"ERREUR: Impossible de tester la copie {path} : {e}")
+            passed = False
+        
+        if passed:
+            return "VALIDATED", None
+        try:
+            write_file(path, duplicate_code)
+        except Exception as e:
+            print(f"ERREUR: Impossible de restaurer la copie {path} : {e}")
+            return "FAILED", f"Tests failed on this copy, restore failed: {e}"
+        return "FAILED", "Tests failed on this copy, original content restored"
+    
+    def _run_full_test_suite(self) -> Optional[Dict]:
+        """
+        Garde-fou de fin de run : toute la suite de tests, une fois les fichiers traites.
+        
+        Le resultat est rapporte (resume, log), jamais impute a un fichier.
+        
+        Returns:
+            dict: {"test_files", "passed", "failed", "returncode"} ou None sans fichier de test
+        """
+        test_files = self.test_impact.existing_test_files() if self.test_impact is not None else []
+        if not test_files:
+            return None
+        
+        try:
+            result = run_pytest(test_files[0], extra_paths=test_files[1:], timeout=FULL_RUN_TIMEOUT)
+            full_run = {"test_files": len(test_files), "passed": result["passed"],
+                        "failed": result["failed"], "returncode": result["returncode"]}
+        except Exception as e:
+            print(f"ERREUR: Execution complete des tests impossible : {e}")
+            full_run = {"test_files": len(test_files), "passed": 0, "failed": 0,
+                        "returncode": None, "error": type(e).__name__}
+        
+        log_experiment(
+            agent_name="Orchestrator",
+            model_used="N/A",
+            action=ActionType.ANALYSIS if full_run["returncode"] in (0, 5) else ActionType.DEBUG,
+            details={
+                "operation": "full_test_run",
+                "input_prompt": f"Running the full test suite ({len(test_files)} test files)",
+                "output_response": f"Full test run: {full_run['passed']} passed, {full_run['failed']} failed",
+                **full_run
+            },
+            status="SUCCESS" if full_run["returncode"] in (0, 5) else "FAILURE"
+        )
+        return full_run
     
-    def _determine_failure_reason(self, state: WorkflowState) -> str:
+    def _dependency_context(self, file_path: str) -> str:
+        """Signatures des symboles du projet references par le fichier (index a jour)."""
+        if self.import_graph is None or self.symbol_index is None:
+            return ""
+        references = self.import_graph.imported_names.get(file_path, {})
+        return get_project_context(self.symbol_index.lookup(references))
+    
+    def _metrics_samples(self) -> List:
+        """Compteurs de l'orchestrateur exposes sur /metrics."""
+        return [
+            ("swarm_files_discovered", {}, self.total_files),
+            ("swarm_files_processed_total", {"status": "validated"}, self.files_validated),
+            ("swarm_files_processed_total", {"status": "failed"}, self.files_failed),
+            ("swarm_files_processed_total", {"status": "skipped"}, len(self.files_skipped)),
+        ]
+    
+    def _determine_failure_reason(self, state: FileResult) -> str:
         """Determine why a file processing failed."""
         if state.status == "MAX_ITERATIONS":
             return "Maximum iterations reached without validation"
+        elif state.status == "STALLED":
+            return f"Fixer returned the last rejected version again (stopped after {state.iteration} iterations)"
+        elif state.status == "OSCILLATING":
+            return f"Fixer cycled back to an earlier rejected version (stopped after {state.iteration} iterations)"
         elif state.status == "FAILED":
             if state.iteration == 0:
                 return "Failed before first iteration (likely audit or read error)"
@@ -449,19 +937,14 @@ class Orchestrator:
             "total_files": self.total_files,
             "files_validated": self.files_validated,
             "files_failed": self.files_failed,
+            "files_skipped": len(self.files_skipped),
             "success_rate": (self.files_validated / self.total_files * 100) if self.total_files > 0 else 0,
             "workflow_engine": "LangGraph_v2.1",
             "files": []
         }
         
         for state in self.files_processed:
-            summary["files"].append({
-                "file_name": state.file_name,
-                "status": state.status,
-                "iterations": state.iteration,
-                "bugs_found": state.total_bugs_found,
-                "bugs_fixed": state.total_bugs_fixed
-            })
+            summary["files"].append(state.to_dict())
         
         return summary
     
@@ -479,6 +962,8 @@ class Orchestrator:
         print(f"Fichiers traites : {summary['total_files']}")
         print(f"Valides : {summary['files_validated']}")
         print(f"Echoues : {summary['files_failed']}")
+        if summary.get('files_skipped'):
+            print(f"Non traites (deadline) : {summary['files_skipped']}")
         print(f"Taux de succes : {summary['success_rate']:.1f}%\n")
         
         if summary['files']:
@@ -494,4 +979,66 @@ class Orchestrator:
                 print(f"   Bugs trouves: {file_info['bugs_found']}")
                 print(f"   Bugs corriges: {file_info['bugs_fixed']}\n")
         
-        print(f"{'#'*80}\n")
\ No newline at end of file
+        print(f"{'#'*80}\n")
+    
+    def _print_timing_summary(self, timing: Dict) -> None:
+        """
+        Affiche le temps passe par categorie, par noeud et par agent.
+        
+        Args:
+            timing (dict): Resultat de summarize_spans()
+        """
+        print(f"{'─'*80}")
+        print(f"TEMPS D'EXECUTION")
+        print(f"{'─'*80}\n")
+        
+        for kind, stats in sorted(timing["by_kind"].items()):
+            print(f"   {kind:<12}: {stats['total_s']:8.2f}s ({stats['count']} span(s), max {stats['max_s']:.2f}s)")
+        
+        if timing["by_node"]:
+            print(f"\nPar noeud du graphe :")
+            for node, stats in sorted(timing["by_node"].items()):
+                print(f"   {node:<18}: {stats['total_s']:8.2f}s ({stats['count']} appel(s))")
+        
+        if timing["llm_by_agent"]:
+            print(f"\nAppels LLM :")
+            for agent, stats in sorted(timing["llm_by_agent"].items()):
+                print(f"   {agent:<14}: {stats['calls']} appel(s), {stats['avg_s']:.2f}s en moyenne, "
+                      f"~{stats['avg_prompt_tokens']:.0f} tokens in / ~{stats['avg_output_tokens']:.0f} tokens out"
+                      f" (~{stats.get('prompt_tokens_saved', 0)} tokens économisés)")
+        
+        if timing.get("llm_by_model"):
+            print(f"\nPar niveau de modele :")
+            for model, stats in sorted(timing["llm_by_model"].items()):
+                print(f"   {model:<22}: {stats['calls']} appel(s), {stats['total_s']:.2f}s, "
+                      f"~{stats['prompt_tokens']} tokens in / ~{stats['output_tokens']} tokens out")
+        
+        wait = timing.get("rate_limiter", {}).get("total_wait_seconds", 0.0)
+        print(f"\nAttente rate limiter : {wait:.2f}s")
+        retries = timing.get("retries", {})
+        if retries.get("retries"):
+            print(f"Reprises LLM        : {retries['retries']} ({retries['backoff_seconds']:.2f}s de backoff, "
+                  f"erreurs {retries['errors']}, disjoncteur ouvert {retries['circuit_open_count']} fois)")
+        hedging = timing.get("hedging", {})
+        if hedging.get("enabled"):
+            print(f"Hedging LLM         : {hedging['hedged']} copie(s) sur {hedging['calls']} appel(s), "
+                  f"{hedging['hedge_wins']} gagnée(s), {hedging['skipped_budget']} refusée(s) (budget)")
+        pytest_pool = timing.get("pytest_pool", {})
+        if pytest_pool.get("tasks"):
+            print(f"Pool pytest         : {pytest_pool['tasks']} exécution(s), "
+                  f"{pytest_pool['timeouts']} timeout(s), {pytest_pool['crashes']} worker(s) perdu(s)")
+        test_impact = timing.get("test_impact", {})
+        if test_impact.get("selections"):
+            print(f"Tests impactés      : {test_impact['tests_selected']} fichier(s) de test sur "
+                  f"{test_impact['selections']} passage(s) du Judge")
+        full_run = test_impact.get("full_run")
+        if full_run:
+            print(f"Suite complète      : {full_run['passed']} réussi(s), {full_run['failed']} échoué(s) "
+                  f"sur {full_run['test_files']} fichier(s) de test (code {full_run['returncode']})")
+        fix_memory = timing.get("fix_memory", {})
+        if fix_memory.get("lookups"):
+            print(f"Mémoire correctifs  : {fix_memory['hits']} exemple(s) sur "
+                  f"{fix_memory['lookups']} recherche(s), {fix_memory['recorded']} fonction(s) "
+                  f"ajoutée(s), {fix_memory['entries']} en mémoire")
+        print()
+        print(f"{'#'*80}\n")
@@ -0,0 +1,260 @@
+"""
+Planification d'un run (mode --plan)
+Estime le coût d'un run sans appeler aucun modèle
+
+Pour chaque fichier traité (un seul par groupe de fichiers identiques, comme
+l'orchestrateur avec la déduplication, src.tools.dedup) :
+- taille (octets, lignes)
+- tokens d'entrée estimés à partir des vrais prompts, budgets appliqués (src.prompts)
+- tokens de sortie estimés (ESTIMATED_COSTS, ou taille du code pour le Fixer)
+- sous le seuil --fuse_max_tokens, un seul appel audit_fix remplace l'audit
+  et la correction
+
+Puis projette le nombre de requêtes et la durée du run selon trois scénarios
+(fichier déjà propre, un passage audit -> fix -> judge, max_iterations
+passages), sous la limite du rate limiter et pour un nombre de workers donné.
+
+Usage:
+    python main.py --target_dir ./sandbox/dataset --plan
+"""
+
+import os
+from typing import Dict, List, Optional
+
+from src.prompts import (
+    ESTIMATED_COSTS,
+    build_audit_fix_prompt,
+    build_auditor_prompt,
+    build_fixer_prompt,
+    build_judge_prompt,
+    count_tokens,
+)
+from src.tools.dedup import group_duplicates
+from src.tools.file_tools import find_python_files
+from src.utils.rate_limiter import get_rate_limiter_stats
+
+# Sortie pytest représentative, utilisée pour dimensionner le prompt du Judge
+_SAMPLE_PYTEST_OUTPUT = """============================= test session starts ==============================
+collected 3 items
+
+test_code.py::test_main PASSED                                        [ 33%]
+test_code.py::test_edge_cases FAILED                                  [ 66%]
+test_code.py::test_empty_input PASSED                                 [100%]
+
+=================================== FAILURES ===================================
+__________________________ test_edge_cases ___________________________
+>       assert result == 3.0
+E       AssertionError: assert 2.5 == 3.0
+========================= 1 failed, 2 passed in 0.08s ==========================
+"""
+
+# Scénarios projetés, dans l'ordre d'affichage
+SCENARIOS = ("best", "typical", "worst")
+
+# L'appel fusionné produit le rapport et le code corrigé : sa durée de
+# référence est celle des deux appels qu'il remplace
+_AUDIT_FIX_COSTS = {
+    "output_tokens_avg": (ESTIMATED_COSTS["auditor"]["output_tokens_avg"]
+                          + ESTIMATED_COSTS["fixer"]["output_tokens_avg"]),
+    "time_avg_seconds": (ESTIMATED_COSTS["auditor"]["time_avg_seconds"]
+                         + ESTIMATED_COSTS["fixer"]["time_avg_seconds"]),
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """Estime le nombre de tokens d'un texte (même compteur que les budgets de prompts)."""
+    return count_tokens(text)
+
+
+def estimate_file(file_path: str, fuse_max_tokens: Optional[int] = None) -> dict:
+    """
+    Estime les tokens d'un passage audit -> fix -> judge sur un fichier.
+
+    Args:
+        file_path (str): Chemin du fichier Python
+        fuse_max_tokens (int, optional): Seuil de l'appel fusionné audit_fix
+            (même test que le workflow : tokens du code <= seuil)
+
+    Returns:
+        dict: Taille du fichier et tokens estimés par agent ("audit_fix" et
+        "judge" si le fichier passe par l'appel fusionné)
+    """
+    with open(file_path, "r", encoding="utf-8", errors="replace") as f:
+        code = f.read()
+
+    file_name = os.path.basename(file_path)
+    code_tokens = estimate_tokens(code)
+
+    auditor_out = ESTIMATED_COSTS["auditor"]["output_tokens_avg"]
+    # Le rapport d'audit est réinjecté dans le prompt du Fixer : on réserve
+    # la taille moyenne d'un rapport à la place d'un rapport vide.
+    fixer_in = build_fixer_prompt(file_name, code, {})[1]["prompt_tokens"] + auditor_out
+    # Le Fixer renvoie le fichier complet
+    fixer_out = max(code_tokens, ESTIMATED_COSTS["fixer"]["output_tokens_avg"])
+
+    judge = {
+        "input": build_judge_prompt(file_name, _SAMPLE_PYTEST_OUTPUT)[1]["prompt_tokens"],
+        "output": ESTIMATED_COSTS["judge"]["output_tokens_avg"],
+    }
+    fused = fuse_max_tokens is not None and code_tokens <= fuse_max_tokens
+    if fused:
+        tokens = {
+            "audit_fix": {
+                "input": build_audit_fix_prompt(file_name, code)[1]["prompt_tokens"],
+                "output": auditor_out + fixer_out,
+            },
+            "judge": judge,
+        }
+    else:
+        tokens = {
+            "auditor": {
+                "input": build_auditor_prompt(file_name, code)[1]["prompt_tokens"],
+                "output": auditor_out,
+            },
+            "fixer": {"input": fixer_in, "output": fixer_out},
+            "judge": judge,
+        }
+
+    return {
+        "file": file_path,
+        "bytes": len(code.encode("utf-8")),
+        "lines": code.count("\n") + 1 if code else 0,
+        "fused": fused,
+        "tokens": tokens,
+    }
+
+
+def _call_seconds(agent: str, estimate: dict) -> float:
+    """Durée estimée d'un appel : la durée moyenne, allongée si la sortie est plus longue."""
+    costs = _AUDIT_FIX_COSTS if agent == "audit_fix" else ESTIMATED_COSTS[agent]
+    ratio = estimate["tokens"][agent]["output"] / costs["output_tokens_avg"]
+    return costs["time_avg_seconds"] * max(1.0, ratio)
+
+
+def _pass_agents(estimate: dict, audit_only: bool) -> tuple:
+    """Appels d'un passage : un fichier propre s'arrête après l'audit (fusionné ou non)."""
+    first = "audit_fix" if estimate["fused"] else "auditor"
+    if audit_only:
+        return (first,)
+    return (first, "judge") if estimate["fused"] else (first, "fixer", "judge")
+
+
+def project_scenario(files: List[dict], passes: int, audit_only: bool,
+              max_rpm: int, workers: int) -> dict:
+    """Projette requêtes, tokens et durée pour un nombre de passages par fichier."""
+    calls = [(f, agent) for f in files for agent in _pass_agents(f, audit_only)]
+
+    requests = len(calls) * passes
+    input_tokens = sum(f["tokens"][a]["input"] for f, a in calls) * passes
+    output_tokens = sum(f["tokens"][a]["output"] for f, a in calls) * passes
+
+    # Temps de réponse cumulé des modèles, réparti sur les workers...
+    latency_s = passes * sum(_call_seconds(a, f) for f, a in calls)
+    compute_s = latency_s / max(workers, 1)
+    # ...mais jamais plus vite que la limite de requêtes par minute
+    rate_limit_s = requests * 60.0 / max_rpm if max_rpm else 0.0
+
+    return {
+        "passes": passes,
+        "requests": requests,
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "wall_seconds": max(compute_s, rate_limit_s),
+        "bound": "rate_limit" if rate_limit_s >= compute_s else "latency",
+    }
+
+
+def build_plan(target_dir: str, max_iterations: int = 10, workers: int = 1,
+               max_rpm: Optional[int] = None, fuse_max_tokens: Optional[int] = None,
+               dedup: bool = True) -> dict:
+    """
+    Construit le plan d'un run sans appeler de modèle.
+
+    Args:
+        target_dir (str): Dossier à analyser
+        max_iterations (int): Itérations maximum par fichier (scénario "worst")
+        workers (int): Nombre de fichiers traités en parallèle
+        max_rpm (int): Requêtes par minute autorisées (défaut: rate limiter global)
+        fuse_max_tokens (int, optional): Seuil de l'appel fusionné audit_fix
+        dedup (bool): Les copies identiques ne sont pas estimées (résultat
+            du représentant appliqué sans appel au modèle)
+
+    Returns:
+        dict: Fichiers estimés, totaux et projections par scénario
+    """
+    if max_rpm is None:
+        max_rpm = get_rate_limiter_stats()["max_rpm"]
+
+    paths = sorted(find_python_files(target_dir))
+    groups = group_duplicates(paths) if dedup else {path: [] for path in paths}
+    files = [estimate_file(path, fuse_max_tokens) for path in groups]
+
+    scenarios: Dict[str, dict] = {
+        "best": project_scenario(files, 1, True, max_rpm, workers),
+        "typical": project_scenario(files, 1, False, max_rpm, workers),
+        "worst": project_scenario(files, max_iterations, False, max_rpm, workers),
+    }
+
+    return {
+        "target_dir": target_dir,
+        "max_iterations": max_iterations,
+        "workers": workers,
+        "max_rpm": max_rpm,
+        "total_files": len(paths),
+        "duplicates": len(paths) - len(files),
+        "fused_files": sum(1 for f in files if f["fused"]),
+        "total_bytes": sum(f["bytes"] for f in files),
+        "total_lines": sum(f["lines"] for f in files),
+        "files": files,
+        "scenarios": scenarios,
+    }
+
+
+def _format_duration(seconds: float) -> str:
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}h{minutes:02d}m"
+    if minutes:
+        return f"{minutes}m{seconds:02d}s"
+    return f"{seconds}s"
+
+
+def print_plan(plan: dict, top: int = 5) -> None:
+    """Affiche le plan dans la console."""
+    print("=" * 80)
+    print("PLAN D'EXÉCUTION (aucun appel au modèle)")
+    print("=" * 80)
+    print(f"Dossier cible     : {plan['target_dir']}")
+    print(f"Fichiers Python   : {plan['total_files']}")
+    if plan["duplicates"]:
+        print(f"Copies identiques : {plan['duplicates']} (non estimées)")
+    if plan["fused_files"]:
+        print(f"Audit + fix fusés : {plan['fused_files']} fichiers")
+    print(f"Taille totale     : {plan['total_bytes']} octets ({plan['total_lines']} lignes)")
+    print(f"Rate limit        : {plan['max_rpm']} requêtes/min")
+    print(f"Workers           : {plan['workers']}")
+
+    if plan["files"]:
+        print("\nFichiers les plus coûteux (tokens d'un passage complet) :")
+        by_cost = sorted(
+            plan["files"],
+            key=lambda f: sum(t["input"] + t["output"] for t in f["tokens"].values()),
+            reverse=True,
+        )
+        for f in by_cost[:top]:
+            total = sum(t["input"] + t["output"] for t in f["tokens"].values())
+            print(f"  {os.path.basename(f['file']):<40} {f['lines']:>6} lignes  ~{total} tokens")
+
+    labels = {
+        "best": "Fichiers propres (audit seul)",
+        "typical": "Un passage audit -> fix -> judge",
+        "worst": f"{plan['max_iterations']} itérations par fichier",
+    }
+    print(f"\n{'Scénario':<36} {'Requêtes':>9} {'Tokens in':>10} {'Tokens out':>11} {'Durée':>9}")
+    print("-" * 80)
+    for name in SCENARIOS:
+        s = plan["scenarios"][name]
+        print(f"{labels[name]:<36} {s['requests']:>9} {s['input_tokens']:>10} "
+              f"{s['output_tokens']:>11} {_format_duration(s['wall_seconds']):>9}")
+    print("=" * 80 + "\n")
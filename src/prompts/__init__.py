@@ -5,6 +5,7 @@ Ce module contient les prompts système pour :
 - Agent Auditeur (analyse de code)
 - Agent Correcteur (correction de bugs)
 - Agent Testeur (validation par tests)
+- Appel combiné Audit + Correction (petits fichiers)
 
 Auteur: Ingénieur Prompt
 Date: 2026-01-10
@@ -14,6 +15,16 @@ Version: 1.0
 from .auditor_prompt import get_auditor_prompt, get_auditor_metadata
 from .fixer_prompt import get_fixer_prompt, get_fixer_metadata
 from .judge_prompt import get_judge_prompt, get_judge_metadata
+from .audit_fix_prompt import get_audit_fix_prompt
+from .context_prompt import get_fix_examples, get_project_context
+from .budget import (
+    AGENT_BUDGETS,
+    build_audit_fix_prompt,
+    build_auditor_prompt,
+    build_fixer_prompt,
+    build_judge_prompt,
+    count_tokens,
+)
 
 __version__ = "1.0.0"
 __author__ = "Ingénieur Prompt"
@@ -25,6 +36,15 @@ __all__ = [
     "get_fixer_metadata",
     "get_judge_prompt",
     "get_judge_metadata",
+    "get_audit_fix_prompt",
+    "get_project_context",
+    "get_fix_examples",
+    "AGENT_BUDGETS",
+    "build_audit_fix_prompt",
+    "build_auditor_prompt",
+    "build_fixer_prompt",
+    "build_judge_prompt",
+    "count_tokens",
     "PROMPT_VERSIONS",
     "ESTIMATED_COSTS",
     "get_module_info",
@@ -64,6 +84,9 @@ PROMPT_VERSIONS = {
     },
 }
 
+# Valeurs de référence mesurées lors de la validation des prompts.
+# Les coûts réels d'un run (durée, tokens par agent) sont mesurés par
+# src.utils.tracing et exposés dans summary["timing"]["llm_by_agent"].
 ESTIMATED_COSTS = {
     "auditor": {
         "input_tokens_avg": 428,  # ← Changé
@@ -0,0 +1,68 @@
+"""
+Prompt System pour l'appel combiné Audit + Correction (petits fichiers)
+Version: 1.0
+Date: 2026-10-18
+Auteur: Ingénieur Prompt
+
+Description:
+Pour un petit fichier, l'audit et la correction tiennent dans un seul appel :
+le modèle renvoie la liste des problèmes ET le code corrigé dans une même
+réponse JSON. Le code n'est envoyé qu'une fois au lieu de deux.
+"""
+
+
+def get_audit_fix_prompt(filename: str, code_content: str, context: str = "") -> str:
+    """
+    Génère le prompt combiné Auditeur + Correcteur.
+
+    Args:
+        filename (str): Nom du fichier à analyser et corriger
+        code_content (str): Contenu du code Python
+        context (str): Signatures des symboles importés d'autres fichiers du projet
+
+    Returns:
+        str: Prompt prêt à envoyer à Gemini
+    """
+
+    context_section = ""
+    if context:
+        context_section = f"""🔗 SYMBOLES DU PROJET (définis dans d'autres fichiers, importés par ce code : ils existent) :
+```python
+{context}
+```
+
+"""
+
+    prompt = f"""Tu es un expert Python : tu audites puis corriges ce code en une seule réponse.
+
+📋 FICHIER : {filename}
+
+🐛 PROBLÈMES À DÉTECTER (sévérité) :
+- CRITICAL : variables non définies, imports manquants, syntaxe invalide
+- HIGH : division par zéro, index hors limites, opérations sur None, clés inexistantes
+- MEDIUM : docstrings manquantes, type hints absents, nommage non descriptif
+- LOW : violations PEP8, imports désordonnés
+Ne JAMAIS inventer de bugs inexistants.
+
+📝 CODE :
+```python
+{code_content}
+```
+
+{context_section}✅ RÈGLES DE CORRECTION :
+- Corrige TOUS les problèmes listés, rien d'autre
+- Conserve la structure et la logique métier
+- Docstrings Google format (Args, Returns), cas limites gérés, PEP8
+
+📤 FORMAT DE SORTIE :
+JSON UNIQUEMENT avec cette structure exacte :
+
+{{"file":"{filename}","total_issues":X,"issues":[{{"line":N,"type":"...","severity":"...","description":"...","suggestion":"..."}}],"fixed_code":"..."}}
+
+"fixed_code" contient le fichier corrigé complet (code Python pur, échappé en chaîne JSON).
+Si aucun bug : {{"file":"{filename}","total_issues":0,"issues":[],"fixed_code":""}}
+
+Pas de texte avant/après le JSON.
+"""
+
+    return prompt
@@ -10,13 +10,14 @@ L'Auditeur analyse du code Python et produit un rapport JSON des problèmes dét
 """
 
 
-def get_auditor_prompt(filename: str, code_content: str) -> str:
+def get_auditor_prompt(filename: str, code_content: str, context: str = "") -> str:
     """
     Génère le prompt pour l'Agent Auditeur - VERSION OPTIMISÉE v1.1.
     
     Args:
         filename (str): Nom du fichier à analyser
         code_content (str): Contenu du code Python
+        context (str): Signatures des symboles importés d'autres fichiers du projet
     
     Returns:
         str: Prompt optimisé prêt à envoyer à Gemini
@@ -24,6 +25,15 @@ def get_auditor_prompt(filename: str, code_content: str) -> str:
     Version: 1.1 (optimisée -4% tokens, qualité préservée)
     """
     
+    context_section = ""
+    if context:
+        context_section = f"""🔗 SYMBOLES DU PROJET (définis dans d'autres fichiers, importés par ce code : ils existent) :
+```python
+{context}
+```
+
+"""
+    
     prompt = f"""Tu es un expert Python et auditeur de code.
 
 📋 FICHIER : {filename}
@@ -59,7 +69,7 @@ LOW :
 {code_content}
 ```
 
-📤 FORMAT DE SORTIE :
+{context_section}📤 FORMAT DE SORTIE :
 JSON UNIQUEMENT avec cette structure exacte :
 
 {{"file":"{filename}","total_issues":X,"issues":[{{"line":N,"type":"...","severity":"...","description":"...","suggestion":"..."}}]}}
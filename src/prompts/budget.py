@@ -0,0 +1,237 @@
+"""
+Budget de tokens des prompts
+Version: 1.0
+Date: 2026-10-18
+Auteur: Ingénieur Prompt
+
+Description:
+Assemble les prompts des trois agents en respectant un budget de tokens
+d'entrée par agent, et mesure l'économie réalisée à chaque appel :
+- comptage rapide local (~4 caractères par token, comme les estimations v1.1)
+- rapport d'audit en JSON compact (sans indentation, sans champs redondants)
+- sortie pytest réduite aux sections d'échec et au résumé
+- si le budget reste dépassé : contexte projet retiré, puis problèmes de
+  faible sévérité retirés (Fixer) ou sortie pytest tronquée (Judge)
+
+Le code du fichier n'est jamais tronqué : un fichier plus gros que le budget
+produit un prompt hors budget, signalé par "over_budget".
+
+Chaque fonction build_*_prompt renvoie (prompt, stats) ; stats est transmis
+à generate_content (span LLM) et aux logs de l'agent.
+"""
+
+import json
+import re
+from typing import Dict, List, Tuple
+
+from .audit_fix_prompt import get_audit_fix_prompt
+from .auditor_prompt import get_auditor_prompt
+from .fixer_prompt import get_fixer_prompt
+from .judge_prompt import get_judge_prompt
+
+CHARS_PER_TOKEN = 4
+
+# Budget de tokens d'entrée par agent (prompt complet)
+AGENT_BUDGETS = {
+    "auditor": 6000,
+    "fixer": 8000,
+    "judge": 1500,
+    "audit_fix": 8000,
+}
+
+# Champs du rapport d'audit déjà présents ailleurs dans le prompt
+_REDUNDANT_AUDIT_FIELDS = ("file", "total_issues")
+
+# Ordre de suppression des problèmes quand le budget du Fixer est dépassé
+_SEVERITY_DROP_ORDER = ("LOW", "MEDIUM")
+
+# Sections de la sortie pytest utiles au Judge
+_PYTEST_SECTION = re.compile(r"^={3,} ?(.*?) ?={3,}$")
+_KEPT_SECTIONS = ("FAILURES", "ERRORS", "short test summary info")
+_RESULT_LINE = re.compile(r"\b(passed|failed|error|errors|no tests ran)\b")
+
+
+def count_tokens(text: str) -> int:
+    """Estimation rapide du nombre de tokens (~4 caractères par token)."""
+    return len(text) // CHARS_PER_TOKEN
+
+
+def compact_json(data) -> str:
+    """JSON sur une ligne, sans espaces superflus."""
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def compact_audit_report(audit_report: dict) -> dict:
+    """
+    Retire du rapport d'audit les champs redondants et les valeurs vides.
+
+    "file" est déjà dans l'en-tête du prompt, "total_issues" vaut len(issues).
+    """
+    compacted = {
+        key: value for key, value in audit_report.items()
+        if key not in _REDUNDANT_AUDIT_FIELDS and value not in (None, "", [], {})
+    }
+    if "issues" in compacted:
+        compacted["issues"] = [
+            {key: value for key, value in issue.items() if value not in (None, "", [], {})}
+            if isinstance(issue, dict) else issue
+            for issue in compacted["issues"]
+        ]
+    return compacted
+
+
+def extract_failure_sections(pytest_output: str) -> str:
+    """
+    Réduit une sortie pytest aux sections FAILURES / ERRORS / short test summary
+    et à la ligne de résultat finale.
+
+    Returns:
+        str: Sortie réduite (la sortie d'origine si aucune section n'est reconnue)
+    """
+    lines = pytest_output.splitlines()
+    kept: List[str] = []
+    keeping = False
+    recognized = False
+
+    for line in lines:
+        match = _PYTEST_SECTION.match(line.strip())
+        if match:
+            recognized = True
+            title = match.group(1)
+            keeping = any(section in title for section in _KEPT_SECTIONS)
+            if keeping or _RESULT_LINE.search(title):
+                kept.append(line)
+            continue
+        if keeping:
+            kept.append(line)
+
+    if not recognized:
+        return pytest_output
+    return "\n".join(kept)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Garde le début et la fin d'un texte trop long (la fin contient le résumé pytest)."""
+    max_chars = max(max_tokens, 0) * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    marker = "\n[... sortie tronquée ...]\n"
+    head = max((max_chars - len(marker)) // 3, 0)
+    tail = max(max_chars - len(marker) - head, 0)
+    return text[:head] + marker + (text[-tail:] if tail else "")
+
+
+def _stats(agent: str, raw_prompt: str, prompt: str, steps: List[str]) -> Dict:
+    raw_tokens = count_tokens(raw_prompt)
+    prompt_tokens = count_tokens(prompt)
+    return {
+        "agent": agent,
+        "budget_tokens": AGENT_BUDGETS[agent],
+        "raw_tokens": raw_tokens,
+        "prompt_tokens": prompt_tokens,
+        "saved_tokens": max(raw_tokens - prompt_tokens, 0),
+        "over_budget": prompt_tokens > AGENT_BUDGETS[agent],
+        "steps": steps,
+    }
+
+
+def build_auditor_prompt(filename: str, code: str, context: str = "") -> Tuple[str, Dict]:
+    """
+    Prompt de l'Auditeur dans le budget : retire le contexte projet si nécessaire.
+
+    Returns:
+        tuple: (prompt, stats)
+    """
+    raw_prompt = get_auditor_prompt(filename, code, context)
+    prompt, steps = raw_prompt, []
+
+    if context and count_tokens(prompt) > AGENT_BUDGETS["auditor"]:
+        prompt = get_auditor_prompt(filename, code)
+        steps.append("dropped_context")
+
+    return prompt, _stats("auditor", raw_prompt, prompt, steps)
+
+
+def build_audit_fix_prompt(filename: str, code: str, context: str = "") -> Tuple[str, Dict]:
+    """
+    Prompt combiné Audit + Correction dans le budget : retire le contexte projet si nécessaire.
+
+    Returns:
+        tuple: (prompt, stats)
+    """
+    raw_prompt = get_audit_fix_prompt(filename, code, context)
+    prompt, steps = raw_prompt, []
+
+    if context and count_tokens(prompt) > AGENT_BUDGETS["audit_fix"]:
+        prompt = get_audit_fix_prompt(filename, code)
+        steps.append("dropped_context")
+
+    return prompt, _stats("audit_fix", raw_prompt, prompt, steps)
+
+
+def build_fixer_prompt(filename: str, code: str, audit_report: dict,
+                       context: str = "", examples: str = "") -> Tuple[str, Dict]:
+    """
+    Prompt du Correcteur dans le budget.
+
+    Étapes : JSON compact, puis (si le budget est dépassé) retrait des
+    exemples de corrections, du contexte projet, puis des problèmes LOW, puis MEDIUM.
+
+    Returns:
+        tuple: (prompt, stats) ; stats["dropped_issues"] liste les problèmes retirés
+    """
+    raw_prompt = get_fixer_prompt(filename, code, audit_report, context, compact=False, examples=examples)
+
+    report = compact_audit_report(audit_report)
+    prompt = get_fixer_prompt(filename, code, report, context, examples=examples)
+    steps = ["compact_json"]
+    dropped_issues = 0
+
+    if examples and count_tokens(prompt) > AGENT_BUDGETS["fixer"]:
+        examples = ""
+        prompt = get_fixer_prompt(filename, code, report, context)
+        steps.append("dropped_examples")
+
+    if context and count_tokens(prompt) > AGENT_BUDGETS["fixer"]:
+        context = ""
+        prompt = get_fixer_prompt(filename, code, report, context)
+        steps.append("dropped_context")
+
+    for severity in _SEVERITY_DROP_ORDER:
+        if count_tokens(prompt) <= AGENT_BUDGETS["fixer"]:
+            break
+        issues = report.get("issues", [])
+        kept = [i for i in issues if not (isinstance(i, dict) and i.get("severity") == severity)]
+        if len(kept) == len(issues):
+            continue
+        dropped_issues += len(issues) - len(kept)
+        report = {**report, "issues": kept}
+        prompt = get_fixer_prompt(filename, code, report, context)
+        steps.append(f"dropped_{severity.lower()}_issues")
+
+    stats = _stats("fixer", raw_prompt, prompt, steps)
+    stats["dropped_issues"] = dropped_issues
+    stats["examples"] = bool(examples)
+    return prompt, stats
+
+
+def build_judge_prompt(filename: str, pytest_output: str) -> Tuple[str, Dict]:
+    """
+    Prompt du Testeur dans le budget : sections d'échec, puis troncature.
+
+    Returns:
+        tuple: (prompt, stats)
+    """
+    raw_prompt = get_judge_prompt(filename, pytest_output)
+
+    output = extract_failure_sections(pytest_output)
+    steps = ["failure_sections"] if output != pytest_output else []
+    prompt = get_judge_prompt(filename, output)
+
+    overflow = count_tokens(prompt) - AGENT_BUDGETS["judge"]
+    if overflow > 0:
+        output = truncate_to_tokens(output, count_tokens(output) - overflow)
+        prompt = get_judge_prompt(filename, output)
+        steps.append("truncated_output")
+
+    return prompt, _stats("judge", raw_prompt, prompt, steps)
@@ -0,0 +1,88 @@
+"""
+Contexte projet pour les prompts de l'Auditeur et du Correcteur
+Version: 1.0
+Date: 2026-10-18
+Auteur: Ingénieur Prompt
+
+Description:
+Met en forme les symboles renvoyés par l'index (src.tools.symbol_index) :
+une signature par symbole, suivie de la première ligne de sa docstring.
+Seuls les symboles référencés par le fichier traité sont transmis.
+
+Met aussi en forme les corrections validées de fonctions quasi identiques
+(src.tools.fix_memory), jointes au prompt du Correcteur comme exemples.
+"""
+
+import os
+from typing import List
+
+# Taille maximale du bloc de contexte (caractères, ~500 tokens)
+MAX_CONTEXT_CHARS = 2000
+# Taille maximale du bloc d'exemples de corrections (caractères, ~750 tokens)
+MAX_EXAMPLES_CHARS = 3000
+
+
+def get_project_context(symbols: List[dict], max_chars: int = MAX_CONTEXT_CHARS) -> str:
+    """
+    Construit le bloc de contexte à partir des symboles référencés.
+
+    Args:
+        symbols (list): Entrées de SymbolIndex.lookup() ({"path", "name", "signature", "doc"})
+        max_chars (int): Taille maximale du bloc ; les symboles en trop sont omis
+
+    Returns:
+        str: Signatures groupées par module ("" si aucun symbole)
+    """
+    blocks: List[str] = []
+    current_module = None
+    size = 0
+
+    for symbol in symbols:
+        lines = symbol["signature"].split("\n")
+        if symbol.get("doc"):
+            lines[0] += f"  # {symbol['doc']}"
+        text = "\n".join(lines)
+
+        module = os.path.splitext(os.path.basename(symbol["path"]))[0]
+        header = f"# module {module}" if module != current_module else None
+        added = len(text) + (len(header) + 2 if header else 0) + 1
+        if size + added > max_chars:
+            blocks.append("# ...")
+            break
+
+        if header:
+            if blocks:
+                blocks.append("")
+            blocks.append(header)
+            current_module = module
+        blocks.append(text)
+        size += added
+
+    return "\n".join(blocks)
+
+
+def get_fix_examples(examples: List[dict], max_chars: int = MAX_EXAMPLES_CHARS) -> str:
+    """
+    Construit le bloc d'exemples à partir des corrections retrouvées.
+
+    Args:
+        examples (list): Entrées de FixMemory.similar() ({"name", "file", "before", "after",
+            "similarity", "matches"})
+        max_chars (int): Taille maximale du bloc ; les exemples en trop sont omis
+
+    Returns:
+        str: Paires avant / après ("" si aucun exemple)
+    """
+    blocks: List[str] = []
+    size = 0
+
+    for example in examples:
+        text = (f"# {example['matches']} ressemble à {example['name']} ({example['file']}, "
+                f"similarité {example['similarity']:.0%})\n"
+                f"# AVANT :\n{example['before']}\n# APRÈS (validé) :\n{example['after']}")
+        if size + len(text) > max_chars:
+            break
+        blocks.append(text)
+        size += len(text) + 2
+
+    return "\n\n".join(blocks)
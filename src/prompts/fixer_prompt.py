@@ -10,7 +10,8 @@ Le Correcteur lit le code buggé et le rapport de l'Auditeur, puis corrige tous
 """
 
 
-def get_fixer_prompt(filename: str, buggy_code: str, audit_report: dict) -> str:
+def get_fixer_prompt(filename: str, buggy_code: str, audit_report: dict, context: str = "",
+                     compact: bool = True, examples: str = "") -> str:
     """
     Génère le prompt pour l'Agent Correcteur (Fixer) - VERSION OPTIMISÉE v1.1.
     
@@ -18,6 +19,9 @@ def get_fixer_prompt(filename: str, buggy_code: str, audit_report: dict) -> str:
         filename (str): Nom du fichier à corriger
         buggy_code (str): Code Python avec bugs
         audit_report (dict): Rapport JSON de l'Auditeur
+        context (str): Signatures des symboles importés d'autres fichiers du projet
+        compact (bool): Rapport en JSON compact (False : indenté, format v1.1)
+        examples (str): Corrections validées de fonctions quasi identiques
     
     Returns:
         str: Prompt optimisé prêt à envoyer à Gemini
@@ -25,9 +29,30 @@ def get_fixer_prompt(filename: str, buggy_code: str, audit_report: dict) -> str:
     Version: 1.1 (optimisée -12% tokens)
     """
     
-    # Convertit le rapport en JSON string
+    # Convertit le rapport en JSON string (compact : ~40% de tokens en moins)
     import json
-    audit_json = json.dumps(audit_report, indent=2, ensure_ascii=False)
+    if compact:
+        audit_json = json.dumps(audit_report, ensure_ascii=False, separators=(",", ":"))
+    else:
+        audit_json = json.dumps(audit_report, indent=2, ensure_ascii=False)
+    
+    context_section = ""
+    if context:
+        context_section = f"""🔗 SYMBOLES DU PROJET (définis dans d'autres fichiers, importés par ce code : ils existent) :
+```python
+{context}
+```
+
+"""
+    
+    examples_section = ""
+    if examples:
+        examples_section = f"""🧩 CORRECTIONS DÉJÀ VALIDÉES SUR DES FONCTIONS SIMILAIRES (exemples, à adapter si le même problème est signalé) :
+```python
+{examples}
+```
+
+"""
     
     prompt = f"""Tu es un expert Python chargé de corriger les bugs détectés.
 
@@ -41,7 +66,7 @@ def get_fixer_prompt(filename: str, buggy_code: str, audit_report: dict) -> str:
 {buggy_code}
 ```
 
-🎯 TA MISSION :
+{context_section}{examples_section}🎯 TA MISSION :
 Corrige TOUS les bugs listés dans le rapport.
 
 ✅ RÈGLES :
@@ -0,0 +1,218 @@
+"""
+Ordonnancement des fichiers à traiter
+Traite d'abord les fichiers qui rapportent le plus, au moindre coût
+
+Chaque fichier reçoit un score local, calculé sans appel au modèle :
+- erreur de syntaxe (ast.parse)      -> toujours en tête de file
+- score pylint (optionnel, --schedule_pylint : un sous-processus par fichier)
+- taille du fichier et durée estimée (src.planning)
+- taux d'échec historique du fichier, relu dans logs/experiment_data.json
+  (clé : chemin relatif au dossier cible, history_key, pour ne pas mélanger
+  les __init__.py ou utils.py de dossiers différents)
+
+Mode normal : erreurs de syntaxe, puis pylint croissant, taux d'échec
+croissant, taille croissante.
+Mode deadline (--deadline 30m) : erreurs de syntaxe, puis rendement attendu
+décroissant (probabilité de validation / durée estimée), pour valider le plus
+de fichiers possible avant l'échéance.
+"""
+
+import ast
+import os
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from src.planning import estimate_file, project_scenario
+from src.utils.logger import read_experiment_log
+from src.utils.rate_limiter import get_rate_limiter_stats
+
+_DURATION_PATTERN = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([smh]?)\s*$", re.IGNORECASE)
+_DURATION_UNITS = {"": 60, "s": 1, "m": 60, "h": 3600}
+
+
+@dataclass
+class ScheduledFile:
+    """Fichier à traiter et éléments de son score."""
+    path: str
+    size: int
+    syntax_error: bool
+    failure_rate: float
+    estimated_seconds: float
+    pylint_score: Optional[float] = None
+    history_key: str = ""
+
+    @property
+    def expected_payoff(self) -> float:
+        """Probabilité de validation par seconde de traitement estimée."""
+        return (1.0 - self.failure_rate) / max(self.estimated_seconds, 1e-6)
+
+
+def parse_duration(value: str) -> float:
+    """
+    Convertit une durée de la CLI en secondes.
+
+    Args:
+        value (str): "90s", "30m", "1.5h" (sans unité : minutes)
+
+    Returns:
+        float: Durée en secondes
+
+    Raises:
+        ValueError: Format non reconnu ou durée nulle
+    """
+    match = _DURATION_PATTERN.match(str(value))
+    if not match:
+        raise ValueError(f"Durée invalide : '{value}' (exemples : 90s, 30m, 1h)")
+
+    seconds = float(match.group(1)) * _DURATION_UNITS[match.group(2).lower()]
+    if seconds <= 0:
+        raise ValueError(f"Durée invalide : '{value}' (doit être positive)")
+    return seconds
+
+
+def history_key(path: str, root: Optional[str] = None) -> str:
+    """
+    Clé de l'historique d'un fichier : chemin relatif à root, séparateurs "/"
+    (nom du fichier seul sans root).
+    """
+    if root is None:
+        return os.path.basename(path)
+    return os.path.relpath(os.path.abspath(path), os.path.abspath(root)).replace(os.sep, "/")
+
+
+def load_failure_history(log_file: Optional[str] = None) -> Dict[str, Tuple[int, int]]:
+    """
+    Relit les runs précédents : nombre de traitements et d'échecs par fichier.
+
+    Les entrées écrites avant l'ajout de "history_key" ne portent que le nom
+    du fichier : elles sont comptées sous la clé "name:<nom>".
+
+    Args:
+        log_file (str): Log à relire (défaut: logs/experiment_data.json)
+
+    Returns:
+        dict: history_key -> (traitements, échecs)
+    """
+    try:
+        entries = read_experiment_log(log_file, rehydrate=False)
+    except (OSError, ValueError):
+        return {}
+
+    history: Dict[str, Tuple[int, int]] = {}
+    for entry in entries:
+        details = entry.get("details", {})
+        if details.get("operation") != "file_processing_complete":
+            continue
+        name = details.get("history_key") or f"name:{details.get('file')}"
+        attempts, failures = history.get(name, (0, 0))
+        failed = details.get("final_status") != "VALIDATED"
+        history[name] = (attempts + 1, failures + int(failed))
+
+    return history
+
+
+def _failure_rate(attempts: int, failures: int) -> float:
+    # Lissage de Laplace : un fichier jamais vu vaut 0.5, un seul échec ne condamne pas
+    return (failures + 1) / (attempts + 2)
+
+
+def _has_syntax_error(path: str) -> bool:
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            ast.parse(f.read(), filename=path)
+    except SyntaxError:
+        return True
+    except (OSError, ValueError):
+        return False
+    return False
+
+
+def score_file(path: str, history: Dict[str, Tuple[int, int]], max_rpm: int,
+               use_pylint: bool = False, root: Optional[str] = None,
+               unique_name: bool = True, fuse_max_tokens: Optional[int] = None) -> ScheduledFile:
+    """
+    Calcule le score local d'un fichier.
+
+    Args:
+        path (str): Chemin du fichier
+        history (dict): Résultat de load_failure_history()
+        max_rpm (int): Limite de requêtes par minute (durée estimée)
+        use_pylint (bool): Lance pylint pour obtenir le score de qualité
+        root (str): Dossier cible (clé de l'historique relative à ce dossier)
+        unique_name (bool): Aucun autre fichier du run ne porte ce nom : les
+            anciennes entrées (nom seul) peuvent lui être attribuées
+        fuse_max_tokens (int, optional): Seuil de l'appel fusionné audit_fix
+
+    Returns:
+        ScheduledFile: Fichier et éléments de son score
+    """
+    estimate = estimate_file(path, fuse_max_tokens)
+    # Durée d'un passage audit -> fix -> judge, au rythme du rate limiter
+    estimated_seconds = project_scenario([estimate], 1, False, max_rpm, 1)["wall_seconds"]
+
+    pylint_score = None
+    if use_pylint:
+        from src.tools.analysis_tools import run_pylint
+        pylint_score = run_pylint(path).get("score")
+
+    key = history_key(path, root)
+    attempts, failures = history.get(key, (0, 0))
+    if not attempts and unique_name:
+        attempts, failures = history.get(f"name:{os.path.basename(path)}", (0, 0))
+
+    return ScheduledFile(
+        path=path,
+        size=estimate["bytes"],
+        syntax_error=_has_syntax_error(path),
+        failure_rate=_failure_rate(attempts, failures),
+        estimated_seconds=estimated_seconds,
+        pylint_score=pylint_score,
+        history_key=key,
+    )
+
+
+def _priority_key(item: ScheduledFile):
+    # Pas de score pylint : placé après les fichiers notés
+    pylint_key = item.pylint_score if item.pylint_score is not None else float("inf")
+    return (not item.syntax_error, pylint_key, item.failure_rate, item.size)
+
+
+def _deadline_key(item: ScheduledFile):
+    return (not item.syntax_error, -item.expected_payoff)
+
+
+def schedule_files(paths: List[str], deadline_seconds: Optional[float] = None,
+                   use_pylint: bool = False, log_file: Optional[str] = None,
+                   max_rpm: Optional[int] = None, root: Optional[str] = None,
+                   fuse_max_tokens: Optional[int] = None) -> List[ScheduledFile]:
+    """
+    Ordonne les fichiers à traiter, du plus prioritaire au moins prioritaire.
+
+    Args:
+        paths (list): Fichiers trouvés par find_python_files()
+        deadline_seconds (float): Budget de temps du run (active le mode deadline)
+        use_pylint (bool): Inclut le score pylint dans l'ordre
+        log_file (str): Log des runs précédents (taux d'échec historique)
+        max_rpm (int): Limite de requêtes par minute (défaut: rate limiter global)
+        root (str): Dossier cible (clés de l'historique, voir history_key)
+        fuse_max_tokens (int, optional): Seuil de l'appel fusionné audit_fix
+
+    Returns:
+        list: ScheduledFile triés (ordre stable à score égal)
+    """
+    if max_rpm is None:
+        max_rpm = get_rate_limiter_stats()["max_rpm"]
+
+    history = load_failure_history(log_file)
+    name_counts = Counter(os.path.basename(path) for path in paths)
+    scored = [
+        score_file(path, history, max_rpm, use_pylint, root,
+                   unique_name=name_counts[os.path.basename(path)] == 1,
+                   fuse_max_tokens=fuse_max_tokens)
+        for path in paths
+    ]
+
+    key = _deadline_key if deadline_seconds is not None else _priority_key
+    return sorted(scored, key=key)
@@ -4,9 +4,12 @@ and returning the analysis results.
 """
 
 import os
+import re
 import subprocess
-from typing import Dict
+from typing import Dict, List, Optional
+from src.tools.pytest_pool import run_pytest_command
 from src.utils.logger import log_experiment, ActionType
+from src.utils.tracing import span
 
 
 def run_pylint(file_path: str) -> Dict[str, float | str | int | bool]:
@@ -23,13 +26,14 @@ def run_pylint(file_path: str) -> Dict[str, float | str | int | bool]:
         if not os.path.isfile(file_path):
             raise FileNotFoundError(f"File not found: {file_path}")
 
-        result = subprocess.run(
-            ["pylint", file_path],
-            capture_output=True,
-            text=True,
-            check=False,
-            timeout=30
-        )
+        with span("pylint", kind="subprocess", target=file_path):
+            result = subprocess.run(
+                ["pylint", file_path],
+                capture_output=True,
+                text=True,
+                check=False,
+                timeout=30
+            )
 
         # Extract score
         score = 0.0
@@ -112,27 +116,31 @@ def run_pylint(file_path: str) -> Dict[str, float | str | int | bool]:
         raise
 
 
-def run_pytest(target_path: str) -> dict:
+def run_pytest(target_path: str, extra_paths: Optional[List[str]] = None, timeout: float = 60) -> dict:
     """
     Run pytest on a given file or directory.
 
     Args:
         target_path (str): Path to test file or directory.
+        extra_paths (list, optional): Other test files run in the same session
+            (tests impacted by target_path, see src.tools.test_impact).
+        timeout (float): Seconds before the pytest run is stopped.
 
     Returns:
         dict: Dictionary containing passed, failed, stdout and stderr.
     """
     try:
-        if not os.path.exists(target_path):
-            raise FileNotFoundError(f"Path not found: {target_path}")
-
-        result = subprocess.run(
-            ["pytest", target_path, "--disable-warnings", "-q", "--tb=short"],
-            capture_output=True,
-            text=True,
-            check=False,
-            timeout=60
-        )
+        paths = [target_path] + [path for path in extra_paths or [] if path != target_path]
+        for path in paths:
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"Path not found: {path}")
+
+        # Worker pytest préchargé si disponible (src.tools.pytest_pool)
+        with span("pytest", kind="subprocess", target=target_path, test_paths=len(paths)):
+            result = run_pytest_command(
+                [*paths, "--disable-warnings", "-q", "--tb=short"],
+                timeout=timeout
+            )
 
         # Comptage des tests passés et échoués
         stdout = result.stdout
@@ -147,6 +155,7 @@ def run_pytest(target_path: str) -> dict:
             details={
                 "operation": "unit_testing",
                 "test_path": target_path,
+                "extra_test_paths": paths[1:],
                 "input_prompt": f"Running tests in: {target_path}",
                 "output_response": f"Tests completed: {passed} passed, {failed} failed",
                 "passed_count": passed,
@@ -190,7 +199,7 @@ def run_pytest(target_path: str) -> dict:
                 "operation": "unit_testing",
                 "test_path": target_path,
                 "input_prompt": f"Running tests in: {target_path}",
-                "output_response": "Pytest execution timeout after 60s",
+                "output_response": f"Pytest execution timeout after {timeout}s",
                 "error_type": "TimeoutExpired"
             },
             status="FAILURE"
@@ -211,4 +220,71 @@ def run_pytest(target_path: str) -> dict:
             },
             status="FAILURE"
         )
-        raise
\ No newline at end of file
+        raise
+
+
+_SUMMARY_COUNT = re.compile(r"(\d+) (passed|failed|errors?|skipped|xfailed|xpassed)")
+_SUMMARY_LINE = re.compile(r"\b(passed|failed|errors?|no tests ran)\b.* in [\d.]+s")
+_SHORT_SUMMARY_ITEM = re.compile(r"^(FAILED|ERROR) (\S+)(?: - (.*))?$")
+_FAILURE_HEADER = re.compile(r"^_{3,} (.+?) _{3,}$")
+
+
+def _first_error_lines(output: str) -> Dict[str, str]:
+    """Première ligne "E   ..." de chaque section de la trace, par nom de test."""
+    errors: Dict[str, str] = {}
+    section = None
+    for line in output.splitlines():
+        header = _FAILURE_HEADER.match(line.strip())
+        if header:
+            section = header.group(1)
+        elif section and line.startswith("E ") and section not in errors:
+            errors[section] = line[1:].strip()
+    return errors
+
+
+def parse_pytest_summary(output: str) -> Optional[Dict[str, object]]:
+    """
+    Lit la ligne de résultat finale de pytest ("1 failed, 2 passed in 0.08s").
+
+    Args:
+        output (str): Sortie console de pytest
+
+    Returns:
+        dict: {"passed", "failed", "errors", "no_tests", "failures"} ou None si
+        aucune ligne de résultat n'est reconnue (timeout, crash...).
+        "failures" liste les entrées FAILED/ERROR du résumé court.
+    """
+    summary_line = None
+    for line in reversed(output.splitlines()):
+        if _SUMMARY_LINE.search(line):
+            summary_line = line
+            break
+    if summary_line is None:
+        return None
+
+    counts = {"passed": 0, "failed": 0, "errors": 0}
+    for number, label in _SUMMARY_COUNT.findall(summary_line):
+        key = "errors" if label.startswith("error") else label
+        if key in counts:
+            counts[key] = int(number)
+
+    failures: List[Dict[str, str]] = []
+    error_lines = _first_error_lines(output)
+    for line in output.splitlines():
+        match = _SHORT_SUMMARY_ITEM.match(line.strip())
+        if match:
+            kind, name, message = match.groups()
+            # Message coupé à la largeur du terminal : repris de la trace
+            message = message or error_lines.get(name.rsplit("::", 1)[-1], "")
+            if ":" in message:
+                error_type = message.split(":", 1)[0].strip()
+            else:
+                error_type = "AssertionError" if message.startswith("assert") else kind
+            failures.append({
+                "test_name": name,
+                "error_type": error_type,
+                "error_message": message,
+                "location": name.split("::", 1)[0],
+            })
+
+    return {**counts, "no_tests": "no tests ran" in summary_line, "failures": failures}
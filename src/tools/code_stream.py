@@ -0,0 +1,179 @@
+"""
+Validation incrémentale du code reçu en streaming (Correcteur)
+
+Le code est vérifié pendant la génération au lieu d'attendre la réponse
+complète pour compile() :
+- la clôture d'ouverture (```python) est retirée, un bloc d'un autre
+  langage interrompt la génération
+- chaque ligne complète est tokenisée (module tokenize) : un caractère
+  impossible en Python ou une indentation incohérente interrompt la
+  génération
+- dès qu'une instruction de niveau 0 est suivie d'une autre, elle est
+  compilée : une phrase d'introduction ("Voici le code corrigé :") ou un
+  bloc incohérent ne peut plus être rattrapé par la suite
+- la clôture de fin (```) termine le code : la fin est compilée et la
+  suite de la réponse est ignorée
+
+Les lignes validées sont transmises au fur et à mesure à `sink` (écriture
+dans un fichier temporaire).
+"""
+
+import io
+import tokenize
+from typing import Callable, List, Optional
+
+FENCE = "```"
+
+# Mots-clés de niveau 0 qui prolongent l'instruction précédente
+_CONTINUATIONS = {"else", "elif", "except", "finally"}
+_LAYOUT_TOKENS = {tokenize.NL, tokenize.NEWLINE, tokenize.COMMENT, tokenize.INDENT,
+                  tokenize.DEDENT, tokenize.ENDMARKER}
+
+
+class IncrementalCodeChecker:
+    """
+    Reçoit les morceaux de la réponse du modèle et détecte au plus tôt une
+    sortie inutilisable.
+
+    Usage:
+        checker = IncrementalCodeChecker(sink=writer.write)
+        for chunk in stream:
+            if not checker.feed(chunk):
+                break           # checker.error explique l'arrêt
+        code = checker.finish()
+    """
+
+    def __init__(self, sink: Optional[Callable[[str], None]] = None):
+        self._sink = sink
+        self.reset()
+
+    def reset(self) -> None:
+        """Repart de zéro (nouvelle tentative de génération)."""
+        self._pending = ""
+        self._started = False
+        self.closed = False
+        self._lines: List[str] = []
+        # Nombre de lignes formant des instructions de niveau 0 déjà compilées
+        self._checked = 0
+        self.error: Optional[str] = None
+
+    @property
+    def checked_lines(self) -> int:
+        """Lignes déjà validées par compile()."""
+        return self._checked
+
+    def feed(self, chunk: str) -> bool:
+        """
+        Ajoute un morceau de la réponse.
+
+        Returns:
+            bool: False si la génération doit être interrompue (voir self.error)
+        """
+        if self.error is not None:
+            return False
+        if self.closed:
+            return True
+
+        self._pending += chunk
+        while "\n" in self._pending and not self.closed:
+            line, self._pending = self._pending.split("\n", 1)
+            self._accept_line(line + "\n")
+            if self.error is not None:
+                return False
+
+        self._check()
+        return self.error is None
+
+    def finish(self) -> str:
+        """
+        Termine la réception (dernière ligne sans retour à la ligne).
+
+        Returns:
+            str: Code reçu, sans les clôtures markdown ni les blancs autour
+        """
+        if self._pending and not self.closed:
+            pending = self._pending
+            self._pending = ""
+            if pending.strip().startswith(FENCE):
+                self.closed = True
+            else:
+                self._accept_line(pending)
+        return "".join(self._lines).strip()
+
+    def _accept_line(self, line: str) -> None:
+        stripped = line.strip()
+
+        if not self._started:
+            if not stripped:
+                return
+            self._started = True
+            if stripped.startswith(FENCE):
+                language = stripped[len(FENCE):].strip().lower()
+                if language not in ("", "python", "py", "python3"):
+                    self.error = f"bloc de code {language} au lieu de Python"
+                return
+
+        if stripped.startswith(FENCE):
+            self.closed = True
+            return
+
+        self._lines.append(line)
+        if self._sink is not None:
+            self._sink(line)
+
+    def _check(self) -> None:
+        """Tokenise les lignes non validées et compile les instructions de niveau 0 terminées."""
+        tail = self._lines[self._checked:]
+        if not tail:
+            return
+
+        if self.closed:
+            # Clôture de fin : le reste du code est complet
+            boundary = len(tail)
+        else:
+            boundary = self._last_boundary("".join(tail))
+        if self.error is not None or boundary is None:
+            return
+
+        segment = "".join(tail[:boundary])
+        try:
+            compile(segment, "<fixer>", "exec")
+        except SyntaxError as e:
+            line = self._checked + (e.lineno or 1)
+            self.error = f"ligne {line} : {e.msg}"
+            return
+        self._checked += boundary
+
+    def _last_boundary(self, text: str) -> Optional[int]:
+        """
+        Nombre de lignes avant la dernière instruction de niveau 0 qui en
+        termine une autre (None s'il n'y en a pas encore).
+        """
+        boundary = None
+        statement_start = True
+        previous_first = None
+        try:
+            for token in tokenize.generate_tokens(io.StringIO(text).readline):
+                if token.type == tokenize.ERRORTOKEN and token.string.strip():
+                    self.error = f"ligne {self._checked + token.start[0]} : caractère invalide {token.string!r}"
+                    return None
+                if token.type == tokenize.NEWLINE:
+                    statement_start = True
+                    continue
+                if token.type in _LAYOUT_TOKENS:
+                    continue
+                if statement_start:
+                    statement_start = False
+                    row, column = token.start
+                    if (column == 0 and row > 1 and previous_first != "@"
+                            and token.string not in _CONTINUATIONS):
+                        boundary = row - 1
+                    if column == 0:
+                        previous_first = token.string
+        except tokenize.TokenError:
+            # Instruction ou chaîne multiligne pas encore terminée
+            pass
+        except SyntaxError as e:
+            self.error = f"ligne {self._checked + (e.lineno or 1)} : {e.msg}"
+            return None
+        return boundary
@@ -0,0 +1,59 @@
+"""
+Regroupement des fichiers au contenu identique (modules copiés ou vendorisés)
+
+Le contenu est normalisé avant le hash (fins de ligne, espaces en fin de
+ligne, lignes vides finales) : deux copies qui ne diffèrent que par ces
+détails forment un même groupe. Seul le représentant d'un groupe (son
+premier fichier, dans l'ordre donné) passe par la boucle Audit -> Fix ->
+Judge ; l'orchestrateur recopie ensuite la version validée dans les autres.
+"""
+
+import hashlib
+from typing import Dict, List, Optional
+
+
+def normalize_source(source: str) -> str:
+    """Contenu sans différences de forme (\\r\\n, espaces en fin de ligne, lignes vides finales)."""
+    lines = source.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    return "\n".join(line.rstrip() for line in lines).rstrip("\n")
+
+
+def normalized_hash(source: str) -> str:
+    """Empreinte SHA-256 du contenu normalisé."""
+    return hashlib.sha256(normalize_source(source).encode("utf-8")).hexdigest()
+
+
+def _file_hash(path: str) -> Optional[str]:
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            return normalized_hash(f.read())
+    except OSError:
+        return None
+
+
+def group_duplicates(paths: List[str]) -> Dict[str, List[str]]:
+    """
+    Regroupe les fichiers de même contenu normalisé.
+
+    Args:
+        paths (list): Fichiers, dans l'ordre de préférence des représentants
+
+    Returns:
+        dict: représentant -> copies (liste vide si le fichier est unique). Les
+        représentants gardent l'ordre de `paths` ; un fichier illisible reste seul.
+    """
+    groups: Dict[str, List[str]] = {}
+    representative_of: Dict[str, str] = {}
+
+    for path in paths:
+        digest = _file_hash(path)
+        if digest is None:
+            groups[path] = []
+            continue
+        representative = representative_of.setdefault(digest, path)
+        if representative == path:
+            groups[path] = []
+        else:
+            groups[representative].append(path)
+
+    return groups
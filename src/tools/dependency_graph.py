@@ -0,0 +1,279 @@
+"""
+Graphe des imports entre les fichiers du dossier cible
+Construit une fois par run, à partir des AST (sans exécuter le code)
+
+Sert à trois choses :
+- ordre de traitement : un module passe après les modules qu'il importe
+- contexte des prompts : noms importés depuis d'autres fichiers du projet,
+  résolus en signatures par l'index des symboles (src.tools.symbol_index)
+- parallélisme : les sous-arbres indépendants peuvent être traités en même temps
+
+Les AST sont mis en cache par chemin, avec le hash du contenu : un fichier
+déjà corrigé est relu, les autres ne sont pas reparsés. Une seule version est
+gardée par fichier, et l'orchestrateur vide le cache une fois les graphes du
+run construits (clear_ast_cache).
+"""
+
+import ast
+import hashlib
+import os
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+
+# chemin -> (sha256 du contenu, AST ou None si le fichier ne parse pas)
+_ast_cache: Dict[str, Tuple[str, Optional[ast.Module]]] = {}
+_cache_lock = threading.Lock()
+
+
+def _read(path: str) -> str:
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        return f.read()
+
+
+def parse_cached(path: str) -> Optional[ast.Module]:
+    """
+    Retourne l'AST d'un fichier, reparsé seulement si son contenu a changé.
+
+    Returns:
+        ast.Module, ou None si le fichier est illisible ou syntaxiquement invalide
+    """
+    try:
+        source = _read(path)
+    except OSError:
+        return None
+
+    key = os.path.abspath(path)
+    digest = hashlib.sha256(source.encode("utf-8")).hexdigest()
+    with _cache_lock:
+        cached = _ast_cache.get(key)
+        if cached is not None and cached[0] == digest:
+            return cached[1]
+
+    try:
+        tree = ast.parse(source, filename=path)
+    except (SyntaxError, ValueError):
+        tree = None
+
+    with _cache_lock:
+        _ast_cache[key] = (digest, tree)
+    return tree
+
+
+def clear_ast_cache() -> None:
+    """Libère les AST gardés (les graphes déjà construits n'en ont plus besoin)."""
+    with _cache_lock:
+        _ast_cache.clear()
+
+
+def module_name(path: str, root: str) -> str:
+    """Nom de module pointé d'un fichier relatif à root (pkg/mod.py -> pkg.mod)."""
+    relative = os.path.relpath(os.path.abspath(path), os.path.abspath(root))
+    parts = relative[:-3].split(os.sep) if relative.endswith(".py") else relative.split(os.sep)
+    if parts[-1] == "__init__":
+        parts = parts[:-1]
+    return ".".join(part for part in parts if part not in ("", "."))
+
+
+def _dotted_name(node) -> Optional[str]:
+    """"a.b.c" pour une chaîne d'attributs sur un nom (None sinon)."""
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    parts.append(node.id)
+    return ".".join(reversed(parts))
+
+
+class ImportGraph:
+    """
+    Imports internes au dossier cible.
+
+    Les copies identiques (src.tools.dedup) restent résolubles : un import
+    qui désigne une copie est compté comme un import de son représentant,
+    seul fichier traité (et seul nœud du graphe).
+
+    Attributes:
+        root (str): Dossier cible
+        paths (list): Fichiers traités (nœuds du graphe, copies exclues)
+        modules (dict): nom de module -> chemin (copies comprises)
+        dependencies (dict): chemin -> chemins des modules importés
+        imported_names (dict): chemin -> {chemin importé -> noms utilisés (None = tous)}
+            Pour "import pkg.mod", les noms sont les attributs lus dans le code (pkg.mod.f -> f).
+    """
+
+    def __init__(self, root: str, paths: List[str], duplicate_of: Optional[Dict[str, str]] = None):
+        self.root = root
+        self.duplicate_of = dict(duplicate_of or {})
+        self.paths = [path for path in paths if path not in self.duplicate_of]
+        self.modules: Dict[str, str] = {module_name(path, root): path for path in paths}
+        self.dependencies: Dict[str, Set[str]] = {path: set() for path in self.paths}
+        self.imported_names: Dict[str, Dict[str, Optional[Set[str]]]] = {path: {} for path in self.paths}
+
+        for path in self.paths:
+            tree = parse_cached(path)
+            if tree is not None:
+                self._collect_imports(path, tree)
+
+    # --- Résolution des imports -------------------------------------------
+
+    def _resolve(self, importer: str, name: str, level: int = 0) -> Optional[str]:
+        """Chemin du module interne désigné par un import (None si externe)."""
+        package = module_name(importer, self.root).split(".")
+        if not os.path.basename(importer) == "__init__.py":
+            package = package[:-1]
+
+        if level:
+            base = package[:len(package) - (level - 1)] if level > 1 else package
+            candidates = [".".join(base + ([name] if name else []))]
+        else:
+            # Import absolu depuis la racine, ou voisin du même dossier (scripts)
+            candidates = [name, ".".join(package + [name])]
+
+        for candidate in candidates:
+            candidate = candidate.strip(".")
+            if candidate in self.modules:
+                return self.modules[candidate]
+        return None
+
+    def _add(self, importer: str, target: Optional[str], names: Optional[Set[str]]) -> None:
+        if target is not None:
+            target = self.duplicate_of.get(target, target)
+        if target is None or target == importer:
+            return
+        self.dependencies[importer].add(target)
+        current = self.imported_names[importer].get(target, set())
+        if names is None or current is None:
+            self.imported_names[importer][target] = None
+        else:
+            self.imported_names[importer][target] = current | names
+
+    def _collect_imports(self, path: str, tree: ast.Module) -> None:
+        # Nom lié dans le code -> module interne importé en entier
+        aliases: Dict[str, str] = {}
+
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    target = self._resolve(path, alias.name)
+                    if target is not None and target != path:
+                        aliases[alias.asname or alias.name] = target
+            elif isinstance(node, ast.ImportFrom):
+                module = self._resolve(path, node.module or "", node.level)
+                for alias in node.names:
+                    # "from pkg import mod" : mod peut être lui-même un module
+                    submodule = self._resolve(
+                        path, f"{node.module}.{alias.name}" if node.module else alias.name, node.level
+                    )
+                    if submodule is not None and submodule != path:
+                        aliases[alias.asname or alias.name] = submodule
+                    elif alias.name != "*":
+                        self._add(path, module, {alias.name})
+                    else:
+                        self._add(path, module, None)
+
+        if not aliases:
+            return
+
+        # Modules importés en entier : seuls les attributs lus comptent (mod.f -> f)
+        used: Dict[str, Set[str]] = {}
+        for node in ast.walk(tree):
+            if not isinstance(node, ast.Attribute):
+                continue
+            dotted = _dotted_name(node)
+            for bound, target in aliases.items():
+                if dotted and dotted.startswith(bound + "."):
+                    used.setdefault(target, set()).add(dotted[len(bound) + 1:].split(".")[0])
+
+        for target in aliases.values():
+            self._add(path, target, used.get(target) or None)
+
+    # --- Ordre et parallélisme --------------------------------------------
+
+    def topological_order(self, priority: Optional[List[str]] = None) -> List[str]:
+        """
+        Ordre de traitement : niveau par niveau, chaque module après ses dépendances.
+
+        Le niveau d'un fichier est 0 sans dépendance, sinon 1 + le niveau de
+        sa dépendance la plus profonde. Dans un niveau, l'ordre de priorité
+        (scheduler : erreurs de syntaxe d'abord, rendement sous deadline)
+        départage les fichiers.
+
+        Args:
+            priority (list): Ordre préféré (ex: scheduler)
+
+        Returns:
+            list: Chemins ordonnés. Les cycles d'imports sont rompus en suivant
+            l'ordre de priorité.
+        """
+        order = priority or self.paths
+        rank = {path: index for index, path in enumerate(order)}
+        remaining = {path: set(deps) for path, deps in self.dependencies.items()}
+        dependents: Dict[str, Set[str]] = {path: set() for path in self.paths}
+        for path, deps in remaining.items():
+            for dep in deps:
+                dependents[dep].add(path)
+
+        level = {path: 0 for path in self.paths}
+        ready = [path for path, deps in remaining.items() if not deps]
+        done: Set[str] = set()
+        # Candidats au déblocage d'un cycle, par priorité (parcourus une seule fois)
+        by_rank = iter(sorted(self.paths, key=lambda p: rank.get(p, len(rank))))
+
+        while len(done) < len(self.paths):
+            if not ready:
+                # Cycle : on débloque le fichier restant le plus prioritaire
+                blocked = next(p for p in by_rank if p not in done)
+                remaining[blocked] = set()
+                ready.append(blocked)
+
+            path = ready.pop()
+            if path in done:
+                continue
+            done.add(path)
+            for dependent in dependents[path]:
+                if dependent in done:
+                    continue
+                level[dependent] = max(level[dependent], level[path] + 1)
+                remaining[dependent].discard(path)
+                if not remaining[dependent]:
+                    ready.append(dependent)
+
+        return sorted(self.paths, key=lambda p: (level[p], rank.get(p, len(rank))))
+
+    def independent_groups(self) -> List[List[str]]:
+        """Composantes connexes du graphe : groupes de fichiers sans import commun."""
+        neighbours: Dict[str, Set[str]] = {path: set(deps) for path, deps in self.dependencies.items()}
+        for path, deps in self.dependencies.items():
+            for dep in deps:
+                neighbours[dep].add(path)
+
+        position = {path: index for index, path in enumerate(self.paths)}
+        groups: List[List[str]] = []
+        seen: Set[str] = set()
+        for start in self.paths:
+            if start in seen:
+                continue
+            stack, group = [start], []
+            seen.add(start)
+            while stack:
+                path = stack.pop()
+                group.append(path)
+                for other in neighbours[path] - seen:
+                    seen.add(other)
+                    stack.append(other)
+            groups.append(sorted(group, key=position.__getitem__))
+        return groups
+
+
+def build_import_graph(root: str, paths: List[str],
+                       duplicate_of: Optional[Dict[str, str]] = None) -> ImportGraph:
+    """
+    Construit le graphe des imports internes de `paths` (relatifs à root).
+
+    Args:
+        duplicate_of (dict): copie -> représentant (imports des copies
+            reportés sur le représentant)
+    """
+    return ImportGraph(root, paths, duplicate_of)
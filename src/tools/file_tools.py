@@ -1,8 +1,15 @@
 import os
+import stat
+import tempfile
 from src.utils.logger import log_experiment, ActionType
+from src.utils.tracing import span
 
 SANDBOX_DIR = os.path.abspath("sandbox")
 
+# umask du processus, lu une fois à l'import (os.umask ne se lit qu'en le changeant)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
 
 def _is_inside_sandbox(path: str) -> bool:
     """
@@ -42,8 +49,9 @@ def read_file(path: str) -> str:
         if not os.path.isfile(path):
             raise FileNotFoundError(f"Fichier introuvable : {path}")
         
-        with open(path, "r", encoding="utf-8") as f:
-            content = f.read()
+        with span("read_file", kind="io", path=path):
+            with open(path, "r", encoding="utf-8") as f:
+                content = f.read()
         
         # Log successful read
         log_experiment(
@@ -126,8 +134,9 @@ def write_file(path: str, content: str) -> None:
         if parent_dir:
             os.makedirs(parent_dir, exist_ok=True)
         
-        with open(path, "w", encoding="utf-8") as f:
-            f.write(content)
+        with span("write_file", kind="io", path=path):
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(content)
         
         # Log successful write
         log_experiment(
@@ -176,4 +185,111 @@ def write_file(path: str, content: str) -> None:
             },
             status="FAILURE"
         )
-        raise
\ No newline at end of file
+        raise
+
+class StreamingFileWriter:
+    """
+    Écriture progressive d'un fichier de sandbox/ : le contenu va dans un
+    fichier temporaire voisin, qui remplace le fichier (os.replace) à
+    commit() ou est supprimé à discard(). Le fichier cible reste intact
+    tant que commit() n'a pas été appelé.
+
+    mkstemp crée le fichier temporaire en 0600 : les permissions du fichier
+    cible (ou celles d'un nouveau fichier, selon l'umask) lui sont appliquées
+    avant le remplacement, comme avec write_file().
+    """
+
+    def __init__(self, path: str):
+        if not _is_inside_sandbox(path):
+            raise PermissionError("Écriture hors du dossier sandbox interdite")
+        self.path = path
+        parent_dir = os.path.dirname(path) or "."
+        fd, self.temp_path = tempfile.mkstemp(
+            dir=parent_dir, prefix=f".{os.path.basename(path)}.", suffix=".tmp"
+        )
+        self._file = os.fdopen(fd, "w", encoding="utf-8")
+        self._written: list = []
+
+    def write(self, text: str) -> None:
+        self._file.write(text)
+        self._file.flush()
+        self._written.append(text)
+
+    def reset(self) -> None:
+        """Vide le fichier temporaire (nouvelle tentative)."""
+        self._file.seek(0)
+        self._file.truncate()
+        self._written = []
+
+    def commit(self, content: str) -> None:
+        """
+        Remplace le fichier cible par `content`.
+
+        Le contenu déjà écrit est complété s'il est un préfixe de `content`
+        (cas courant : dernière ligne), réécrit sinon. Pas de troncature à
+        une longueur en octets : le fichier est en mode texte, la traduction
+        des fins de ligne (LF -> CRLF sous Windows) la fausserait.
+        """
+        written = "".join(self._written)
+        with span("write_file", kind="io", path=self.path, streamed_chars=len(written)):
+            if content.startswith(written):
+                self._file.write(content[len(written):])
+            else:
+                self._file.seek(0)
+                self._file.truncate()
+                self._file.write(content)
+            self._file.close()
+            os.chmod(self.temp_path, self._target_mode())
+            os.replace(self.temp_path, self.path)
+
+        log_experiment(
+            agent_name="FileSystem_Tool",
+            model_used="N/A",
+            action=ActionType.FIX,
+            details={
+                "operation": "write_file",
+                "file_path": self.path,
+                "input_prompt": f"Writing streamed content to file: {self.path}",
+                "output_response": f"Successfully wrote {len(content)} characters to {os.path.basename(self.path)}",
+                "content_size_chars": len(content),
+                "streamed_chars": len(written),
+                "file_name": os.path.basename(self.path),
+                "content_preview": content[:150] + "..." if len(content) > 150 else content
+            },
+            status="SUCCESS"
+        )
+
+    def _target_mode(self) -> int:
+        try:
+            return stat.S_IMODE(os.stat(self.path).st_mode)
+        except FileNotFoundError:
+            return 0o666 & ~_UMASK
+
+    def discard(self) -> None:
+        """Supprime le fichier temporaire sans toucher au fichier cible."""
+        if not self._file.closed:
+            self._file.close()
+        if os.path.exists(self.temp_path):
+            os.remove(self.temp_path)
+
+
+def is_test_file(path: str) -> bool:
+    """Fichier collecté par pytest par défaut (test_*.py ou *_test.py)."""
+    name = os.path.basename(path)
+    return name.endswith(".py") and (name.startswith("test_") or name.endswith("_test.py"))
+
+
+def find_python_files(target_dir: str) -> list:
+    """
+    Liste les fichiers Python à traiter dans target_dir (récursif).
+
+    Les fichiers de test (is_test_file) sont ignorés : ils servent au Judge.
+    """
+    python_files = []
+
+    for root, _, files in os.walk(target_dir):
+        for file in files:
+            if file.endswith(".py") and not is_test_file(file):
+                python_files.append(os.path.join(root, file))
+
+    return python_files
@@ -0,0 +1,319 @@
+"""
+Mémoire des corrections validées, retrouvées par similarité de fonctions
+Persistante entre les runs, à côté du fichier de logs
+
+Quand un fichier est validé, chaque fonction modifiée par la correction est
+gardée (avant / après). Avant un appel au Correcteur, les fonctions du code
+à corriger sont comparées à cette mémoire : les corrections de fonctions
+quasi identiques sont jointes au prompt comme exemples.
+
+Empreinte d'une fonction :
+- AST normalisé : identifiants renommés dans l'ordre d'apparition (v0, v1...),
+  docstrings et textes des chaînes retirés ; les attributs et les nombres
+  restent (ils portent la logique)
+- un hash par sous-arbre (calculé de bas en haut, linéaire en taille)
+- MinHash sur cet ensemble : la part de composantes égales estime la
+  similarité de Jaccard entre deux fonctions
+
+La recherche passe par des buckets LSH (bandes de la signature) : seules
+les entrées qui partagent au moins une bande sont comparées.
+
+Stockage : logs/fix_memory.json, réécrit de façon atomique.
+"""
+
+import ast
+import hashlib
+import json
+import os
+import random
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+
+from src.utils import logger
+
+MEMORY_VERSION = 1
+
+# MinHash : NUM_PERM composantes, découpées en BANDS bandes pour le LSH
+NUM_PERM = 64
+BANDS = 16
+_ROWS = NUM_PERM // BANDS
+_PRIME = (1 << 61) - 1
+_rng = random.Random(20261018)
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+# Similarité minimale d'un exemple, taille minimale d'une fonction (sous-arbres)
+DEFAULT_THRESHOLD = 0.8
+MIN_SHINGLES = 8
+# Entrées gardées (les plus anciennes sont oubliées)
+MAX_ENTRIES = 2000
+
+
+def default_memory_file() -> str:
+    """Fichier de la mémoire, toujours à côté du fichier de logs."""
+    return os.path.join(os.path.dirname(logger.LOG_FILE) or ".", "fix_memory.json")
+
+
+class _Normalizer(ast.NodeTransformer):
+    """Renomme les identifiants dans l'ordre d'apparition, retire docstrings et textes."""
+
+    def __init__(self):
+        self.names: Dict[str, str] = {}
+
+    def _rename(self, name: str) -> str:
+        return self.names.setdefault(name, f"v{len(self.names)}")
+
+    def visit_Name(self, node):
+        node.id = self._rename(node.id)
+        return node
+
+    def visit_arg(self, node):
+        node.arg = self._rename(node.arg)
+        node.annotation = None
+        return node
+
+    def _visit_definition(self, node):
+        node.name = self._rename(node.name)
+        body = node.body
+        if body and isinstance(body[0], ast.Expr) and isinstance(getattr(body[0], "value", None), ast.Constant) \
+                and isinstance(body[0].value.value, str):
+            node.body = body[1:] or [ast.Pass()]
+        self.generic_visit(node)
+        return node
+
+    visit_FunctionDef = _visit_definition
+    visit_AsyncFunctionDef = _visit_definition
+    visit_ClassDef = _visit_definition
+
+    def visit_Constant(self, node):
+        if isinstance(node.value, str):
+            node.value = ""
+        return node
+
+
+def _subtree_hashes(node: ast.AST, out: List[int]) -> int:
+    """Hash de chaque sous-arbre (ajoutés à `out`), retourne celui de `node`."""
+    parts = [type(node).__name__]
+    for field, value in ast.iter_fields(node):
+        if field in ("ctx", "type_comment"):
+            continue
+        items = value if isinstance(value, list) else [value]
+        for item in items:
+            if isinstance(item, ast.AST):
+                parts.append(str(_subtree_hashes(item, out)))
+            else:
+                parts.append(repr(item))
+    digest = int.from_bytes(hashlib.blake2b("|".join(parts).encode("utf-8"), digest_size=8).digest(), "big")
+    out.append(digest)
+    return digest
+
+
+def shingles(function_node: ast.AST) -> Set[int]:
+    """Ensemble des hashes de sous-arbres de la fonction normalisée."""
+    tree = _Normalizer().visit(ast.parse(ast.unparse(function_node)))
+    out: List[int] = []
+    for statement in tree.body:
+        _subtree_hashes(statement, out)
+    return set(out)
+
+
+def minhash(values: Set[int]) -> Tuple[int, ...]:
+    """Signature MinHash (NUM_PERM composantes) d'un ensemble non vide."""
+    return tuple(min((a * value + b) % _PRIME for value in values) for a, b in _PERMUTATIONS)
+
+
+def similarity(first: Tuple[int, ...], second: Tuple[int, ...]) -> float:
+    """Estimation de la similarité de Jaccard entre deux signatures."""
+    return sum(1 for x, y in zip(first, second) if x == y) / NUM_PERM
+
+
+def _bands(signature: Tuple[int, ...]) -> List[Tuple]:
+    return [(index,) + tuple(signature[index * _ROWS:(index + 1) * _ROWS]) for index in range(BANDS)]
+
+
+def extract_functions(source: str) -> Dict[str, ast.AST]:
+    """
+    Fonctions de premier niveau et méthodes d'un module.
+
+    Returns:
+        dict: nom qualifié (Classe.methode) -> nœud (vide si le code ne parse pas)
+    """
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return {}
+
+    functions: Dict[str, ast.AST] = {}
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            functions[node.name] = node
+        elif isinstance(node, ast.ClassDef):
+            for item in node.body:
+                if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    functions[f"{node.name}.{item.name}"] = item
+    return functions
+
+
+class FixMemory:
+    """
+    Corrections validées, indexées par empreinte MinHash de la fonction avant correction.
+
+    Usage:
+        memory = FixMemory.load()
+        memory.record(original_code, fixed_code, file_path)
+        examples = memory.similar(code_to_fix)
+        memory.save()
+    """
+
+    def __init__(self, memory_file: Optional[str] = None, threshold: float = DEFAULT_THRESHOLD):
+        self.memory_file = memory_file or default_memory_file()
+        self.threshold = threshold
+        self.entries: List[dict] = []
+        self.stats = {"recorded": 0, "lookups": 0, "hits": 0}
+        self._buckets: Dict[Tuple, Set[int]] = {}
+        self._offset = 0  # entrées oubliées avant self.entries[0]
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, memory_file: Optional[str] = None, threshold: float = DEFAULT_THRESHOLD) -> "FixMemory":
+        """Charge la mémoire depuis le disque (vide si absente, illisible ou d'une autre version)."""
+        memory = cls(memory_file, threshold)
+        try:
+            with open(memory.memory_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return memory
+
+        if data.get("version") == MEMORY_VERSION:
+            for entry in data.get("entries", []):
+                memory._add({**entry, "signature": tuple(entry["signature"])})
+        return memory
+
+    def save(self) -> None:
+        """Écrit la mémoire (fichier temporaire puis os.replace)."""
+        parent_dir = os.path.dirname(self.memory_file)
+        if parent_dir:
+            os.makedirs(parent_dir, exist_ok=True)
+
+        with self._lock:
+            data = {"version": MEMORY_VERSION,
+                    "entries": [{**entry, "signature": list(entry["signature"])} for entry in self.entries]}
+            tmp_path = f"{self.memory_file}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.memory_file)
+
+    def _add(self, entry: dict) -> None:
+        """Ajoute une entrée (verrou pris par l'appelant ou pas encore partagé)."""
+        entry_id = self._offset + len(self.entries)
+        self.entries.append(entry)
+        for band in _bands(entry["signature"]):
+            self._buckets.setdefault(band, set()).add(entry_id)
+
+        if len(self.entries) > MAX_ENTRIES:
+            oldest = self.entries.pop(0)
+            for band in _bands(oldest["signature"]):
+                bucket = self._buckets.get(band)
+                if bucket is not None:
+                    bucket.discard(self._offset)
+                    if not bucket:
+                        del self._buckets[band]
+            self._offset += 1
+
+    def record(self, original_code: str, fixed_code: str, file_path: str) -> int:
+        """
+        Garde les fonctions modifiées par une correction validée.
+
+        Returns:
+            int: Nombre de fonctions ajoutées
+        """
+        before = extract_functions(original_code)
+        after = extract_functions(fixed_code)
+        added = 0
+
+        for name, node in before.items():
+            fixed_node = after.get(name)
+            if fixed_node is None or ast.dump(node) == ast.dump(fixed_node):
+                continue
+            values = shingles(node)
+            if len(values) < MIN_SHINGLES:
+                continue
+            entry = {
+                "file": os.path.basename(file_path),
+                "name": name,
+                "before": ast.get_source_segment(original_code, node) or ast.unparse(node),
+                "after": ast.get_source_segment(fixed_code, fixed_node) or ast.unparse(fixed_node),
+                "signature": minhash(values),
+            }
+            with self._lock:
+                self._add(entry)
+                self.stats["recorded"] += 1
+            added += 1
+
+        return added
+
+    def similar(self, code: str, limit: int = 2) -> List[dict]:
+        """
+        Corrections de fonctions quasi identiques à celles de `code`.
+
+        Returns:
+            list: [{"name", "file", "before", "after", "similarity", "matches"}], la
+            meilleure entrée par fonction de `code`, par similarité décroissante
+        """
+        found: List[dict] = []
+        for name, node in extract_functions(code).items():
+            values = shingles(node)
+            if len(values) < MIN_SHINGLES:
+                continue
+            signature = minhash(values)
+            source = ast.get_source_segment(code, node)
+
+            with self._lock:
+                self.stats["lookups"] += 1
+                candidates: Set[int] = set()
+                for band in _bands(signature):
+                    candidates |= self._buckets.get(band, set())
+                entries = [self.entries[entry_id - self._offset] for entry_id in candidates]
+
+            best = None
+            for entry in entries:
+                # Une fonction déjà sous sa forme corrigée n'a rien à apprendre de l'exemple
+                if entry["after"] == source:
+                    continue
+                score = similarity(signature, entry["signature"])
+                if score >= self.threshold and (best is None or score > best["similarity"]):
+                    best = {**entry, "similarity": score, "matches": name}
+            if best is not None:
+                del best["signature"]
+                found.append(best)
+
+        found.sort(key=lambda example: -example["similarity"])
+        if found:
+            with self._lock:
+                self.stats["hits"] += min(len(found), limit)
+        return found[:limit]
+
+
+_memory: Optional[FixMemory] = None
+
+
+def configure_fix_memory(memory: Optional[FixMemory]) -> None:
+    """Mémoire consultée avant chaque correction pour ce run (None : aucun exemple)."""
+    global _memory
+    _memory = memory
+
+
+def find_similar_fixes(code: str, limit: int = 2) -> List[dict]:
+    """Exemples de corrections pour `code` (liste vide sans mémoire configurée)."""
+    memory = _memory
+    if memory is None:
+        return []
+    return memory.similar(code, limit)
+
+
+def get_fix_memory_stats() -> dict:
+    """Compteurs de la mémoire (vide si inactive)."""
+    memory = _memory
+    if memory is None:
+        return {"enabled": False}
+    with memory._lock:
+        return {"enabled": True, "entries": len(memory.entries), **memory.stats}
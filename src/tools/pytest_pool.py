@@ -0,0 +1,276 @@
+"""
+Pool de workers pytest préchargés
+Évite de relancer un interpréteur et de réimporter pytest à chaque test
+
+Chaque worker est un processus issu du forkserver de multiprocessing, dans
+lequel pytest est déjà importé (set_forkserver_preload). Un worker exécute
+pytest.main() pour chaque demande, puis retire de sys.modules les modules
+chargés par la demande (code testé, fichiers de test, conftest) : la demande
+suivante relit les fichiers modifiés par le Correcteur. Les modules de la
+bibliothèque standard et des site-packages restent chargés.
+
+Garde-fous :
+- échéance stricte par demande : le worker est tué au-delà du timeout
+  (subprocess.TimeoutExpired, comme subprocess.run)
+- un worker mort (os._exit, crash) est remplacé et la demande rejouée dans
+  un processus pytest classique
+- un worker est recyclé après max_tasks demandes (fuites d'état)
+- si un worker meurt avant sa première demande (ex: module __main__ non
+  réimportable), le pool est abandonné pour le reste du run
+
+Sans forkserver (Windows) ou si le pool est désactivé, chaque demande lance
+un processus `pytest` comme avant.
+"""
+
+import atexit
+import contextlib
+import io
+import multiprocessing
+import os
+import queue
+import subprocess
+import sys
+import sysconfig
+import threading
+import traceback
+from typing import List, Optional
+
+# Code de sortie pytest "erreur interne"
+_INTERNAL_ERROR = 3
+
+
+# --- Côté worker ---------------------------------------------------------------
+
+def _library_roots() -> tuple:
+    paths = sysconfig.get_paths()
+    roots = {paths.get(key) for key in ("stdlib", "platstdlib", "purelib", "platlib")}
+    return tuple(os.path.abspath(root) for root in roots if root)
+
+
+def _is_library_module(module, roots: tuple) -> bool:
+    path = getattr(module, "__file__", None)
+    return bool(path) and os.path.abspath(path).startswith(roots)
+
+
+def _run_in_worker(args: List[str], baseline: set, roots: tuple) -> dict:
+    """Un pytest.main() isolé : sys.modules, sys.path et dossier courant restaurés."""
+    import pytest
+
+    saved_path = list(sys.path)
+    saved_cwd = os.getcwd()
+    stdout, stderr = io.StringIO(), io.StringIO()
+    try:
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            returncode = int(pytest.main(list(args)))
+    except BaseException:
+        stderr.write(traceback.format_exc())
+        returncode = _INTERNAL_ERROR
+    finally:
+        for name in [name for name in sys.modules if name not in baseline]:
+            if not _is_library_module(sys.modules[name], roots):
+                del sys.modules[name]
+        sys.path[:] = saved_path
+        os.chdir(saved_cwd)
+    return {"stdout": stdout.getvalue(), "stderr": stderr.getvalue(), "returncode": returncode}
+
+
+def _worker_main(conn) -> None:
+    """Boucle d'un worker : une liste d'arguments pytest par message, None pour arrêter."""
+    import pytest
+
+    # Premier appel à vide : charge les plugins avant de figer la référence
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        pytest.main(["--version"])
+    baseline = set(sys.modules)
+    roots = _library_roots()
+
+    while True:
+        try:
+            args = conn.recv()
+        except EOFError:
+            break
+        if args is None:
+            break
+        conn.send(_run_in_worker(args, baseline, roots))
+
+
+# --- Côté orchestrateur --------------------------------------------------------
+
+class _Worker:
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn,), daemon=True,
+                                       name="pytest-worker")
+        self.process.start()
+        child_conn.close()
+        self.tasks = 0
+
+    def kill(self) -> None:
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(timeout=5)
+        self.conn.close()
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout=2)
+        self.kill()
+
+
+class PytestPool:
+    """
+    Workers pytest réutilisables, partagés par les threads de l'orchestrateur.
+
+    Args:
+        max_workers (int): Nombre maximum de workers (créés à la demande)
+        max_tasks (int): Demandes traitées par un worker avant son remplacement
+    """
+
+    def __init__(self, max_workers: int = 1, max_tasks: int = 100):
+        self.max_workers = max(1, max_workers)
+        self.max_tasks = max_tasks
+        self._context = multiprocessing.get_context("forkserver")
+        self._context.set_forkserver_preload(["pytest"])
+        self._idle: "queue.LifoQueue[_Worker]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._workers: List[_Worker] = []
+        self.stats = {"tasks": 0, "timeouts": 0, "crashes": 0, "recycled": 0}
+        self.broken = False
+
+    def _acquire(self) -> _Worker:
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            with self._lock:
+                if len(self._workers) < self.max_workers:
+                    worker = _Worker(self._context)
+                    self._workers.append(worker)
+                    return worker
+            # Tous occupés : attente courte, un worker tué libère aussi une place
+            try:
+                return self._idle.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+    def _discard(self, worker: _Worker, reason: str) -> None:
+        worker.kill()
+        with self._lock:
+            self._workers.remove(worker)
+            self.stats[reason] += 1
+
+    def _release(self, worker: _Worker) -> None:
+        worker.tasks += 1
+        if worker.tasks >= self.max_tasks:
+            worker.stop()
+            with self._lock:
+                self._workers.remove(worker)
+                self.stats["recycled"] += 1
+            return
+        self._idle.put(worker)
+
+    def run(self, args: List[str], timeout: float) -> subprocess.CompletedProcess:
+        """
+        Exécute `pytest <args>` dans un worker.
+
+        Raises:
+            subprocess.TimeoutExpired: Pas de résultat avant `timeout` secondes
+        """
+        command = ["pytest", *args]
+        worker = self._acquire()
+        with self._lock:
+            self.stats["tasks"] += 1
+
+        try:
+            worker.conn.send(list(args))
+            if not worker.conn.poll(timeout):
+                self._discard(worker, "timeouts")
+                raise subprocess.TimeoutExpired(command, timeout)
+            result = worker.conn.recv()
+        except (EOFError, OSError, BrokenPipeError):
+            # Worker mort pendant la demande : rejouée dans un processus dédié.
+            # Mort avant sa première demande : les workers ne démarrent pas
+            # dans ce contexte, le pool n'est plus utilisé.
+            if worker.tasks == 0:
+                self.broken = True
+            self._discard(worker, "crashes")
+            return _run_subprocess(args, timeout)
+
+        self._release(worker)
+        return subprocess.CompletedProcess(command, result["returncode"],
+                                           result["stdout"], result["stderr"])
+
+    def close(self) -> None:
+        with self._lock:
+            workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.stop()
+
+
+def _run_subprocess(args: List[str], timeout: float) -> subprocess.CompletedProcess:
+    return subprocess.run(["pytest", *args], capture_output=True, text=True,
+                          check=False, timeout=timeout)
+
+
+_pool: Optional[PytestPool] = None
+_pool_enabled = "forkserver" in multiprocessing.get_all_start_methods()
+_pool_size = 1
+_pool_lock = threading.Lock()
+
+
+def configure_pytest_pool(enabled: bool = True, max_workers: int = 1) -> None:
+    """
+    Active ou désactive le pool (désactivé d'office sans forkserver) et fixe
+    sa taille ; le pool existant est arrêté, le suivant est créé à la demande.
+    """
+    global _pool_enabled, _pool_size
+    shutdown_pytest_pool()
+    _pool_enabled = enabled and "forkserver" in multiprocessing.get_all_start_methods()
+    _pool_size = max(1, max_workers)
+
+
+def _get_pool() -> Optional[PytestPool]:
+    global _pool
+    if not _pool_enabled:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = PytestPool(max_workers=_pool_size)
+        return _pool
+
+
+def run_pytest_command(args: List[str], timeout: float) -> subprocess.CompletedProcess:
+    """
+    Exécute pytest avec `args`, dans le pool s'il est actif, sinon dans un
+    nouveau processus. Même résultat et mêmes exceptions que subprocess.run.
+    """
+    pool = _get_pool()
+    if pool is None or pool.broken:
+        return _run_subprocess(args, timeout)
+    return pool.run(args, timeout)
+
+
+def get_pytest_pool_stats() -> dict:
+    """Compteurs du pool (vide si inactif ou pas encore créé)."""
+    with _pool_lock:
+        pool = _pool
+    if pool is None:
+        return {"enabled": _pool_enabled}
+    with pool._lock:
+        return {"enabled": True, "workers": len(pool._workers), **pool.stats}
+
+
+def shutdown_pytest_pool() -> None:
+    """Arrête les workers du pool."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.close()
+
+
+atexit.register(shutdown_pytest_pool)
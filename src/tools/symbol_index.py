@@ -0,0 +1,199 @@
+"""
+Index des symboles du projet (classes, fonctions, signatures, docstrings)
+Persistant entre les runs, mis à jour fichier par fichier selon le hash du contenu
+
+Pour chaque module du dossier cible, l'index garde :
+- les classes (bases, méthodes publiques), fonctions et constantes de premier niveau
+- leur signature compacte et la première ligne de leur docstring
+
+Les prompts n'embarquent ainsi que les signatures des symboles réellement
+référencés par le fichier traité, jamais les fichiers entiers.
+
+Stockage : logs/symbol_index.json (à côté du fichier de logs), réécrit de
+façon atomique.
+"""
+
+import ast
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Set
+
+from src.utils import logger
+
+INDEX_VERSION = 1
+
+
+def default_index_file() -> str:
+    """Fichier de l'index, toujours à côté du fichier de logs."""
+    return os.path.join(os.path.dirname(logger.LOG_FILE) or ".", "symbol_index.json")
+
+
+def _first_doc_line(node) -> str:
+    doc = ast.get_docstring(node)
+    if not doc:
+        return ""
+    return doc.strip().splitlines()[0].strip()
+
+
+def _function_signature(node, indent: str = "") -> str:
+    prefix = "async def" if isinstance(node, ast.AsyncFunctionDef) else "def"
+    returns = f" -> {ast.unparse(node.returns)}" if node.returns is not None else ""
+    return f"{indent}{prefix} {node.name}({ast.unparse(node.args)}){returns}"
+
+
+def extract_symbols(tree: ast.Module) -> Dict[str, dict]:
+    """
+    Symboles de premier niveau d'un module.
+
+    Returns:
+        dict: nom -> {"kind", "signature", "doc", "line"}
+    """
+    symbols: Dict[str, dict] = {}
+
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            symbols[node.name] = {
+                "kind": "function",
+                "signature": _function_signature(node),
+                "doc": _first_doc_line(node),
+                "line": node.lineno,
+            }
+        elif isinstance(node, ast.ClassDef):
+            bases = ", ".join(ast.unparse(base) for base in node.bases)
+            lines = [f"class {node.name}({bases})" if bases else f"class {node.name}"]
+            for item in node.body:
+                if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)) and (
+                    not item.name.startswith("_") or item.name == "__init__"
+                ):
+                    lines.append(_function_signature(item, indent="    "))
+            symbols[node.name] = {
+                "kind": "class",
+                "signature": "\n".join(lines),
+                "doc": _first_doc_line(node),
+                "line": node.lineno,
+            }
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            for target in targets:
+                if isinstance(target, ast.Name) and target.id.isupper():
+                    symbols[target.id] = {
+                        "kind": "constant",
+                        "signature": f"{target.id} = ...",
+                        "doc": "",
+                        "line": node.lineno,
+                    }
+
+    return symbols
+
+
+class SymbolIndex:
+    """
+    Index persistant : chemin absolu du module -> hash du contenu et symboles.
+
+    Usage:
+        index = SymbolIndex.load()
+        index.update(paths)
+        entries = index.lookup({dep_path: {"User"}, other_dep: None})
+        index.save()
+    """
+
+    def __init__(self, index_file: Optional[str] = None):
+        self.index_file = index_file or default_index_file()
+        self.modules: Dict[str, dict] = {}
+        self.reparsed = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, index_file: Optional[str] = None) -> "SymbolIndex":
+        """Charge l'index depuis le disque (index vide si absent, illisible ou d'une autre version)."""
+        index = cls(index_file)
+        try:
+            with open(index.index_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return index
+
+        if data.get("version") == INDEX_VERSION:
+            index.modules = data.get("modules", {})
+        return index
+
+    def save(self) -> None:
+        """Écrit l'index (fichier temporaire puis os.replace)."""
+        parent_dir = os.path.dirname(self.index_file)
+        if parent_dir:
+            os.makedirs(parent_dir, exist_ok=True)
+
+        with self._lock:
+            data = {"version": INDEX_VERSION, "modules": self.modules}
+            tmp_path = f"{self.index_file}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.index_file)
+
+    def update(self, paths: Iterable[str]) -> int:
+        """
+        Met à jour l'index pour ces fichiers ; seuls ceux dont le contenu a changé sont reparsés.
+
+        Returns:
+            int: Nombre de fichiers reparsés
+        """
+        reparsed = 0
+        for path in paths:
+            key = os.path.abspath(path)
+            try:
+                with open(path, "r", encoding="utf-8", errors="replace") as f:
+                    source = f.read()
+            except OSError:
+                with self._lock:
+                    self.modules.pop(key, None)
+                continue
+
+            digest = hashlib.sha256(source.encode("utf-8")).hexdigest()
+            with self._lock:
+                cached = self.modules.get(key)
+            if cached is not None and cached["hash"] == digest:
+                continue
+
+            try:
+                symbols = extract_symbols(ast.parse(source, filename=path))
+            except (SyntaxError, ValueError):
+                # Fichier invalide : on garde ses anciens symboles, on les reprendra plus tard
+                continue
+
+            with self._lock:
+                self.modules[key] = {"hash": digest, "symbols": symbols}
+            reparsed += 1
+
+        self.reparsed += reparsed
+        return reparsed
+
+    def symbols(self, path: str) -> Dict[str, dict]:
+        """Symboles indexés d'un module (dict vide si inconnu)."""
+        with self._lock:
+            entry = self.modules.get(os.path.abspath(path))
+        return dict(entry["symbols"]) if entry else {}
+
+    def lookup(self, references: Dict[str, Optional[Set[str]]]) -> List[dict]:
+        """
+        Symboles référencés, module par module (les dépendances sont rafraîchies avant lecture).
+
+        Args:
+            references (dict): chemin du module -> noms utilisés (None = tous les noms publics)
+
+        Returns:
+            list: [{"path", "name", "kind", "signature", "doc"}] dans l'ordre des modules puis des lignes
+        """
+        self.update(references.keys())
+
+        found: List[dict] = []
+        for path, names in references.items():
+            symbols = self.symbols(path)
+            for name, symbol in sorted(symbols.items(), key=lambda item: item[1]["line"]):
+                if names is None and name.startswith("_"):
+                    continue
+                if names is not None and name not in names:
+                    continue
+                found.append({"path": path, "name": name, **symbol})
+        return found
@@ -0,0 +1,118 @@
+"""
+Sélection des tests impactés pour le Judge
+Construit une fois par run, à partir du graphe des imports (sans exécuter le code)
+
+Un fichier de test est impacté par un module s'il l'importe directement. Le
+Judge exécute le fichier corrigé (ses propres tests éventuels) et ces seuls
+tests, au lieu de dépendre de la taille de la suite. Les importeurs
+indirects ne sont pas retenus : un test qui passe par un autre module du
+projet échoue aussi sur les bugs de ce module (pas encore corrigé, ou en
+cours de correction par un autre worker), et ferait rejeter un fichier juste.
+
+Garde-fou : la suite complète est exécutée une fois, après le traitement de
+tous les fichiers (imports dynamiques, fixtures partagées, graphe devenu
+obsolète après une correction qui ajoute un import). Son résultat est
+rapporté dans le résumé du run, sans changer le statut des fichiers.
+"""
+
+import os
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+
+from src.tools.dependency_graph import ImportGraph
+from src.tools.file_tools import is_test_file
+
+# Délai de l'exécution complète (la suite entière, pas un seul fichier)
+FULL_RUN_TIMEOUT = 600
+
+
+def find_test_files(target_dir: str) -> List[str]:
+    """Fichiers de test de target_dir (récursif, ordre stable)."""
+    test_files = []
+    for root, dirs, files in os.walk(target_dir):
+        dirs.sort()
+        for file in sorted(files):
+            if is_test_file(file):
+                test_files.append(os.path.join(root, file))
+    return test_files
+
+
+class TestImpactIndex:
+    """
+    Module du projet -> fichiers de test qui l'importent directement.
+
+    Args:
+        root (str): Dossier cible
+        source_files (list): Modules traités par le run
+    """
+
+    __test__ = False  # pas une classe de test pour pytest
+
+    def __init__(self, root: str, source_files: List[str]):
+        self.root = root
+        self.test_files = find_test_files(root)
+        self.stats = {"selections": 0, "no_impacted_tests": 0, "tests_selected": 0}
+        self._lock = threading.Lock()
+
+        graph = ImportGraph(root, list(source_files) + self.test_files)
+        self.importers: Dict[str, List[str]] = {}
+        for test in self.test_files:
+            for dep in graph.dependencies.get(test, ()):
+                if dep != test:
+                    self.importers.setdefault(dep, []).append(test)
+
+    def impacted_tests(self, path: str) -> List[str]:
+        """Fichiers de test qui importent `path` directement."""
+        return list(self.importers.get(path, []))
+
+    def select(self, path: str) -> Tuple[List[str], str]:
+        """
+        Chemins à passer à pytest pour juger `path`.
+
+        Returns:
+            tuple: (chemins, raison) avec raison "impact" ou "self" (aucun test
+            n'importe le fichier)
+        """
+        tests = self.impacted_tests(path)
+        with self._lock:
+            self.stats["selections"] += 1
+            if not tests:
+                self.stats["no_impacted_tests"] += 1
+            self.stats["tests_selected"] += len(tests)
+
+        return [path] + tests, "impact" if tests else "self"
+
+    def existing_test_files(self) -> List[str]:
+        """Fichiers de test encore présents (exécution complète de fin de run)."""
+        return [test for test in self.test_files if os.path.exists(test)]
+
+
+_index: Optional[TestImpactIndex] = None
+
+
+def configure_test_impact(index: Optional[TestImpactIndex]) -> None:
+    """Index utilisé par le Judge pour ce run (None : pytest sur le seul fichier jugé)."""
+    global _index
+    _index = index
+
+
+def select_tests(path: str) -> Tuple[Optional[List[str]], str]:
+    """
+    Tests à exécuter pour juger `path`.
+
+    Returns:
+        tuple: (chemins, raison), ou (None, "disabled") sans index configuré
+    """
+    index = _index
+    if index is None:
+        return None, "disabled"
+    return index.select(path)
+
+
+def get_test_impact_stats() -> dict:
+    """Compteurs de la sélection (vide si inactive)."""
+    index = _index
+    if index is None:
+        return {"enabled": False}
+    with index._lock:
+        return {"enabled": True, "test_files": len(index.test_files), **index.stats}
@@ -3,6 +3,6 @@ Package utils pour le Refactoring Swarm
 Créé par: Data Officer
 """
 
-from .logger import log_experiment, ActionType
+from .logger import log_experiment, ActionType, read_experiment_log, export_experiment_log
 
-__all__ = ['log_experiment', 'ActionType']
\ No newline at end of file
+__all__ = ['log_experiment', 'ActionType', 'read_experiment_log', 'export_experiment_log']
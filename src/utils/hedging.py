@@ -0,0 +1,212 @@
+"""
+Requêtes LLM couvertes (hedging) contre la latence de queue
+Optionnel : désactivé tant que configure_hedging() n'a pas été appelé
+(--hedge_percentile dans la CLI)
+
+Principe : si un appel n'a pas répondu après le percentile p de la latence
+observée pour cet agent, une copie de la requête est envoyée et la première
+réponse est gardée. La copie n'est envoyée que si :
+- l'agent est couvert (Auditeur, Correcteur et appel combiné par défaut : le
+  Testeur est court)
+- l'histogramme de l'agent a assez d'échantillons pour estimer le percentile
+- le rate limiter a un créneau libre sans attente (try_acquire_rate_limit)
+- les copies restent sous une fraction des appels (max_extra_fraction)
+
+L'appel perdant n'est pas annulé (le SDK ne le permet pas) : sa réponse est
+ignorée.
+
+Les appels passent par un pool de threads dimensionné selon le nombre de
+fichiers traités en parallèle (configure_hedging(policy, workers)). Le délai
+avant la copie court à partir du démarrage effectif de l'appel principal :
+une attente dans la file du pool ne déclenche pas de copie.
+
+Les appels en streaming (Correcteur, stream_content) ne sont pas couverts.
+"""
+
+import contextvars
+import math
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, Optional, Tuple
+
+from src.utils.rate_limiter import try_acquire_rate_limit
+from src.utils.tracing import span
+
+
+@dataclass
+class HedgePolicy:
+    """Paramètres du hedging."""
+    percentile: float = 95.0
+    min_samples: int = 20
+    max_extra_fraction: float = 0.1
+    agents: Tuple[str, ...] = ("Auditor_Agent", "Fixer_Agent", "AuditFix_Agent")
+
+
+class LatencyHistogram:
+    """Dernières latences d'un agent (fenêtre glissante), pour estimer un percentile."""
+
+    def __init__(self, window: int = 500):
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._samples)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Percentile p (0-100) par rang le plus proche, None sans échantillon."""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        rank = min(max(math.ceil(p / 100.0 * len(samples)) - 1, 0), len(samples) - 1)
+        return samples[rank]
+
+
+_policy: Optional[HedgePolicy] = None
+_histograms: Dict[str, LatencyHistogram] = {}
+_lock = threading.Lock()
+_stats = {"calls": 0, "hedged": 0, "hedge_wins": 0, "skipped_budget": 0}
+# Threads par fichier traité en parallèle (appel principal + copie), et marge
+# pour les requêtes perdantes qui se terminent en arrière-plan
+THREADS_PER_WORKER = 2
+SPARE_THREADS = 4
+
+
+def _new_executor(workers: int) -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=THREADS_PER_WORKER * max(1, workers) + SPARE_THREADS,
+                              thread_name_prefix="hedge")
+
+
+# Threads des requêtes : la requête perdante peut s'y terminer en arrière-plan
+_executor = _new_executor(1)
+
+
+def configure_hedging(policy: Optional[HedgePolicy], workers: int = 1) -> None:
+    """
+    Active (policy) ou désactive (None) le hedging pour tout le processus.
+
+    Args:
+        policy (HedgePolicy): Paramètres, None pour désactiver
+        workers (int): Fichiers traités en parallèle (taille du pool de threads)
+    """
+    global _policy, _executor
+    _policy = policy
+    previous, _executor = _executor, _new_executor(workers)
+    # Les requêtes en cours se terminent, leurs threads sont ensuite libérés
+    previous.shutdown(wait=False)
+
+
+def histogram(agent: str) -> LatencyHistogram:
+    """Histogramme des latences d'un agent (créé au premier appel)."""
+    with _lock:
+        return _histograms.setdefault(agent, LatencyHistogram())
+
+
+def record_latency(agent: str, seconds: float) -> None:
+    """Alimente l'histogramme de l'agent (appelé pour chaque réponse reçue)."""
+    histogram(agent).record(seconds)
+
+
+def _count(key: str) -> None:
+    with _lock:
+        _stats[key] += 1
+
+
+def _hedge_delay(agent: str) -> Optional[float]:
+    """Délai avant la copie, None si l'agent ne doit pas être couvert."""
+    policy = _policy
+    if policy is None or agent not in policy.agents:
+        return None
+    agent_histogram = histogram(agent)
+    if len(agent_histogram) < policy.min_samples:
+        return None
+    return agent_histogram.percentile(policy.percentile)
+
+
+def _within_budget() -> bool:
+    with _lock:
+        allowed = _stats["hedged"] < _policy.max_extra_fraction * max(_stats["calls"], 1)
+    return allowed and try_acquire_rate_limit()
+
+
+def _submit(call: Callable):
+    return _executor.submit(contextvars.copy_context().run, call)
+
+
+def hedged_call(call: Callable, agent: str):
+    """
+    Exécute `call`, en envoyant une copie si la réponse tarde.
+
+    Args:
+        call: Fonction sans argument (l'appel au modèle)
+        agent (str): Agent appelant (choisit l'histogramme de latence)
+
+    Returns:
+        Le résultat du premier appel réussi
+    """
+    _count("calls")
+    delay = _hedge_delay(agent)
+    if delay is None:
+        return call()
+
+    started = threading.Event()
+
+    def run_primary():
+        started.set()
+        return call()
+
+    primary = _submit(run_primary)
+    # Le délai court à partir du démarrage de l'appel, pas de sa mise en file
+    started.wait()
+    done, _ = wait([primary], timeout=delay)
+    if done:
+        return primary.result()
+
+    if not _within_budget():
+        _count("skipped_budget")
+        return primary.result()
+
+    _count("hedged")
+    with span("hedge", kind="hedge", agent=agent, delay_seconds=round(delay, 3)) as current:
+        hedge = _submit(call)
+        pending = {primary, hedge}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    winner = "hedge" if future is hedge else "primary"
+                    current.set(winner=winner)
+                    if winner == "hedge":
+                        _count("hedge_wins")
+                    return future.result()
+                error = future.exception()
+        # Les deux appels ont échoué : la reprise (src.utils.resilience) décide
+        raise error
+
+
+def get_hedging_stats() -> dict:
+    """Compteurs du hedging et percentile courant par agent."""
+    with _lock:
+        stats = dict(_stats)
+        agents = dict(_histograms)
+    stats["enabled"] = _policy is not None
+    if _policy is not None:
+        stats["thresholds"] = {
+            agent: agent_histogram.percentile(_policy.percentile)
+            for agent, agent_histogram in agents.items()
+        }
+    return stats
+
+
+def reset_hedging() -> None:
+    """Remet à zéro les compteurs (les histogrammes sont conservés)."""
+    with _lock:
+        _stats.update(calls=0, hedged=0, hedge_wins=0, skipped_budget=0)
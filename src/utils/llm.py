@@ -0,0 +1,191 @@
+"""
+Appels au modèle Gemini
+Point de passage unique des agents vers generate_content
+
+Centralise ce qui doit entourer chaque appel LLM (traçage, tokens,
+reprise des erreurs transitoires...) pour que les trois agents se
+comportent de la même façon.
+"""
+
+import inspect
+import time
+from functools import lru_cache
+from typing import Callable, Optional, Tuple
+
+from src.utils.hedging import hedged_call, record_latency
+from src.utils.rate_limiter import wait_for_rate_limit
+from src.utils.resilience import RetryPolicy, call_with_retry
+from src.utils.tracing import span, record_llm_usage
+
+
+@lru_cache(maxsize=8)
+def _accepts_request_options(model_class: type) -> bool:
+    # request_options (timeout par appel) n'existe que dans les SDK récents
+    try:
+        return "request_options" in inspect.signature(model_class.generate_content).parameters
+    except (AttributeError, TypeError, ValueError):
+        return False
+
+
+def _set_prompt_stats(current, prompt_stats: Optional[dict]) -> None:
+    if prompt_stats:
+        current.set(
+            prompt_tokens_estimated=prompt_stats["prompt_tokens"],
+            prompt_tokens_saved=prompt_stats["saved_tokens"],
+            over_budget=prompt_stats["over_budget"],
+        )
+
+
+def _chunk_text(chunk) -> str:
+    # Un morceau sans texte (fin de génération, blocage) lève ValueError dans le SDK
+    try:
+        return chunk.text
+    except ValueError:
+        return ""
+
+
+def _cancel_stream(response) -> bool:
+    """
+    Interrompt un flux abandonné, pour que le serveur arrête la génération.
+
+    google-generativeai 0.3.2 n'expose pas d'annulation publique : le flux
+    gRPC est dans response._iterator (cancel()), un générateur se ferme
+    avec close(). Sans l'un ou l'autre, rien n'est interrompu.
+
+    Returns:
+        bool: True si le flux a été annulé ou fermé
+    """
+    stream = getattr(response, "_iterator", response)
+    for method_name in ("cancel", "close"):
+        method = getattr(stream, method_name, None)
+        if callable(method):
+            try:
+                method()
+            except Exception:
+                return False
+            return True
+    return False
+
+
+def generate_content(model, prompt: str, agent_name: str, model_name: str,
+                     prompt_stats: Optional[dict] = None,
+                     retry_policy: Optional[RetryPolicy] = None, **kwargs):
+    """
+    Appelle model.generate_content en mesurant la durée et les tokens.
+
+    Les erreurs de quota et transitoires (429, 503, timeout) sont reprises
+    avec backoff (src.utils.resilience) ; chaque nouvelle tentative repasse
+    par le rate limiter. Seules les erreurs définitives remontent tout de suite.
+    Si le hedging est activé (src.utils.hedging), une copie de la requête part
+    quand la réponse dépasse le percentile de latence de l'agent.
+
+    Args:
+        model: Instance genai.GenerativeModel
+        prompt (str): Prompt à envoyer
+        agent_name (str): Agent appelant (ex: "Auditor_Agent")
+        model_name (str): Nom du modèle (ex: "gemini-2.5-flash")
+        prompt_stats (dict, optional): Stats de src.prompts.budget (tokens économisés)
+        retry_policy (RetryPolicy, optional): Paramètres de reprise (défaut: RetryPolicy())
+        **kwargs: Options transmises à generate_content
+
+    Returns:
+        La réponse Gemini
+    """
+    with span("generate_content", kind="llm", agent=agent_name, model=model_name,
+              prompt_chars=len(prompt)) as current:
+        _set_prompt_stats(current, prompt_stats)
+        policy = retry_policy or RetryPolicy()
+        if policy.call_timeout and _accepts_request_options(type(model)):
+            kwargs.setdefault("request_options", {"timeout": policy.call_timeout})
+
+        attempts = 0
+
+        def request():
+            started = time.monotonic()
+            response = model.generate_content(prompt, **kwargs)
+            record_latency(agent_name, time.monotonic() - started)
+            return response
+
+        def call():
+            nonlocal attempts
+            attempts += 1
+            return hedged_call(request, agent_name)
+
+        try:
+            response = call_with_retry(call, policy, before_retry=wait_for_rate_limit)
+        finally:
+            current.set(attempts=attempts)
+        record_llm_usage(current, response)
+        return response
+
+
+def stream_content(model, prompt: str, agent_name: str, model_name: str,
+                   on_chunk: Callable[[str], bool],
+                   on_restart: Optional[Callable[[], None]] = None,
+                   prompt_stats: Optional[dict] = None,
+                   retry_policy: Optional[RetryPolicy] = None, **kwargs) -> Tuple[str, dict]:
+    """
+    Appelle model.generate_content(stream=True) et transmet chaque morceau
+    à `on_chunk` dès sa réception ; la lecture du flux s'arrête dès que
+    `on_chunk` renvoie False : le flux est alors annulé (voir _cancel_stream)
+    pour que le serveur cesse de générer. Si le SDK ne permet pas de
+    l'annuler ("cancelled" à False), l'arrêt n'économise que le travail
+    local : les tokens de sortie restants sont générés et facturés.
+
+    Même reprise que generate_content : une erreur transitoire, y compris
+    au milieu du flux, relance la génération depuis le début (`on_restart`
+    est appelée avant). Pas de hedging : deux flux concurrents alimenteraient
+    le même `on_chunk`.
+
+    Args:
+        model: Instance genai.GenerativeModel
+        prompt (str): Prompt à envoyer
+        agent_name (str): Agent appelant (ex: "Fixer_Agent")
+        model_name (str): Nom du modèle (ex: "gemini-2.5-flash")
+        on_chunk: Reçoit le texte de chaque morceau, False pour arrêter le flux
+        on_restart: Appelée avant chaque nouvelle tentative
+        prompt_stats (dict, optional): Stats de src.prompts.budget (tokens économisés)
+        retry_policy (RetryPolicy, optional): Paramètres de reprise (défaut: RetryPolicy())
+        **kwargs: Options transmises à generate_content
+
+    Returns:
+        tuple: (texte reçu, {"chunks", "first_chunk_s", "stopped", "cancelled"})
+    """
+    with span("generate_content", kind="llm", agent=agent_name, model=model_name,
+              prompt_chars=len(prompt), streaming=True) as current:
+        _set_prompt_stats(current, prompt_stats)
+        policy = retry_policy or RetryPolicy()
+        if policy.call_timeout and _accepts_request_options(type(model)):
+            kwargs.setdefault("request_options", {"timeout": policy.call_timeout})
+
+        attempts = 0
+
+        def call():
+            nonlocal attempts
+            attempts += 1
+            if attempts > 1 and on_restart is not None:
+                on_restart()
+
+            started = time.monotonic()
+            response = model.generate_content(prompt, stream=True, **kwargs)
+            parts = []
+            stats = {"chunks": 0, "first_chunk_s": None, "stopped": False, "cancelled": False}
+            for chunk in response:
+                if stats["first_chunk_s"] is None:
+                    stats["first_chunk_s"] = round(time.monotonic() - started, 3)
+                text = _chunk_text(chunk)
+                parts.append(text)
+                stats["chunks"] += 1
+                if on_chunk(text) is False:
+                    stats["stopped"] = True
+                    stats["cancelled"] = _cancel_stream(response)
+                    break
+            return response, "".join(parts), stats
+
+        try:
+            response, text, stats = call_with_retry(call, policy, before_retry=wait_for_rate_limit)
+        finally:
+            current.set(attempts=attempts)
+        current.set(**stats)
+        record_llm_usage(current, response)
+        return text, stats
@@ -1,12 +1,38 @@
+import gzip
+import hashlib
 import json
 import os
+import threading
 import uuid
 from datetime import datetime
 from enum import Enum
 
+from src.utils.tracing import span
+
 # Chemin du fichier de logs
+# Pendant un run, chaque entrée est ajoutée à un journal JSON Lines voisin
+# (experiment_data.jsonl) : une écriture par entrée, sans relire le log.
+# export_experiment_log() reverse le journal dans la liste JSON en fin de run ;
+# read_experiment_log() lit les deux.
 LOG_FILE = os.path.join("logs", "experiment_data.json")
 
+# --- Stockage des gros champs texte (blobs) ---
+# Les chaînes de 'details' dont la taille dépasse ce seuil (en caractères) sont
+# stockées une seule fois, compressées, dans logs/blobs/ et remplacées dans
+# l'entrée du journal par une référence "blob:sha256:<hash>". 0 désactive le
+# mécanisme. Les blobs ne servent qu'au journal : export_experiment_log()
+# réintègre leur contenu dans la liste JSON (livrable lisible sans
+# logs/blobs/, dossier non versionné) puis les supprime.
+BLOB_THRESHOLD = int(os.getenv("LOG_BLOB_THRESHOLD", "1024"))
+BLOB_PREFIX = "blob:sha256:"
+
+# Hashs déjà présents sur disque (évite un os.path.exists à chaque écriture)
+_known_blobs = set()
+
+# Sérialise les ajouts au journal et l'export quand plusieurs fichiers sont
+# traités en parallèle (Orchestrator --workers)
+_write_lock = threading.Lock()
+
 class ActionType(str, Enum):
     """
     Énumération des types d'actions possibles pour standardiser l'analyse.
@@ -16,10 +42,228 @@ class ActionType(str, Enum):
     DEBUG = "DEBUG"             # Analyse d'erreurs d'exécution
     FIX = "FIX"                 # Application de correctifs
 
+
+def _blob_dir() -> str:
+    """Dossier des blobs, toujours à côté du fichier de logs."""
+    return os.path.join(os.path.dirname(LOG_FILE), "blobs")
+
+
+def _blob_path(digest: str) -> str:
+    return os.path.join(_blob_dir(), digest[:2], f"{digest}.gz")
+
+
+def is_blob_ref(value) -> bool:
+    """Indique si une valeur de 'details' est une référence vers un blob."""
+    return isinstance(value, str) and value.startswith(BLOB_PREFIX)
+
+
+def store_blob(text: str) -> str:
+    """
+    Stocke un texte compressé (gzip) et adressé par son contenu.
+
+    Un même texte (ex: le code envoyé à l'Auditeur puis au Correcteur) n'est
+    écrit qu'une seule fois sur disque.
+
+    Args:
+        text (str): Contenu à stocker
+
+    Returns:
+        str: Référence "blob:sha256:<hash>" à placer dans l'entrée de log
+    """
+    raw = text.encode("utf-8")
+    digest = hashlib.sha256(raw).hexdigest()
+
+    if digest not in _known_blobs:
+        path = _blob_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(gzip.compress(raw, compresslevel=6))
+            os.replace(tmp_path, path)
+        _known_blobs.add(digest)
+
+    return BLOB_PREFIX + digest
+
+
+def load_blob(ref: str) -> str:
+    """
+    Relit le texte d'origine à partir d'une référence de blob.
+
+    Raises:
+        ValueError: Si la valeur n'est pas une référence de blob.
+        FileNotFoundError: Si le blob n'existe pas dans logs/blobs/.
+    """
+    if not is_blob_ref(ref):
+        raise ValueError(f"❌ Référence de blob invalide : '{ref}'")
+
+    with open(_blob_path(ref[len(BLOB_PREFIX):]), "rb") as f:
+        return gzip.decompress(f.read()).decode("utf-8")
+
+
+def _externalize_details(details: dict) -> dict:
+    """Remplace les gros champs texte de 'details' par des références de blobs."""
+    if BLOB_THRESHOLD <= 0:
+        return details
+
+    return {
+        key: store_blob(value) if isinstance(value, str) and len(value) >= BLOB_THRESHOLD else value
+        for key, value in details.items()
+    }
+
+
+def rehydrate_entry(entry: dict) -> dict:
+    """
+    Retourne une copie de l'entrée où chaque référence de blob de 'details'
+    est remplacée par le texte d'origine.
+    """
+    details = entry.get("details")
+    if not isinstance(details, dict):
+        return entry
+
+    return {
+        **entry,
+        "details": {
+            key: load_blob(value) if is_blob_ref(value) else value
+            for key, value in details.items()
+        }
+    }
+
+
+def _inline_blobs(entry: dict, inlined: set) -> dict:
+    """Comme rehydrate_entry, mais garde la référence d'un blob absent ; note les hashs réintégrés."""
+    details = entry.get("details")
+    if not isinstance(details, dict):
+        return entry
+
+    inline = {}
+    for key, value in details.items():
+        if is_blob_ref(value):
+            try:
+                text = load_blob(value)
+            except FileNotFoundError:
+                text = value
+            else:
+                inlined.add(value[len(BLOB_PREFIX):])
+            value = text
+        inline[key] = value
+    return {**entry, "details": inline}
+
+
+def _remove_blobs(digests: set) -> None:
+    for digest in digests:
+        _known_blobs.discard(digest)
+        try:
+            os.remove(_blob_path(digest))
+        except FileNotFoundError:
+            pass
+
+
+def journal_file(path: str = None) -> str:
+    """Journal JSON Lines d'un fichier de logs (experiment_data.json -> experiment_data.jsonl)."""
+    return os.path.splitext(path or LOG_FILE)[0] + ".jsonl"
+
+
+def _read_array(path: str) -> list:
+    if not os.path.exists(path):
+        return []
+
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read().strip()
+    if not content:  # Vérifie que le fichier n'est pas juste vide
+        return []
+    return json.loads(content)
+
+
+def _read_journal(path: str) -> list:
+    if not os.path.exists(path):
+        return []
+
+    entries = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                # Dernière ligne coupée par un arrêt brutal : ignorée
+                continue
+    return entries
+
+
+def read_experiment_log(path: str = None, rehydrate: bool = True) -> list:
+    """
+    Lit le fichier de logs (liste d'entrées JSON) suivi de son journal.
+
+    Args:
+        path (str): Fichier à lire (défaut: LOG_FILE)
+        rehydrate (bool): Remplacer les références de blobs par leur contenu
+
+    Returns:
+        list: Entrées du log (liste vide si le fichier est absent ou vide)
+
+    Raises:
+        json.JSONDecodeError: Si le fichier est corrompu.
+    """
+    path = path or LOG_FILE
+    data = _read_array(path) + _read_journal(journal_file(path))
+    if rehydrate:
+        data = [rehydrate_entry(entry) for entry in data]
+    return data
+
+
+def export_experiment_log(path: str = None) -> int:
+    """
+    Reverse le journal dans le fichier de logs (liste JSON), puis le supprime.
+
+    Appelé une fois en fin de run : la liste n'est réécrite qu'à ce moment.
+    Les références de blobs y sont remplacées par leur contenu, et les blobs
+    réintégrés sont supprimés de logs/blobs/.
+
+    Returns:
+        int: Nombre d'entrées ajoutées à la liste
+    """
+    path = path or LOG_FILE
+    journal = journal_file(path)
+
+    with _write_lock:
+        entries = _read_journal(journal)
+        if not entries:
+            if os.path.exists(journal):
+                os.remove(journal)
+            return 0
+
+        try:
+            data = _read_array(path)
+        except json.JSONDecodeError:
+            # Si le fichier est corrompu, on repart à zéro (ou on pourrait sauvegarder un backup)
+            print(f"⚠️ Attention : Le fichier de logs {path} était corrompu. Une nouvelle liste a été créée.")
+            data = []
+        data.extend(entries)
+        inlined = set()
+        data = [_inline_blobs(entry, inlined) for entry in data]
+
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=4, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        os.remove(journal)
+        _remove_blobs(inlined)
+
+    return len(entries)
+
+
 def log_experiment(agent_name: str, model_used: str, action: ActionType, details: dict, status: str):
     """
     Enregistre une interaction d'agent pour l'analyse scientifique.
 
+    Les champs texte volumineux de 'details' (prompts, réponses, code) sont
+    stockés dans logs/blobs/ et référencés depuis l'entrée du journal
+    jusqu'à export_experiment_log() ; utiliser read_experiment_log() pour
+    relire le log avec leur contenu complet.
+
     Args:
         agent_name (str): Nom de l'agent (ex: "Auditor", "Fixer").
         model_used (str): Modèle LLM utilisé (ex: "gemini-1.5-flash").
@@ -57,33 +301,22 @@ def log_experiment(agent_name: str, model_used: str, action: ActionType, details
 
     # --- 3. PRÉPARATION DE L'ENTRÉE ---
     # Création du dossier logs s'il n'existe pas
-    os.makedirs("logs", exist_ok=True)
+    os.makedirs(os.path.dirname(LOG_FILE) or ".", exist_ok=True)
     
-    entry = {
-        "id": str(uuid.uuid4()),  # ID unique pour éviter les doublons lors de la fusion des données
-        "timestamp": datetime.now().isoformat(),
-        "agent": agent_name,
-        "model": model_used,
-        "action": action_str,
-        "details": details,
-        "status": status
-    }
-
-    # --- 4. LECTURE & ÉCRITURE ROBUSTE ---
-    data = []
-    if os.path.exists(LOG_FILE):
-        try:
-            with open(LOG_FILE, 'r', encoding='utf-8') as f:
-                content = f.read().strip()
-                if content: # Vérifie que le fichier n'est pas juste vide
-                    data = json.loads(content)
-        except json.JSONDecodeError:
-            # Si le fichier est corrompu, on repart à zéro (ou on pourrait sauvegarder un backup)
-            print(f"⚠️ Attention : Le fichier de logs {LOG_FILE} était corrompu. Une nouvelle liste a été créée.")
-            data = []
+    # Le temps disque (blobs + ajout au journal) est mesuré par le traçage
+    with span("log_experiment", kind="io", agent=agent_name):
+        entry = {
+            "id": str(uuid.uuid4()),  # ID unique pour éviter les doublons lors de la fusion des données
+            "timestamp": datetime.now().isoformat(),
+            "agent": agent_name,
+            "model": model_used,
+            "action": action_str,
+            "details": _externalize_details(details),
+            "status": status
+        }
 
-    data.append(entry)
-    
-    # Écriture
-    with open(LOG_FILE, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=4, ensure_ascii=False)
\ No newline at end of file
+        # --- 4. AJOUT AU JOURNAL (une ligne, sans relire le log) ---
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with _write_lock:
+            with open(journal_file(LOG_FILE), 'a', encoding='utf-8') as f:
+                f.write(line)
@@ -0,0 +1,272 @@
+"""
+Métriques Prometheus du Refactoring Swarm
+Visibilité en direct sur les runs longs
+
+Expose, via un petit serveur HTTP local (stdlib http.server), les compteurs
+et histogrammes du run au format texte Prometheus :
+- fichiers traités (validés / échoués) et fichiers découverts
+- itérations par fichier
+- latence des appels LLM par agent
+- attente du rate limiter et nombre de requêtes
+- durée des exécutions pytest
+
+Les histogrammes de latence sont alimentés par les spans de src.utils.tracing,
+les compteurs de l'Orchestrateur et du rate limiter sont lus à chaque scrape.
+
+Usage:
+    python main.py --target_dir ./sandbox/dataset --metrics_port 9108
+    curl http://127.0.0.1:9108/metrics
+"""
+
+import bisect
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.utils.rate_limiter import get_rate_limiter_stats
+from src.utils.tracing import Span, add_span_listener
+
+# (nom, labels, valeur) renvoyés par un collecteur au moment du scrape
+Sample = Tuple[str, Dict[str, str], float]
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    inner = ",".join(
+        '{}="{}"'.format(key, str(value).replace("\\", "\\\\").replace('"', '\\"'))
+        for key, value in sorted(labels.items())
+    )
+    return "{" + inner + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class Counter:
+    """Compteur monotone, éventuellement étiqueté."""
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help_text = help_text
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(tuple(sorted(labels.items())), 0.0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(dict(key))} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """Histogramme à buckets cumulés, éventuellement étiqueté."""
+
+    def __init__(self, name: str, help_text: str, buckets: Tuple[float, ...]):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple, dict] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._series.setdefault(key, {
+                "counts": [0] * len(self.buckets), "sum": 0.0, "count": 0
+            })
+            index = bisect.bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                series["counts"][index] += 1
+            series["sum"] += value
+            series["count"] += 1
+
+    def count(self, **labels) -> int:
+        series = self._series.get(tuple(sorted(labels.items())))
+        return series["count"] if series else 0
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                labels = dict(key)
+                cumulative = 0
+                for bound, count in zip(self.buckets, series["counts"]):
+                    cumulative += count
+                    bucket_labels = _format_labels({**labels, "le": _format_value(bound)})
+                    lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+                lines.append(f"{self.name}_bucket{_format_labels({**labels, 'le': '+Inf'})} {series['count']}")
+                lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(series['sum'])}")
+                lines.append(f"{self.name}_count{_format_labels(labels)} {series['count']}")
+        return lines
+
+
+class MetricsRegistry:
+    """Ensemble des métriques et des collecteurs lus à chaque scrape."""
+
+    def __init__(self):
+        self._metrics: List = []
+        self._collectors: Dict[str, Tuple[Callable[[], List[Sample]], Dict[str, Tuple[str, str]]]] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        metric = Counter(name, help_text)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, help_text: str, buckets: Tuple[float, ...]) -> Histogram:
+        metric = Histogram(name, help_text, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, key: str, collect: Callable[[], List[Sample]],
+                           descriptions: Dict[str, Tuple[str, str]]) -> None:
+        """
+        Enregistre (ou remplace) un collecteur.
+
+        Args:
+            key (str): Identifiant du collecteur (ex: "orchestrator")
+            collect: Fonction renvoyant une liste de (nom, labels, valeur)
+            descriptions: nom -> (type Prometheus, texte d'aide)
+        """
+        with self._lock:
+            self._collectors[key] = (collect, descriptions)
+
+    def unregister_collector(self, key: str) -> None:
+        with self._lock:
+            self._collectors.pop(key, None)
+
+    def render(self) -> str:
+        """Retourne toutes les métriques au format texte Prometheus."""
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+
+        with self._lock:
+            collectors = list(self._collectors.values())
+
+        for collect, descriptions in collectors:
+            samples_by_name: Dict[str, List[Sample]] = {}
+            for sample in collect():
+                samples_by_name.setdefault(sample[0], []).append(sample)
+            for name, samples in samples_by_name.items():
+                metric_type, help_text = descriptions.get(name, ("gauge", name))
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {metric_type}")
+                for _, labels, value in samples:
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+LLM_LATENCY = REGISTRY.histogram(
+    "swarm_llm_request_duration_seconds",
+    "Duree des appels generate_content par agent",
+    (0.5, 1, 2, 5, 10, 20, 30, 60, 120),
+)
+PYTEST_DURATION = REGISTRY.histogram(
+    "swarm_pytest_duration_seconds",
+    "Duree des executions pytest",
+    (0.1, 0.25, 0.5, 1, 2, 5, 10, 30, 60),
+)
+ITERATIONS_PER_FILE = REGISTRY.histogram(
+    "swarm_iterations_per_file",
+    "Nombre d'iterations du graphe par fichier traite",
+    (1, 2, 3, 5, 10, 20),
+)
+LLM_ERRORS = REGISTRY.counter(
+    "swarm_llm_errors_total",
+    "Appels generate_content termines en erreur, par agent",
+)
+
+
+def _observe_span(finished: Span) -> None:
+    """Alimente les histogrammes à partir des spans terminés."""
+    if finished.kind == "llm":
+        agent = finished.attributes.get("agent", "unknown")
+        LLM_LATENCY.observe(finished.duration_s, agent=agent)
+        if finished.status == "ERROR":
+            LLM_ERRORS.inc(agent=agent)
+    elif finished.kind == "subprocess" and finished.name == "pytest":
+        PYTEST_DURATION.observe(finished.duration_s)
+
+
+add_span_listener(_observe_span)
+
+
+def _rate_limiter_samples() -> List[Sample]:
+    stats = get_rate_limiter_stats()
+    return [
+        ("swarm_rate_limit_requests_total", {}, stats["total_requests"]),
+        ("swarm_rate_limit_wait_seconds_total", {}, stats["total_wait_seconds"]),
+        ("swarm_rate_limit_max_rpm", {}, stats["max_rpm"]),
+    ]
+
+
+REGISTRY.register_collector("rate_limiter", _rate_limiter_samples, {
+    "swarm_rate_limit_requests_total": ("counter", "Requetes passees par le rate limiter"),
+    "swarm_rate_limit_wait_seconds_total": ("counter", "Temps total d'attente impose par le rate limiter"),
+    "swarm_rate_limit_max_rpm": ("gauge", "Limite de requetes par minute configuree"),
+})
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry: MetricsRegistry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+
+        body = self.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Pas de ligne sur stdout à chaque scrape
+        pass
+
+
+def start_metrics_server(port: int, host: str = "127.0.0.1",
+                         registry: Optional[MetricsRegistry] = None) -> ThreadingHTTPServer:
+    """
+    Démarre le serveur /metrics dans un thread daemon.
+
+    Args:
+        port (int): Port d'écoute (0 = port libre choisi par le système)
+        host (str): Adresse d'écoute (localhost par défaut)
+        registry: Registre à exposer (défaut: REGISTRY)
+
+    Returns:
+        ThreadingHTTPServer: Serveur démarré (server.server_address donne le port réel)
+    """
+    handler = type("MetricsHandler", (_MetricsHandler,), {"registry": registry or REGISTRY})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+
+    thread = threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True)
+    thread.start()
+    return server
+
+
+def stop_metrics_server(server: ThreadingHTTPServer) -> None:
+    """Arrête un serveur démarré avec start_metrics_server."""
+    server.shutdown()
+    server.server_close()
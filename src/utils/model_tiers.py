@@ -0,0 +1,70 @@
+"""
+Niveaux de modèles par agent (tiering)
+Le modèle le moins cher d'abord, un modèle plus fort seulement si nécessaire
+
+Chaque agent a une liste de niveaux, du moins cher au plus fort :
+- Auditeur, Correcteur, Audit + Correction : modèle léger, puis modèle standard
+- Testeur : moteur de règles local (RULES, aucun appel), puis les modèles
+
+Le graphe passe au niveau suivant :
+- immédiatement, pour le même nœud, si la sortie est invalide (rapport JSON
+  irréparable, code corrigé syntaxiquement invalide)
+- pour l'itération suivante, quand le Testeur renvoie PASS_TO_FIXER
+
+Désactivable (--no_tiering) : chaque agent n'a alors qu'un niveau, le
+modèle par défaut des agents.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+# Niveau "moteur de règles" du Testeur : décision tirée du résumé pytest
+RULES = "rules"
+
+DEFAULT_MODEL = "gemini-2.5-flash"
+
+DEFAULT_TIERS: Dict[str, Tuple[str, ...]] = {
+    "auditor": ("gemini-2.5-flash-lite", DEFAULT_MODEL),
+    "fixer": ("gemini-2.5-flash-lite", DEFAULT_MODEL),
+    "audit_fix": ("gemini-2.5-flash-lite", DEFAULT_MODEL),
+    "judge": (RULES, "gemini-2.5-flash-lite", DEFAULT_MODEL),
+}
+
+SINGLE_TIER: Dict[str, Tuple[str, ...]] = {agent: (DEFAULT_MODEL,) for agent in DEFAULT_TIERS}
+
+_tiers: Dict[str, Tuple[str, ...]] = DEFAULT_TIERS
+
+
+def configure_tiers(tiers: Optional[Dict[str, Tuple[str, ...]]]) -> None:
+    """Définit les niveaux par agent (None : un seul niveau, le modèle par défaut)."""
+    global _tiers
+    _tiers = tiers if tiers is not None else SINGLE_TIER
+
+
+def tiers_for(agent: str) -> Tuple[str, ...]:
+    """Niveaux d'un agent ("auditor", "fixer", "audit_fix" ou "judge"), du moins cher au plus fort."""
+    return _tiers.get(agent, (DEFAULT_MODEL,))
+
+
+def max_level(agent: str) -> int:
+    """Niveau le plus fort d'un agent."""
+    return len(tiers_for(agent)) - 1
+
+
+def models_for(agent: str, level: int = 0) -> List[str]:
+    """
+    Niveaux à essayer pour un appel, à partir du niveau courant du fichier.
+
+    Args:
+        agent (str): "auditor", "fixer", "audit_fix" ou "judge"
+        level (int): Niveau d'escalade du fichier (borné au plus fort)
+
+    Returns:
+        list: Niveaux dans l'ordre d'essai (le premier est celui du niveau courant)
+    """
+    tiers = tiers_for(agent)
+    return list(tiers[min(max(level, 0), len(tiers) - 1):])
+
+
+def llm_models(models: List[str]) -> List[str]:
+    """Les mêmes niveaux sans le moteur de règles."""
+    return [model for model in models if model != RULES]
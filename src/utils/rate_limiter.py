@@ -9,10 +9,13 @@ IMPORTANT: Free tier actual limit is 5 RPM, not 15!
 Using 4 RPM to be safe and avoid quota errors.
 """
 
+import threading
 import time
 from datetime import datetime, timedelta
 from typing import Optional
 
+from src.utils.tracing import span
+
 class RateLimiter:
     """
     Rate limiter for Gemini API calls to prevent quota errors.
@@ -46,6 +49,10 @@ class RateLimiter:
         self.min_delay = 60.0 / max_requests_per_minute  # 15 seconds for 4 RPM
         self.last_request_time: Optional[datetime] = None
         self.request_count = 0
+        self.total_wait_seconds = 0.0
+        # Plusieurs workers partagent la même limite : un seul à la fois calcule
+        # son attente et réserve le créneau suivant
+        self._lock = threading.Lock()
         
     def wait_if_needed(self):
         """
@@ -56,23 +63,48 @@ class RateLimiter:
             rate_limiter.wait_if_needed()
             response = model.generate_content(prompt)
         """
-        current_time = datetime.now()
+        with self._lock:
+            current_time = datetime.now()
         
-        if self.last_request_time is not None:
-            time_since_last = (current_time - self.last_request_time).total_seconds()
+            with span("rate_limit_wait", kind="rate_limit") as current:
+                wait_time = 0.0
+                if self.last_request_time is not None:
+                    time_since_last = (current_time - self.last_request_time).total_seconds()
+                
+                    if time_since_last < self.min_delay:
+                        wait_time = self.min_delay - time_since_last
+                        print(f"⏳ Rate limiting: waiting {wait_time:.1f}s to avoid quota errors (Free tier: 5 RPM)")
+                        time.sleep(wait_time)
             
-            if time_since_last < self.min_delay:
-                wait_time = self.min_delay - time_since_last
-                print(f"⏳ Rate limiting: waiting {wait_time:.1f}s to avoid quota errors (Free tier: 5 RPM)")
-                time.sleep(wait_time)
+                current.set(wait_seconds=wait_time)
+                self.total_wait_seconds += wait_time
+        
+            self.last_request_time = datetime.now()
+            self.request_count += 1
+        
+    def try_acquire(self) -> bool:
+        """
+        Reserve a slot only if it is available right now (never waits).
         
-        self.last_request_time = datetime.now()
-        self.request_count += 1
+        Used for optional requests (hedging): they must not delay the others.
+        
+        Returns:
+            bool: True if the slot was reserved
+        """
+        with self._lock:
+            now = datetime.now()
+            if (self.last_request_time is not None
+                    and (now - self.last_request_time).total_seconds() < self.min_delay):
+                return False
+            self.last_request_time = now
+            self.request_count += 1
+            return True
         
     def reset(self):
         """Reset the rate limiter."""
         self.last_request_time = None
         self.request_count = 0
+        self.total_wait_seconds = 0.0
         
     def get_stats(self) -> dict:
         """Get rate limiter statistics."""
@@ -80,6 +112,7 @@ class RateLimiter:
             "total_requests": self.request_count,
             "max_rpm": self.max_requests_per_minute,
             "min_delay_seconds": self.min_delay,
+            "total_wait_seconds": self.total_wait_seconds,
             "last_request": self.last_request_time.isoformat() if self.last_request_time else None
         }
 
@@ -104,6 +137,11 @@ def wait_for_rate_limit():
     _global_limiter.wait_if_needed()
 
 
+def try_acquire_rate_limit() -> bool:
+    """Non-blocking variant of wait_for_rate_limit() for optional requests."""
+    return _global_limiter.try_acquire()
+
+
 def reset_rate_limiter():
     """Reset the global rate limiter."""
     _global_limiter.reset()
@@ -0,0 +1,322 @@
+"""
+Résilience des appels au modèle
+Reprise des erreurs transitoires au lieu de faire échouer le fichier
+
+- classification des erreurs : quota (429), transitoire (5xx, timeout,
+  réseau) ou définitive (requête invalide, clé refusée...)
+- backoff exponentiel avec jitter ("full jitter") entre les tentatives
+- respect du délai demandé par l'API (en-tête Retry-After, retry_delay)
+- échéance par appel (transmise au SDK s'il la supporte) et échéance
+  globale des tentatives
+- disjoncteur partagé par tous les workers : après une série d'échecs
+  transitoires, les appels attendent la fin de la pause au lieu de
+  marteler l'API, puis le résultat d'un unique appel d'essai
+
+Usage:
+    response = call_with_retry(lambda: model.generate_content(prompt))
+"""
+
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from src.utils.tracing import span
+
+# Catégories d'erreurs
+RATE_LIMIT = "rate_limit"
+TRANSIENT = "transient"
+FATAL = "fatal"
+
+_RATE_LIMIT_CODES = {429}
+_TRANSIENT_CODES = {408, 500, 502, 503, 504}
+_RATE_LIMIT_NAMES = {"ResourceExhausted", "TooManyRequests"}
+_TRANSIENT_NAMES = {
+    "ServiceUnavailable", "InternalServerError", "DeadlineExceeded", "GatewayTimeout",
+    "BadGateway", "Aborted", "Unknown", "RetryError",
+}
+
+# "retry_delay { seconds: 41 }" (gRPC) ou "Please retry in 12.5s" (REST)
+_RETRY_DELAY_PATTERNS = (
+    re.compile(r"retry_delay\s*\{\s*seconds:\s*(\d+)", re.IGNORECASE),
+    re.compile(r"retry in\s+(\d+(?:\.\d+)?)\s*s", re.IGNORECASE),
+)
+
+
+class CircuitOpenError(RuntimeError):
+    """Le disjoncteur est ouvert et l'échéance ne permet pas d'attendre sa fermeture."""
+
+
+@dataclass
+class RetryPolicy:
+    """Paramètres de reprise d'un appel."""
+    max_attempts: int = 5
+    base_delay: float = 2.0
+    max_delay: float = 60.0
+    call_timeout: Optional[float] = 120.0
+    deadline: Optional[float] = 300.0
+
+    def backoff(self, attempt: int, rng: Callable[[], float] = random.random) -> float:
+        """Délai avant la tentative suivante : full jitter sur base * 2^(attempt-1)."""
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return ceiling * rng()
+
+
+def classify_error(error: BaseException) -> str:
+    """
+    Classe une exception levée par le SDK.
+
+    Returns:
+        str: RATE_LIMIT, TRANSIENT ou FATAL
+    """
+    name = type(error).__name__
+    code = getattr(error, "code", None)
+    code = code if isinstance(code, int) else None
+
+    if code in _RATE_LIMIT_CODES or name in _RATE_LIMIT_NAMES:
+        return RATE_LIMIT
+    if code in _TRANSIENT_CODES or name in _TRANSIENT_NAMES:
+        return TRANSIENT
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return TRANSIENT
+    return FATAL
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """Délai demandé par l'API (en-tête Retry-After ou message), None si absent."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    value = headers.get("Retry-After") or headers.get("retry-after")
+    if value is not None:
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+
+    message = str(error)
+    for pattern in _RETRY_DELAY_PATTERNS:
+        match = pattern.search(message)
+        if match:
+            return float(match.group(1))
+    return None
+
+
+class CircuitBreaker:
+    """
+    Disjoncteur partagé : s'ouvre après `failure_threshold` échecs transitoires
+    consécutifs, laisse passer un appel d'essai après `cooldown` secondes.
+
+    Un seul appel d'essai à la fois (try_probe) : les autres workers attendent
+    son résultat (wait_for_probe) au lieu de partir tous ensemble vers une API
+    qui vient de faire ouvrir le disjoncteur.
+    """
+
+    def __init__(self, failure_threshold: int = 5, cooldown: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.open_count = 0
+        self._lock = threading.Lock()
+        self._probe_done = threading.Condition(self._lock)
+        self._probe_owner: Optional[int] = None
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self.opened_at is None:
+                return "closed"
+            if time.monotonic() - self.opened_at >= self.cooldown:
+                return "half_open"
+            return "open"
+
+    def remaining_open(self) -> float:
+        """Secondes avant la fin de la pause (0 si fermé ou en essai)."""
+        with self._lock:
+            if self.opened_at is None:
+                return 0.0
+            return max(self.cooldown - (time.monotonic() - self.opened_at), 0.0)
+
+    def try_probe(self) -> bool:
+        """
+        Autorise un appel : toujours si le disjoncteur est fermé, sinon un
+        seul appel d'essai, une fois la pause écoulée.
+
+        Returns:
+            bool: True si l'appelant peut appeler l'API (il devient l'essai
+            en cours si le disjoncteur est ouvert)
+        """
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if self._probe_owner is not None:
+                return False
+            if time.monotonic() - self.opened_at < self.cooldown:
+                return False
+            self._probe_owner = threading.get_ident()
+            return True
+
+    def wait_for_probe(self, timeout: Optional[float] = None) -> bool:
+        """
+        Attend le résultat de l'appel d'essai en cours.
+
+        Returns:
+            bool: False si l'essai est toujours en cours après `timeout`
+        """
+        with self._lock:
+            return self._probe_done.wait_for(lambda: self._probe_owner is None, timeout)
+
+    def release_probe(self) -> None:
+        """Essai terminé sans verdict sur l'API (erreur définitive) : un autre appel peut essayer."""
+        with self._lock:
+            if self._probe_owner == threading.get_ident():
+                self._end_probe()
+
+    def _end_probe(self) -> None:
+        self._probe_owner = None
+        self._probe_done.notify_all()
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.consecutive_failures = 0
+            self.opened_at = None
+            self._end_probe()
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.opened_at is not None:
+                # Appel d'essai en échec : nouvelle pause complète
+                self.opened_at = time.monotonic()
+            elif self.consecutive_failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+                self.open_count += 1
+            self._end_probe()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.consecutive_failures = 0
+            self.opened_at = None
+            self.open_count = 0
+            self._end_probe()
+
+
+# Disjoncteur et compteurs globaux, partagés par les workers
+_global_breaker = CircuitBreaker()
+_stats_lock = threading.Lock()
+_stats = {"calls": 0, "retries": 0, "backoff_seconds": 0.0, "errors": {}}
+
+
+def _record(calls: int = 0, retries: int = 0, backoff: float = 0.0,
+            category: Optional[str] = None) -> None:
+    with _stats_lock:
+        _stats["calls"] += calls
+        _stats["retries"] += retries
+        _stats["backoff_seconds"] += backoff
+        if category:
+            _stats["errors"][category] = _stats["errors"].get(category, 0) + 1
+
+
+def _sleep(seconds: float, reason: str, attempt: int) -> None:
+    with span("retry_backoff", kind="retry", reason=reason, attempt=attempt,
+              wait_seconds=round(seconds, 3)):
+        time.sleep(seconds)
+
+
+def call_with_retry(call: Callable, policy: Optional[RetryPolicy] = None,
+                    breaker: Optional[CircuitBreaker] = None,
+                    before_retry: Optional[Callable[[], None]] = None,
+                    sleep: Optional[Callable[[float, str, int], None]] = None):
+    """
+    Exécute `call` en reprenant les erreurs de quota et transitoires.
+
+    Args:
+        call: Fonction sans argument (l'appel au modèle)
+        policy (RetryPolicy): Paramètres de reprise (défaut: RetryPolicy())
+        breaker (CircuitBreaker): Disjoncteur (défaut: disjoncteur global)
+        before_retry: Appelée avant chaque nouvelle tentative (ex: rate limiter)
+        sleep: Attente (défaut: time.sleep tracée en span "retry")
+
+    Returns:
+        Le résultat de `call`
+
+    Raises:
+        L'exception d'origine si elle est définitive, ou si les tentatives
+        ou l'échéance sont épuisées ; CircuitOpenError si le disjoncteur
+        reste ouvert au-delà de l'échéance.
+    """
+    policy = policy or RetryPolicy()
+    breaker = breaker or _global_breaker
+    sleep = sleep or _sleep
+    started = time.monotonic()
+    _record(calls=1)
+
+    def remaining() -> float:
+        if policy.deadline is None:
+            return float("inf")
+        return policy.deadline - (time.monotonic() - started)
+
+    attempt = 0
+    while True:
+        attempt += 1
+
+        # Disjoncteur ouvert : pause, puis un seul appel d'essai pour tous les workers
+        while not breaker.try_probe():
+            pause = breaker.remaining_open()
+            if pause > 0:
+                if pause > remaining():
+                    raise CircuitOpenError(f"API indisponible : disjoncteur ouvert encore {pause:.0f}s")
+                sleep(pause, "circuit_open", attempt)
+            elif not breaker.wait_for_probe(None if policy.deadline is None else max(remaining(), 0.0)):
+                raise CircuitOpenError("API indisponible : appel d'essai toujours en cours à l'échéance")
+
+        try:
+            result = call()
+        except Exception as error:
+            category = classify_error(error)
+            _record(category=category)
+            if category == FATAL:
+                breaker.release_probe()
+                raise
+            breaker.record_failure()
+
+            if attempt >= policy.max_attempts:
+                raise
+            delay = policy.backoff(attempt)
+            requested = retry_after_seconds(error)
+            if requested is not None:
+                delay = max(delay, requested)
+            if delay > remaining():
+                raise
+
+            print(f"⚠️  Erreur {category} ({type(error).__name__}), "
+                  f"nouvelle tentative {attempt + 1}/{policy.max_attempts} dans {delay:.1f}s")
+            _record(retries=1, backoff=delay)
+            sleep(delay, category, attempt)
+            if before_retry is not None:
+                before_retry()
+            continue
+        except BaseException:
+            breaker.release_probe()
+            raise
+
+        breaker.record_success()
+        return result
+
+
+def get_resilience_stats() -> dict:
+    """Compteurs de reprise depuis le dernier reset."""
+    with _stats_lock:
+        stats = {**_stats, "errors": dict(_stats["errors"])}
+    stats["circuit_state"] = _global_breaker.state
+    stats["circuit_open_count"] = _global_breaker.open_count
+    return stats
+
+
+def reset_resilience() -> None:
+    """Remet à zéro les compteurs et le disjoncteur global."""
+    with _stats_lock:
+        _stats.update(calls=0, retries=0, backoff_seconds=0.0, errors={})
+    _global_breaker.reset()
@@ -0,0 +1,112 @@
+"""
+Résumé du run écrit au fil de l'eau (JSON Lines)
+
+Chaque fichier terminé ajoute une ligne au fichier de résumé, écrite et
+vidée immédiatement : un run interrompu garde les résultats déjà obtenus.
+En mémoire, l'orchestrateur ne garde qu'un FileResult par fichier
+(statut et compteurs, jamais le code), la mémoire reste stable quel que
+soit le nombre de fichiers.
+
+Format (logs/run_summary.jsonl par défaut, à côté du fichier de logs) :
+    {"type": "run", "target_dir": ..., "started_at": ...}
+    {"type": "file", "file_name": ..., "status": ..., ...}   (un par fichier)
+    {"type": "skipped", "file_path": ...}                     (deadline)
+    {"type": "summary", "total_files": ..., ...}              (fin du run)
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, Optional
+
+from src.utils import logger
+
+
+def default_summary_file() -> str:
+    """Fichier de résumé, toujours à côté du fichier de logs."""
+    return os.path.join(os.path.dirname(logger.LOG_FILE) or ".", "run_summary.jsonl")
+
+
+class FileResult:
+    """Résultat compact d'un fichier traité (sans le code original ni corrigé)."""
+
+    __slots__ = ("file_name", "file_path", "status", "iteration", "total_bugs_found", "total_bugs_fixed")
+
+    def __init__(self, file_name: str, file_path: str, status: str = "PENDING", iteration: int = 0,
+                 total_bugs_found: int = 0, total_bugs_fixed: int = 0):
+        self.file_name = file_name
+        self.file_path = file_path
+        self.status = status
+        self.iteration = iteration
+        self.total_bugs_found = total_bugs_found
+        self.total_bugs_fixed = total_bugs_fixed
+
+    def to_dict(self) -> Dict:
+        """Entrée du résumé (summary["files"])."""
+        return {
+            "file_name": self.file_name,
+            "status": self.status,
+            "iterations": self.iteration,
+            "bugs_found": self.total_bugs_found,
+            "bugs_fixed": self.total_bugs_fixed
+        }
+
+
+class SummaryWriter:
+    """
+    Écrit le résumé du run ligne par ligne (partagé par les workers).
+
+    Usage:
+        writer = SummaryWriter(path)
+        writer.write("file", {...})
+        writer.close({...})
+    """
+
+    def __init__(self, path: Optional[str] = None, target_dir: str = ""):
+        self.path = path or default_summary_file()
+        parent_dir = os.path.dirname(self.path)
+        if parent_dir:
+            os.makedirs(parent_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._file = open(self.path, "w", encoding="utf-8")
+        self.write("run", {"target_dir": target_dir, "started_at": datetime.now().isoformat()})
+
+    def write(self, record_type: str, record: Dict) -> None:
+        line = json.dumps({"type": record_type, **record}, ensure_ascii=False)
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self, summary: Optional[Dict] = None) -> None:
+        """Ajoute la ligne de synthèse (si fournie) et ferme le fichier."""
+        if summary is not None:
+            self.write("summary", summary)
+        with self._lock:
+            self._file.close()
+
+
+def read_summary(path: str) -> Dict:
+    """
+    Relit un fichier de résumé.
+
+    Returns:
+        dict: {"run": ..., "files": [...], "skipped": [...], "summary": ... ou None si le run
+        n'est pas allé à son terme}
+    """
+    result = {"run": None, "files": [], "skipped": [], "summary": None}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            record_type = record.pop("type", None)
+            if record_type == "file":
+                result["files"].append(record)
+            elif record_type == "skipped":
+                result["skipped"].append(record)
+            elif record_type in ("run", "summary"):
+                result[record_type] = record
+    return result
@@ -0,0 +1,262 @@
+"""
+Réponses JSON structurées des agents (Auditeur, Testeur, Audit + Correction)
+Schémas pydantic des rapports, demande de sortie JSON au modèle et
+réparation locale des réponses mal formées.
+
+Une réponse légèrement cassée (balises markdown, texte autour, virgule en
+trop, JSON tronqué par la limite de tokens) est réparée sans nouvel appel
+au modèle, au lieu de faire échouer le fichier.
+
+Usage:
+    kwargs = json_generation_kwargs(AuditReport)
+    response = generate_content(model, prompt, agent, model_name, **kwargs)
+    report, repaired = parse_structured(response.text, AuditReport)
+"""
+
+import inspect
+import json
+import re
+from functools import lru_cache
+from typing import List, Optional, Tuple, Type
+
+from pydantic import BaseModel, ConfigDict, ValidationError, field_validator, model_validator
+
+# Nombre maximum de points de coupure essayés sur une réponse tronquée
+_MAX_REPAIR_ATTEMPTS = 50
+
+_FENCE = re.compile(r"```(?:json|JSON)?\s*(.*?)(?:```|$)", re.DOTALL)
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+class StructuredOutputError(ValueError):
+    """Réponse du modèle impossible à réparer ou non conforme au schéma."""
+
+
+# --- Schémas des rapports ----------------------------------------------------
+
+class AuditIssue(BaseModel):
+    """Problème signalé par l'Auditeur."""
+    model_config = ConfigDict(extra="allow")
+
+    line: Optional[int] = None
+    type: str = ""
+    severity: str = "MEDIUM"
+    description: str = ""
+    suggestion: str = ""
+
+    @field_validator("line", mode="before")
+    @classmethod
+    def _parse_line(cls, value):
+        # "12", "12-14" ou "L12" : on garde la première ligne citée
+        match = re.search(r"\d+", str(value)) if value is not None else None
+        return int(match.group()) if match else None
+
+    @field_validator("severity", mode="before")
+    @classmethod
+    def _normalize_severity(cls, value):
+        return str(value).strip().upper() if value else "MEDIUM"
+
+
+class AuditReport(BaseModel):
+    """Rapport de l'Auditeur (voir le format de sortie de get_auditor_prompt)."""
+    model_config = ConfigDict(extra="allow")
+
+    file: str = ""
+    # Obligatoires : un rapport tronqué ou vide ne doit pas passer pour un
+    # fichier propre (total_issues == 0 envoie le fichier à la validation)
+    total_issues: int
+    issues: List[AuditIssue]
+
+    @model_validator(mode="after")
+    def _count_issues(self):
+        # total_issues pilote le graphe : il ne peut pas contredire la liste
+        self.total_issues = max(self.total_issues, len(self.issues))
+        return self
+
+
+class AuditFixReport(AuditReport):
+    """Réponse de l'appel combiné Audit + Correction (voir get_audit_fix_prompt)."""
+
+    fixed_code: str = ""
+
+
+class JudgeError(BaseModel):
+    """Test en échec décrit par le Testeur."""
+    model_config = ConfigDict(extra="allow")
+
+    test_name: str = ""
+    error_type: str = ""
+    error_message: str = ""
+    location: str = ""
+
+    @model_validator(mode="before")
+    @classmethod
+    def _from_message(cls, value):
+        # Le modèle renvoie parfois une simple liste de messages
+        return {"error_message": value} if isinstance(value, str) else value
+
+
+class JudgeReport(BaseModel):
+    """Décision du Testeur (voir le format de sortie de get_judge_prompt)."""
+    model_config = ConfigDict(extra="allow")
+
+    decision: str
+    tests_run: int = 0
+    tests_passed: int = 0
+    tests_failed: int = 0
+    errors: List[JudgeError] = []
+    message: str = ""
+
+    @field_validator("decision", mode="before")
+    @classmethod
+    def _normalize_decision(cls, value):
+        decision = str(value).strip().upper().replace(" ", "_")
+        if decision not in ("VALIDATE", "PASS_TO_FIXER"):
+            raise ValueError(f"décision inconnue : {value!r}")
+        return decision
+
+
+# --- Demande de sortie JSON ----------------------------------------------------
+
+@lru_cache(maxsize=1)
+def _supported_generation_fields() -> frozenset:
+    import google.generativeai as genai
+
+    try:
+        return frozenset(inspect.signature(genai.types.GenerationConfig).parameters)
+    except (AttributeError, TypeError, ValueError):
+        return frozenset()
+
+
+def json_generation_kwargs(schema: Type[BaseModel]) -> dict:
+    """
+    Options de generate_content demandant une réponse JSON conforme au schéma.
+
+    Le SDK installé n'accepte pas forcément response_mime_type / response_schema
+    (ajoutés dans les versions récentes de google-generativeai) : seules les
+    options supportées sont transmises, sinon le prompt seul décrit le format.
+
+    Returns:
+        dict: {"generation_config": {...}} ou {} si le SDK ne supporte rien
+    """
+    supported = _supported_generation_fields()
+    config = {}
+    if "response_mime_type" in supported:
+        config["response_mime_type"] = "application/json"
+        if "response_schema" in supported:
+            config["response_schema"] = schema
+    return {"generation_config": config} if config else {}
+
+
+# --- Réparation locale ---------------------------------------------------------
+
+def _strip_fences(text: str) -> str:
+    match = _FENCE.search(text)
+    return match.group(1).strip() if match else text.strip()
+
+
+def _scan(text: str) -> Tuple[List[str], bool, List[int]]:
+    """Parcourt le JSON : pile des ouvrants, chaîne ouverte en fin de texte, virgules structurelles."""
+    stack: List[str] = []
+    commas: List[int] = []
+    in_string = escaped = False
+
+    for index, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in _CLOSERS:
+            stack.append(char)
+        elif char in "}]" and stack:
+            stack.pop()
+        elif char == ",":
+            commas.append(index)
+
+    return stack, in_string, commas
+
+
+def _close(fragment: str) -> str:
+    """Ferme la chaîne et les objets/listes restés ouverts."""
+    stack, in_string, _ = _scan(fragment)
+    if in_string:
+        fragment += '"'
+    fragment = fragment.rstrip().rstrip(",:").rstrip()
+    return fragment + "".join(_CLOSERS[opener] for opener in reversed(stack))
+
+
+def repair_json(text: str):
+    """
+    Extrait un objet JSON d'une réponse du modèle, en réparant si besoin.
+
+    Étapes : balises markdown retirées, texte avant/après l'objet ignoré,
+    virgules finales supprimées, puis pour une réponse tronquée : coupure au
+    dernier élément complet et fermeture des chaînes/objets ouverts.
+
+    Returns:
+        Objet JSON décodé
+
+    Raises:
+        StructuredOutputError: Aucun objet JSON récupérable
+    """
+    cleaned = _strip_fences(text)
+    start = cleaned.find("{")
+    if start == -1:
+        raise StructuredOutputError("aucun objet JSON dans la réponse")
+
+    decoder = json.JSONDecoder()
+    body = cleaned[start:]
+    for candidate in (body, _TRAILING_COMMA.sub(r"\1", body)):
+        try:
+            return decoder.raw_decode(candidate)[0]
+        except json.JSONDecodeError:
+            continue
+
+    # Réponse tronquée : on coupe au dernier élément complet et on referme
+    body = _TRAILING_COMMA.sub(r"\1", body)
+    _, _, commas = _scan(body)
+    cuts = [len(body)] + list(reversed(commas))
+    for cut in cuts[:_MAX_REPAIR_ATTEMPTS]:
+        try:
+            return json.loads(_close(body[:cut]))
+        except json.JSONDecodeError:
+            continue
+
+    raise StructuredOutputError("JSON invalide et irréparable")
+
+
+def parse_structured(text: str, schema: Type[BaseModel]) -> Tuple[dict, bool]:
+    """
+    Décode et valide une réponse JSON du modèle.
+
+    Args:
+        text (str): Réponse brute du modèle
+        schema (type): AuditReport ou JudgeReport
+
+    Returns:
+        tuple: (rapport validé en dict, True si la réponse a dû être réparée)
+
+    Raises:
+        StructuredOutputError: JSON irréparable ou non conforme au schéma
+    """
+    try:
+        data = json.loads(_strip_fences(text))
+        repaired = False
+    except json.JSONDecodeError:
+        data = repair_json(text)
+        repaired = True
+
+    if not isinstance(data, dict):
+        raise StructuredOutputError(f"objet JSON attendu, reçu {type(data).__name__}")
+
+    try:
+        return schema.model_validate(data).model_dump(), repaired
+    except ValidationError as e:
+        raise StructuredOutputError(f"réponse non conforme à {schema.__name__} : {e}") from e
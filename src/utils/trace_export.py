@@ -0,0 +1,112 @@
+"""
+Export des spans au format OTLP/JSON (OpenTelemetry)
+
+Écrit les spans enregistrés par src.utils.tracing dans un fichier local,
+sans collecteur : le fichier peut être chargé tel quel dans un visualiseur
+de traces compatible OTLP (Jaeger, Grafana Tempo...).
+
+Usage:
+    python main.py --target_dir ./sandbox/dataset --trace_file logs/traces.otlp.json
+"""
+
+import json
+import os
+from typing import Iterable, Optional
+
+from src.utils.tracing import Span, get_spans
+
+SERVICE_NAME = "refactoring-swarm"
+SCOPE_NAME = "src.utils.tracing"
+
+# SpanKind OTLP : les appels sortants (LLM, sous-processus) sont des CLIENT
+_SPAN_KIND_INTERNAL = 1
+_SPAN_KIND_CLIENT = 3
+_CLIENT_KINDS = ("llm", "subprocess")
+
+# StatusCode OTLP
+_STATUS_OK = 1
+_STATUS_ERROR = 2
+
+
+def _attribute_value(value) -> dict:
+    """Convertit une valeur Python en AnyValue OTLP."""
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _attributes(attributes: dict) -> list:
+    return [
+        {"key": key, "value": _attribute_value(value)}
+        for key, value in attributes.items()
+        if value is not None
+    ]
+
+
+def span_to_otlp(span: Span) -> dict:
+    """Convertit un span interne en span OTLP/JSON."""
+    return {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "parentSpanId": span.parent_id or "",
+        "name": span.name,
+        "kind": _SPAN_KIND_CLIENT if span.kind in _CLIENT_KINDS else _SPAN_KIND_INTERNAL,
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.end_ns),
+        "attributes": _attributes({"swarm.kind": span.kind, **span.attributes}),
+        "status": {"code": _STATUS_ERROR if span.status == "ERROR" else _STATUS_OK},
+    }
+
+
+def build_otlp_document(spans: Optional[Iterable[Span]] = None,
+                        service_name: str = SERVICE_NAME) -> dict:
+    """
+    Construit le document OTLP/JSON (ExportTraceServiceRequest).
+
+    Args:
+        spans: Spans à exporter (défaut: spans gardés, voir configure_span_retention)
+        service_name (str): Valeur de l'attribut de ressource service.name
+
+    Returns:
+        dict: Document {"resourceSpans": [...]}
+    """
+    spans = get_spans() if spans is None else list(spans)
+
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": _attributes({"service.name": service_name})},
+            "scopeSpans": [{
+                "scope": {"name": SCOPE_NAME},
+                "spans": [span_to_otlp(s) for s in spans],
+            }],
+        }]
+    }
+
+
+def export_otlp_json(path: str, spans: Optional[Iterable[Span]] = None,
+                     service_name: str = SERVICE_NAME) -> int:
+    """
+    Écrit les spans dans un fichier OTLP/JSON.
+
+    Args:
+        path (str): Fichier de sortie (les dossiers parents sont créés)
+        spans: Spans à exporter (défaut: spans gardés, voir configure_span_retention)
+        service_name (str): Nom du service dans la trace
+
+    Returns:
+        int: Nombre de spans exportés
+    """
+    document = build_otlp_document(spans, service_name)
+
+    parent_dir = os.path.dirname(path)
+    if parent_dir:
+        os.makedirs(parent_dir, exist_ok=True)
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(document, f, ensure_ascii=False)
+
+    return len(document["resourceSpans"][0]["scopeSpans"][0]["spans"])
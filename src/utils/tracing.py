@@ -0,0 +1,337 @@
+"""
+Traçage des performances du Refactoring Swarm
+Mesure le temps passé dans chaque étape du workflow
+
+Chaque étape est enregistrée comme un "span" (intervalle de temps nommé) :
+- run         : Orchestrator.run complet
+- file        : traitement d'un fichier
+- node        : nœud du graphe LangGraph (audit, fixer, judge...)
+- llm         : appel generate_content (+ tokens de usage_metadata)
+- rate_limit  : attente imposée par le rate limiter
+- subprocess  : exécution de pytest / pylint
+- io          : lecture / écriture disque (fichiers sandbox, logs)
+
+Les spans imbriqués héritent de l'attribut "file" de leur parent, ce qui
+permet d'agréger les temps par fichier sans le repasser partout.
+
+Mémoire constante : les spans terminés sont agrégés au fil de l'eau par un
+listener (SpanAggregator) ; seuls les MAX_RETAINED_SPANS derniers sont
+gardés, sauf si le run les exporte tous (configure_span_retention).
+
+Usage:
+    from src.utils.tracing import span
+
+    with span("pytest", kind="subprocess", target=path):
+        subprocess.run(...)
+"""
+
+import contextvars
+import functools
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional
+
+# Attributs recopiés automatiquement du span parent vers ses enfants
+INHERITED_ATTRIBUTES = ("file",)
+# Spans terminés gardés pour inspection (les plus récents), hors export complet
+MAX_RETAINED_SPANS = 1000
+
+
+@dataclass
+class Span:
+    """Intervalle de temps mesuré pour une étape du workflow."""
+    name: str
+    kind: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str] = None
+    start_ns: int = 0
+    end_ns: int = 0
+    duration_s: float = 0.0
+    attributes: Dict = field(default_factory=dict)
+    status: str = "OK"
+
+    def set(self, **attributes) -> None:
+        """Ajoute des attributs au span."""
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_s": self.duration_s,
+            "attributes": dict(self.attributes),
+            "status": self.status,
+        }
+
+
+# Span actif : un ContextVar (et non un threading.local) pour que les nœuds
+# exécutés par LangGraph dans son pool de threads restent rattachés au span
+# du fichier qui a lancé le graphe.
+_current: contextvars.ContextVar = contextvars.ContextVar("current_span", default=None)
+_lock = threading.Lock()
+_finished_spans: deque = deque(maxlen=MAX_RETAINED_SPANS)
+_listeners: List[Callable[[Span], None]] = []
+
+
+def _new_id(n_bytes: int) -> str:
+    return os.urandom(n_bytes).hex()
+
+
+def current_span() -> Optional[Span]:
+    """Retourne le span actif dans le contexte courant (ou None)."""
+    return _current.get()
+
+
+@contextmanager
+def span(name: str, kind: str = "internal", **attributes):
+    """
+    Mesure la durée du bloc et l'enregistre comme span.
+
+    Args:
+        name (str): Nom de l'étape (ex: "audit", "pytest")
+        kind (str): Catégorie (run, file, node, llm, rate_limit, subprocess, io)
+        **attributes: Attributs libres (file, agent, model...)
+
+    Yields:
+        Span: Le span en cours, pour y ajouter des attributs
+    """
+    parent = current_span()
+
+    inherited = {}
+    if parent is not None:
+        inherited = {
+            key: parent.attributes[key]
+            for key in INHERITED_ATTRIBUTES
+            if key in parent.attributes
+        }
+
+    current = Span(
+        name=name,
+        kind=kind,
+        trace_id=parent.trace_id if parent else _new_id(16),
+        span_id=_new_id(8),
+        parent_id=parent.span_id if parent else None,
+        start_ns=time.time_ns(),
+        attributes={**inherited, **attributes},
+    )
+
+    token = _current.set(current)
+    start = time.perf_counter()
+    try:
+        yield current
+    except BaseException as e:
+        current.status = "ERROR"
+        current.attributes["error_type"] = type(e).__name__
+        raise
+    finally:
+        current.duration_s = time.perf_counter() - start
+        current.end_ns = time.time_ns()
+        _current.reset(token)
+        with _lock:
+            _finished_spans.append(current)
+        _notify(current)
+
+
+def add_span_listener(listener: Callable[[Span], None]) -> None:
+    """Enregistre une fonction appelée à la fin de chaque span (ex: métriques)."""
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def remove_span_listener(listener: Callable[[Span], None]) -> None:
+    """Retire une fonction enregistrée avec add_span_listener."""
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+def _notify(finished: Span) -> None:
+    for listener in list(_listeners):
+        try:
+            listener(finished)
+        except Exception as e:
+            # Une erreur de métrique ne doit jamais interrompre le workflow
+            print(f"⚠️ Listener de span en erreur ({finished.name}) : {e}")
+
+
+def traced(name: str, kind: str = "internal"):
+    """
+    Décorateur : exécute la fonction dans un span.
+
+    Pour les nœuds du graphe, l'attribut "file" est extrait de l'état.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            attributes = {}
+            state = args[0] if args else None
+            if isinstance(state, dict) and "file_name" in state:
+                attributes["file"] = state["file_name"]
+                attributes["iteration"] = state.get("iteration", 0)
+            with span(name, kind=kind, **attributes):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record_llm_usage(current: Span, response) -> None:
+    """
+    Copie les compteurs de tokens de la réponse Gemini dans le span.
+
+    Les anciennes versions du SDK ne renvoient pas usage_metadata :
+    le span reste alors sans tokens.
+    """
+    usage = getattr(response, "usage_metadata", None)
+    if usage is None:
+        return
+
+    prompt_tokens = getattr(usage, "prompt_token_count", None)
+    output_tokens = getattr(usage, "candidates_token_count", None)
+    total_tokens = getattr(usage, "total_token_count", None)
+
+    if prompt_tokens is not None:
+        current.set(prompt_tokens=prompt_tokens)
+    if output_tokens is not None:
+        current.set(output_tokens=output_tokens)
+    if total_tokens is not None:
+        current.set(total_tokens=total_tokens)
+
+
+def get_spans() -> List[Span]:
+    """Retourne une copie des spans gardés (les MAX_RETAINED_SPANS derniers, ou tous)."""
+    with _lock:
+        return list(_finished_spans)
+
+
+def configure_span_retention(keep_all: bool) -> None:
+    """Garde tous les spans (export de la trace complète) ou seulement les plus récents."""
+    global _finished_spans
+    with _lock:
+        _finished_spans = deque(_finished_spans, maxlen=None if keep_all else MAX_RETAINED_SPANS)
+
+
+def reset_tracing() -> None:
+    """Efface les spans gardés et l'agrégat du run."""
+    with _lock:
+        _finished_spans.clear()
+    _run_aggregator.reset()
+
+
+def _add(bucket: dict, key: str, duration: float) -> None:
+    entry = bucket.setdefault(key, {"count": 0, "total_s": 0.0, "max_s": 0.0})
+    entry["count"] += 1
+    entry["total_s"] += duration
+    entry["max_s"] = max(entry["max_s"], duration)
+
+
+def _add_llm(bucket: Dict[str, dict], key: str, s: Span) -> None:
+    stats = bucket.setdefault(key, {
+        "calls": 0, "total_s": 0.0, "prompt_tokens": 0, "output_tokens": 0,
+        "prompt_tokens_saved": 0
+    })
+    stats["calls"] += 1
+    stats["total_s"] += s.duration_s
+    stats["prompt_tokens"] += s.attributes.get("prompt_tokens", 0)
+    stats["output_tokens"] += s.attributes.get("output_tokens", 0)
+    stats["prompt_tokens_saved"] += s.attributes.get("prompt_tokens_saved", 0)
+
+
+class SpanAggregator:
+    """
+    Agrégats des spans par catégorie, par nœud, par opération d'E/S, par fichier,
+    par agent et par niveau de modèle (les décisions du moteur de règles comptent
+    comme des appels sans token au niveau "rules").
+
+    Mis à jour span par span (add), sans garder les spans eux-mêmes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.by_kind: Dict[str, dict] = {}
+            self.by_node: Dict[str, dict] = {}
+            self.by_io: Dict[str, dict] = {}
+            self.by_file: Dict[str, dict] = {}
+            self.llm_by_agent: Dict[str, dict] = {}
+            self.llm_by_model: Dict[str, dict] = {}
+
+    def add(self, s: Span) -> None:
+        with self._lock:
+            _add(self.by_kind, s.kind, s.duration_s)
+
+            if s.kind == "node":
+                _add(self.by_node, s.name, s.duration_s)
+            elif s.kind == "io":
+                _add(self.by_io, s.name, s.duration_s)
+
+            file_name = s.attributes.get("file")
+            if file_name is not None:
+                per_file = self.by_file.setdefault(file_name, {})
+                key = "wall_s" if s.kind == "file" else f"{s.kind}_s"
+                per_file[key] = per_file.get(key, 0.0) + s.duration_s
+
+            if s.kind == "llm":
+                _add_llm(self.llm_by_agent, s.attributes.get("agent", "unknown"), s)
+                _add_llm(self.llm_by_model, s.attributes.get("model", "unknown"), s)
+            elif s.kind == "rules" and s.attributes.get("decided"):
+                _add_llm(self.llm_by_model, s.attributes.get("model", "rules"), s)
+
+    def summary(self) -> dict:
+        """Copie des agrégats, avec les moyennes des appels LLM."""
+        with self._lock:
+            result = {
+                "by_kind": _copy(self.by_kind),
+                "by_node": _copy(self.by_node),
+                "by_io": _copy(self.by_io),
+                "by_file": _copy(self.by_file),
+                "llm_by_agent": _copy(self.llm_by_agent),
+                "llm_by_model": _copy(self.llm_by_model),
+            }
+
+        for stats in list(result["llm_by_agent"].values()) + list(result["llm_by_model"].values()):
+            calls = stats["calls"]
+            stats["avg_s"] = stats["total_s"] / calls
+            stats["avg_prompt_tokens"] = stats["prompt_tokens"] / calls
+            stats["avg_output_tokens"] = stats["output_tokens"] / calls
+        return result
+
+
+def _copy(bucket: Dict[str, dict]) -> Dict[str, dict]:
+    return {key: dict(value) for key, value in bucket.items()}
+
+
+# Agrégat du run courant, alimenté à la fin de chaque span (comme les métriques)
+_run_aggregator = SpanAggregator()
+add_span_listener(_run_aggregator.add)
+
+
+def summarize_spans(spans: Optional[Iterable[Span]] = None) -> dict:
+    """
+    Agrège les spans (voir SpanAggregator).
+
+    Args:
+        spans: Spans à agréger (défaut: tous les spans terminés depuis reset_tracing,
+            agrégés au fil de l'eau)
+
+    Returns:
+        dict: {"by_kind", "by_node", "by_io", "by_file", "llm_by_agent", "llm_by_model"}
+    """
+    if spans is None:
+        return _run_aggregator.summary()
+
+    aggregator = SpanAggregator()
+    for s in spans:
+        aggregator.add(s)
+    return aggregator.summary()
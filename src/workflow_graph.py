@@ -6,14 +6,47 @@ Ne pas modifier sans synchroniser avec l'équipe
 Responsable : Lead Dev (Orchestrateur)
 Date : 2026-01-31
 Version : 2.0 - LangGraph Implementation (Logique identique à v1.1)
+
+LangGraph et les agents (google.generativeai) ne sont importés qu'à la
+construction du graphe : utiliser get_refactoring_graph(), qui le compile
+une seule fois, à la première utilisation.
+
+Arrêt anticipé : chaque version rejetée par le Judge est mémorisée par son
+hash. Si le Fixer renvoie la dernière version rejetée (point fixe, STALLED)
+ou une version rejetée plus tôt (cycle, OSCILLATING), la boucle s'arrête sans
+rappeler le Judge ni l'Auditeur, et la meilleure version testée est remise
+dans le fichier.
+
+Niveaux de modèles (src.utils.model_tiers) : chaque nœud commence au niveau
+courant du fichier et essaie le niveau suivant si la sortie est invalide ;
+un PASS_TO_FIXER fait monter l'Auditeur et le Correcteur d'un niveau pour
+l'itération suivante. Chaque escalade est gardée dans l'état ("escalations").
+
+Audit + Correction fusionnés (optionnel, create_refactoring_graph(fuse_max_tokens)) :
+un fichier dont le code tient sous le seuil passe par le nœud "audit_fix",
+qui obtient la liste des problèmes et le code corrigé en un seul appel ;
+les fichiers plus gros gardent la séquence Auditeur -> Correcteur. Si aucun
+niveau ne renvoie de réponse utilisable, le fichier repasse par la séquence
+Auditeur -> Correcteur (pour cette itération et les suivantes).
+
+État léger : l'état ne contient pas le code, seulement le hash des versions
+(courante, meilleure) ; le texte est gardé une fois dans un magasin partagé
+(CODE_STORE), libéré par l'orchestrateur à la fin du fichier. Chaque nœud
+ne renvoie que les clés qu'il modifie, sans réducteur : une transition ne
+copie rien qui dépende de la taille du fichier.
 """
 
-from typing import TypedDict, Annotated, Literal
-from langgraph.graph import StateGraph, END
-import operator
+from typing import Callable, Dict, Literal, Optional, Set, TypedDict
+import hashlib
+import threading
 
-from src.agents import AuditorAgent, FixerAgent, JudgeAgent
-from src.tools.file_tools import read_file
+from src.prompts.budget import count_tokens
+from src.prompts.context_prompt import get_fix_examples
+from src.tools.file_tools import read_file, write_file
+from src.tools.fix_memory import find_similar_fixes
+from src.tools.test_impact import select_tests
+from src.utils.model_tiers import RULES, llm_models, max_level, models_for
+from src.utils.tracing import traced
 
 
 class RefactoringState(TypedDict):
@@ -23,15 +56,215 @@ class RefactoringState(TypedDict):
     """
     file_path: str
     file_name: str
-    iteration: Annotated[int, operator.add]
+    iteration: int
     max_iterations: int
     audit_report: dict
     judge_report: dict
-    status: Literal["PENDING", "VALIDATED", "FAILED", "MAX_ITERATIONS"]
-    total_bugs_found: Annotated[int, operator.add]
-    total_bugs_fixed: Annotated[int, operator.add]
-    original_code: str
-    current_code: str
+    status: Literal["PENDING", "VALIDATED", "FAILED", "MAX_ITERATIONS", "STALLED", "OSCILLATING"]
+    total_bugs_found: int
+    total_bugs_fixed: int
+    # Hash de la version présente dans le fichier (texte dans CODE_STORE)
+    current_hash: str
+    # Arrêt anticipé : hashs des versions rejetées par le Judge (dans l'ordre),
+    # convergence détectée après le Fixer, meilleure version testée
+    rejected_hashes: list
+    convergence: Optional[str]
+    best_hash: Optional[str]
+    best_score: Optional[list]
+    # Signatures des symboles importés d'autres fichiers du projet (src.tools.dependency_graph)
+    dependency_context: str
+    # Niveau de modèle courant du fichier et escalades effectuées
+    model_tier: int
+    escalations: list
+    # Audit + Correction fusionnés en échec : séquence Auditeur -> Correcteur
+    fused_fallback: bool
+
+
+def code_hash(code: str) -> str:
+    """Empreinte SHA-256 d'une version du code."""
+    return hashlib.sha256(code.encode("utf-8")).hexdigest()
+
+
+class CodeStore:
+    """
+    Versions du code par hash, partagées par les fichiers en cours.
+
+    Chaque version est rattachée aux fichiers (owner) qui l'ont produite ;
+    release(owner) libère celles qui ne servent plus à aucun fichier.
+    """
+
+    def __init__(self):
+        self._codes: Dict[str, str] = {}
+        self._owners: Dict[str, Set[str]] = {}
+        self._by_owner: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def put(self, code: str, owner: str) -> str:
+        """Mémorise une version du code et retourne son hash."""
+        digest = code_hash(code)
+        with self._lock:
+            self._codes.setdefault(digest, code)
+            self._owners.setdefault(digest, set()).add(owner)
+            self._by_owner.setdefault(owner, set()).add(digest)
+        return digest
+
+    def get(self, digest: str) -> str:
+        with self._lock:
+            return self._codes[digest]
+
+    def release(self, owner: str) -> int:
+        """
+        Oublie les versions d'un fichier.
+
+        Returns:
+            int: Nombre de versions effectivement libérées
+        """
+        freed = 0
+        with self._lock:
+            for digest in self._by_owner.pop(owner, set()):
+                owners = self._owners[digest]
+                owners.discard(owner)
+                if not owners:
+                    del self._owners[digest]
+                    del self._codes[digest]
+                    freed += 1
+        return freed
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._codes)
+
+
+CODE_STORE = CodeStore()
+
+
+def detect_convergence(code: str, rejected_hashes: list) -> Optional[str]:
+    """
+    Compare une nouvelle version aux versions déjà rejetées par le Judge.
+
+    Returns:
+        "STALLED" si c'est la dernière version rejetée (point fixe),
+        "OSCILLATING" si c'est une version rejetée plus tôt (cycle),
+        None sinon
+    """
+    return _convergence(code_hash(code), rejected_hashes)
+
+
+def _convergence(digest: str, rejected_hashes: list) -> Optional[str]:
+    if rejected_hashes and rejected_hashes[-1] == digest:
+        return "STALLED"
+    if digest in rejected_hashes:
+        return "OSCILLATING"
+    return None
+
+
+def _judge_score(judge_report: dict) -> list:
+    """Score d'une version testée : moins de tests en échec, puis plus de tests réussis."""
+    # Le Judge renvoie "failed"/"passed" ou "tests_failed"/"tests_passed" selon le chemin
+    failed = judge_report.get("failed", judge_report.get("tests_failed", 0)) or 0
+    passed = judge_report.get("passed", judge_report.get("tests_passed", 0)) or 0
+    return [failed, -passed]
+
+
+def _restore_best_version(state: RefactoringState) -> str:
+    """
+    Remet dans le fichier la meilleure version testée, si ce n'est pas la version courante.
+
+    Returns:
+        str: Hash de la version présente dans le fichier après restauration
+    """
+    best_hash = state.get("best_hash")
+    if best_hash is None or best_hash == state["current_hash"]:
+        return state["current_hash"]
+
+    try:
+        write_file(state["file_path"], CODE_STORE.get(best_hash))
+    except Exception as e:
+        print(f"ERREUR: Impossible de restaurer la meilleure version : {e}")
+        return state["current_hash"]
+
+    print(f"Meilleure version restauree ({state.get('best_score')})")
+    return best_hash
+
+
+def _read_version(state: RefactoringState) -> tuple:
+    """
+    Relit le fichier après correction et mémorise la version dans CODE_STORE.
+
+    Returns:
+        tuple: (hash de la version, convergence détectée ou None)
+    """
+    current_code = read_file(state["file_path"])
+    digest = CODE_STORE.put(current_code, state["file_path"])
+    # Version déjà rejetée par le Judge : inutile de la retester
+    return digest, _convergence(digest, state.get("rejected_hashes") or [])
+
+
+def _escalation(node: str, from_model: str, to_model: str, reason: str) -> dict:
+    print(f"Escalade {node} : {from_model} -> {to_model} ({reason})")
+    return {"node": node, "from": from_model, "to": to_model, "reason": reason}
+
+
+def _escalations_update(state: RefactoringState, new_escalations: list) -> dict:
+    """Clé "escalations" à renvoyer par un nœud (aucune si rien de nouveau)."""
+    if not new_escalations:
+        return {}
+    return {"escalations": (state.get("escalations") or []) + new_escalations}
+
+
+def _run_tiers(node: str, models: list, run: Callable, escalations: list,
+               before_retry: Optional[Callable] = None):
+    """
+    Appelle run(model) sur chaque niveau jusqu'à une sortie valide (ni None ni False).
+
+    Returns:
+        Le dernier résultat obtenu
+    """
+    result = None
+    for index, model in enumerate(models):
+        result = run(model)
+        if result is not None and result is not False:
+            break
+        if index + 1 < len(models):
+            escalations.append(_escalation(node, model, models[index + 1], "invalid_output"))
+            if before_retry is not None:
+                before_retry()
+    return result
+
+
+def _run_judge(state: RefactoringState, escalations: list):
+    """Testeur : moteur de règles puis modèles, du moins cher au plus fort."""
+    from src.agents import JudgeAgent
+
+    tiers = models_for("judge")
+    models = llm_models(tiers)
+    use_rules = RULES in tiers
+    # Tests impactés par le fichier (une sélection par passage, quel que soit le modèle)
+    test_paths, _ = select_tests(state["file_path"])
+    # pytest une seule fois par passage : le code ne change pas d'un niveau à l'autre
+    pytest_result = None
+
+    def run(model):
+        nonlocal pytest_result
+        judge = JudgeAgent(model, use_rules=use_rules and model == models[0])
+        report = judge.judge_file(state["file_path"], state["audit_report"], test_paths=test_paths,
+                                  pytest_result=pytest_result)
+        pytest_result = judge.pytest_result or pytest_result
+        return report
+
+    return _run_tiers("judge", models, run, escalations)
+
+
+def _escalate_after_rejection(state: RefactoringState, escalations: list) -> int:
+    """PASS_TO_FIXER : l'itération suivante passe au niveau supérieur (s'il existe)."""
+    level = state.get("model_tier", 0)
+    top = max(max_level("auditor"), max_level("fixer"))
+    if level >= top:
+        return level
+    escalations.append(_escalation(
+        "fixer", models_for("fixer", level)[0], models_for("fixer", level + 1)[0], "pass_to_fixer"
+    ))
+    return level + 1
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -39,7 +272,7 @@ class RefactoringState(TypedDict):
 #  Logique identique : lignes 166-179 de l'orchestrateur original
 # ═══════════════════════════════════════════════════════════════
 
-def audit_node(state: RefactoringState) -> RefactoringState:
+def audit_node(state: RefactoringState) -> dict:
     """
     Nœud AUDITOR : Analyse le code et détecte les problèmes.
     
@@ -55,27 +288,33 @@ def audit_node(state: RefactoringState) -> RefactoringState:
     print(f"ITERATION {state['iteration'] + 1}/{state['max_iterations']}")
     print(f"{'='*80}")
     
-    auditor = AuditorAgent()
-    audit_report = auditor.analyze_file(state["file_path"])
+    from src.agents import AuditorAgent
+    
+    escalations = []
+    audit_report = _run_tiers(
+        "audit", models_for("auditor", state.get("model_tier", 0)),
+        lambda model: AuditorAgent(model).analyze_file(state["file_path"], state.get("dependency_context", "")),
+        escalations,
+    )
     
     # EXACTEMENT comme ligne 170 : if audit_report is None
     if audit_report is None:
         print(f"ERREUR: Audit echoue - Arret du traitement")
         return {
-            **state,
             "audit_report": {},
             "status": "FAILED",
-            "iteration": 1
+            "iteration": state["iteration"] + 1,
+            **_escalations_update(state, escalations)
         }
     
     # EXACTEMENT comme lignes 175-176
     bugs_found = audit_report.get("total_issues", 0)
     
     return {
-        **state,
         "audit_report": audit_report,
-        "total_bugs_found": bugs_found,
-        "iteration": 1
+        "total_bugs_found": state["total_bugs_found"] + bugs_found,
+        "iteration": state["iteration"] + 1,
+        **_escalations_update(state, escalations)
     }
 
 
@@ -118,7 +357,7 @@ def route_after_audit(state: RefactoringState) -> Literal["judge_clean_code", "f
 #  Logique identique : lignes 181-193 de l'orchestrateur original
 # ═══════════════════════════════════════════════════════════════
 
-def judge_clean_code_node(state: RefactoringState) -> RefactoringState:
+def judge_clean_code_node(state: RefactoringState) -> dict:
     """
     Nœud JUDGE pour code propre (0 bugs détectés).
     
@@ -132,26 +371,26 @@ def judge_clean_code_node(state: RefactoringState) -> RefactoringState:
             state.status = "FAILED"
             break
     """
-    judge = JudgeAgent()
+    escalations = []
     
     # EXACTEMENT comme ligne 182 : Passer audit_report au judge
-    judge_report = judge.judge_file(state["file_path"], state["audit_report"])
+    judge_report = _run_judge(state, escalations)
     
     # EXACTEMENT comme ligne 184
     if judge_report and judge_report.get("decision") == "VALIDATE":
         print(f"\n✅ {state['file_name']} VALIDE !")
         return {
-            **state,
             "judge_report": judge_report,
-            "status": "VALIDATED"
+            "status": "VALIDATED",
+            **_escalations_update(state, escalations)
         }
     else:
         # EXACTEMENT comme lignes 189-191
         print(f"ATTENTION: Tests ont echoue malgre l'absence de bugs detectes")
         return {
-            **state,
             "judge_report": judge_report if judge_report else {},
-            "status": "FAILED"
+            "status": "FAILED",
+            **_escalations_update(state, escalations)
         }
 
 
@@ -160,7 +399,7 @@ def judge_clean_code_node(state: RefactoringState) -> RefactoringState:
 #  Logique identique : lignes 195-201 de l'orchestrateur original
 # ═══════════════════════════════════════════════════════════════
 
-def fixer_node(state: RefactoringState) -> RefactoringState:
+def fixer_node(state: RefactoringState) -> dict:
     """
     Nœud FIXER : Corrige les bugs selon le rapport d'audit.
     
@@ -172,45 +411,150 @@ def fixer_node(state: RefactoringState) -> RefactoringState:
         state.current_code = read_file(file_path)
         state.total_bugs_fixed += bugs_found
     """
-    fixer = FixerAgent()
+    from src.agents import FixerAgent
+    
+    escalations = []
+    
+    def restore_current_code():
+        # Une correction invalide a été écrite : le niveau suivant repart de la version courante
+        write_file(state["file_path"], CODE_STORE.get(state["current_hash"]))
+    
+    # Corrections validées de fonctions quasi identiques, en exemples pour le Correcteur
+    examples = get_fix_examples(find_similar_fixes(CODE_STORE.get(state["current_hash"])))
     
     # EXACTEMENT comme ligne 196
-    fix_success = fixer.fix_file(state["file_path"], state["audit_report"])
+    fix_success = _run_tiers(
+        "fixer", models_for("fixer", state.get("model_tier", 0)),
+        lambda model: FixerAgent(model).fix_file(state["file_path"], state["audit_report"],
+                                                 state.get("dependency_context", ""), examples),
+        escalations, before_retry=restore_current_code,
+    )
     
     # EXACTEMENT comme ligne 198
     if not fix_success:
         print(f"ERREUR: Correction echouee - Arret du traitement")
         return {
-            **state,
-            "status": "FAILED"
+            "status": "FAILED",
+            **_escalations_update(state, escalations)
         }
     
     # EXACTEMENT comme ligne 202
     try:
-        current_code = read_file(state["file_path"])
+        current_hash, convergence = _read_version(state)
     except Exception as e:
         print(f"ERREUR: Impossible de lire le fichier corrigé : {e}")
         return {
-            **state,
-            "status": "FAILED"
+            "status": "FAILED",
+            **_escalations_update(state, escalations)
         }
     
     # EXACTEMENT comme ligne 203
     bugs_fixed = state["audit_report"].get("total_issues", 0)
     
     return {
-        **state,
-        "current_code": current_code,
-        "total_bugs_fixed": bugs_fixed
+        "current_hash": current_hash,
+        "total_bugs_fixed": state["total_bugs_fixed"] + bugs_fixed,
+        "convergence": convergence,
+        **_escalations_update(state, escalations)
     }
 
 
+# ═══════════════════════════════════════════════════════════════
+#  NŒUD 3 bis : AUDIT + FIX en un seul appel (petits fichiers)
+#  Remplace AUDIT puis FIXER quand la fusion est activée
+# ═══════════════════════════════════════════════════════════════
+
+def audit_fix_node(state: RefactoringState) -> dict:
+    """
+    Nœud AUDIT_FIX : problèmes et code corrigé dans la même réponse.
+    
+    Mêmes effets sur l'état que AUDIT suivi de FIXER : rapport d'audit,
+    bugs trouvés/corrigés, nouvelle version du code et détection de convergence.
+    """
+    print(f"\n{'='*80}")
+    print(f"ITERATION {state['iteration'] + 1}/{state['max_iterations']} (audit + correction)")
+    print(f"{'='*80}")
+    
+    from src.agents import AuditFixAgent
+    
+    escalations = []
+    audit_report = _run_tiers(
+        "audit_fix", models_for("audit_fix", state.get("model_tier", 0)),
+        lambda model: AuditFixAgent(model).audit_and_fix(state["file_path"],
+                                                         state.get("dependency_context", "")),
+        escalations,
+    )
+    
+    if audit_report is None:
+        print(f"ATTENTION: Audit + correction inutilisable - Auditeur puis Correcteur")
+        return {"fused_fallback": True, **_escalations_update(state, escalations)}
+    
+    bugs_found = audit_report.get("total_issues", 0)
+    updates = {
+        "audit_report": audit_report,
+        "total_bugs_found": state["total_bugs_found"] + bugs_found,
+        "iteration": state["iteration"] + 1,
+        **_escalations_update(state, escalations)
+    }
+    
+    if bugs_found:
+        try:
+            current_hash, convergence = _read_version(state)
+        except Exception as e:
+            print(f"ERREUR: Impossible de lire le fichier corrigé : {e}")
+            return {**updates, "status": "FAILED"}
+        updates.update(
+            current_hash=current_hash,
+            total_bugs_fixed=state["total_bugs_fixed"] + bugs_found,
+            convergence=convergence
+        )
+    
+    return updates
+
+
+def route_after_audit_fix(state: RefactoringState) -> Literal["audit", "judge_clean_code", "judge_after_fix",
+                                                             "stop_early", "end"]:
+    """Après AUDIT_FIX : AUDIT en cas d'échec, comme après AUDIT si aucun bug, comme après FIXER sinon."""
+    if state.get("fused_fallback"):
+        return "audit"
+    route = route_after_audit(state)
+    if route == "fixer":
+        return route_after_fix(state)
+    return route
+
+
+def make_entry_router(fuse_max_tokens: int) -> Callable[[RefactoringState], str]:
+    """Début d'itération : AUDIT_FIX si le code tient sous le seuil, AUDIT sinon."""
+    def route_entry(state: RefactoringState) -> Literal["audit_fix", "audit"]:
+        if state.get("fused_fallback"):
+            return "audit"
+        if count_tokens(CODE_STORE.get(state["current_hash"])) <= fuse_max_tokens:
+            return "audit_fix"
+        return "audit"
+    return route_entry
+
+
+def start_node(state: RefactoringState) -> dict:
+    """Nœud d'aiguillage (aucune mise à jour de l'état)."""
+    return {}
+
+
+def route_after_fix(state: RefactoringState) -> Literal["judge_after_fix", "stop_early"]:
+    """
+    Après le FIXER : test de la nouvelle version, ou arrêt si elle a déjà été rejetée.
+    """
+    if state.get("convergence"):
+        print(f"\nATTENTION: Le Fixer renvoie une version deja rejetee ({state['convergence']})")
+        return "stop_early"
+    return "judge_after_fix"
+
+
 # ═══════════════════════════════════════════════════════════════
 #  NŒUD 4 : JUDGE (après FIX)
 #  Logique identique : lignes 205-228 de l'orchestrateur original
 # ═══════════════════════════════════════════════════════════════
 
-def judge_after_fix_node(state: RefactoringState) -> RefactoringState:
+def judge_after_fix_node(state: RefactoringState) -> dict:
     """
     Nœud JUDGE après correction.
     
@@ -229,24 +573,33 @@ def judge_after_fix_node(state: RefactoringState) -> RefactoringState:
             status = "FAILED"
             break
     """
-    judge = JudgeAgent()
+    escalations = []
     
     # EXACTEMENT comme ligne 207 : Passer audit_report
-    judge_report = judge.judge_file(state["file_path"], state["audit_report"])
+    judge_report = _run_judge(state, escalations)
     
     # EXACTEMENT comme ligne 209
     if judge_report is None:
         print(f"ERREUR: Test echoue - Arret du traitement")
         return {
-            **state,
             "judge_report": {},
-            "status": "FAILED"
+            "status": "FAILED",
+            **_escalations_update(state, escalations)
         }
     
-    return {
-        **state,
-        "judge_report": judge_report
-    }
+    updates = {"judge_report": judge_report}
+    
+    if judge_report.get("decision") != "VALIDATE":
+        updates["model_tier"] = _escalate_after_rejection(state, escalations)
+        # Version rejetée : mémorisée pour détecter points fixes et cycles
+        updates["rejected_hashes"] = (state.get("rejected_hashes") or []) + [state["current_hash"]]
+        score = _judge_score(judge_report)
+        if state.get("best_score") is None or score <= state["best_score"]:
+            updates["best_hash"] = state["current_hash"]
+            updates["best_score"] = score
+    
+    updates.update(_escalations_update(state, escalations))
+    return updates
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -307,19 +660,16 @@ def route_after_judge(state: RefactoringState) -> Literal["validate", "retry_aud
 #  NŒUDS FINAUX : VALIDATE et FAIL
 # ═══════════════════════════════════════════════════════════════
 
-def validate_node(state: RefactoringState) -> RefactoringState:
+def validate_node(state: RefactoringState) -> dict:
     """
     Nœud final : Validation réussie.
     
     LOGIQUE ORIGINALE : Correspond aux lignes 217-220 et 185-187
     """
-    return {
-        **state,
-        "status": "VALIDATED"
-    }
+    return {"status": "VALIDATED"}
 
 
-def fail_node(state: RefactoringState) -> RefactoringState:
+def fail_node(state: RefactoringState) -> dict:
     """
     Nœud final : Échec.
     
@@ -328,13 +678,22 @@ def fail_node(state: RefactoringState) -> RefactoringState:
     # EXACTEMENT comme ligne 225
     if state["iteration"] >= state["max_iterations"]:
         return {
-            **state,
+            "current_hash": _restore_best_version(state),
             "status": "MAX_ITERATIONS"
         }
     
+    return {"status": "FAILED"}
+
+
+def stop_early_node(state: RefactoringState) -> dict:
+    """
+    Nœud final : arrêt anticipé (point fixe ou cycle du Fixer).
+    
+    Garde la meilleure version testée et prend le statut STALLED ou OSCILLATING.
+    """
     return {
-        **state,
-        "status": "FAILED"
+        "current_hash": _restore_best_version(state),
+        "status": state["convergence"]
     }
 
 
@@ -343,11 +702,16 @@ def fail_node(state: RefactoringState) -> RefactoringState:
 #  Reproduit exactement le flux de l'orchestrateur original
 # ═══════════════════════════════════════════════════════════════
 
-def create_refactoring_graph() -> StateGraph:
+def create_refactoring_graph(fuse_max_tokens: Optional[int] = None):
     """
     Crée le graphe LangGraph qui reproduit EXACTEMENT la logique
     de la boucle while de l'orchestrateur original (lignes 164-232).
     
+    Args:
+        fuse_max_tokens (int, optional): Active le nœud AUDIT_FIX pour les
+            fichiers d'au plus ce nombre de tokens (un appel au lieu de deux
+            par itération). None : séquence Auditeur -> Correcteur seule.
+    
     FLUX ORIGINAL :
         while iteration < max_iterations:
             iteration += 1
@@ -376,20 +740,50 @@ def create_refactoring_graph() -> StateGraph:
             elif decision == "PASS_TO_FIXER": continue (RETRY)
             else: break (FAILED)
     """
+    from langgraph.graph import StateGraph, END
+    
     print("\n🏗️  Construction du graphe LangGraph (logique v1.1)...")
     
     workflow = StateGraph(RefactoringState)
     
-    # Ajout des nœuds
-    workflow.add_node("audit", audit_node)
-    workflow.add_node("judge_clean_code", judge_clean_code_node)
-    workflow.add_node("fixer", fixer_node)
-    workflow.add_node("judge_after_fix", judge_after_fix_node)
-    workflow.add_node("validate", validate_node)
-    workflow.add_node("fail", fail_node)
-    
-    # Point d'entrée : AUDIT (comme ligne 166)
-    workflow.set_entry_point("audit")
+    # Ajout des nœuds (chaque nœud est mesuré par le traçage)
+    workflow.add_node("audit", traced("audit", kind="node")(audit_node))
+    workflow.add_node("judge_clean_code", traced("judge_clean_code", kind="node")(judge_clean_code_node))
+    workflow.add_node("fixer", traced("fixer", kind="node")(fixer_node))
+    workflow.add_node("judge_after_fix", traced("judge_after_fix", kind="node")(judge_after_fix_node))
+    workflow.add_node("validate", traced("validate", kind="node")(validate_node))
+    workflow.add_node("fail", traced("fail", kind="node")(fail_node))
+    workflow.add_node("stop_early", traced("stop_early", kind="node")(stop_early_node))
+    
+    if fuse_max_tokens is None:
+        # Point d'entrée : AUDIT (comme ligne 166)
+        workflow.set_entry_point("audit")
+        iteration_start = "audit"
+    else:
+        # Chaque itération commence par l'aiguillage AUDIT_FIX / AUDIT
+        workflow.add_node("audit_fix", traced("audit_fix", kind="node")(audit_fix_node))
+        workflow.add_node("start", start_node)
+        workflow.set_entry_point("start")
+        iteration_start = "start"
+        workflow.add_conditional_edges(
+            "start",
+            make_entry_router(fuse_max_tokens),
+            {
+                "audit_fix": "audit_fix",
+                "audit": "audit"
+            }
+        )
+        workflow.add_conditional_edges(
+            "audit_fix",
+            route_after_audit_fix,
+            {
+                "audit": "audit",
+                "judge_clean_code": "judge_clean_code",
+                "judge_after_fix": "judge_after_fix",
+                "stop_early": "stop_early",
+                "end": "fail"
+            }
+        )
     
     # Après AUDIT : bugs == 0 ? → JUDGE_CLEAN_CODE, sinon → FIXER
     # (comme lignes 178-193 vs 195+)
@@ -413,8 +807,16 @@ def create_refactoring_graph() -> StateGraph:
         }
     )
     
-    # Après FIXER : JUDGE_AFTER_FIX (comme ligne 205)
-    workflow.add_edge("fixer", "judge_after_fix")
+    # Après FIXER : JUDGE_AFTER_FIX (comme ligne 205), sauf si le Fixer
+    # renvoie une version déjà rejetée (point fixe ou cycle)
+    workflow.add_conditional_edges(
+        "fixer",
+        route_after_fix,
+        {
+            "judge_after_fix": "judge_after_fix",
+            "stop_early": "stop_early"
+        }
+    )
     
     # Après JUDGE_AFTER_FIX : VALIDATE, RETRY ou FAIL
     # (comme lignes 215-231)
@@ -423,7 +825,7 @@ def create_refactoring_graph() -> StateGraph:
         route_after_judge,
         {
             "validate": "validate",
-            "retry_audit": "audit",  # Continue (comme ligne 228)
+            "retry_audit": iteration_start,  # Continue (comme ligne 228)
             "fail": "fail"
         }
     )
@@ -431,6 +833,7 @@ def create_refactoring_graph() -> StateGraph:
     # Nœuds finaux
     workflow.add_edge("validate", END)
     workflow.add_edge("fail", END)
+    workflow.add_edge("stop_early", END)
     
     app = workflow.compile()
     
@@ -439,5 +842,35 @@ def create_refactoring_graph() -> StateGraph:
     return app
 
 
-# Instance globale (à importer dans orchestrator.py)
-refactoring_graph = create_refactoring_graph()
\ No newline at end of file
+# Graphes compilés à la première utilisation, par seuil de fusion
+_refactoring_graphs = {}
+_graph_lock = threading.Lock()
+
+
+def get_refactoring_graph(fuse_max_tokens: Optional[int] = None):
+    """
+    Retourne le graphe compilé, en le construisant au premier appel.
+    
+    Args:
+        fuse_max_tokens (int, optional): Seuil du nœud AUDIT_FIX (voir create_refactoring_graph)
+    
+    Returns:
+        Graphe LangGraph compilé (partagé par tous les fichiers)
+    """
+    graph = _refactoring_graphs.get(fuse_max_tokens)
+    
+    if graph is None:
+        with _graph_lock:
+            graph = _refactoring_graphs.get(fuse_max_tokens)
+            if graph is None:
+                graph = create_refactoring_graph(fuse_max_tokens)
+                _refactoring_graphs[fuse_max_tokens] = graph
+    
+    return graph
+
+
+def __getattr__(name):
+    # Compatibilité : "from src.workflow_graph import refactoring_graph"
+    if name == "refactoring_graph":
+        return get_refactoring_graph()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
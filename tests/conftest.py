@@ -0,0 +1,117 @@
+"""
+Configuration commune des tests.
+
+Redirige le fichier de logs vers un dossier temporaire pour que les tests
+n'écrivent jamais dans logs/experiment_data.json.
+"""
+
+import json
+
+import pytest
+
+from src.utils import logger
+
+
+@pytest.fixture(autouse=True)
+def isolated_log_file(tmp_path, monkeypatch):
+    """Fichier de logs (et blobs) isolé pour chaque test."""
+    log_file = tmp_path / "logs" / "experiment_data.json"
+    monkeypatch.setattr(logger, "LOG_FILE", str(log_file))
+    monkeypatch.setattr(logger, "_known_blobs", set())
+    return log_file
+
+
+class FakeUsage:
+    """Imite response.usage_metadata du SDK Gemini."""
+
+    def __init__(self, prompt, text):
+        self.prompt_token_count = len(prompt) // 4
+        self.candidates_token_count = len(text) // 4
+        self.total_token_count = self.prompt_token_count + self.candidates_token_count
+
+
+class FakeChunk:
+    """Imite un morceau de réponse en streaming."""
+
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeResponse:
+    """Imite la réponse de generate_content (itérable par ligne avec stream=True)."""
+
+    def __init__(self, prompt, text):
+        self.text = text
+        self.usage_metadata = FakeUsage(prompt, text)
+
+    def __iter__(self):
+        for line in self.text.splitlines(keepends=True):
+            yield FakeChunk(line)
+
+
+class FakeGenerativeModel:
+    """
+    Modèle Gemini factice, sans appel réseau.
+
+    - Auditeur : signale 1 problème tant que le code ne contient pas "# fixed"
+    - Correcteur : renvoie le code avec "# fixed" ajouté
+    - Audit + Correction : comme l'Auditeur, avec le code corrigé du Correcteur
+    - Testeur : valide toujours
+    """
+
+    calls = []
+
+    def __init__(self, model_name="gemini-2.5-flash", **kwargs):
+        self.model_name = model_name
+
+    def generate_content(self, prompt, **kwargs):
+        FakeGenerativeModel.calls.append(prompt)
+
+        if "en une seule réponse" in prompt:
+            code = prompt.split("```python", 1)[1].split("```", 1)[0]
+            if "# fixed" in code:
+                text = '{"file":"f.py","total_issues":0,"issues":[],"fixed_code":""}'
+            else:
+                text = json.dumps({"file": "f.py", "total_issues": 1, "issues": [{
+                    "line": 1, "type": "missing_docstring", "severity": "MEDIUM",
+                    "description": "No docstring", "suggestion": "Add one"}],
+                    "fixed_code": code.strip() + "\n# fixed\n"})
+        elif "auditeur de code" in prompt:
+            code = prompt.split("```python", 1)[1].split("```", 1)[0]
+            if "# fixed" in code:
+                text = '{"file":"f.py","total_issues":0,"issues":[]}'
+            else:
+                text = ('{"file":"f.py","total_issues":1,"issues":[{"line":1,"type":"missing_docstring",'
+                        '"severity":"MEDIUM","description":"No docstring","suggestion":"Add one"}]}')
+        elif "corriger les bugs" in prompt:
+            code = prompt.split("```python", 1)[1].split("```", 1)[0]
+            text = code.strip() + "\n# fixed\n"
+        else:
+            text = ('{"decision":"VALIDATE","tests_run":0,"tests_passed":0,"tests_failed":0,'
+                    '"errors":[],"message":"All tests passed"}')
+
+        return FakeResponse(prompt, text)
+
+
+@pytest.fixture
+def fake_gemini(monkeypatch):
+    """Remplace genai.GenerativeModel par le modèle factice."""
+    import google.generativeai as genai
+
+    FakeGenerativeModel.calls = []
+    monkeypatch.setattr(genai, "GenerativeModel", FakeGenerativeModel)
+    return FakeGenerativeModel
+
+
+@pytest.fixture
+def sandbox_dir(tmp_path, monkeypatch):
+    """Dossier sandbox temporaire accepté par les outils fichiers."""
+    from src.tools import file_tools
+    from src.utils import rate_limiter
+
+    sandbox = tmp_path / "sandbox"
+    sandbox.mkdir()
+    monkeypatch.setattr(file_tools, "SANDBOX_DIR", str(sandbox))
+    monkeypatch.setattr(rate_limiter._global_limiter, "min_delay", 0.0)
+    rate_limiter.reset_rate_limiter()
+    return sandbox
@@ -0,0 +1,160 @@
+"""
+Tests du nœud combiné Audit + Correction (petits fichiers).
+"""
+
+import pytest
+
+from src.agents.audit_fix_agent import AuditFixAgent
+from src.orchestrator import Orchestrator
+from src.prompts import build_audit_fix_prompt
+from src.utils.tracing import get_spans
+
+from conftest import FakeGenerativeModel, FakeResponse
+
+SMALL = "def f():\n    return 1\n"
+LITE = "gemini-2.5-flash-lite"
+TRUNCATED = ('{"total_issues":1,"issues":[{"line":1}],'
+             '"fixed_code":"def a():\\n    return 1\\n\\ndef b():\\n    return 2\\n\\ndef c():\\n    ret')
+
+
+def fused_calls(calls):
+    return [p for p in calls if "en une seule réponse" in p]
+
+
+class BrokenLiteModel(FakeGenerativeModel):
+    """Modèle léger : code corrigé syntaxiquement invalide dans la réponse combinée."""
+
+    def generate_content(self, prompt, **kwargs):
+        if self.model_name == LITE and "en une seule réponse" in prompt:
+            FakeGenerativeModel.calls.append(prompt)
+            return FakeResponse(prompt, '{"total_issues":1,"issues":[{"line":1}],'
+                                        '"fixed_code":"def f(:\\n    return 1"}')
+        return super().generate_content(prompt, **kwargs)
+
+
+class TruncatedModel(FakeGenerativeModel):
+    """Réponse combinée coupée par la limite de tokens, au milieu du code corrigé (tous niveaux)."""
+
+    def generate_content(self, prompt, **kwargs):
+        if "en une seule réponse" in prompt:
+            FakeGenerativeModel.calls.append(prompt)
+            return FakeResponse(prompt, TRUNCATED)
+        return super().generate_content(prompt, **kwargs)
+
+
+class TruncatedCleanModel(FakeGenerativeModel):
+    """Réponse combinée coupée dans la liste des problèmes : réparée, elle semble propre."""
+
+    def generate_content(self, prompt, **kwargs):
+        if "en une seule réponse" in prompt:
+            FakeGenerativeModel.calls.append(prompt)
+            return FakeResponse(prompt, '{"file":"m.py","total_issues":0,"issues":[')
+        return super().generate_content(prompt, **kwargs)
+
+
+class TestAuditFixAgent:
+
+    def test_report_without_code_and_file_fixed(self, fake_gemini, sandbox_dir):
+        path = sandbox_dir / "m.py"
+        path.write_text(SMALL, encoding="utf-8")
+
+        report = AuditFixAgent().audit_and_fix(str(path))
+
+        assert report["total_issues"] == 1
+        assert "fixed_code" not in report
+        assert path.read_text(encoding="utf-8").endswith("# fixed")
+
+    def test_invalid_fixed_code_leaves_file_untouched(self, monkeypatch, sandbox_dir):
+        import google.generativeai as genai
+
+        monkeypatch.setattr(genai, "GenerativeModel", BrokenLiteModel)
+        path = sandbox_dir / "m.py"
+        path.write_text(SMALL, encoding="utf-8")
+
+        assert AuditFixAgent(LITE).audit_and_fix(str(path)) is None
+        assert path.read_text(encoding="utf-8") == SMALL
+
+    def test_truncated_fixed_code_is_not_written(self, monkeypatch, sandbox_dir):
+        import google.generativeai as genai
+
+        monkeypatch.setattr(genai, "GenerativeModel", TruncatedModel)
+        path = sandbox_dir / "m.py"
+        path.write_text(SMALL, encoding="utf-8")
+
+        # Réparé en JSON valide dont le code compile, mais c() est perdue
+        assert AuditFixAgent().audit_and_fix(str(path)) is None
+        assert path.read_text(encoding="utf-8") == SMALL
+
+    def test_prompt_sends_code_once(self):
+        prompt, stats = build_audit_fix_prompt("m.py", SMALL)
+
+        assert prompt.count(SMALL) == 1
+        assert stats["agent"] == "audit_fix"
+
+
+class TestFusedGraph:
+
+    def test_small_file_uses_one_call_per_iteration(self, fake_gemini, sandbox_dir):
+        (sandbox_dir / "m.py").write_text(SMALL, encoding="utf-8")
+
+        summary = Orchestrator(str(sandbox_dir), fuse_max_tokens=1000).run()
+
+        assert summary["files"][0]["status"] == "VALIDATED"
+        # audit + correction, puis Testeur (aucun test : décision du modèle)
+        assert len(fake_gemini.calls) == 2
+        assert len(fused_calls(fake_gemini.calls)) == 1
+        assert "audit_fix" in {s.name for s in get_spans() if s.kind == "node"}
+
+    def test_large_file_keeps_separate_calls(self, fake_gemini, sandbox_dir):
+        (sandbox_dir / "m.py").write_text(SMALL, encoding="utf-8")
+
+        summary = Orchestrator(str(sandbox_dir), fuse_max_tokens=1).run()
+
+        assert summary["files"][0]["status"] == "VALIDATED"
+        assert len(fake_gemini.calls) == 3
+        assert fused_calls(fake_gemini.calls) == []
+
+    def test_invalid_fused_output_escalates(self, monkeypatch, sandbox_dir):
+        import google.generativeai as genai
+
+        FakeGenerativeModel.calls = []
+        monkeypatch.setattr(genai, "GenerativeModel", BrokenLiteModel)
+        (sandbox_dir / "m.py").write_text(SMALL, encoding="utf-8")
+
+        summary = Orchestrator(str(sandbox_dir), fuse_max_tokens=1000).run()
+
+        assert summary["files"][0]["status"] == "VALIDATED"
+        assert len(fused_calls(FakeGenerativeModel.calls)) == 2
+        assert "# fixed" in (sandbox_dir / "m.py").read_text(encoding="utf-8")
+
+    def test_unusable_fused_output_falls_back_to_separate_calls(self, monkeypatch, sandbox_dir):
+        import google.generativeai as genai
+
+        FakeGenerativeModel.calls = []
+        monkeypatch.setattr(genai, "GenerativeModel", TruncatedModel)
+        (sandbox_dir / "m.py").write_text(SMALL, encoding="utf-8")
+
+        summary = Orchestrator(str(sandbox_dir), fuse_max_tokens=1000).run()
+
+        assert summary["files"][0]["status"] == "VALIDATED"
+        calls = FakeGenerativeModel.calls
+        assert len(fused_calls(calls)) == 2  # un par niveau, puis plus d'appel combiné
+        assert any("auditeur de code" in p for p in calls)
+        assert (sandbox_dir / "m.py").read_text(encoding="utf-8").startswith(SMALL.strip())
+
+    def test_truncated_clean_fused_output_is_not_trusted(self, monkeypatch, sandbox_dir):
+        import google.generativeai as genai
+
+        FakeGenerativeModel.calls = []
+        monkeypatch.setattr(genai, "GenerativeModel", TruncatedCleanModel)
+        (sandbox_dir / "m.py").write_text(SMALL, encoding="utf-8")
+
+        assert AuditFixAgent().audit_and_fix(str(sandbox_dir / "m.py")) is None
+
+        summary = Orchestrator(str(sandbox_dir), fuse_max_tokens=1000).run()
+
+        # Pas de validation sur le rapport réparé : l'Auditeur reprend la main
+        calls = FakeGenerativeModel.calls
+        assert any("auditeur de code" in p for p in calls)
+        assert any("corriger les bugs" in p for p in calls)
+        assert summary["files"][0]["status"] == "VALIDATED"
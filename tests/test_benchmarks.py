@@ -0,0 +1,75 @@
+"""
+Tests du benchmark de pipeline (modèle factice, petits datasets).
+"""
+
+from benchmarks.bench_pipeline import compare_results, percentile, run_scenario
+from benchmarks.datasets import generate_dataset
+from benchmarks.fake_model import CLEAN_MARKER
+
+
+class TestDatasets:
+    """Génération des datasets synthétiques."""
+
+    def test_generate_dataset_sizes_and_clean_ratio(self, sandbox_dir):
+        """Les fichiers varient en taille et une fraction est marquée propre."""
+        paths = generate_dataset(str(sandbox_dir / "ds"), 12, clean_ratio=0.5)
+
+        assert len(paths) == 12
+        contents = [open(p, encoding="utf-8").read() for p in paths]
+        assert sum(CLEAN_MARKER in c for c in contents) == 6
+        assert len({len(c) for c in contents}) > 5
+
+
+class TestPipelineBenchmark:
+    """Scénario complet dans le processus courant."""
+
+    def test_run_scenario_reports_metrics(self, fake_gemini, sandbox_dir):
+        """Le scénario valide tous les fichiers et renvoie les mesures attendues."""
+        result = run_scenario(str(sandbox_dir / "ds"), 3, latency=0.0, clean_ratio=0.5)
+
+        assert result["files_validated"] == 3
+        assert result["files_per_second"] > 0
+        assert 0 < result["p50_file_seconds"] <= result["p95_file_seconds"]
+        assert result["log_write_seconds"] > 0
+        assert result["log_bytes"] > 0
+
+
+class TestHelpers:
+    """Percentiles et comparaison de résultats."""
+
+    def test_percentile(self):
+        assert percentile([], 50) == 0.0
+        assert percentile([1, 2, 3, 4], 50) == 2.5
+        assert percentile([1, 2, 3, 4], 100) == 4
+
+    def test_compare_detects_regression(self):
+        """Une baisse de débit au-delà de la tolérance est signalée."""
+        baseline = {"scenarios": [{"files": 10, "files_per_second": 10.0, "p95_file_seconds": 1.0}]}
+        current = {"scenarios": [{"files": 10, "files_per_second": 7.0, "p95_file_seconds": 1.1}]}
+
+        regressions = compare_results(current, baseline, tolerance=0.2)
+        assert len(regressions) == 1
+        assert "files_per_second" in regressions[0]
+
+
+class TestMicroBenchmarks:
+    """Micro-benchmarks du chemin I/O."""
+
+    def test_bench_log_size_measures_all_helpers(self, isolated_log_file):
+        """Les quatre fonctions sont mesurées sans toucher au log courant."""
+        from benchmarks.bench_micro import bench_log_size
+
+        results = bench_log_size(10, repeat=2)
+
+        assert set(results) == {"log_experiment", "_is_inside_sandbox", "read_file", "write_file"}
+        assert all(stats["mean_ms"] > 0 for stats in results.values())
+        assert not isolated_log_file.exists()
+
+    def test_compare_flags_slower_helper(self):
+        """Un helper plus lent que la référence est signalé."""
+        from benchmarks.bench_micro import compare_results
+
+        baseline = {"results": {"0": {"read_file": {"mean_ms": 1.0}}}}
+        current = {"results": {"0": {"read_file": {"mean_ms": 1.5}}}}
+
+        assert len(compare_results(current, baseline, tolerance=0.2)) == 1
@@ -0,0 +1,98 @@
+"""
+Tests du regroupement des fichiers identiques (src.tools.dedup).
+"""
+
+from src.orchestrator import Orchestrator
+from src.tools.dedup import group_duplicates, normalized_hash
+from src.utils.run_summary import read_summary
+
+CODE = "def f():\n    return 0\n"
+FIXED = CODE + "# fixed"
+
+
+def auditor_calls(calls):
+    return [p for p in calls if "auditeur de code" in p]
+
+
+class TestGroupDuplicates:
+
+    def test_normalization_ignores_layout_only(self):
+        assert normalized_hash(CODE) == normalized_hash("def f():  \r\n    return 0\r\n\r\n")
+        assert normalized_hash(CODE) != normalized_hash("def f():\n  return 0\n")
+
+    def test_first_path_is_representative(self, tmp_path):
+        paths = []
+        for name, content in (("a.py", CODE), ("b.py", "x = 1\n"), ("c.py", CODE + "\n")):
+            (tmp_path / name).write_text(content, encoding="utf-8")
+            paths.append(str(tmp_path / name))
+
+        assert group_duplicates(paths) == {paths[0]: [paths[2]], paths[1]: []}
+
+
+class TestOrchestratorDedup:
+
+    def test_validated_fix_is_copied_to_duplicates(self, fake_gemini, sandbox_dir):
+        for name in ("a.py", "vendor/a.py", "vendor/copy/a.py"):
+            (sandbox_dir / name).parent.mkdir(parents=True, exist_ok=True)
+            (sandbox_dir / name).write_text(CODE, encoding="utf-8")
+
+        summary = Orchestrator(str(sandbox_dir)).run()
+
+        assert len(auditor_calls(fake_gemini.calls)) == 1
+        assert summary["total_files"] == 3
+        assert summary["files_validated"] == 3
+        for name in ("a.py", "vendor/a.py", "vendor/copy/a.py"):
+            assert (sandbox_dir / name).read_text(encoding="utf-8") == FIXED
+        streamed = read_summary(summary["summary_file"])
+        assert sum(1 for f in streamed["files"] if f.get("duplicate_of")) == 2
+
+    def test_failing_copy_is_restored_when_verified(self, fake_gemini, sandbox_dir):
+        (sandbox_dir / "util.py").write_text(CODE, encoding="utf-8")
+        (sandbox_dir / "other").mkdir()
+        (sandbox_dir / "other" / "helper.py").write_text(CODE, encoding="utf-8")
+        (sandbox_dir / "other" / "test_helper.py").write_text(
+            "import helper\n\ndef test_unchanged():\n"
+            "    assert '# fixed' not in open(helper.__file__).read()\n",
+            encoding="utf-8"
+        )
+
+        summary = Orchestrator(str(sandbox_dir), verify_duplicates=True).run()
+
+        statuses = {f["file_name"]: f["status"] for f in summary["files"]}
+        assert statuses == {"util.py": "VALIDATED", "helper.py": "FAILED"}
+        assert (sandbox_dir / "util.py").read_text(encoding="utf-8") == FIXED
+        assert (sandbox_dir / "other" / "helper.py").read_text(encoding="utf-8") == CODE
+
+    def test_failed_restore_does_not_abort_the_run(self, fake_gemini, sandbox_dir, monkeypatch):
+        from src import orchestrator
+
+        (sandbox_dir / "util.py").write_text(CODE, encoding="utf-8")
+        (sandbox_dir / "other").mkdir()
+        (sandbox_dir / "other" / "helper.py").write_text(CODE, encoding="utf-8")
+        (sandbox_dir / "other" / "test_helper.py").write_text(
+            "import helper\n\ndef test_fails():\n    assert False\n", encoding="utf-8"
+        )
+        write_file = orchestrator.write_file
+
+        def failing_restore(path, content):
+            if path.endswith("helper.py") and content == CODE:
+                raise OSError("disk full")
+            write_file(path, content)
+
+        monkeypatch.setattr(orchestrator, "write_file", failing_restore)
+
+        summary = Orchestrator(str(sandbox_dir), verify_duplicates=True, workers=2).run()
+
+        statuses = {f["file_name"]: f["status"] for f in summary["files"]}
+        assert statuses == {"util.py": "VALIDATED", "helper.py": "FAILED"}
+        streamed = read_summary(summary["summary_file"])
+        reasons = [f["failure_reason"] for f in streamed["files"] if f.get("duplicate_of")]
+        assert "restore failed: disk full" in reasons[0]
+
+    def test_no_dedup_processes_every_copy(self, fake_gemini, sandbox_dir):
+        for name in ("a.py", "b.py"):
+            (sandbox_dir / name).write_text(CODE, encoding="utf-8")
+
+        Orchestrator(str(sandbox_dir), dedup=False).run()
+
+        assert len(auditor_calls(fake_gemini.calls)) == 2
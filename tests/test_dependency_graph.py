@@ -0,0 +1,169 @@
+"""
+Tests du graphe des imports (ordre topologique, contexte des prompts).
+"""
+
+from src.orchestrator import Orchestrator
+from src.tools import dependency_graph
+from src.tools.dependency_graph import build_import_graph, clear_ast_cache, parse_cached
+from src.tools.file_tools import find_python_files
+
+MODELS = '''
+MAX_USERS = 10
+
+
+class User(Base):
+    def __init__(self, name: str):
+        self.name = name
+
+    def greet(self, polite: bool = True) -> str:
+        return "hi"
+
+    def _secret(self):
+        pass
+
+
+def helper(x):
+    return x
+'''
+
+
+def _project(root):
+    (root / "pkg").mkdir(parents=True)
+    (root / "pkg" / "__init__.py").write_text("", encoding="utf-8")
+    (root / "pkg" / "models.py").write_text(MODELS, encoding="utf-8")
+    (root / "pkg" / "service.py").write_text(
+        "from .models import User\n\n\ndef make(name):\n    return User(name)\n", encoding="utf-8")
+    (root / "app.py").write_text("import pkg.service\n\npkg.service.make('a')\n", encoding="utf-8")
+    (root / "standalone.py").write_text("import os\n\n\ndef f():\n    return os.sep\n", encoding="utf-8")
+    return {name: str(root / name) for name in
+            ("pkg/__init__.py", "pkg/models.py", "pkg/service.py", "app.py", "standalone.py")}
+
+
+class TestImportGraph:
+
+    def test_dependencies_and_topological_order(self, tmp_path):
+        files = _project(tmp_path)
+        # Ordre de priorité défavorable : l'application en premier
+        priority = [files["app.py"], files["pkg/service.py"], files["standalone.py"],
+                    files["pkg/models.py"], files["pkg/__init__.py"]]
+
+        graph = build_import_graph(str(tmp_path), priority)
+        order = graph.topological_order(priority=priority)
+
+        assert graph.dependencies[files["pkg/service.py"]] == {files["pkg/models.py"]}
+        assert files["pkg/service.py"] in graph.dependencies[files["app.py"]]
+        assert order.index(files["pkg/models.py"]) < order.index(files["pkg/service.py"]) < order.index(files["app.py"])
+        # Fichier sans dépendance : garde sa priorité
+        assert order[0] == files["standalone.py"]
+
+    def test_import_of_a_duplicate_points_to_its_representative(self, tmp_path):
+        files = _project(tmp_path)
+        legacy = tmp_path / "pkg" / "legacy.py"
+        legacy.write_text(MODELS, encoding="utf-8")
+        client = tmp_path / "client.py"
+        client.write_text("from pkg.legacy import helper\n\nhelper(1)\n", encoding="utf-8")
+        paths = list(files.values()) + [str(legacy), str(client)]
+
+        graph = build_import_graph(str(tmp_path), paths, duplicate_of={str(legacy): files["pkg/models.py"]})
+
+        assert str(legacy) not in graph.paths
+        assert graph.dependencies[str(client)] == {files["pkg/models.py"]}
+        assert graph.imported_names[str(client)] == {files["pkg/models.py"]: {"helper"}}
+        order = graph.topological_order()
+        assert order.index(files["pkg/models.py"]) < order.index(str(client))
+
+    def test_scheduler_order_within_each_level(self, tmp_path):
+        """Un fichier débloqué passe après tous les fichiers prêts du niveau précédent."""
+        for name, content in (("a.py", "X = 1\n"), ("b.py", "import a\n"),
+                              ("c.py", "Y = 2\n"), ("d.py", "def f(:\n")):
+            (tmp_path / name).write_text(content, encoding="utf-8")
+        a, b, c, d = (str(tmp_path / name) for name in ("a.py", "b.py", "c.py", "d.py"))
+        # Scheduler : erreur de syntaxe d'abord, puis b (meilleur rendement), a, c
+        priority = [d, b, a, c]
+
+        order = build_import_graph(str(tmp_path), priority).topological_order(priority=priority)
+
+        assert order == [d, a, c, b]
+
+    def test_independent_groups(self, tmp_path):
+        files = _project(tmp_path)
+        graph = build_import_graph(str(tmp_path), list(files.values()))
+
+        groups = graph.independent_groups()
+
+        assert [files["standalone.py"]] in groups
+        assert [files["pkg/models.py"], files["pkg/service.py"], files["app.py"]] in groups
+        # pkg/__init__.py n'importe rien et n'est importé explicitement par personne
+        assert len(groups) == 3
+
+    def test_import_cycle_is_broken(self, tmp_path):
+        (tmp_path / "a.py").write_text("import b\n", encoding="utf-8")
+        (tmp_path / "b.py").write_text("import a\n", encoding="utf-8")
+        paths = [str(tmp_path / "a.py"), str(tmp_path / "b.py")]
+
+        order = build_import_graph(str(tmp_path), paths).topological_order(priority=paths)
+
+        assert order == paths
+
+    def test_imported_names_follow_usage(self, tmp_path):
+        """from m import X -> X ; import pkg.mod -> attributs lus (pkg.mod.f -> f)."""
+        files = _project(tmp_path)
+        graph = build_import_graph(str(tmp_path), list(files.values()))
+
+        assert graph.imported_names[files["pkg/service.py"]] == {files["pkg/models.py"]: {"User"}}
+        assert graph.imported_names[files["app.py"]] == {files["pkg/service.py"]: {"make"}}
+        assert graph.imported_names[files["standalone.py"]] == {}
+
+    def test_ast_cache_follows_content(self, tmp_path):
+        clear_ast_cache()
+        path = tmp_path / "m.py"
+        path.write_text("x = 1\n", encoding="utf-8")
+        first = parse_cached(str(path))
+
+        assert parse_cached(str(path)) is first
+        path.write_text("x = 2\n", encoding="utf-8")
+        assert parse_cached(str(path)) is not first
+        # Une seule version gardée par fichier, cache vidé après construction des graphes
+        assert len(dependency_graph._ast_cache) == 1
+        clear_ast_cache()
+        assert dependency_graph._ast_cache == {}
+
+
+class TestOrchestratorDependencies:
+
+    def test_prompts_receive_dependency_signatures(self, fake_gemini, sandbox_dir):
+        _project(sandbox_dir)
+
+        summary = Orchestrator(str(sandbox_dir), max_iterations=3, workers=2).run()
+
+        assert summary["files_validated"] == len(find_python_files(str(sandbox_dir)))
+        service_prompts = [p for p in fake_gemini.calls if "FICHIER : service.py" in p]
+        assert service_prompts
+        assert all("class User(Base)" in p for p in service_prompts)
+
+    def test_workers_start_files_after_their_dependencies(self, fake_gemini, sandbox_dir):
+        _project(sandbox_dir)
+
+        Orchestrator(str(sandbox_dir), max_iterations=3, workers=3).run()
+
+        def prompts(name):
+            return [i for i, p in enumerate(fake_gemini.calls) if f"FICHIER : {name}" in p]
+
+        assert max(prompts("models.py")) < min(prompts("service.py"))
+        assert max(prompts("service.py")) < min(prompts("app.py"))
+
+    def test_duplicate_import_keeps_order_and_context(self, fake_gemini, sandbox_dir):
+        _project(sandbox_dir)
+        (sandbox_dir / "pkg" / "legacy.py").write_text(MODELS, encoding="utf-8")
+        (sandbox_dir / "client.py").write_text(
+            "from pkg.legacy import helper\n\n\ndef run():\n    return helper(1)\n", encoding="utf-8")
+
+        Orchestrator(str(sandbox_dir), max_iterations=3, workers=3).run()
+
+        def prompts(name):
+            return [i for i, p in enumerate(fake_gemini.calls) if f"FICHIER : {name}" in p]
+
+        # Représentant : models.py ou legacy.py selon l'ordre du parcours
+        representative = prompts("models.py") or prompts("legacy.py")
+        assert max(representative) < min(prompts("client.py"))
+        assert all("def helper(x)" in fake_gemini.calls[i] for i in prompts("client.py"))
@@ -0,0 +1,88 @@
+"""
+Tests de l'arrêt anticipé de la boucle Fixer -> Judge (points fixes, cycles).
+"""
+
+import pytest
+
+from src.orchestrator import Orchestrator
+from src.workflow_graph import code_hash, detect_convergence
+
+from conftest import FakeGenerativeModel, FakeResponse
+
+VERSION_A = "def f():\n    return 1  # A\n"
+VERSION_B = "def f():\n    return 2  # B\n"
+
+
+class StuckModel(FakeGenerativeModel):
+    """
+    Auditeur : toujours 1 problème. Testeur : toujours PASS_TO_FIXER.
+    Correcteur : renvoie successivement les versions de `fixes` (en boucle).
+    """
+
+    fixes = [VERSION_A]
+    failed_by_version = {VERSION_A: 2, VERSION_B: 1}
+    last_fix = None
+
+    def generate_content(self, prompt, **kwargs):
+        StuckModel.calls.append(prompt)
+
+        if "auditeur de code" in prompt:
+            text = ('{"file":"f.py","total_issues":1,"issues":[{"line":1,"type":"bug",'
+                    '"severity":"HIGH","description":"Wrong value","suggestion":"Fix it"}]}')
+        elif "corriger les bugs" in prompt:
+            fix_count = sum(1 for p in StuckModel.calls if "corriger les bugs" in p)
+            text = StuckModel.fixes[(fix_count - 1) % len(StuckModel.fixes)]
+            StuckModel.last_fix = text
+        else:
+            text = ('{"decision":"PASS_TO_FIXER","passed":0,"failed":%d,"errors":["assert"],'
+                    '"message":"Tests failed"}' % StuckModel.failed_by_version[StuckModel.last_fix])
+
+        return FakeResponse(prompt, text)
+
+
+@pytest.fixture
+def stuck_gemini(monkeypatch):
+    import google.generativeai as genai
+
+    StuckModel.calls = []
+    StuckModel.last_fix = None
+    monkeypatch.setattr(genai, "GenerativeModel", StuckModel)
+    return StuckModel
+
+
+class TestConvergenceDetection:
+
+    def test_detect_convergence(self):
+        rejected = [code_hash(VERSION_A), code_hash(VERSION_B)]
+
+        assert detect_convergence(VERSION_B, rejected) == "STALLED"
+        assert detect_convergence(VERSION_A, rejected) == "OSCILLATING"
+        assert detect_convergence("x = 1\n", rejected) is None
+        assert detect_convergence(VERSION_A, []) is None
+
+
+class TestEarlyStop:
+    """Une limite d'itérations très haute : seule la détection peut arrêter la boucle."""
+
+    def test_fixed_point_stops_without_judging_again(self, stuck_gemini, sandbox_dir):
+        """Le Fixer renvoie deux fois la même version : arrêt STALLED."""
+        StuckModel.fixes = [VERSION_A]
+        (sandbox_dir / "module.py").write_text("def f():\n    return 0\n", encoding="utf-8")
+
+        summary = Orchestrator(str(sandbox_dir), max_iterations=1000).run()
+
+        assert summary["files"][0]["status"] == "STALLED"
+        # audit, fix, judge, audit, fix : pas de second appel au Testeur
+        assert len(StuckModel.calls) == 5
+
+    def test_cycle_stops_and_keeps_best_version(self, stuck_gemini, sandbox_dir):
+        """A -> B -> A : arrêt OSCILLATING, B (moins de tests en échec) est conservée."""
+        StuckModel.fixes = [VERSION_A, VERSION_B]
+        target = sandbox_dir / "module.py"
+        target.write_text("def f():\n    return 0\n", encoding="utf-8")
+
+        summary = Orchestrator(str(sandbox_dir), max_iterations=1000).run()
+
+        assert summary["files"][0]["status"] == "OSCILLATING"
+        assert len(StuckModel.calls) == 8
+        assert target.read_text(encoding="utf-8").strip() == VERSION_B.strip()
@@ -0,0 +1,139 @@
+"""
+Tests de la mémoire des corrections validées (src.tools.fix_memory).
+"""
+
+import pytest
+
+from src.orchestrator import Orchestrator
+from src.prompts.budget import build_fixer_prompt
+from src.prompts.context_prompt import get_fix_examples
+from src.tools.fix_memory import FixMemory
+
+from conftest import FakeGenerativeModel, FakeResponse
+
+TOTAL = '''def total(values):
+    """Somme des valeurs."""
+    result = 0
+    for value in values:
+        if value is not None:
+            result += value
+    return result
+'''
+TOTAL_FIXED = TOTAL.replace("result = 0", "result = 0.0")
+# Même fonction, autres noms
+SUM_PRICES = '''def sum_prices(prices):
+    acc = 0
+    for price in prices:
+        if price is not None:
+            acc += price
+    return acc
+'''
+UNRELATED = '''def parse(line):
+    key, _, raw = line.partition("=")
+    if not key:
+        raise ValueError(line)
+    return key.strip(), [item.strip() for item in raw.split(",")]
+'''
+REPORT = {"file": "f.py", "total_issues": 1, "issues": [{
+    "line": 3, "type": "bug", "severity": "HIGH", "description": "Int sum", "suggestion": "Use a float"}]}
+
+
+def fixer_calls(calls):
+    return [p for p in calls if "corriger les bugs" in p]
+
+
+class TestFixMemory:
+
+    def test_renamed_function_matches_unrelated_does_not(self, tmp_path):
+        memory = FixMemory(str(tmp_path / "memory.json"))
+        assert memory.record(TOTAL, TOTAL_FIXED, "a.py") == 1
+
+        examples = memory.similar(SUM_PRICES + "\n\n" + UNRELATED)
+
+        assert [(e["matches"], e["name"]) for e in examples] == [("sum_prices", "total")]
+        assert examples[0]["similarity"] >= 0.8
+        assert examples[0]["after"] == TOTAL_FIXED.strip()
+        assert memory.stats == {"recorded": 1, "lookups": 2, "hits": 1}
+
+    def test_unchanged_functions_are_not_recorded(self, tmp_path):
+        memory = FixMemory(str(tmp_path / "memory.json"))
+
+        # Seul un commentaire change : l'AST est identique
+        assert memory.record(TOTAL, TOTAL + "# fixed\n", "a.py") == 0
+        assert memory.entries == []
+
+    def test_save_and_load_roundtrip(self, tmp_path):
+        memory_file = str(tmp_path / "memory.json")
+        memory = FixMemory(memory_file)
+        memory.record(TOTAL, TOTAL_FIXED, "a.py")
+        memory.save()
+
+        reloaded = FixMemory.load(memory_file)
+
+        assert len(reloaded.entries) == 1
+        assert reloaded.similar(SUM_PRICES)[0]["name"] == "total"
+
+
+class TestFixerExamples:
+
+    def test_examples_are_dropped_when_over_budget(self):
+        memory = FixMemory("unused.json")
+        memory.record(TOTAL, TOTAL_FIXED, "a.py")
+        examples = get_fix_examples(memory.similar(SUM_PRICES))
+
+        prompt, stats = build_fixer_prompt("b.py", SUM_PRICES, REPORT, examples=examples)
+        assert "CORRECTIONS DÉJÀ VALIDÉES" in prompt and "result = 0.0" in prompt
+        assert stats["examples"] is True
+
+        big_code = SUM_PRICES + "\n".join(f"X_{i} = {i}" for i in range(6000))
+        prompt, stats = build_fixer_prompt("b.py", big_code, REPORT, examples=examples)
+        assert "CORRECTIONS DÉJÀ VALIDÉES" not in prompt
+        assert "dropped_examples" in stats["steps"]
+        assert stats["examples"] is False
+
+
+class FloatFixModel(FakeGenerativeModel):
+    """Comme le modèle factice, mais le Correcteur change aussi l'initialisation (0 -> 0.0)."""
+
+    def generate_content(self, prompt, **kwargs):
+        response = super().generate_content(prompt, **kwargs)
+        if "corriger les bugs" in prompt:
+            text = response.text.replace("result = 0\n", "result = 0.0\n").replace("acc = 0\n", "acc = 0.0\n")
+            return FakeResponse(prompt, text)
+        return response
+
+
+@pytest.fixture
+def float_gemini(monkeypatch):
+    import google.generativeai as genai
+
+    FakeGenerativeModel.calls = []
+    monkeypatch.setattr(genai, "GenerativeModel", FloatFixModel)
+    return FloatFixModel
+
+
+class TestOrchestratorFixMemory:
+
+    def test_fix_is_offered_to_similar_function_in_same_run(self, float_gemini, sandbox_dir):
+        (sandbox_dir / "a.py").write_text(TOTAL, encoding="utf-8")
+        (sandbox_dir / "b.py").write_text(SUM_PRICES, encoding="utf-8")
+
+        summary = Orchestrator(str(sandbox_dir)).run()
+
+        calls = fixer_calls(float_gemini.calls)
+        assert len(calls) == 2
+        assert "CORRECTIONS DÉJÀ VALIDÉES" not in calls[0]
+        assert "CORRECTIONS DÉJÀ VALIDÉES" in calls[1]
+        assert summary["timing"]["fix_memory"]["recorded"] == 2
+        assert summary["timing"]["fix_memory"]["hits"] == 1
+        # Gardée pour le run suivant
+        assert len(FixMemory.load().entries) == 2
+
+    def test_disabled_memory_adds_no_examples(self, float_gemini, sandbox_dir):
+        (sandbox_dir / "a.py").write_text(TOTAL, encoding="utf-8")
+        (sandbox_dir / "b.py").write_text(SUM_PRICES, encoding="utf-8")
+
+        summary = Orchestrator(str(sandbox_dir), fix_memory=False).run()
+
+        assert all("CORRECTIONS DÉJÀ VALIDÉES" not in p for p in fixer_calls(float_gemini.calls))
+        assert summary["timing"]["fix_memory"] == {"enabled": False}
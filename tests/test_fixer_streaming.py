@@ -0,0 +1,220 @@
+"""
+Tests du streaming du Correcteur (src.tools.code_stream, stream_content).
+"""
+
+import os
+import stat
+
+import pytest
+from google.api_core import exceptions as api_exceptions
+
+from src.agents.fixer_agent import FixerAgent
+from src.tools.code_stream import IncrementalCodeChecker
+from src.tools.file_tools import StreamingFileWriter
+from src.utils import resilience
+from src.utils.llm import stream_content
+from src.utils.tracing import get_spans, reset_tracing
+
+from conftest import FakeGenerativeModel, FakeResponse
+
+AUDIT = {"total_issues": 1, "issues": [{"line": 1, "type": "bug", "severity": "HIGH",
+                                        "description": "Wrong value", "suggestion": "Fix it"}]}
+
+VALID = """\
+```python
+import os
+
+@decorator
+@other
+def f():
+    try:
+        return 1
+    except ValueError:
+        return 2
+
+try:
+    import json
+except ImportError:
+    json = None
+else:
+    pass
+finally:
+    pass
+
+DOC = '''
+not code: `x` $
+'''
+```
+Explication : le bug est corrigé.
+"""
+
+
+def feed_all(checker, text, size=5):
+    for start in range(0, len(text), size):
+        if not checker.feed(text[start:start + size]):
+            return False
+    return True
+
+
+class ScriptedModel(FakeGenerativeModel):
+    """Le Correcteur renvoie `fix_text` ; compte les morceaux lus dans le flux."""
+
+    fix_text = ""
+    consumed = 0
+    stream_failures = 0
+
+    def generate_content(self, prompt, **kwargs):
+        if "corriger les bugs" not in prompt:
+            return super().generate_content(prompt, **kwargs)
+        ScriptedModel.calls.append(prompt)
+        return self._stream(FakeResponse(prompt, ScriptedModel.fix_text))
+
+    def _stream(self, response):
+        fail = ScriptedModel.stream_failures > 0
+        ScriptedModel.stream_failures -= 1
+        for index, chunk in enumerate(response):
+            if fail and index == 2:
+                raise api_exceptions.ServiceUnavailable("stream reset")
+            ScriptedModel.consumed += 1
+            yield chunk
+
+
+@pytest.fixture
+def scripted_gemini(monkeypatch):
+    import google.generativeai as genai
+
+    ScriptedModel.calls = []
+    ScriptedModel.consumed = 0
+    ScriptedModel.stream_failures = 0
+    monkeypatch.setattr(genai, "GenerativeModel", ScriptedModel)
+    monkeypatch.setattr(resilience, "_sleep", lambda seconds, reason, attempt: None)
+    reset_tracing()
+    return ScriptedModel
+
+
+class TestIncrementalCodeChecker:
+
+    def test_valid_fenced_code_passes_and_stops_at_closing_fence(self):
+        written = []
+        checker = IncrementalCodeChecker(sink=written.append)
+
+        assert feed_all(checker, VALID)
+        assert checker.closed
+        code = checker.finish()
+        assert code.startswith("import os") and code.endswith("'''")
+        assert "Explication" not in code
+        compile(code, "f.py", "exec")
+        assert "".join(written).strip() == code
+
+    def test_prose_preamble_aborts_at_first_statement(self):
+        checker = IncrementalCodeChecker()
+
+        assert not feed_all(checker, "Voici le code corrigé :\n\nimport os\nimport sys\n")
+        assert checker.error.startswith("ligne 1")
+
+    def test_other_language_and_invalid_characters_abort(self):
+        assert not feed_all(IncrementalCodeChecker(), "```javascript\nvar x = 1;\n")
+        assert not feed_all(IncrementalCodeChecker(), "x = `ls`\n")
+        assert not feed_all(IncrementalCodeChecker(), "def f():\n    a = 1\n  b = 2\n")
+
+    def test_incomplete_statement_is_not_judged_early(self):
+        checker = IncrementalCodeChecker()
+
+        assert feed_all(checker, "def f(\n    a,\n")
+        assert feed_all(checker, "):\n    return a\n")
+        assert checker.finish() == "def f(\n    a,\n):\n    return a"
+
+
+class TestStreamingFixer:
+
+    def test_fix_is_streamed_to_temp_file_then_replaced(self, fake_gemini, sandbox_dir):
+        path = sandbox_dir / "m.py"
+        path.write_text("def f():\n    return 0\n", encoding="utf-8")
+        reset_tracing()
+
+        assert FixerAgent().fix_file(str(path), AUDIT) is True
+
+        assert path.read_text(encoding="utf-8") == "def f():\n    return 0\n# fixed"
+        assert [p.name for p in sandbox_dir.iterdir()] == ["m.py"]
+        llm_span = [s for s in get_spans() if s.kind == "llm"][0]
+        assert llm_span.attributes["streaming"] is True
+        assert llm_span.attributes["chunks"] == 3
+
+    def test_streamed_fix_keeps_file_permissions(self, fake_gemini, sandbox_dir):
+        path = sandbox_dir / "m.py"
+        path.write_text("def f():\n    return 0\n", encoding="utf-8")
+        os.chmod(path, 0o750)
+
+        assert FixerAgent().fix_file(str(path), AUDIT) is True
+
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o750
+
+    def test_new_file_gets_default_permissions(self, sandbox_dir):
+        path = sandbox_dir / "new.py"
+        writer = StreamingFileWriter(str(path))
+        writer.commit("x = 1\n")
+
+        reference = sandbox_dir / "reference.py"
+        reference.write_text("", encoding="utf-8")
+        assert stat.S_IMODE(os.stat(path).st_mode) == stat.S_IMODE(os.stat(reference).st_mode)
+
+    def test_shorter_content_matches_write_file_bytes(self, sandbox_dir):
+        """Contenu final plus court que le flux (blancs de fin) : mêmes octets qu'une écriture directe."""
+        path = sandbox_dir / "m.py"
+        writer = StreamingFileWriter(str(path))
+        writer.write("é = 1\nx = 2\n\n\n")
+        writer.commit("é = 1\nx = 2\n")
+
+        reference = sandbox_dir / "reference.py"
+        with open(reference, "w", encoding="utf-8") as f:
+            f.write("é = 1\nx = 2\n")
+        assert path.read_bytes() == reference.read_bytes()
+
+    def test_garbage_aborts_stream_and_keeps_file(self, scripted_gemini, sandbox_dir):
+        original = "def f():\n    return 0\n"
+        path = sandbox_dir / "m.py"
+        path.write_text(original, encoding="utf-8")
+        ScriptedModel.fix_text = "Voici le code corrigé :\n\n" + "x = 1\n" * 50
+
+        assert FixerAgent().fix_file(str(path), AUDIT) is False
+
+        assert path.read_text(encoding="utf-8") == original
+        assert [p.name for p in sandbox_dir.iterdir()] == ["m.py"]
+        assert ScriptedModel.consumed < 5
+
+    def test_stream_error_restarts_from_scratch(self, scripted_gemini, sandbox_dir):
+        path = sandbox_dir / "m.py"
+        path.write_text("def f():\n    return 0\n", encoding="utf-8")
+        ScriptedModel.fix_text = "```python\ndef f():\n    return 1\n\nvalue = f()\n```\n"
+        ScriptedModel.stream_failures = 1
+
+        assert FixerAgent().fix_file(str(path), AUDIT) is True
+
+        assert path.read_text(encoding="utf-8") == "def f():\n    return 1\n\nvalue = f()"
+        llm_span = [s for s in get_spans() if s.kind == "llm"][0]
+        assert llm_span.attributes["attempts"] == 2
+        assert llm_span.attributes["stopped"] is True
+        assert llm_span.attributes["cancelled"] is True
+
+    def test_aborted_stream_is_cancelled(self):
+        """Arrêt du flux : le flux sous-jacent (gRPC) est annulé, pas seulement abandonné."""
+
+        class GrpcStream:
+            cancelled = False
+
+            def cancel(self):
+                GrpcStream.cancelled = True
+
+        class StreamResponse(FakeResponse):
+            _iterator = GrpcStream()
+
+        class StreamModel:
+            def generate_content(self, prompt, **kwargs):
+                return StreamResponse(prompt, "a\nb\nc\n")
+
+        text, stats = stream_content(StreamModel(), "p", "Fixer_Agent", "m",
+                                     on_chunk=lambda chunk: chunk != "b\n")
+
+        assert text == "a\nb\n"
+        assert stats["stopped"] and stats["cancelled"]
+        assert GrpcStream.cancelled
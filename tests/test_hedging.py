@@ -0,0 +1,169 @@
+"""
+Tests du hedging des appels LLM (src.utils.hedging).
+"""
+
+import threading
+import time
+
+import pytest
+
+from src.utils import hedging
+from src.utils.hedging import (
+    HedgePolicy,
+    LatencyHistogram,
+    configure_hedging,
+    get_hedging_stats,
+    hedged_call,
+    record_latency,
+    reset_hedging,
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_hedging(monkeypatch):
+    monkeypatch.setattr(hedging, "_histograms", {})
+    monkeypatch.setattr(hedging, "try_acquire_rate_limit", lambda: True)
+    reset_hedging()
+    yield
+    configure_hedging(None)
+    reset_hedging()
+
+
+def _warm(agent, seconds=0.01, count=20):
+    for _ in range(count):
+        record_latency(agent, seconds)
+
+
+class SlowThenFast:
+    """Premier appel lent (queue de latence), les suivants rapides."""
+
+    def __init__(self, slow=1.0):
+        self.slow = slow
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.calls += 1
+            number = self.calls
+        time.sleep(self.slow if number == 1 else 0.0)
+        return f"response {number}"
+
+
+class TestHistogram:
+
+    def test_nearest_rank_percentile(self):
+        histogram = LatencyHistogram()
+        for value in range(1, 101):
+            histogram.record(float(value))
+
+        assert histogram.percentile(95) == 95.0
+        assert histogram.percentile(50) == 50.0
+        assert LatencyHistogram().percentile(95) is None
+
+    def test_window_keeps_recent_samples(self):
+        histogram = LatencyHistogram(window=3)
+        for value in (100.0, 1.0, 2.0, 3.0):
+            histogram.record(value)
+
+        assert histogram.percentile(100) == 3.0
+
+
+class TestHedgedCall:
+
+    def test_disabled_by_default(self):
+        call = SlowThenFast(slow=0.0)
+
+        assert hedged_call(call, "Auditor_Agent") == "response 1"
+        assert get_hedging_stats()["enabled"] is False
+
+    def test_slow_call_is_hedged_and_fast_copy_wins(self):
+        configure_hedging(HedgePolicy(percentile=95, min_samples=20, max_extra_fraction=1.0))
+        _warm("Auditor_Agent")
+        call = SlowThenFast(slow=1.0)
+
+        started = time.monotonic()
+        result = hedged_call(call, "Auditor_Agent")
+
+        assert result == "response 2"
+        assert time.monotonic() - started < 0.5
+        stats = get_hedging_stats()
+        assert stats["hedged"] == 1
+        assert stats["hedge_wins"] == 1
+
+    def test_not_hedged_without_enough_samples_or_for_other_agents(self):
+        configure_hedging(HedgePolicy(min_samples=20, max_extra_fraction=1.0))
+        _warm("Auditor_Agent", count=5)
+        _warm("Judge_Agent")
+
+        assert hedged_call(SlowThenFast(slow=0.05), "Auditor_Agent") == "response 1"
+        assert hedged_call(SlowThenFast(slow=0.05), "Judge_Agent") == "response 1"
+        assert get_hedging_stats()["hedged"] == 0
+
+    def test_rate_limit_budget_blocks_the_copy(self, monkeypatch):
+        configure_hedging(HedgePolicy(max_extra_fraction=1.0))
+        monkeypatch.setattr(hedging, "try_acquire_rate_limit", lambda: False)
+        _warm("Fixer_Agent")
+
+        assert hedged_call(SlowThenFast(slow=0.1), "Fixer_Agent") == "response 1"
+        assert get_hedging_stats()["skipped_budget"] == 1
+
+    def test_extra_fraction_caps_the_copies(self):
+        configure_hedging(HedgePolicy(max_extra_fraction=0.5))
+        _warm("Fixer_Agent")
+
+        for _ in range(4):
+            hedged_call(SlowThenFast(slow=0.1), "Fixer_Agent")
+
+        stats = get_hedging_stats()
+        assert stats["hedged"] == 2
+        assert stats["skipped_budget"] == 2
+
+    def test_failing_primary_falls_back_to_copy(self):
+        configure_hedging(HedgePolicy(max_extra_fraction=1.0))
+        _warm("Auditor_Agent")
+        calls = []
+
+        def call():
+            calls.append(1)
+            if len(calls) == 1:
+                time.sleep(0.1)
+                raise TimeoutError("primary lost")
+            time.sleep(0.2)
+            return "copy"
+
+        assert hedged_call(call, "Auditor_Agent") == "copy"
+
+
+    def test_pool_is_sized_from_workers(self):
+        configure_hedging(HedgePolicy(), workers=8)
+
+        assert hedging._executor._max_workers == 8 * hedging.THREADS_PER_WORKER + hedging.SPARE_THREADS
+
+    def test_time_queued_in_pool_does_not_trigger_copy(self):
+        configure_hedging(HedgePolicy(max_extra_fraction=1.0), workers=1)
+        _warm("Auditor_Agent")
+        release = threading.Event()
+        busy = [hedging._executor.submit(release.wait) for _ in range(hedging._executor._max_workers)]
+        result = []
+        caller = threading.Thread(target=lambda: result.append(hedged_call(SlowThenFast(slow=0.0), "Auditor_Agent")))
+        caller.start()
+
+        time.sleep(0.2)  # bien au-delà du percentile (0.01 s) : l'appel attend dans la file
+        release.set()
+        caller.join(timeout=5)
+
+        assert result == ["response 1"]
+        assert get_hedging_stats()["hedged"] == 0
+        assert all(future.result() for future in busy)
+
+
+class TestRateLimiterTryAcquire:
+
+    def test_try_acquire_never_waits(self):
+        from src.utils.rate_limiter import RateLimiter
+
+        limiter = RateLimiter(max_requests_per_minute=60)
+        assert limiter.try_acquire() is True
+        assert limiter.try_acquire() is False
+        assert limiter.request_count == 1
@@ -0,0 +1,61 @@
+"""
+Tests du chargement différé (démarrage rapide de la CLI).
+
+Chaque test s'exécute dans un interpréteur neuf : sys.modules du processus
+pytest contient déjà les modules lourds.
+"""
+
+import os
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _run(code):
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, timeout=60
+    )
+
+
+class TestLazyImports:
+    """Les imports lourds n'ont lieu qu'à la première utilisation."""
+
+    def test_light_modules_do_not_import_gemini_or_langgraph(self):
+        """src et src.prompts se chargent sans google.generativeai ni LangGraph."""
+        result = _run(
+            "import sys, src, src.prompts, src.agents\n"
+            "assert 'google.generativeai' not in sys.modules, 'genai'\n"
+            "assert 'langgraph' not in sys.modules, 'langgraph'\n"
+        )
+        assert result.returncode == 0, result.stderr
+
+    def test_orchestrator_import_does_not_compile_graph(self):
+        """Importer l'orchestrateur ne construit pas le graphe."""
+        result = _run(
+            "import sys, src.orchestrator, src.workflow_graph as wg\n"
+            "assert wg._refactoring_graphs == {}\n"
+            "assert 'langgraph' not in sys.modules\n"
+        )
+        assert result.returncode == 0, result.stderr
+        assert "Construction du graphe" not in result.stdout
+
+    def test_lazy_exports_resolve(self):
+        """Les noms exportés restent accessibles comme avant."""
+        result = _run(
+            "from src import Orchestrator, AuditorAgent\n"
+            "from src.workflow_graph import refactoring_graph, get_refactoring_graph\n"
+            "assert refactoring_graph is get_refactoring_graph()\n"
+        )
+        assert result.returncode == 0, result.stderr
+
+    def test_help_needs_no_api_key(self):
+        """--help répond sans clé API ni import lourd."""
+        env = {k: v for k, v in os.environ.items() if k != "GOOGLE_API_KEY"}
+        result = subprocess.run(
+            [sys.executable, "main.py", "--help"],
+            cwd=PROJECT_ROOT, capture_output=True, text=True, timeout=60, env=env
+        )
+        assert result.returncode == 0
+        assert "--target_dir" in result.stdout
@@ -0,0 +1,81 @@
+"""
+Tests de l'état léger du graphe (CODE_STORE, mises à jour partielles).
+"""
+
+import pytest
+
+from src.orchestrator import Orchestrator
+from src.workflow_graph import CODE_STORE, CodeStore, code_hash, fail_node, validate_node
+
+from conftest import FakeGenerativeModel, FakeResponse
+
+
+class RejectingModel(FakeGenerativeModel):
+    """Auditeur : 1 problème. Correcteur : une nouvelle version à chaque appel. Testeur : rejet."""
+
+    def generate_content(self, prompt, **kwargs):
+        RejectingModel.calls.append(prompt)
+        if "auditeur de code" in prompt:
+            text = ('{"file":"m.py","total_issues":1,"issues":[{"line":1,"type":"bug",'
+                    '"severity":"HIGH","description":"Wrong value","suggestion":"Fix it"}]}')
+        elif "corriger les bugs" in prompt:
+            fix_count = sum(1 for p in RejectingModel.calls if "corriger les bugs" in p)
+            text = f"def f():\n    return {fix_count}\n"
+        else:
+            text = ('{"decision":"PASS_TO_FIXER","passed":0,"failed":1,"errors":["assert"],'
+                    '"message":"Tests failed"}')
+        return FakeResponse(prompt, text)
+
+
+@pytest.fixture
+def rejecting_gemini(monkeypatch):
+    import google.generativeai as genai
+
+    RejectingModel.calls = []
+    monkeypatch.setattr(genai, "GenerativeModel", RejectingModel)
+    return RejectingModel
+
+
+class TestCodeStore:
+
+    def test_shared_version_survives_release_of_one_owner(self):
+        store = CodeStore()
+        digest = store.put("x = 1\n", "a.py")
+        assert store.put("x = 1\n", "b.py") == digest == code_hash("x = 1\n")
+        store.put("x = 2\n", "a.py")
+
+        assert store.release("a.py") == 1
+        assert store.get(digest) == "x = 1\n"
+        assert store.release("b.py") == 1
+        assert len(store) == 0
+
+
+class TestPartialUpdates:
+
+    def test_final_nodes_return_changed_keys_only(self):
+        state = {"file_path": "m.py", "iteration": 1, "max_iterations": 3,
+                 "current_hash": "h", "best_hash": None}
+
+        assert validate_node(state) == {"status": "VALIDATED"}
+        assert fail_node(state) == {"status": "FAILED"}
+
+    def test_counters_are_exact_and_store_is_released(self, fake_gemini, sandbox_dir):
+        (sandbox_dir / "m.py").write_text("def f():\n    return 0\n", encoding="utf-8")
+
+        summary = Orchestrator(str(sandbox_dir)).run()
+
+        assert summary["files"][0] == {"file_name": "m.py", "status": "VALIDATED",
+                                       "iterations": 1, "bugs_found": 1, "bugs_fixed": 1}
+        assert len(CODE_STORE) == 0
+
+    def test_iterations_stop_at_limit_with_best_version(self, rejecting_gemini, sandbox_dir):
+        target = sandbox_dir / "m.py"
+        target.write_text("def f():\n    return 0\n", encoding="utf-8")
+
+        summary = Orchestrator(str(sandbox_dir), max_iterations=3).run()
+
+        assert summary["files"][0] == {"file_name": "m.py", "status": "MAX_ITERATIONS",
+                                       "iterations": 3, "bugs_found": 3, "bugs_fixed": 3}
+        # Toutes les versions ont le même score : la dernière testée est gardée
+        assert target.read_text(encoding="utf-8").strip() == "def f():\n    return 3"
+        assert len(CODE_STORE) == 0
@@ -0,0 +1,140 @@
+"""
+Tests du stockage des gros champs du logger dans des blobs dédupliqués.
+"""
+
+import json
+import os
+
+from src.utils import logger
+from src.utils.logger import (
+    ActionType,
+    export_experiment_log,
+    is_blob_ref,
+    journal_file,
+    load_blob,
+    log_experiment,
+    read_experiment_log,
+)
+
+
+def _log(prompt, response="OK"):
+    log_experiment(
+        agent_name="Auditor_Agent",
+        model_used="gemini-2.5-flash",
+        action=ActionType.ANALYSIS,
+        details={"input_prompt": prompt, "output_response": response, "bugs_found": 1},
+        status="SUCCESS"
+    )
+
+
+class TestBlobStorage:
+    """Externalisation des gros champs texte."""
+
+    def test_large_field_is_replaced_by_reference(self, isolated_log_file):
+        """Un prompt volumineux est stocké hors de l'entrée."""
+        prompt = "x = 1\n" * 500
+        _log(prompt)
+
+        raw = read_experiment_log(rehydrate=False)
+        assert is_blob_ref(raw[0]["details"]["input_prompt"])
+        assert load_blob(raw[0]["details"]["input_prompt"]) == prompt
+
+    def test_small_fields_stay_inline(self, isolated_log_file):
+        """Les petits champs et les valeurs non textuelles restent dans l'entrée."""
+        _log("petit prompt")
+
+        raw = read_experiment_log(rehydrate=False)
+        assert raw[0]["details"]["input_prompt"] == "petit prompt"
+        assert raw[0]["details"]["bugs_found"] == 1
+
+    def test_identical_content_is_stored_once(self, isolated_log_file):
+        """Le même code référencé deux fois ne produit qu'un seul blob."""
+        prompt = "def f():\n    return 42\n" * 100
+        _log(prompt)
+        _log(prompt)
+
+        blobs = list((isolated_log_file.parent / "blobs").rglob("*.gz"))
+        assert len(blobs) == 1
+
+    def test_threshold_zero_disables_blobs(self, isolated_log_file, monkeypatch):
+        """LOG_BLOB_THRESHOLD=0 conserve le format historique."""
+        monkeypatch.setattr(logger, "BLOB_THRESHOLD", 0)
+        prompt = "y" * 5000
+        _log(prompt)
+
+        raw = read_experiment_log(rehydrate=False)
+        assert raw[0]["details"]["input_prompt"] == prompt
+
+
+class TestReader:
+    """Relecture transparente du log."""
+
+    def test_reader_rehydrates_references(self):
+        """read_experiment_log restitue le texte complet."""
+        prompt = "print('hello')\n" * 200
+        response = "{" + '"total_issues": 0, ' * 100 + "}"
+        _log(prompt, response)
+
+        entries = read_experiment_log()
+        assert entries[0]["details"]["input_prompt"] == prompt
+        assert entries[0]["details"]["output_response"] == response
+
+    def test_reader_without_rehydration_keeps_references(self):
+        """rehydrate=False renvoie les entrées telles qu'écrites sur disque."""
+        _log("z" * 4096)
+
+        entries = read_experiment_log(rehydrate=False)
+        assert is_blob_ref(entries[0]["details"]["input_prompt"])
+
+    def test_missing_log_file_returns_empty_list(self):
+        """Un log absent se lit comme une liste vide."""
+        assert read_experiment_log() == []
+
+
+class TestJournal:
+    """Ajout au journal pendant le run, export de la liste JSON en fin de run."""
+
+    def test_entries_are_appended_without_rewriting_the_log(self, isolated_log_file):
+        _log("premier")
+        _log("second")
+
+        assert not isolated_log_file.exists()
+        lines = open(journal_file(), encoding="utf-8").read().splitlines()
+        assert [json.loads(line)["details"]["input_prompt"] for line in lines] == ["premier", "second"]
+
+    def test_export_merges_journal_into_json_array(self, isolated_log_file):
+        _log("ancien")
+        assert export_experiment_log() == 1
+        _log("nouveau")
+
+        # Lecture : liste exportée puis journal en cours
+        assert [e["details"]["input_prompt"] for e in read_experiment_log()] == ["ancien", "nouveau"]
+
+        assert export_experiment_log() == 1
+        raw = json.loads(isolated_log_file.read_text(encoding="utf-8"))
+        assert [e["details"]["input_prompt"] for e in raw] == ["ancien", "nouveau"]
+        assert not os.path.exists(journal_file())
+
+    def test_truncated_last_line_is_ignored(self):
+        _log("complet")
+        with open(journal_file(), "a", encoding="utf-8") as f:
+            f.write('{"id": "coupé", "details": {')
+
+        assert [e["details"]["input_prompt"] for e in read_experiment_log()] == ["complet"]
+
+    def test_export_inlines_blobs(self, isolated_log_file):
+        """La liste exportée se lit sans logs/blobs/ ; les blobs réintégrés sont supprimés."""
+        prompt = "x = 1\n" * 500
+        _log(prompt)
+        blob_dir = isolated_log_file.parent / "blobs"
+        assert list(blob_dir.rglob("*.gz"))
+
+        export_experiment_log()
+
+        raw = json.loads(isolated_log_file.read_text(encoding="utf-8"))
+        assert raw[0]["details"]["input_prompt"] == prompt
+        assert not list(blob_dir.rglob("*.gz"))
+
+        # Le même contenu, journalisé après l'export, est de nouveau stocké
+        _log(prompt)
+        assert load_blob(read_experiment_log(rehydrate=False)[1]["details"]["input_prompt"]) == prompt
@@ -0,0 +1,97 @@
+"""
+Tests du endpoint de métriques Prometheus.
+"""
+
+import urllib.error
+import urllib.request
+
+import pytest
+
+from src.orchestrator import Orchestrator
+from src.utils.metrics import (
+    Counter,
+    Histogram,
+    LLM_LATENCY,
+    MetricsRegistry,
+    start_metrics_server,
+    stop_metrics_server,
+)
+from src.utils.tracing import span
+
+
+class TestExposition:
+    """Format texte Prometheus."""
+
+    def test_counter_render(self):
+        """Un compteur étiqueté est rendu avec HELP, TYPE et labels."""
+        counter = Counter("swarm_test_total", "Aide")
+        counter.inc(agent="Auditor_Agent")
+        counter.inc(2, agent="Auditor_Agent")
+
+        assert counter.render() == [
+            "# HELP swarm_test_total Aide",
+            "# TYPE swarm_test_total counter",
+            'swarm_test_total{agent="Auditor_Agent"} 3.0',
+        ]
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Les buckets sont cumulés et terminés par +Inf."""
+        histogram = Histogram("swarm_test_seconds", "Aide", (1, 5))
+        for value in (0.5, 2, 10):
+            histogram.observe(value)
+
+        lines = histogram.render()
+        assert 'swarm_test_seconds_bucket{le="1.0"} 1' in lines
+        assert 'swarm_test_seconds_bucket{le="5.0"} 2' in lines
+        assert 'swarm_test_seconds_bucket{le="+Inf"} 3' in lines
+        assert "swarm_test_seconds_count 3" in lines
+
+    def test_llm_spans_feed_latency_histogram(self):
+        """Les spans LLM alimentent l'histogramme de latence."""
+        before = LLM_LATENCY.count(agent="Metrics_Test")
+        with span("generate_content", kind="llm", agent="Metrics_Test"):
+            pass
+
+        assert LLM_LATENCY.count(agent="Metrics_Test") == before + 1
+
+
+class TestServer:
+    """Serveur HTTP local."""
+
+    def test_metrics_endpoint(self):
+        """/metrics renvoie les métriques et les collecteurs, le reste 404."""
+        registry = MetricsRegistry()
+        registry.counter("swarm_demo_total", "Demo").inc()
+        registry.register_collector("demo", lambda: [("swarm_demo_files", {}, 7)], {
+            "swarm_demo_files": ("gauge", "Fichiers"),
+        })
+
+        server = start_metrics_server(0, registry=registry)
+        try:
+            port = server.server_address[1]
+            body = urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics").read().decode()
+            assert "swarm_demo_total 1.0" in body
+            assert "# TYPE swarm_demo_files gauge" in body
+            assert "swarm_demo_files 7.0" in body
+
+            with pytest.raises(urllib.error.HTTPError):
+                urllib.request.urlopen(f"http://127.0.0.1:{port}/other")
+        finally:
+            stop_metrics_server(server)
+
+    def test_orchestrator_exposes_counters(self, fake_gemini, sandbox_dir):
+        """Les compteurs de l'orchestrateur et du rate limiter sont exposés."""
+        (sandbox_dir / "module.py").write_text("x = 1\n", encoding="utf-8")
+
+        orchestrator = Orchestrator(str(sandbox_dir), max_iterations=3, metrics_port=0)
+        orchestrator.run()
+        try:
+            port = orchestrator.metrics_server.server_address[1]
+            body = urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics").read().decode()
+        finally:
+            stop_metrics_server(orchestrator.metrics_server)
+
+        assert 'swarm_files_processed_total{status="validated"} 1.0' in body
+        assert "swarm_iterations_per_file_count" in body
+        assert "swarm_pytest_duration_seconds_count" in body
+        assert "swarm_rate_limit_wait_seconds_total" in body
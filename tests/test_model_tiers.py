@@ -0,0 +1,195 @@
+"""
+Tests des niveaux de modèles (src.utils.model_tiers) et du moteur de règles du Testeur.
+"""
+
+import pytest
+
+from src.agents.judge_agent import JudgeAgent
+from src.orchestrator import Orchestrator
+from src.tools.analysis_tools import parse_pytest_summary
+from src.utils.model_tiers import (
+    DEFAULT_MODEL,
+    DEFAULT_TIERS,
+    RULES,
+    configure_tiers,
+    llm_models,
+    max_level,
+    models_for,
+)
+
+from conftest import FakeGenerativeModel, FakeResponse
+
+LITE = "gemini-2.5-flash-lite"
+
+PYTEST_OUTPUT = """\
+F.                                                                       [100%]
+=================================== FAILURES ===================================
+=========================== short test summary info ============================
+FAILED m.py::test_value - assert 0 == 1
+FAILED m.py::test_div - ZeroDivisionError: division by zero
+2 failed, 1 passed in 0.05s
+"""
+
+# Le test du fichier ne passe qu'une fois la correction du modèle standard appliquée
+MODULE = (
+    "def f():\n"
+    "    return 1\n"
+    "\n"
+    "def test_fixed():\n"
+    "    assert '# fix' + 'ed' in open(__file__).read()\n"
+)
+
+
+class TieredModel(FakeGenerativeModel):
+    """
+    Modèle factice dont la qualité dépend du niveau :
+    - Auditeur léger : réponse illisible (sortie invalide)
+    - Correcteur léger : correction incomplète ("# lite"), standard : "# fixed"
+    """
+
+    def generate_content(self, prompt, **kwargs):
+        if self.model_name == LITE and "auditeur de code" in prompt:
+            TieredModel.calls.append(prompt)
+            return FakeResponse(prompt, "Je ne peux pas analyser ce fichier.")
+        if self.model_name == LITE and "corriger les bugs" in prompt:
+            TieredModel.calls.append(prompt)
+            code = prompt.split("```python", 1)[1].split("```", 1)[0]
+            return FakeResponse(prompt, code.strip() + "\n# lite\n")
+        return super().generate_content(prompt, **kwargs)
+
+
+class UnreadableLiteJudge(FakeGenerativeModel):
+    """Testeur léger : réponse illisible (escalade vers le modèle standard)."""
+
+    def generate_content(self, prompt, **kwargs):
+        response = super().generate_content(prompt, **kwargs)
+        if self.model_name == LITE and "VALIDATE" in response.text:
+            return FakeResponse(prompt, "Je ne sais pas.")
+        return response
+
+
+@pytest.fixture(autouse=True)
+def default_tiers():
+    configure_tiers(DEFAULT_TIERS)
+    yield
+    configure_tiers(DEFAULT_TIERS)
+
+
+@pytest.fixture
+def tiered_gemini(monkeypatch):
+    import google.generativeai as genai
+
+    TieredModel.calls = []
+    monkeypatch.setattr(genai, "GenerativeModel", TieredModel)
+    return TieredModel
+
+
+class TestTiers:
+
+    def test_models_for_starts_at_level_and_is_clamped(self):
+        assert models_for("fixer") == [LITE, DEFAULT_MODEL]
+        assert models_for("fixer", 1) == [DEFAULT_MODEL]
+        assert models_for("fixer", 9) == [DEFAULT_MODEL]
+        assert llm_models(models_for("judge")) == [LITE, DEFAULT_MODEL]
+        assert max_level("judge") == 2
+
+    def test_disabled_tiering_uses_default_model_only(self):
+        configure_tiers(None)
+
+        assert models_for("auditor") == [DEFAULT_MODEL]
+        assert RULES not in models_for("judge")
+
+
+class TestPytestSummary:
+
+    def test_counts_and_failures(self):
+        summary = parse_pytest_summary(PYTEST_OUTPUT)
+
+        assert (summary["passed"], summary["failed"], summary["errors"]) == (1, 2, 0)
+        assert [f["error_type"] for f in summary["failures"]] == ["AssertionError", "ZeroDivisionError"]
+        assert summary["failures"][0]["location"] == "m.py"
+
+    def test_no_result_line(self):
+        assert parse_pytest_summary("Timeout after 60s") is None
+        assert parse_pytest_summary("no tests ran in 0.01s")["no_tests"] is True
+
+
+class TestJudgeRules:
+
+    def test_failing_test_is_decided_without_model(self, fake_gemini, sandbox_dir):
+        path = sandbox_dir / "m.py"
+        path.write_text("def test_value():\n    assert 0 == 1\n", encoding="utf-8")
+
+        report = JudgeAgent(LITE, use_rules=True).judge_file(str(path), {"total_issues": 1})
+
+        assert report["decision"] == "PASS_TO_FIXER"
+        assert report["validation_method"] == RULES
+        assert report["errors"][0]["error_type"] == "AssertionError"
+        assert fake_gemini.calls == []
+
+    def test_passing_tests_are_validated_without_model(self, fake_gemini, sandbox_dir):
+        path = sandbox_dir / "m.py"
+        path.write_text("def test_value():\n    assert 1 == 1\n", encoding="utf-8")
+
+        report = JudgeAgent(LITE, use_rules=True).judge_file(str(path), {"total_issues": 1})
+
+        assert report["decision"] == "VALIDATE"
+        assert fake_gemini.calls == []
+
+    def test_collection_error_goes_to_model(self, fake_gemini, sandbox_dir):
+        path = sandbox_dir / "m.py"
+        path.write_text("x = 1 / 0\n\ndef test_value():\n    assert True\n", encoding="utf-8")
+
+        JudgeAgent(LITE, use_rules=True).judge_file(str(path), {"total_issues": 1})
+
+        assert len(fake_gemini.calls) == 1
+
+
+class TestEscalation:
+
+    def test_invalid_output_and_rejection_escalate(self, tiered_gemini, sandbox_dir):
+        (sandbox_dir / "m.py").write_text(MODULE, encoding="utf-8")
+
+        summary = Orchestrator(str(sandbox_dir)).run()
+
+        assert summary["files"][0]["status"] == "VALIDATED"
+        by_model = summary["timing"]["llm_by_model"]
+        assert by_model[RULES]["calls"] == 2
+        assert by_model[RULES]["prompt_tokens"] == 0
+        assert by_model[LITE]["calls"] == 2
+        assert by_model[DEFAULT_MODEL]["calls"] == 3
+
+    def test_no_tiering_calls_default_model_only(self, fake_gemini, sandbox_dir):
+        (sandbox_dir / "m.py").write_text("def f():\n    return 1\n", encoding="utf-8")
+
+        summary = Orchestrator(str(sandbox_dir), model_tiering=False).run()
+
+        assert summary["files"][0]["status"] == "VALIDATED"
+        assert set(summary["timing"]["llm_by_model"]) == {DEFAULT_MODEL}
+
+    def test_judge_tiers_share_one_pytest_run(self, monkeypatch, sandbox_dir):
+        import google.generativeai as genai
+        from src.agents import judge_agent
+        from src.workflow_graph import _run_judge
+
+        FakeGenerativeModel.calls = []
+        monkeypatch.setattr(genai, "GenerativeModel", UnreadableLiteJudge)
+        runs = []
+        run_pytest = judge_agent.run_pytest
+
+        def counting_run_pytest(path, extra_paths=None):
+            runs.append(path)
+            return run_pytest(path, extra_paths=extra_paths)
+
+        monkeypatch.setattr(judge_agent, "run_pytest", counting_run_pytest)
+        path = sandbox_dir / "m.py"
+        # Erreur de collecte : les règles ne décident pas, les deux modèles sont appelés
+        path.write_text("x = 1 / 0\n\ndef test_value():\n    assert True\n", encoding="utf-8")
+
+        escalations = []
+        report = _run_judge({"file_path": str(path), "audit_report": {"total_issues": 1}}, escalations)
+
+        assert report["decision"] == "VALIDATE"
+        assert len(FakeGenerativeModel.calls) == 2
+        assert [e["to"] for e in escalations] == [DEFAULT_MODEL]
+        assert runs == [str(path)]
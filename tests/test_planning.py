@@ -0,0 +1,108 @@
+"""
+Tests du mode --plan (estimation d'un run sans appel au modèle).
+"""
+
+import os
+import subprocess
+import sys
+
+from src.planning import build_plan, estimate_file, estimate_tokens
+from src.prompts import ESTIMATED_COSTS
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SAMPLE_CODE = "def add(a, b):\n    return a + b\n"
+
+
+def _make_target(tmp_path, count=3):
+    target = tmp_path / "target"
+    (target / "pkg").mkdir(parents=True)
+    for i in range(count):
+        folder = target if i % 2 == 0 else target / "pkg"
+        (folder / f"module_{i}.py").write_text(SAMPLE_CODE * (i + 1), encoding="utf-8")
+    # Les fichiers de test ne sont pas traités par l'orchestrateur
+    (target / "test_module_0.py").write_text("def test_x():\n    pass\n", encoding="utf-8")
+    return target
+
+
+class TestPlanning:
+    """Estimation des tokens, des requêtes et de la durée."""
+
+    def test_estimate_file_uses_prompt_sizes(self, tmp_path):
+        """Les tokens d'entrée suivent la taille du code et des prompts."""
+        path = tmp_path / "small.py"
+        path.write_text(SAMPLE_CODE, encoding="utf-8")
+        big_path = tmp_path / "big.py"
+        big_path.write_text(SAMPLE_CODE * 50, encoding="utf-8")
+
+        small = estimate_file(str(path))
+        big = estimate_file(str(big_path))
+
+        assert small["lines"] == 3
+        assert small["tokens"]["auditor"]["input"] > estimate_tokens(SAMPLE_CODE)
+        assert big["tokens"]["auditor"]["input"] > small["tokens"]["auditor"]["input"]
+        assert big["tokens"]["fixer"]["output"] >= estimate_tokens(SAMPLE_CODE * 50)
+        assert small["tokens"]["judge"]["output"] == ESTIMATED_COSTS["judge"]["output_tokens_avg"]
+
+    def test_scenarios_project_requests(self, tmp_path):
+        """Requêtes : 1 par fichier propre, 3 par passage, max_iterations passages au pire."""
+        plan = build_plan(str(_make_target(tmp_path)), max_iterations=4, max_rpm=60)
+
+        assert plan["total_files"] == 3
+        assert plan["scenarios"]["best"]["requests"] == 3
+        assert plan["scenarios"]["typical"]["requests"] == 9
+        assert plan["scenarios"]["worst"]["requests"] == 36
+
+    def test_duplicates_are_not_estimated(self, tmp_path):
+        """Une copie identique reprend le résultat de son représentant, sans appel."""
+        target = _make_target(tmp_path)
+        (target / "pkg" / "copy.py").write_text(SAMPLE_CODE, encoding="utf-8")
+
+        plan = build_plan(str(target), max_iterations=4, max_rpm=60)
+        assert plan["total_files"] == 4
+        assert plan["duplicates"] == 1
+        assert plan["scenarios"]["typical"]["requests"] == 9
+
+        assert build_plan(str(target), max_rpm=60, dedup=False)["scenarios"]["typical"]["requests"] == 12
+
+    def test_fused_files_use_one_call_for_audit_and_fix(self, tmp_path):
+        """Sous le seuil : audit_fix -> judge, deux appels par passage."""
+        plan = build_plan(str(_make_target(tmp_path)), max_iterations=4, max_rpm=60,
+                          fuse_max_tokens=1500)
+
+        assert plan["fused_files"] == 3
+        assert set(plan["files"][0]["tokens"]) == {"audit_fix", "judge"}
+        assert plan["scenarios"]["best"]["requests"] == 3
+        assert plan["scenarios"]["typical"]["requests"] == 6
+        assert plan["scenarios"]["worst"]["requests"] == 24
+
+        # Seuil trop bas : aucun fichier fusionné
+        assert build_plan(str(_make_target(tmp_path / "other")), max_rpm=60,
+                          fuse_max_tokens=1)["fused_files"] == 0
+
+    def test_wall_time_bounded_by_rate_limit(self, tmp_path):
+        """Ajouter des workers ne dépasse pas la limite de requêtes par minute."""
+        target = str(_make_target(tmp_path))
+
+        slow = build_plan(target, max_rpm=4, workers=1)["scenarios"]["typical"]
+        parallel = build_plan(target, max_rpm=4, workers=8)["scenarios"]["typical"]
+        assert slow["bound"] == "rate_limit"
+        assert parallel["wall_seconds"] == slow["wall_seconds"] == 9 * 15.0
+
+        fast_single = build_plan(target, max_rpm=1000, workers=1)["scenarios"]["typical"]
+        fast_parallel = build_plan(target, max_rpm=1000, workers=3)["scenarios"]["typical"]
+        assert fast_single["bound"] == "latency"
+        assert fast_parallel["wall_seconds"] < fast_single["wall_seconds"]
+
+    def test_plan_cli_without_api_key(self, tmp_path):
+        """--plan fonctionne sans clé API et sans importer Gemini."""
+        env = {k: v for k, v in os.environ.items() if k != "GOOGLE_API_KEY"}
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", os.path.join(PROJECT_ROOT, "main.py"),
+             "--target_dir", str(_make_target(tmp_path)), "--plan"],
+            cwd=str(tmp_path), capture_output=True, text=True, timeout=60, env=env
+        )
+
+        assert result.returncode == 0, result.stderr
+        assert "PLAN D'EXÉCUTION" in result.stdout
+        assert "google.generativeai" not in result.stderr
@@ -0,0 +1,136 @@
+"""
+Tests du budget de tokens des prompts (src.prompts.budget).
+"""
+
+from src.orchestrator import Orchestrator
+from src.prompts import AGENT_BUDGETS, build_auditor_prompt, build_fixer_prompt, build_judge_prompt
+from src.prompts.budget import (
+    compact_audit_report,
+    count_tokens,
+    extract_failure_sections,
+    truncate_to_tokens,
+)
+from src.prompts.fixer_prompt import get_fixer_prompt
+from src.utils.tracing import summarize_spans
+
+
+PYTEST_OUTPUT = """============================= test session starts ==============================
+platform linux -- Python 3.11.7, pytest-7.4.0
+collected 3 items
+
+test_code.py::test_main PASSED                                        [ 33%]
+test_code.py::test_edge_cases FAILED                                  [ 66%]
+test_code.py::test_empty_input PASSED                                 [100%]
+
+=================================== FAILURES ===================================
+__________________________ test_edge_cases ___________________________
+>       assert result == 3.0
+E       AssertionError: assert 2.5 == 3.0
+=========================== short test summary info ============================
+FAILED test_code.py::test_edge_cases - AssertionError: assert 2.5 == 3.0
+========================= 1 failed, 2 passed in 0.08s ==========================
+"""
+
+
+def _report(issues):
+    return {"file": "m.py", "total_issues": len(issues), "issues": issues, "summary": ""}
+
+
+def _issue(severity, description="x" * 200):
+    return {"line": 1, "type": "BUG", "severity": severity, "description": description,
+            "suggestion": "", "fix": None}
+
+
+class TestCompaction:
+    """Réduction des éléments injectés dans les prompts."""
+
+    def test_audit_report_drops_redundant_and_empty_fields(self):
+        """'file', 'total_issues' et les valeurs vides disparaissent."""
+        compacted = compact_audit_report(_report([_issue("HIGH", "boom")]))
+
+        assert compacted == {"issues": [{"line": 1, "type": "BUG", "severity": "HIGH",
+                                         "description": "boom"}]}
+
+    def test_compact_fixer_prompt_is_smaller(self):
+        """Le JSON compact coûte moins de tokens que le JSON indenté."""
+        report = _report([_issue("HIGH"), _issue("LOW")])
+        legacy = get_fixer_prompt("m.py", "x = 1\n", report, compact=False)
+        compact = get_fixer_prompt("m.py", "x = 1\n", report)
+
+        assert count_tokens(compact) < count_tokens(legacy)
+
+    def test_failure_sections_keep_failures_and_summary(self):
+        """Les lignes PASSED et l'en-tête de session sont retirées."""
+        reduced = extract_failure_sections(PYTEST_OUTPUT)
+
+        assert "AssertionError" in reduced
+        assert "short test summary info" in reduced
+        assert "1 failed, 2 passed" in reduced
+        assert "PASSED" not in reduced
+        assert "platform linux" not in reduced
+
+    def test_unrecognized_output_is_kept(self):
+        """Une sortie sans sections pytest est renvoyée telle quelle."""
+        assert extract_failure_sections("Timeout: Tests took too long") == "Timeout: Tests took too long"
+
+    def test_truncation_keeps_head_and_tail(self):
+        """La troncature garde le début et la fin (résumé pytest)."""
+        text = "START " + "a" * 4000 + " END"
+        truncated = truncate_to_tokens(text, 100)
+
+        assert count_tokens(truncated) <= 100
+        assert truncated.startswith("START")
+        assert truncated.endswith("END")
+
+
+class TestBudgets:
+    """Respect des budgets par agent."""
+
+    def test_fixer_stats_report_saved_tokens(self):
+        """Les stats comparent le prompt envoyé au prompt historique."""
+        prompt, stats = build_fixer_prompt("m.py", "x = 1\n", _report([_issue("HIGH")]))
+
+        assert stats["agent"] == "fixer"
+        assert stats["saved_tokens"] > 0
+        assert stats["prompt_tokens"] == count_tokens(prompt)
+        assert not stats["over_budget"]
+
+    def test_fixer_drops_low_severity_issues_over_budget(self):
+        """Au-delà du budget : contexte retiré, puis problèmes LOW avant les HIGH."""
+        issues = [_issue("HIGH", "critical bug")] + [_issue("LOW", "y" * 2000) for _ in range(20)]
+        prompt, stats = build_fixer_prompt("m.py", "x = 1\n", _report(issues), context="ctx " * 3000)
+
+        assert stats["steps"][:2] == ["compact_json", "dropped_context"]
+        assert "dropped_low_issues" in stats["steps"]
+        assert stats["dropped_issues"] == 20
+        assert "critical bug" in prompt
+        assert stats["prompt_tokens"] <= AGENT_BUDGETS["fixer"]
+
+    def test_auditor_drops_context_over_budget(self):
+        """Le contexte projet est retiré, jamais le code."""
+        code = "def f():\n    return 1\n"
+        prompt, stats = build_auditor_prompt("m.py", code, context="ctx " * 8000)
+
+        assert stats["steps"] == ["dropped_context"]
+        assert code in prompt
+
+    def test_judge_prompt_fits_budget(self):
+        """Une sortie pytest énorme est réduite puis tronquée."""
+        huge = PYTEST_OUTPUT.replace("E       AssertionError", "E       " + "z" * 20000 + "\nE       AssertionError")
+        prompt, stats = build_judge_prompt("m.py", huge)
+
+        assert stats["steps"] == ["failure_sections", "truncated_output"]
+        assert stats["prompt_tokens"] <= AGENT_BUDGETS["judge"]
+        assert "1 failed, 2 passed" in prompt
+
+
+class TestTracedSavings:
+    """Les tokens économisés remontent dans le résumé des temps."""
+
+    def test_run_reports_saved_tokens(self, fake_gemini, sandbox_dir):
+        (sandbox_dir / "module.py").write_text("def f():\n    return 1\n", encoding="utf-8")
+
+        Orchestrator(str(sandbox_dir), max_iterations=3).run()
+
+        fixer = summarize_spans()["llm_by_agent"]["Fixer_Agent"]
+        assert fixer["prompt_tokens_saved"] > 0
@@ -0,0 +1,95 @@
+"""
+Tests du pool de workers pytest (src.tools.pytest_pool).
+"""
+
+import multiprocessing
+import subprocess
+
+import pytest
+
+from src.tools import pytest_pool
+from src.tools.pytest_pool import PytestPool, configure_pytest_pool, run_pytest_command
+
+pytestmark = pytest.mark.skipif(
+    "forkserver" not in multiprocessing.get_all_start_methods(),
+    reason="forkserver indisponible"
+)
+
+ARGS = ["--disable-warnings", "-q", "--tb=short"]
+
+
+@pytest.fixture
+def pool():
+    pool = PytestPool(max_workers=1)
+    yield pool
+    pool.close()
+
+
+def last_line(result):
+    return result.stdout.strip().splitlines()[-1].split(" in ")[0]
+
+
+class TestPytestPool:
+
+    def test_same_result_as_subprocess(self, pool, tmp_path):
+        test_file = tmp_path / "test_m.py"
+        test_file.write_text("def test_ok():\n    assert 1\n\ndef test_ko():\n    assert 0\n",
+                             encoding="utf-8")
+
+        pooled = pool.run([str(test_file), *ARGS], timeout=60)
+        direct = subprocess.run(["pytest", str(test_file), *ARGS], capture_output=True, text=True)
+
+        assert pooled.returncode == direct.returncode == 1
+        assert last_line(pooled) == last_line(direct) == "1 failed, 1 passed"
+        assert "FAILED" in pooled.stdout
+
+    def test_modified_code_is_reimported(self, pool, tmp_path):
+        (tmp_path / "m.py").write_text("def f():\n    return 0\n", encoding="utf-8")
+        test_file = tmp_path / "test_m.py"
+        test_file.write_text("from m import f\n\ndef test_f():\n    assert f() == 1\n", encoding="utf-8")
+
+        assert pool.run([str(test_file), *ARGS], timeout=60).returncode == 1
+        (tmp_path / "m.py").write_text("def f():\n    return 1  # corrigé\n", encoding="utf-8")
+
+        assert pool.run([str(test_file), *ARGS], timeout=60).returncode == 0
+        assert pool.stats["tasks"] == 2
+        assert len(pool._workers) == 1
+
+    def test_timeout_kills_worker(self, pool, tmp_path):
+        slow = tmp_path / "test_slow.py"
+        slow.write_text("import time\n\ndef test_slow():\n    time.sleep(30)\n", encoding="utf-8")
+        fast = tmp_path / "test_fast.py"
+        fast.write_text("def test_fast():\n    assert 1\n", encoding="utf-8")
+        pool.run([str(fast), *ARGS], timeout=60)
+
+        with pytest.raises(subprocess.TimeoutExpired):
+            pool.run([str(slow), *ARGS], timeout=1)
+
+        assert pool.stats["timeouts"] == 1
+        assert pool.run([str(fast), *ARGS], timeout=60).returncode == 0
+
+    def test_crashed_worker_is_replaced(self, pool, tmp_path):
+        fast = tmp_path / "test_fast.py"
+        fast.write_text("def test_fast():\n    assert 1\n", encoding="utf-8")
+        crash = tmp_path / "test_crash.py"
+        crash.write_text("import os\n\ndef test_crash():\n    os._exit(7)\n", encoding="utf-8")
+        pool.run([str(fast), *ARGS], timeout=60)
+
+        result = pool.run([str(crash), *ARGS], timeout=60)
+
+        assert result.returncode == 7
+        assert pool.stats["crashes"] == 1
+        assert not pool.broken
+        assert pool.run([str(fast), *ARGS], timeout=60).returncode == 0
+
+
+def test_disabled_pool_runs_subprocess(tmp_path, monkeypatch):
+    test_file = tmp_path / "test_m.py"
+    test_file.write_text("def test_ok():\n    assert 1\n", encoding="utf-8")
+    configure_pytest_pool(enabled=False)
+    try:
+        result = run_pytest_command([str(test_file), *ARGS], timeout=60)
+        assert result.returncode == 0
+        assert pytest_pool._pool is None
+    finally:
+        configure_pytest_pool(enabled=True)
@@ -0,0 +1,258 @@
+"""
+Tests de la reprise des erreurs transitoires (src.utils.resilience).
+"""
+
+import threading
+import time
+
+import pytest
+from google.api_core import exceptions as api_exceptions
+
+from src.agents.auditor_agent import AuditorAgent
+from src.utils import resilience
+from src.utils.resilience import (
+    FATAL,
+    RATE_LIMIT,
+    TRANSIENT,
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+    call_with_retry,
+    classify_error,
+    get_resilience_stats,
+    reset_resilience,
+    retry_after_seconds,
+)
+from src.utils.tracing import get_spans, reset_tracing
+
+from conftest import FakeGenerativeModel
+
+
+class Flaky:
+    """Appel qui échoue avec `errors` avant de réussir."""
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+@pytest.fixture(autouse=True)
+def clean_state():
+    reset_resilience()
+    reset_tracing()
+    yield
+    reset_resilience()
+
+
+@pytest.fixture
+def sleeps():
+    recorded = []
+    return recorded, lambda seconds, reason, attempt: recorded.append((round(seconds, 3), reason))
+
+
+class TestClassification:
+
+    def test_sdk_errors(self):
+        assert classify_error(api_exceptions.ResourceExhausted("quota")) == RATE_LIMIT
+        assert classify_error(api_exceptions.ServiceUnavailable("down")) == TRANSIENT
+        assert classify_error(api_exceptions.DeadlineExceeded("slow")) == TRANSIENT
+        assert classify_error(TimeoutError()) == TRANSIENT
+        assert classify_error(api_exceptions.InvalidArgument("bad")) == FATAL
+        assert classify_error(ValueError("bug")) == FATAL
+
+    def test_retry_after_from_message_and_header(self):
+        grpc = api_exceptions.ResourceExhausted("Quota exceeded. retry_delay {\n  seconds: 41\n}")
+        assert retry_after_seconds(grpc) == 41
+
+        class Response:
+            headers = {"Retry-After": "7"}
+
+        assert retry_after_seconds(api_exceptions.TooManyRequests("slow down", response=Response())) == 7
+        assert retry_after_seconds(api_exceptions.ServiceUnavailable("down")) is None
+
+    def test_backoff_is_exponential_with_jitter_and_capped(self):
+        policy = RetryPolicy(base_delay=2.0, max_delay=10.0)
+
+        assert [policy.backoff(n, rng=lambda: 1.0) for n in (1, 2, 3, 4)] == [2.0, 4.0, 8.0, 10.0]
+        assert policy.backoff(3, rng=lambda: 0.5) == 4.0
+
+
+class TestCallWithRetry:
+
+    def test_transient_errors_are_retried(self, sleeps):
+        recorded, sleep = sleeps
+        call = Flaky(api_exceptions.ServiceUnavailable("503"), api_exceptions.ResourceExhausted("429"))
+
+        assert call_with_retry(call, RetryPolicy(base_delay=0.01), CircuitBreaker(), sleep=sleep) == "ok"
+        assert call.calls == 3
+        assert [reason for _, reason in recorded] == [TRANSIENT, RATE_LIMIT]
+        assert get_resilience_stats()["retries"] == 2
+
+    def test_retry_after_overrides_shorter_backoff(self, sleeps):
+        recorded, sleep = sleeps
+        call = Flaky(api_exceptions.ResourceExhausted("retry in 3s"))
+
+        call_with_retry(call, RetryPolicy(base_delay=0.01), CircuitBreaker(), sleep=sleep)
+
+        assert recorded == [(3.0, RATE_LIMIT)]
+
+    def test_fatal_error_is_not_retried(self, sleeps):
+        recorded, sleep = sleeps
+        call = Flaky(api_exceptions.PermissionDenied("bad key"))
+
+        with pytest.raises(api_exceptions.PermissionDenied):
+            call_with_retry(call, RetryPolicy(), CircuitBreaker(), sleep=sleep)
+        assert call.calls == 1
+        assert recorded == []
+
+    def test_attempts_and_deadline_are_bounded(self, sleeps):
+        _, sleep = sleeps
+        call = Flaky(*[api_exceptions.ServiceUnavailable("503")] * 10)
+        with pytest.raises(api_exceptions.ServiceUnavailable):
+            call_with_retry(call, RetryPolicy(max_attempts=3, base_delay=0.01), CircuitBreaker(), sleep=sleep)
+        assert call.calls == 3
+
+        call = Flaky(api_exceptions.ResourceExhausted("retry in 60s"))
+        with pytest.raises(api_exceptions.ResourceExhausted):
+            call_with_retry(call, RetryPolicy(deadline=5.0), CircuitBreaker(), sleep=sleep)
+        assert call.calls == 1
+
+    def test_before_retry_runs_between_attempts(self, sleeps):
+        _, sleep = sleeps
+        hook = []
+        call = Flaky(api_exceptions.ServiceUnavailable("503"))
+
+        call_with_retry(call, RetryPolicy(base_delay=0.01), CircuitBreaker(), sleep=sleep,
+                        before_retry=lambda: hook.append(1))
+
+        assert hook == [1]
+
+    def test_backoff_is_traced(self):
+        call = Flaky(api_exceptions.ServiceUnavailable("503"))
+
+        call_with_retry(call, RetryPolicy(base_delay=0.001), CircuitBreaker())
+
+        assert [s.kind for s in get_spans()] == ["retry"]
+
+
+class TestCircuitBreaker:
+
+    def test_opens_after_threshold_and_closes_on_success(self):
+        breaker = CircuitBreaker(failure_threshold=2, cooldown=60.0)
+        breaker.record_failure()
+        assert breaker.state == "closed"
+        breaker.record_failure()
+        assert breaker.state == "open"
+        assert breaker.open_count == 1
+
+        breaker.record_success()
+        assert breaker.state == "closed"
+
+    def test_open_breaker_waits_then_probes(self, sleeps):
+        recorded, record = sleeps
+        breaker = CircuitBreaker(failure_threshold=1, cooldown=0.05)
+        breaker.record_failure()
+
+        def sleep(seconds, reason, attempt):
+            record(seconds, reason, attempt)
+            time.sleep(seconds)
+
+        assert call_with_retry(Flaky(), RetryPolicy(deadline=30.0), breaker, sleep=sleep) == "ok"
+        assert recorded[0][1] == "circuit_open"
+        assert breaker.state == "closed"
+
+    def test_open_breaker_beyond_deadline_fails_fast(self, sleeps):
+        _, sleep = sleeps
+        breaker = CircuitBreaker(failure_threshold=1, cooldown=120.0)
+        breaker.record_failure()
+        call = Flaky()
+
+        with pytest.raises(CircuitOpenError):
+            call_with_retry(call, RetryPolicy(deadline=10.0), breaker, sleep=sleep)
+        assert call.calls == 0
+
+    def test_single_probe_after_cooldown(self):
+        """Pause écoulée : un seul essai à la fois, libéré par son résultat."""
+        breaker = CircuitBreaker(failure_threshold=1, cooldown=0.0)
+        breaker.record_failure()
+
+        assert breaker.try_probe()
+        assert not breaker.try_probe()
+        assert not breaker.wait_for_probe(timeout=0.01)
+
+        breaker.release_probe()
+        assert breaker.try_probe()
+        breaker.record_success()
+        assert breaker.try_probe() and breaker.try_probe()
+
+    def test_concurrent_workers_send_one_probe(self):
+        """Les autres workers attendent le résultat de l'essai au lieu d'appeler l'API."""
+        breaker = CircuitBreaker(failure_threshold=1, cooldown=0.0)
+        breaker.record_failure()
+        release = threading.Event()
+        started = []
+
+        def call():
+            started.append(threading.get_ident())
+            assert release.wait(5.0)
+            return "ok"
+
+        results = []
+        workers = [
+            threading.Thread(target=lambda: results.append(
+                call_with_retry(call, RetryPolicy(deadline=10.0), breaker, sleep=lambda *args: None)))
+            for _ in range(4)
+        ]
+        for worker in workers:
+            worker.start()
+        deadline = time.monotonic() + 5.0
+        while not started and time.monotonic() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.1)
+
+        assert len(started) == 1
+        assert breaker.state == "half_open"
+
+        release.set()
+        for worker in workers:
+            worker.join(5.0)
+        assert results == ["ok"] * 4
+        assert len(started) == 4
+        assert breaker.state == "closed"
+
+
+class QuotaBlipModel(FakeGenerativeModel):
+    """Premier appel : 429, puis comportement normal du modèle factice."""
+
+    failures = 1
+
+    def generate_content(self, prompt, **kwargs):
+        if QuotaBlipModel.failures:
+            QuotaBlipModel.failures -= 1
+            raise api_exceptions.ResourceExhausted("Quota exceeded, retry in 0.01s")
+        return super().generate_content(prompt, **kwargs)
+
+
+class TestAgentRecovers:
+
+    def test_quota_blip_does_not_fail_the_file(self, monkeypatch, sandbox_dir):
+        import google.generativeai as genai
+
+        QuotaBlipModel.failures = 1
+        monkeypatch.setattr(genai, "GenerativeModel", QuotaBlipModel)
+        monkeypatch.setattr(resilience, "_sleep", lambda seconds, reason, attempt: None)
+        path = sandbox_dir / "m.py"
+        path.write_text("def f():\n    return 1\n", encoding="utf-8")
+
+        report = AuditorAgent().analyze_file(str(path))
+
+        assert report["total_issues"] == 1
+        assert get_resilience_stats()["errors"] == {RATE_LIMIT: 1}
+        llm_span = [s for s in get_spans() if s.kind == "llm"][0]
+        assert llm_span.attributes["attempts"] == 2
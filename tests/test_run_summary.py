@@ -0,0 +1,52 @@
+"""
+Tests du résumé écrit au fil du run (src.utils.run_summary).
+"""
+
+import pytest
+
+from src.orchestrator import Orchestrator
+from src.utils.run_summary import FileResult, SummaryWriter, read_summary
+
+CODE = "def f():\n    return 1\n"
+
+
+class TestSummaryWriter:
+
+    def test_lines_are_readable_before_close(self, tmp_path):
+        path = tmp_path / "summary.jsonl"
+        writer = SummaryWriter(str(path), target_dir="sandbox")
+
+        writer.write("file", FileResult("m.py", "sandbox/m.py", "VALIDATED", 1).to_dict())
+
+        partial = read_summary(str(path))
+        assert partial["run"]["target_dir"] == "sandbox"
+        assert partial["files"][0]["status"] == "VALIDATED"
+        assert partial["summary"] is None
+
+        writer.close({"total_files": 1})
+        assert read_summary(str(path))["summary"] == {"total_files": 1}
+
+    def test_file_result_keeps_no_code(self):
+        result = FileResult("m.py", "sandbox/m.py")
+
+        assert not hasattr(result, "__dict__")
+        with pytest.raises(AttributeError):
+            result.current_code = CODE
+
+
+class TestOrchestratorSummaryFile:
+
+    def test_each_file_is_streamed(self, fake_gemini, sandbox_dir, isolated_log_file):
+        for name in ("a.py", "b.py"):
+            (sandbox_dir / name).write_text(CODE, encoding="utf-8")
+
+        summary = Orchestrator(str(sandbox_dir)).run()
+
+        assert summary["summary_file"] == str(isolated_log_file.parent / "run_summary.jsonl")
+        streamed = read_summary(summary["summary_file"])
+        assert sorted(f["file_name"] for f in streamed["files"]) == ["a.py", "b.py"]
+        assert {f["file_name"]: f["status"] for f in streamed["files"]} == {
+            f["file_name"]: f["status"] for f in summary["files"]
+        }
+        assert streamed["summary"]["files_validated"] == summary["files_validated"]
+        assert "files" not in streamed["summary"]
@@ -0,0 +1,119 @@
+"""
+Tests de l'ordonnancement des fichiers (priorités, deadline, workers).
+"""
+
+import os
+
+import pytest
+
+from src.orchestrator import Orchestrator
+from src.scheduler import history_key, load_failure_history, parse_duration, schedule_files
+from src.utils.logger import ActionType, log_experiment
+
+VALID_CODE = "def f():\n    return 1\n"
+
+
+def _write(folder, name, content):
+    path = folder / name
+    path.write_text(content, encoding="utf-8")
+    return str(path)
+
+
+def _log_result(file_name, final_status, key=None):
+    log_experiment(
+        agent_name="Orchestrator",
+        model_used="N/A",
+        action=ActionType.ANALYSIS,
+        details={
+            "operation": "file_processing_complete",
+            "file": file_name,
+            "history_key": key,
+            "input_prompt": f"Completed processing file: {file_name}",
+            "output_response": f"Status: {final_status}",
+            "final_status": final_status,
+        },
+        status="SUCCESS"
+    )
+
+
+class TestScheduler:
+    """Score local et ordre de traitement."""
+
+    def test_parse_duration(self):
+        assert parse_duration("90s") == 90
+        assert parse_duration("30m") == 1800
+        assert parse_duration("1.5h") == 5400
+        assert parse_duration("5") == 300
+        with pytest.raises(ValueError):
+            parse_duration("soon")
+
+    def test_syntax_errors_first_then_history_then_size(self, tmp_path):
+        """Erreur de syntaxe en tête, fichiers souvent en échec en fin de file."""
+        flaky = _write(tmp_path, "flaky.py", VALID_CODE)
+        big = _write(tmp_path, "big.py", VALID_CODE * 20)
+        small = _write(tmp_path, "small.py", VALID_CODE)
+        broken = _write(tmp_path, "broken.py", "def f(:\n    return 1\n")
+        for _ in range(3):
+            _log_result("flaky.py", "MAX_ITERATIONS", key="flaky.py")
+
+        order = [item.path for item in schedule_files([flaky, big, small, broken], max_rpm=60,
+                                                      root=str(tmp_path))]
+
+        assert order == [broken, small, big, flaky]
+
+    def test_failure_history_from_logs(self):
+        _log_result("a.py", "VALIDATED", key="pkg/a.py")
+        _log_result("a.py", "FAILED", key="pkg/a.py")
+        _log_result("b.py", "FAILED")  # entrée antérieure à history_key
+
+        assert load_failure_history() == {"pkg/a.py": (2, 1), "name:b.py": (1, 1)}
+
+    def test_same_name_in_different_folders_has_separate_history(self, tmp_path):
+        """Deux utils.py : l'échec de l'un ne repousse pas l'autre."""
+        (tmp_path / "api").mkdir()
+        (tmp_path / "core").mkdir()
+        api = _write(tmp_path / "api", "utils.py", VALID_CODE)
+        core = _write(tmp_path / "core", "utils.py", VALID_CODE)
+        for _ in range(3):
+            _log_result("utils.py", "MAX_ITERATIONS", key=history_key(api, str(tmp_path)))
+        # Anciennes entrées (nom seul) : ambiguës, donc ignorées ici
+        _log_result("utils.py", "FAILED")
+
+        scheduled = {item.path: item for item in schedule_files([api, core], max_rpm=60, root=str(tmp_path))}
+
+        assert scheduled[api].history_key == "api/utils.py"
+        assert scheduled[api].failure_rate > 0.5
+        assert scheduled[core].failure_rate == 0.5  # jamais vu
+
+    def test_deadline_mode_prefers_expected_payoff(self, tmp_path):
+        """Sous deadline, un petit fichier fiable passe avant un gros fichier."""
+        big = _write(tmp_path, "big.py", VALID_CODE * 400)
+        small = _write(tmp_path, "small.py", VALID_CODE)
+
+        order = [item.path for item in schedule_files([big, small], deadline_seconds=600, max_rpm=1000)]
+
+        assert order == [small, big]
+
+
+class TestOrchestratorScheduling:
+    """Workers et deadline dans l'orchestrateur."""
+
+    def test_workers_process_all_files(self, fake_gemini, sandbox_dir):
+        for i in range(4):
+            _write(sandbox_dir, f"module_{i}.py", VALID_CODE)
+
+        summary = Orchestrator(str(sandbox_dir), max_iterations=3, workers=3).run()
+
+        assert summary["files_validated"] == 4
+        assert summary["files_failed"] == 0
+        assert sorted(f["file_name"] for f in summary["files"]) == [f"module_{i}.py" for i in range(4)]
+
+    def test_deadline_skips_files_that_do_not_fit(self, fake_gemini, sandbox_dir):
+        """Aucun fichier ne tient dans une seconde au rythme du rate limiter."""
+        _write(sandbox_dir, "module.py", VALID_CODE)
+
+        summary = Orchestrator(str(sandbox_dir), max_iterations=3, deadline_seconds=1).run()
+
+        assert summary["files_skipped"] == 1
+        assert summary["files"] == []
+        assert fake_gemini.calls == []
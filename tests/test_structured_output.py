@@ -0,0 +1,176 @@
+"""
+Tests des réponses JSON structurées (src.utils.structured_output).
+"""
+
+import pytest
+from conftest import FakeResponse
+
+from src.agents.auditor_agent import AuditorAgent
+from src.agents.judge_agent import JudgeAgent
+from src.utils.structured_output import (
+    AuditReport,
+    JudgeReport,
+    StructuredOutputError,
+    json_generation_kwargs,
+    parse_structured,
+    repair_json,
+)
+
+
+class TestRepair:
+    """Réparation locale des réponses mal formées."""
+
+    def test_markdown_fences_are_not_a_repair(self):
+        """Une réponse entourée de ```json est décodée directement."""
+        report, repaired = parse_structured('```json\n{"total_issues":0,"issues":[]}\n```', AuditReport)
+
+        assert report["total_issues"] == 0
+        assert not repaired
+
+    def test_surrounding_text_and_trailing_comma(self):
+        """Texte autour de l'objet et virgule finale sont tolérés."""
+        data = repair_json('Voici le rapport : {"decision":"VALIDATE","errors":[],} Merci.')
+
+        assert data == {"decision": "VALIDATE", "errors": []}
+
+    def test_truncated_response_keeps_complete_items(self):
+        """Une réponse tronquée garde les éléments complets."""
+        text = '{"total_issues":2,"issues":[{"line":5,"type":"bug"},{"line":9,"descr'
+        report, repaired = parse_structured(text, AuditReport)
+
+        assert repaired
+        assert report["issues"][0] == {"line": 5, "type": "bug", "severity": "MEDIUM",
+                                       "description": "", "suggestion": ""}
+        assert report["total_issues"] == 2
+
+    def test_unterminated_string_is_closed(self):
+        """Une chaîne coupée en plein milieu est refermée."""
+        data = repair_json('{"decision":"PASS_TO_FIXER","message":"2 tests fail')
+
+        assert data == {"decision": "PASS_TO_FIXER", "message": "2 tests fail"}
+
+    def test_no_json_raises(self):
+        """Sans objet JSON, l'erreur est explicite."""
+        with pytest.raises(StructuredOutputError):
+            parse_structured("Je ne peux pas analyser ce fichier.", AuditReport)
+
+
+class TestSchemas:
+    """Validation des rapports."""
+
+    def test_audit_report_normalizes_fields(self):
+        """Sévérité en majuscules, ligne extraite, total cohérent avec la liste."""
+        report, _ = parse_structured(
+            '{"total_issues":0,"issues":[{"line":"12-14","severity":"high"}]}', AuditReport
+        )
+
+        assert report["issues"][0]["line"] == 12
+        assert report["issues"][0]["severity"] == "HIGH"
+        assert report["total_issues"] == 1
+
+    @pytest.mark.parametrize("text", [
+        '{"file": "a.py", "total_iss',
+        '```json\n{\n```',
+        'Sorry, I cannot help. {}',
+        '{"total_issues": 0, "issu',
+    ])
+    def test_incomplete_audit_report_is_refused(self, text):
+        """Sans total_issues et issues, pas de rapport « propre » par défaut."""
+        with pytest.raises(StructuredOutputError):
+            parse_structured(text, AuditReport)
+
+    def test_judge_decision_is_validated(self):
+        """Une décision inconnue est refusée, la casse est normalisée."""
+        report, _ = parse_structured('{"decision":"validate","tests_passed":3,"errors":["boom"]}', JudgeReport)
+        assert report["decision"] == "VALIDATE"
+        assert report["errors"][0]["error_message"] == "boom"
+
+        with pytest.raises(StructuredOutputError):
+            parse_structured('{"decision":"MAYBE"}', JudgeReport)
+
+    def test_generation_kwargs_follow_sdk_support(self, monkeypatch):
+        """response_mime_type / response_schema ne sont envoyés que si le SDK les accepte."""
+        from src.utils import structured_output
+
+        monkeypatch.setattr(structured_output, "_supported_generation_fields",
+                            lambda: frozenset({"temperature"}))
+        assert json_generation_kwargs(AuditReport) == {}
+
+        monkeypatch.setattr(structured_output, "_supported_generation_fields",
+                            lambda: frozenset({"response_mime_type", "response_schema"}))
+        config = json_generation_kwargs(JudgeReport)["generation_config"]
+        assert config == {"response_mime_type": "application/json", "response_schema": JudgeReport}
+
+
+class BrokenJsonModel:
+    """Modèle factice renvoyant un JSON tronqué entouré de texte."""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def generate_content(self, prompt, **kwargs):
+        if "auditeur de code" in prompt:
+            text = ('Analyse :\n```json\n{"file":"m.py","total_issues":1,"issues":[{"line":1,'
+                    '"type":"bug","severity":"HIGH","description":"Division by zero"},{"line":')
+        else:
+            text = '{"decision":"PASS_TO_FIXER","tests_run":2,"tests_passed":1,"tests_failed":1,'
+        return FakeResponse(prompt, text)
+
+
+class TruncatedAuditModel(BrokenJsonModel):
+    """L'Auditeur est coupé juste après l'ouverture de la liste des problèmes."""
+
+    calls = []
+
+    def generate_content(self, prompt, **kwargs):
+        TruncatedAuditModel.calls.append(prompt)
+        if "auditeur de code" in prompt:
+            return FakeResponse(prompt, '{"file":"m.py","total_issues":0,"issues":[')
+        return FakeResponse(prompt, '{"decision":"VALIDATE"}')
+
+
+class TestAgents:
+    """Les agents réparent au lieu d'échouer."""
+
+    def test_auditor_repairs_truncated_report(self, monkeypatch, sandbox_dir):
+        import google.generativeai as genai
+
+        monkeypatch.setattr(genai, "GenerativeModel", BrokenJsonModel)
+        path = sandbox_dir / "m.py"
+        path.write_text("def f(x):\n    return 1 / 0\n", encoding="utf-8")
+
+        report = AuditorAgent().analyze_file(str(path))
+
+        assert report["total_issues"] == 1
+        assert report["issues"][0]["description"] == "Division by zero"
+
+    def test_judge_repairs_truncated_decision(self, monkeypatch, sandbox_dir):
+        import google.generativeai as genai
+        from src.agents import judge_agent
+
+        monkeypatch.setattr(genai, "GenerativeModel", BrokenJsonModel)
+        monkeypatch.setattr(judge_agent, "run_pytest", lambda path, extra_paths=None: {
+            "passed": 1, "failed": 1, "returncode": 1, "stdout": "1 failed, 1 passed", "stderr": ""
+        })
+        path = sandbox_dir / "m.py"
+        path.write_text("x = 1\n", encoding="utf-8")
+
+        report = JudgeAgent().judge_file(str(path))
+
+        assert report["decision"] == "PASS_TO_FIXER"
+        assert report["tests_failed"] == 1
+
+    def test_truncated_clean_report_never_validates(self, monkeypatch, sandbox_dir):
+        """Un rapport réparé sans problème n'envoie pas le fichier à la validation."""
+        import google.generativeai as genai
+        from src.orchestrator import Orchestrator
+
+        TruncatedAuditModel.calls = []
+        monkeypatch.setattr(genai, "GenerativeModel", TruncatedAuditModel)
+        (sandbox_dir / "m.py").write_text("def f(x):\n    return 1 / 0\n", encoding="utf-8")
+
+        assert AuditorAgent().analyze_file(str(sandbox_dir / "m.py")) is None
+
+        summary = Orchestrator(str(sandbox_dir)).run()
+        assert summary["files_validated"] == 0
+        assert summary["files_failed"] == 1
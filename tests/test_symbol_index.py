@@ -0,0 +1,116 @@
+"""
+Tests de l'index des symboles et du contexte injecté dans les prompts.
+"""
+
+from src.prompts import get_project_context
+from src.tools.symbol_index import SymbolIndex
+
+MODELS = '''
+MAX_USERS = 10
+
+
+class User(Base):
+    """Utilisateur du service.
+
+    Détails ignorés.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def greet(self, polite: bool = True) -> str:
+        return "hi"
+
+    def _secret(self):
+        pass
+
+
+def helper(x):
+    """Aide interne."""
+    return x
+
+
+def _private():
+    pass
+'''
+
+
+class TestSymbolIndex:
+
+    def test_extracts_signatures_and_doc_lines(self, tmp_path):
+        path = tmp_path / "models.py"
+        path.write_text(MODELS, encoding="utf-8")
+        index = SymbolIndex(str(tmp_path / "index.json"))
+        index.update([str(path)])
+
+        symbols = index.symbols(str(path))
+
+        assert symbols["User"]["kind"] == "class"
+        assert symbols["User"]["doc"] == "Utilisateur du service."
+        assert "def greet(self, polite: bool=True) -> str" in symbols["User"]["signature"]
+        assert "_secret" not in symbols["User"]["signature"]
+        assert symbols["helper"]["signature"] == "def helper(x)"
+        assert symbols["MAX_USERS"]["kind"] == "constant"
+
+    def test_incremental_update_and_persistence(self, tmp_path):
+        a, b = tmp_path / "a.py", tmp_path / "b.py"
+        a.write_text("def f():\n    pass\n", encoding="utf-8")
+        b.write_text("def g():\n    pass\n", encoding="utf-8")
+        index_file = str(tmp_path / "index.json")
+
+        index = SymbolIndex.load(index_file)
+        assert index.update([str(a), str(b)]) == 2
+        index.save()
+
+        reloaded = SymbolIndex.load(index_file)
+        assert reloaded.update([str(a), str(b)]) == 0
+        b.write_text("def g(x):\n    pass\n", encoding="utf-8")
+        assert reloaded.update([str(a), str(b)]) == 1
+        assert reloaded.symbols(str(b))["g"]["signature"] == "def g(x)"
+
+    def test_invalid_file_keeps_previous_symbols(self, tmp_path):
+        path = tmp_path / "m.py"
+        path.write_text("def f():\n    pass\n", encoding="utf-8")
+        index = SymbolIndex(str(tmp_path / "index.json"))
+        index.update([str(path)])
+
+        path.write_text("def f(:\n", encoding="utf-8")
+
+        assert index.update([str(path)]) == 0
+        assert "f" in index.symbols(str(path))
+
+    def test_lookup_only_referenced_symbols(self, tmp_path):
+        path = tmp_path / "models.py"
+        path.write_text(MODELS, encoding="utf-8")
+        index = SymbolIndex(str(tmp_path / "index.json"))
+
+        named = [s["name"] for s in index.lookup({str(path): {"User"}})]
+        public = [s["name"] for s in index.lookup({str(path): None})]
+
+        assert named == ["User"]
+        assert public == ["MAX_USERS", "User", "helper"]
+
+
+class TestProjectContext:
+
+    def test_format_groups_by_module_with_doc(self, tmp_path):
+        path = tmp_path / "models.py"
+        path.write_text(MODELS, encoding="utf-8")
+        index = SymbolIndex(str(tmp_path / "index.json"))
+
+        context = get_project_context(index.lookup({str(path): {"User", "helper"}}))
+
+        assert context.startswith("# module models\nclass User(Base)  # Utilisateur du service.")
+        assert "def helper(x)  # Aide interne." in context
+
+    def test_budget_drops_extra_symbols(self):
+        symbols = [
+            {"path": "m.py", "name": f"f{i}", "signature": f"def f{i}(a, b, c)", "doc": ""}
+            for i in range(100)
+        ]
+
+        context = get_project_context(symbols, max_chars=200)
+
+        assert len(context) <= 210
+        assert context.endswith("# ...")
+        assert get_project_context([]) == ""
@@ -0,0 +1,99 @@
+"""
+Tests de la sélection des tests impactés (src.tools.test_impact).
+"""
+
+from src.agents.judge_agent import JudgeAgent
+from src.orchestrator import Orchestrator
+from src.tools.file_tools import find_python_files
+from src.tools.test_impact import TestImpactIndex, configure_test_impact, find_test_files, select_tests
+
+CALC = "def add(a, b):\n    return a + b\n"
+TEST_CALC = "from calc import add\n\ndef test_add():\n    assert add(1, 2) == 3\n"
+
+
+def write(directory, files):
+    paths = {}
+    for name, content in files.items():
+        path = directory / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+        paths[name] = str(path)
+    return paths
+
+
+class TestTestImpactIndex:
+
+    def test_direct_importers_only(self, tmp_path):
+        paths = write(tmp_path, {
+            "base.py": "X = 1\n",
+            "service.py": "from base import X\n",
+            "other.py": "Y = 2\n",
+            "tests/test_service.py": "import service\n\ndef test_s():\n    pass\n",
+            "tests/test_other.py": "from other import Y\n\ndef test_o():\n    pass\n",
+        })
+        sources = [paths["base.py"], paths["service.py"], paths["other.py"]]
+        index = TestImpactIndex(str(tmp_path), sources)
+
+        # test_service échoue aussi sur les bugs de service.py : pas imputé à base.py
+        assert index.impacted_tests(paths["base.py"]) == []
+        assert index.impacted_tests(paths["service.py"]) == [paths["tests/test_service.py"]]
+        assert index.select(paths["other.py"]) == (
+            [paths["other.py"], paths["tests/test_other.py"]], "impact"
+        )
+
+    def test_no_tests_selects_file_only(self, tmp_path):
+        paths = write(tmp_path, {"calc.py": CALC, "alone.py": "Z = 0\n", "test_calc.py": TEST_CALC})
+        index = TestImpactIndex(str(tmp_path), [paths["calc.py"], paths["alone.py"]])
+
+        assert index.select(paths["alone.py"]) == ([paths["alone.py"]], "self")
+        assert index.select(paths["calc.py"]) == ([paths["calc.py"], paths["test_calc.py"]], "impact")
+        assert index.stats == {"selections": 2, "no_impacted_tests": 1, "tests_selected": 1}
+
+    def test_suffix_test_files_are_not_processed(self, tmp_path):
+        write(tmp_path, {"calc.py": CALC, "calc_test.py": TEST_CALC, "test_calc.py": TEST_CALC})
+
+        assert find_python_files(str(tmp_path)) == [str(tmp_path / "calc.py")]
+        assert len(find_test_files(str(tmp_path))) == 2
+
+    def test_disabled_without_index(self):
+        configure_test_impact(None)
+
+        assert select_tests("calc.py") == (None, "disabled")
+
+
+class TestJudgeWithImpactedTests:
+
+    def test_judge_runs_selected_tests(self, fake_gemini, sandbox_dir):
+        paths = write(sandbox_dir, {"calc.py": CALC, "test_calc.py": TEST_CALC})
+
+        report = JudgeAgent(use_rules=True).judge_file(
+            paths["calc.py"], {"total_issues": 1}, test_paths=[paths["test_calc.py"]]
+        )
+
+        assert report["decision"] == "VALIDATE"
+        assert report["tests_passed"] == 1
+        assert fake_gemini.calls == []
+
+    def test_orchestrator_selects_tests_for_fixed_file(self, fake_gemini, sandbox_dir):
+        write(sandbox_dir, {"calc.py": CALC, "test_calc.py": TEST_CALC})
+
+        summary = Orchestrator(str(sandbox_dir)).run()
+
+        assert summary["files"][0]["status"] == "VALIDATED"
+        impact = summary["timing"]["test_impact"]
+        assert impact["enabled"] and impact["test_files"] == 1
+        assert impact["tests_selected"] == impact["selections"] >= 1
+
+    def test_full_run_is_reported_not_charged_to_files(self, fake_gemini, sandbox_dir):
+        write(sandbox_dir, {
+            "calc.py": CALC,
+            "test_calc.py": TEST_CALC,
+            "test_broken.py": "def test_broken():\n    assert False\n",
+        })
+
+        summary = Orchestrator(str(sandbox_dir)).run()
+
+        assert summary["files"][0]["status"] == "VALIDATED"
+        full_run = summary["timing"]["test_impact"]["full_run"]
+        assert full_run["test_files"] == 2
+        assert full_run["failed"] >= 1 and full_run["returncode"] == 1
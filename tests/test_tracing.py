@@ -0,0 +1,139 @@
+"""
+Tests du traçage des performances (spans).
+"""
+
+from src.orchestrator import Orchestrator
+from src.utils import tracing
+from src.utils.tracing import (
+    configure_span_retention, get_spans, reset_tracing, span, summarize_spans, traced
+)
+
+
+class TestSpans:
+    """Enregistrement et imbrication des spans."""
+
+    def setup_method(self):
+        reset_tracing()
+
+    def test_nested_spans_share_trace_and_inherit_file(self):
+        """Un span enfant hérite de la trace et de l'attribut 'file'."""
+        with span("file", kind="file", file="a.py") as parent:
+            with span("pytest", kind="subprocess") as child:
+                pass
+
+        assert child.trace_id == parent.trace_id
+        assert child.parent_id == parent.span_id
+        assert child.attributes["file"] == "a.py"
+        assert len(get_spans()) == 2
+
+    def test_error_is_recorded(self):
+        """Une exception marque le span en erreur sans être avalée."""
+        try:
+            with span("boom", kind="io"):
+                raise OSError("disk full")
+        except OSError:
+            pass
+
+        recorded = get_spans()[0]
+        assert recorded.status == "ERROR"
+        assert recorded.attributes["error_type"] == "OSError"
+
+    def test_traced_node_reads_file_from_state(self):
+        """Le décorateur extrait le fichier de l'état du graphe."""
+        node = traced("audit", kind="node")(lambda state: state)
+        node({"file_name": "b.py", "iteration": 2})
+
+        recorded = get_spans()[0]
+        assert recorded.kind == "node"
+        assert recorded.attributes == {"file": "b.py", "iteration": 2}
+
+    def test_summary_aggregates_by_kind_node_file_and_agent(self):
+        """Le résumé agrège durées et tokens."""
+        with span("file", kind="file", file="c.py"):
+            with span("audit", kind="node"):
+                with span("generate_content", kind="llm", agent="Auditor_Agent") as llm:
+                    llm.set(prompt_tokens=100, output_tokens=20)
+
+        timing = summarize_spans()
+        assert timing["by_kind"]["llm"]["count"] == 1
+        assert timing["by_node"]["audit"]["count"] == 1
+        assert set(timing["by_file"]["c.py"]) == {"wall_s", "node_s", "llm_s"}
+        assert timing["llm_by_agent"]["Auditor_Agent"]["avg_prompt_tokens"] == 100
+
+
+    def test_summary_is_aggregated_without_keeping_spans(self, monkeypatch):
+        """Le résumé couvre tous les spans, seuls les plus récents sont gardés."""
+        monkeypatch.setattr(tracing, "MAX_RETAINED_SPANS", 3)
+        configure_span_retention(keep_all=False)
+        try:
+            for _ in range(10):
+                with span("write_file", kind="io"):
+                    pass
+
+            assert len(get_spans()) == 3
+            assert summarize_spans()["by_io"]["write_file"]["count"] == 10
+        finally:
+            monkeypatch.undo()
+            configure_span_retention(keep_all=False)
+
+
+class TestOrchestratorTiming:
+    """Résumé des temps en fin de run."""
+
+    def test_run_reports_timing(self, fake_gemini, sandbox_dir):
+        """Orchestrator.run renvoie les temps par nœud, fichier et agent."""
+        (sandbox_dir / "module.py").write_text("def f():\n    return 1\n", encoding="utf-8")
+
+        summary = Orchestrator(str(sandbox_dir), max_iterations=3).run()
+
+        timing = summary["timing"]
+        assert {"audit", "fixer", "judge_after_fix"} <= set(timing["by_node"])
+        assert "subprocess" in timing["by_kind"]
+        assert "io" in timing["by_kind"]
+        assert "module.py" in timing["by_file"]
+        assert timing["llm_by_agent"]["Fixer_Agent"]["prompt_tokens"] > 0
+        assert "total_wait_seconds" in timing["rate_limiter"]
+
+
+class TestOtlpExport:
+    """Export OTLP/JSON des spans."""
+
+    def setup_method(self):
+        reset_tracing()
+
+    def test_document_structure(self):
+        """Les spans sont convertis avec ids, horodatages et attributs typés."""
+        from src.utils.trace_export import build_otlp_document
+
+        with span("refactoring_graph.invoke", kind="graph", file="a.py"):
+            with span("generate_content", kind="llm", prompt_tokens=12, ratio=0.5):
+                pass
+
+        document = build_otlp_document()
+        resource = document["resourceSpans"][0]
+        assert resource["resource"]["attributes"][0]["value"] == {"stringValue": "refactoring-swarm"}
+
+        llm, graph = resource["scopeSpans"][0]["spans"]
+        assert llm["parentSpanId"] == graph["spanId"]
+        assert llm["traceId"] == graph["traceId"] and len(llm["traceId"]) == 32
+        assert llm["kind"] == 3 and graph["kind"] == 1
+        assert int(llm["endTimeUnixNano"]) >= int(llm["startTimeUnixNano"])
+        attributes = {a["key"]: a["value"] for a in llm["attributes"]}
+        assert attributes["prompt_tokens"] == {"intValue": "12"}
+        assert attributes["ratio"] == {"doubleValue": 0.5}
+        assert attributes["file"] == {"stringValue": "a.py"}
+
+    def test_orchestrator_writes_trace_file(self, fake_gemini, sandbox_dir, tmp_path):
+        """--trace_file produit un fichier contenant les spans du graphe."""
+        import json
+
+        (sandbox_dir / "module.py").write_text("x = 1\n", encoding="utf-8")
+        trace_file = tmp_path / "traces.otlp.json"
+
+        Orchestrator(str(sandbox_dir), max_iterations=3, trace_file=str(trace_file)).run()
+
+        spans = json.loads(trace_file.read_text())["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        names = {s["name"] for s in spans}
+        assert {"orchestrator.run", "refactoring_graph.invoke", "audit", "generate_content", "pytest"} <= names
+        run_trace = next(s["traceId"] for s in spans if s["name"] == "orchestrator.run")
+        assert all(s["traceId"] == run_trace for s in spans if s["name"] in ("audit", "pytest"))
@@ -9,6 +9,8 @@ import sys
 from pathlib import Path
 from datetime import datetime
 
+from src.utils.logger import rehydrate_entry
+
 
 def validate_experiment_logs():
     """Valide le fichier experiment_data.json selon les spécifications du TP"""
@@ -95,6 +97,12 @@ def validate_experiment_logs():
             if 'model' in entry and not entry['model']:
                 entry_warnings.append("Le nom du modèle n'est pas spécifié")
             
+            # Les gros champs (prompts, réponses) sont stockés dans logs/blobs/
+            try:
+                entry = rehydrate_entry(entry)
+            except (OSError, EOFError, ValueError) as e:
+                entry_errors.append(f"Blob référencé illisible ou manquant : {e}")
+            
             # Vérifier les détails (CRITIQUE pour l'évaluation)
             if 'details' in entry:
                 details = entry['details']